@@ -1,5 +1,8 @@
-import { useEffect, useState } from "react";
+import { useEffect, useMemo, useState } from "react";
 import { socket } from "./network/socket.js";
+import { applyStatePatch, loadSnapshot } from "./network/stateSync.js";
+import { cachedCardTable, fetchCardTable } from "./network/cardTable.js";
+import { withCardDefinitions } from "./state/selectors.js";
 import { LobbyScreen } from "./components/LobbyScreen.jsx";
 import { GameShell } from "./game/GameShell.jsx";
 import { BonusCardSelector } from "./game/BonusCardSelector.jsx";
@@ -10,6 +13,14 @@ export default function App() {
   const [gameState, setGameState] = useState(null);
   const [reconnecting, setReconnecting] = useState(false);
   const [bonusCardSelection, setBonusCardSelection] = useState(null);
+  const [cardTable, setCardTable] = useState(cachedCardTable);
+
+  // Bird definitions for the cards in game states
+  useEffect(() => {
+    fetchCardTable().then(setCardTable);
+  }, []);
+
+  const state = useMemo(() => withCardDefinitions(gameState, cardTable), [gameState, cardTable]);
 
   useEffect(() => {
     const handleConnect = () => {
@@ -32,10 +43,10 @@ export default function App() {
       setLobby(lobby);
     };
 
-    const handleGameStarted = ({ state }) => {
+    const handleGameStarted = (snapshot) => {
       // Always use current socket.id to avoid stale closures
       setMyPlayerId(socket.id);
-      setGameState(state);
+      setGameState(loadSnapshot(snapshot));
       setLobby(null);
       
       // Save game session
@@ -48,14 +59,19 @@ export default function App() {
       }
     };
 
-    const handleStateUpdate = (state) => {
-      setGameState(state);
+    const handleStateSnapshot = (snapshot) => {
+      setGameState(loadSnapshot(snapshot));
+    };
+
+    const handleStatePatch = (patch) => {
+      const state = applyStatePatch(patch);
+      if (state) setGameState(state);
     };
 
-    const handleReconnectSuccess = ({ state, message }) => {
+    const handleReconnectSuccess = ({ message, ...snapshot }) => {
       setReconnecting(false);
       setMyPlayerId(socket.id);
-      setGameState(state);
+      setGameState(loadSnapshot(snapshot));
       console.log(message);
     };
 
@@ -93,7 +109,8 @@ export default function App() {
     socket.on("connect", handleConnect);
     socket.on("lobbyUpdate", handleLobbyUpdate);
     socket.on("gameStarted", handleGameStarted);
-    socket.on("stateUpdate", handleStateUpdate);
+    socket.on("stateSnapshot", handleStateSnapshot);
+    socket.on("statePatch", handleStatePatch);
     socket.on("reconnectSuccess", handleReconnectSuccess);
     socket.on("reconnectError", handleReconnectError);
     socket.on("powerActivated", handlePowerActivated);
@@ -108,7 +125,8 @@ export default function App() {
       socket.off("connect", handleConnect);
       socket.off("lobbyUpdate", handleLobbyUpdate);
       socket.off("gameStarted", handleGameStarted);
-      socket.off("stateUpdate", handleStateUpdate);
+      socket.off("stateSnapshot", handleStateSnapshot);
+      socket.off("statePatch", handleStatePatch);
       socket.off("reconnectSuccess", handleReconnectSuccess);
       socket.off("reconnectError", handleReconnectError);
       socket.off("powerActivated", handlePowerActivated);
@@ -141,7 +159,7 @@ export default function App() {
     return (
       <>
         <GameShell
-          state={gameState}
+          state={state}
           myPlayerId={myPlayerId}
         />
         {bonusCardSelection && (
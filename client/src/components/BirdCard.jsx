@@ -3,6 +3,8 @@ import { FoodToken } from "./FoodToken.jsx";
 import { EggCounter } from "./EggToken.jsx";
 import { Tooltip } from "./Tooltip.jsx";
 import { CardZoom } from "./CardZoom.jsx";
+import { ResponsiveImage } from "./ResponsiveImage.jsx";
+import { birdImageUrl, spriteKey, spriteStyle, useSpriteAtlas } from "../utils/assets.js";
 
 const HABITAT_COLORS = {
   forest: "#2E7D32",
@@ -16,10 +18,16 @@ export function BirdCard({ bird, onClick, selected, compact = false, showEggs =
   const habitatColor = HABITAT_COLORS[bird.habitats?.[0]] || "#666";
   
   // Try to load actual card image
-  const cardImagePath = `/assets/birds/fronts/${bird.id}.jpg`;
+  const cardImagePath = birdImageUrl(bird);
   const [imageExists, setImageExists] = React.useState(true);
   const [imageLoaded, setImageLoaded] = React.useState(false);
 
+  // Cards packed into the sprite atlas are drawn from a shared sheet
+  const atlas = useSpriteAtlas();
+  const cardSprite = spriteStyle(atlas, spriteKey(cardImagePath), 200);
+  const thumbSprite = spriteStyle(atlas, spriteKey(cardImagePath), 60);
+  const showImage = Boolean(cardSprite) || imageLoaded;
+
   if (compact) {
     return (
       <Tooltip text={bird.name}>
@@ -29,6 +37,12 @@ export function BirdCard({ bird, onClick, selected, compact = false, showEggs =
             width: 60,
             height: 80,
             backgroundColor: habitatColor,
+            ...(thumbSprite && {
+              backgroundImage: thumbSprite.backgroundImage,
+              backgroundPosition: thumbSprite.backgroundPosition,
+              backgroundSize: thumbSprite.backgroundSize,
+              backgroundRepeat: "no-repeat"
+            }),
             borderRadius: 6,
             border: selected ? "3px solid #FFD700" : "2px solid #333",
             boxShadow: selected
@@ -78,19 +92,24 @@ export function BirdCard({ bird, onClick, selected, compact = false, showEggs =
             position: "relative"
           }}
         >
-          <img
-            src={cardImagePath}
-            alt={bird.name}
-            style={{
-              width: '100%',
-              height: '100%',
-              objectFit: 'contain',
-              display: imageLoaded ? 'block' : 'none'
-            }}
-            onError={() => setImageExists(false)}
-            onLoad={() => setImageLoaded(true)}
-          />
-          {!imageLoaded && (
+          {cardSprite ? (
+            <div role="img" aria-label={bird.name} style={cardSprite} />
+          ) : atlas !== undefined && (
+            <ResponsiveImage
+              src={cardImagePath}
+              sizes="200px"
+              alt={bird.name}
+              style={{
+                width: '100%',
+                height: '100%',
+                objectFit: 'contain',
+                display: imageLoaded ? 'block' : 'none'
+              }}
+              onError={() => setImageExists(false)}
+              onLoad={() => setImageLoaded(true)}
+            />
+          )}
+          {!showImage && (
             <div style={{
               width: '100%',
               height: '100%',
@@ -102,7 +121,7 @@ export function BirdCard({ bird, onClick, selected, compact = false, showEggs =
               fontSize: '0.9em'
             }}>Loading...</div>
           )}
-          {showEggs && bird.eggs > 0 && imageLoaded && (
+          {showEggs && bird.eggs > 0 && showImage && (
             <div style={{
               position: 'absolute',
               bottom: 8,
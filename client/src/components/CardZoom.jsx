@@ -1,4 +1,5 @@
 import React, { useEffect, useState } from "react";
+import { ResponsiveImage } from "./ResponsiveImage.jsx";
 
 /**
  * CardZoom - Shows a large version of a card when Alt is held and mouse hovers over card
@@ -86,8 +87,9 @@ export function CardZoom({ children, cardImagePath, cardContent }) {
           }}
         >
           {cardImagePath ? (
-            <img
+            <ResponsiveImage
               src={cardImagePath}
+              sizes={`${zoomWidth}px`}
               alt="Card zoom"
               style={{
                 width: "100%",
@@ -1,4 +1,5 @@
 import React from "react";
+import { Sprite } from "./Sprite.jsx";
 
 const FOOD_COLORS = {
   invertebrate: "#FF6B9D",
@@ -43,7 +44,7 @@ export function DiceToken({ type, size = 48, onClick, selected }) {
       }}
       title={`${type} (click to select)`}
     >
-      {icon}
+      <Sprite name={`dice/${type}`} width={Math.round(size * 0.7)} fallback={icon} />
     </div>
   );
 }
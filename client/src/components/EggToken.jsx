@@ -1,4 +1,5 @@
 import React from "react";
+import { Sprite } from "./Sprite.jsx";
 
 export function EggToken({ size = 24 }) {
   return (
@@ -17,7 +18,7 @@ export function EggToken({ size = 24 }) {
       }}
       title="Egg"
     >
-      🥚
+      <Sprite name="eggs/egg" width={Math.round(size * 0.8)} fallback="🥚" />
     </div>
   );
 }
@@ -1,4 +1,5 @@
 import React from "react";
+import { Sprite } from "./Sprite.jsx";
 
 // Food token styling based on Wingspan dice
 const FOOD_STYLES = {
@@ -71,12 +72,18 @@ export function FoodToken({ type, size = 32, count = 1, style = {} }) {
       onMouseEnter={(e) => e.currentTarget.style.transform = "scale(1.1)"}
       onMouseLeave={(e) => e.currentTarget.style.transform = "scale(1)"}
     >
-      <span style={{ 
-        filter: "drop-shadow(0 1px 2px rgba(0,0,0,0.3))",
-        transform: "translateY(-1px)"
-      }}>
-        {foodStyle.icon}
-      </span>
+      <Sprite
+        name={`food/${type}`}
+        width={Math.round(size * 0.7)}
+        fallback={
+          <span style={{ 
+            filter: "drop-shadow(0 1px 2px rgba(0,0,0,0.3))",
+            transform: "translateY(-1px)"
+          }}>
+            {foodStyle.icon}
+          </span>
+        }
+      />
       {count > 1 && (
         <div
           style={{
@@ -0,0 +1,37 @@
+import React from "react";
+import { responsiveSources, useAssetManifest } from "../utils/assets.js";
+
+/**
+ * <img> that picks a resized AVIF/WebP/JPEG variant for its display size.
+ * `sizes` is the CSS width the image is shown at, e.g. "200px".
+ * Falls back to the full-size image when no variants were built.
+ */
+export function ResponsiveImage({ src, sizes, alt, style, onLoad, onError }) {
+  const assetManifest = useAssetManifest();
+
+  // Wait for the manifest so the full-size image isn't fetched first
+  if (assetManifest === undefined) return null;
+
+  const sources = responsiveSources(assetManifest, src);
+  if (!sources) {
+    return <img src={src} alt={alt} style={style} onLoad={onLoad} onError={onError} />;
+  }
+
+  const fallback = sources.find(s => s.format === "jpeg");
+  return (
+    <picture style={{ display: "contents" }}>
+      {sources.filter(s => s !== fallback).map(s => (
+        <source key={s.format} type={s.type} srcSet={s.srcSet} sizes={sizes} />
+      ))}
+      <img
+        src={src}
+        srcSet={fallback?.srcSet}
+        sizes={sizes}
+        alt={alt}
+        style={style}
+        onLoad={onLoad}
+        onError={onError}
+      />
+    </picture>
+  );
+}
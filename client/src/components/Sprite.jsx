@@ -0,0 +1,14 @@
+import React from "react";
+import { spriteStyle, useSpriteAtlas } from "../utils/assets.js";
+
+/**
+ * Draws an image from the sprite atlas at the given CSS width.
+ * Renders `fallback` when the atlas is missing or doesn't contain `name`.
+ */
+export function Sprite({ name, width, title, style, fallback = null }) {
+  const atlas = useSpriteAtlas();
+  const css = spriteStyle(atlas, name, width);
+  if (!css) return fallback;
+
+  return <div role="img" aria-label={title} title={title} style={{ ...css, ...style }} />;
+}
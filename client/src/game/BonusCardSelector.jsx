@@ -1,5 +1,7 @@
 import React, { useState } from "react";
 import { socket } from "../network/socket.js";
+import { bonusImageUrl } from "../utils/assets.js";
+import { ResponsiveImage } from "../components/ResponsiveImage.jsx";
 
 export function BonusCardSelector({ gameId, bonusCards, birdName, onClose }) {
   const [selectedCard, setSelectedCard] = useState(null);
@@ -71,7 +73,7 @@ export function BonusCardSelector({ gameId, bonusCards, birdName, onClose }) {
           }}
         >
           {bonusCards.map((card) => {
-            const bonusImagePath = `/assets/bonus/${card.id}.jpg`;
+            const bonusImagePath = bonusImageUrl(card);
             const isSelected = selectedCard && (selectedCard.instanceId || selectedCard.id) === (card.instanceId || card.id);
 
             return (
@@ -119,8 +121,9 @@ export function BonusCardSelector({ gameId, bonusCards, birdName, onClose }) {
                     ✓ Selected
                   </div>
                 )}
-                <img
+                <ResponsiveImage
                   src={bonusImagePath}
+                  sizes="280px"
                   alt={card.name}
                   style={{
                     width: "100%",
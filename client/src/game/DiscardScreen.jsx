@@ -35,7 +35,7 @@ export function DiscardScreen({ state, myPlayerId }) {
   };
 
   const confirmedCount = state.players.filter((p) => 
-    (p.hand?.length || 0) <= 5 || p.discardConfirmed
+    (p.handCount ?? p.hand?.length ?? 0) <= 5 || p.discardConfirmed
   ).length;
   const totalPlayers = state.players.length;
 
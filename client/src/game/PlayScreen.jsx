@@ -5,6 +5,7 @@ import { ActionPanel } from "./ActionPanel.jsx";
 import { SharedBoard } from "./SharedBoard.jsx";
 import { RoundGoalScorer } from "./RoundGoalScorer.jsx";
 import { playDingSound } from "../utils/sound.js";
+import { logEntries } from "../state/selectors.js";
 
 export function PlayScreen({ state, myPlayerId }) {
   const me = state.players.find(p => p.id === myPlayerId);
@@ -65,8 +66,10 @@ export function PlayScreen({ state, myPlayerId }) {
               currentRound={state.round?.round || 1}
             />
             <SharedBoard 
+              gameId={state.id}
               diceTray={state.diceTray} 
-              logs={state.logs}
+              logs={logEntries(state.logs)}
+              logTotal={state.logs?.total}
               round={state.round}
               birdTray={state.birdTray}
             />
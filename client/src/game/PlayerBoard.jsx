@@ -13,11 +13,7 @@ export function PlayerBoard({ player, compact = false }) {
     return <div className="player-board">Loading player board…</div>;
   }
 
-  const totalEggs = [
-    ...player.habitats.forest,
-    ...player.habitats.grassland,
-    ...player.habitats.wetlands
-  ].reduce((sum, b) => sum + (b.eggs || 0), 0);
+  const totalEggs = player.board?.eggs || 0;
 
   const roundCubes = [8, 7, 6, 5][0] || 8; // TODO: Get actual round from state
 
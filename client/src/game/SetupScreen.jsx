@@ -1,5 +1,7 @@
 import React, { useState } from "react";
 import { socket } from "../network/socket.js";
+import { bonusImageUrl } from "../utils/assets.js";
+import { ResponsiveImage } from "../components/ResponsiveImage.jsx";
 import { BirdCard } from "../components/BirdCard.jsx";
 
 export function SetupScreen({ state, myPlayerId }) {
@@ -219,7 +221,7 @@ export function SetupScreen({ state, myPlayerId }) {
                 </h3>
                 <div style={{ display: "flex", gap: 16, flexWrap: "wrap" }}>
                   {bonusCards.map((card) => {
-                    const bonusImagePath = `/assets/bonus/${card.id}.jpg`;
+                    const bonusImagePath = bonusImageUrl(card);
                     return (
                       <div
                         key={card.id}
@@ -247,8 +249,9 @@ export function SetupScreen({ state, myPlayerId }) {
                           justifyContent: "center"
                         }}
                       >
-                        <img
+                        <ResponsiveImage
                           src={bonusImagePath}
+                          sizes="250px"
                           alt={card.name}
                           style={{
                             width: "100%",
@@ -1,7 +1,31 @@
+import React, { useState } from "react";
 import { DiceTray } from "../components/DiceToken.jsx";
 import { BirdCard } from "../components/BirdCard.jsx";
+import { fetchLogHistory } from "../network/logHistory.js";
+
+export function SharedBoard({ gameId, diceTray = [], logs = [], logTotal = logs.length, roundGoals = [], currentRoundGoal, round, birdTray = [] }) {
+  // Entries older than the live log, fetched from the server on request.
+  // They stay contiguous with the live entries: if the live log has moved
+  // on since the last fetch, the next fetch starts again from its edge.
+  const [earlier, setEarlier] = useState({ entries: [], start: 0, hasMore: false });
+  const [expanded, setExpanded] = useState(false);
+  const liveStart = logTotal - logs.length;
+  const contiguous = earlier.entries.length > 0 && earlier.start + earlier.entries.length >= liveStart;
+  const olderEntries = contiguous ? earlier.entries.slice(0, liveStart - earlier.start) : [];
+  const visibleLogs = expanded ? [...olderEntries, ...logs] : logs.slice(-15);
+  const canShowEarlier = expanded
+    ? (contiguous ? earlier.hasMore : liveStart > 0)
+    : logs.length > 15 || liveStart > 0;
+
+  const showEarlier = async () => {
+    setExpanded(true);
+    if (!gameId || liveStart <= 0 || (expanded && contiguous && !earlier.hasMore)) return;
+    const page = await fetchLogHistory(gameId, contiguous ? earlier.start : liveStart);
+    setEarlier(contiguous
+      ? { entries: [...page.entries, ...olderEntries], start: page.start, hasMore: page.hasMore }
+      : page);
+  };
 
-export function SharedBoard({ diceTray = [], logs = [], roundGoals = [], currentRoundGoal, round, birdTray = [] }) {
   return (
     <div
       className="shared-board"
@@ -115,13 +139,21 @@ export function SharedBoard({ diceTray = [], logs = [], roundGoals = [], current
             fontSize: "0.8em"
           }}
         >
-          {logs && logs.length > 0 ? (
-            logs.slice(-15).map((log, i) => (
+          {canShowEarlier && (
+            <button
+              onClick={showEarlier}
+              style={{ display: "block", margin: "0 auto 4px", fontSize: "0.9em", cursor: "pointer" }}
+            >
+              Show earlier entries
+            </button>
+          )}
+          {visibleLogs.length > 0 ? (
+            visibleLogs.map((log, i) => (
               <div
                 key={i}
                 style={{
                   padding: "4px 0",
-                  borderBottom: i < logs.slice(-15).length - 1 ? "1px solid #eee" : "none",
+                  borderBottom: i < visibleLogs.length - 1 ? "1px solid #eee" : "none",
                   color: log.includes("activated") ? "#2e7d32" : "#333",
                   fontWeight: log.includes("activated") ? "600" : "normal"
                 }}
@@ -0,0 +1,46 @@
+import { socket } from "./socket.js";
+
+// Bird definitions, by id. Cards in game states carry only their id and
+// their own state (eggs, tucked cards...); the rest is looked up here (see
+// withCardDefinitions). The table is kept in localStorage and fetched again
+// only when the server has a different version.
+
+const STORAGE_KEY = "wingspan_cardTable";
+
+function toMap(birds) {
+  return new Map(birds.map(bird => [bird.id, bird]));
+}
+
+function readCache() {
+  try {
+    return JSON.parse(localStorage.getItem(STORAGE_KEY));
+  } catch {
+    return null;
+  }
+}
+
+/** The cached table, or null before the first fetch */
+export function cachedCardTable() {
+  const cached = readCache();
+  return cached?.birds ? toMap(cached.birds) : null;
+}
+
+/** Check the cached table with the server. Resolves with the current table. */
+export function fetchCardTable() {
+  const cached = readCache();
+  return new Promise(resolve => {
+    socket.once("cardTable", table => {
+      if (table.birds) {
+        try {
+          localStorage.setItem(STORAGE_KEY, JSON.stringify(table));
+        } catch {
+          // Storage full or unavailable: keep the table for this page only
+        }
+        resolve(toMap(table.birds));
+      } else {
+        resolve(toMap(cached.birds));
+      }
+    });
+    socket.emit("requestCardTable", { version: cached?.birds ? cached.version : undefined });
+  });
+}
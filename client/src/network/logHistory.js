@@ -0,0 +1,17 @@
+import { socket } from "./socket.js";
+
+/**
+ * Fetch log entries older than entry number `before` (see GameLog.page on
+ * the server). Resolves with { entries, start, total, hasMore }.
+ */
+export function fetchLogHistory(gameId, before, limit = 50) {
+  return new Promise(resolve => {
+    const handle = page => {
+      if (page.gameId !== gameId) return;
+      socket.off("logHistory", handle);
+      resolve(page);
+    };
+    socket.on("logHistory", handle);
+    socket.emit("requestLogHistory", { gameId, before, limit });
+  });
+}
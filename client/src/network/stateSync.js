@@ -0,0 +1,51 @@
+import { socket } from "./socket.js";
+import { applyPatch } from "../state/statePatch.js";
+import { withOwnPlayer } from "../state/selectors.js";
+
+// Game state arrives versioned (see server/network/StateSync.js): a full
+// snapshot on game start, reconnect or request, then patches against the
+// last version this client acknowledged. Recent versions are kept because
+// the server may base a patch on an older version than the newest one here
+// when an ack is still in flight. Versions are kept as received; callers
+// get them with the own player's private part merged in.
+
+let gameId = null;
+let latest = 0;
+const versions = new Map(); // version -> state
+
+function remember(id, version, state) {
+  gameId = id;
+  latest = version;
+  versions.set(version, state);
+  socket.emit("stateAck", { gameId: id, version });
+  return withOwnPlayer(state);
+}
+
+/**
+ * Start from a full snapshot ({ gameId, version, state }, as sent with
+ * stateSnapshot, gameStarted and reconnectSuccess). Returns the state.
+ */
+export function loadSnapshot({ gameId: id, version, state }) {
+  versions.clear();
+  return remember(id ?? state?.id, version, state);
+}
+
+/**
+ * Apply a statePatch. Returns the new state, or null if the patch was
+ * stale or its base version is gone (a snapshot is requested instead).
+ */
+export function applyStatePatch({ gameId: id, version, baseVersion, ops }) {
+  if (id !== gameId || version <= latest) return null;
+
+  const base = versions.get(baseVersion);
+  if (base === undefined) {
+    socket.emit("requestSnapshot", { gameId: id });
+    return null;
+  }
+
+  // The server never patches from below an acknowledged version again
+  for (const known of versions.keys()) {
+    if (known < baseVersion) versions.delete(known);
+  }
+  return remember(id, version, applyPatch(base, ops));
+}
@@ -0,0 +1,73 @@
+/**
+ * The live log entries in a serialized game state, oldest first. The
+ * server sends its log ring buffer in slot order (see
+ * server/engine/GameLog.js); older states sent a plain array.
+ */
+export function logEntries(logs) {
+  if (!logs) return [];
+  if (Array.isArray(logs)) return logs;
+  const { total, capacity, entries } = logs;
+  if (total <= capacity) return entries;
+  const head = total % capacity;
+  return [...entries.slice(head), ...entries.slice(0, head)];
+}
+
+/**
+ * Merge the private part of a received state (`you`, see
+ * server/network/projection.js) into the player it belongs to, so
+ * components can read the own player's hand and setup cards from
+ * state.players like any other field.
+ */
+export function withOwnPlayer(state) {
+  const you = state?.you;
+  if (!you) return state;
+  const { playerId, setup, ...own } = you;
+  return {
+    ...state,
+    players: state.players.map(p =>
+      p.id === playerId ? { ...p, ...own, setup: { ...p.setup, ...setup } } : p
+    )
+  };
+}
+
+// Cards with their definitions filled in, per card table, so unchanged
+// card objects in successive states resolve to the same object
+const resolvedCards = new WeakMap(); // card table -> WeakMap(card -> full card)
+
+/**
+ * Fill in the bird cards of a state (tray, boards, own hand and setup
+ * birds) from the card table (see network/cardTable.js). The server sends
+ * each card as its id plus its own state; components read name, foodCost,
+ * power and the rest from the full card as before.
+ */
+export function withCardDefinitions(state, cards) {
+  if (!state || !cards) return state;
+  if (!resolvedCards.has(cards)) resolvedCards.set(cards, new WeakMap());
+  const resolved = resolvedCards.get(cards);
+
+  const card = instance => {
+    if (!instance || typeof instance !== "object") return instance;
+    let full = resolved.get(instance);
+    if (!full) {
+      const definition = cards.get(instance.id);
+      full = definition ? { ...definition, ...instance } : instance;
+      resolved.set(instance, full);
+    }
+    return full;
+  };
+  const row = list => (Array.isArray(list) ? list.map(card) : list);
+
+  return {
+    ...state,
+    birdTray: row(state.birdTray),
+    faceUpBirds: row(state.faceUpBirds),
+    players: state.players.map(p => ({
+      ...p,
+      ...(p.hand && { hand: row(p.hand) }),
+      habitats: p.habitats && Object.fromEntries(
+        Object.entries(p.habitats).map(([habitat, birds]) => [habitat, row(birds)])
+      ),
+      setup: p.setup && { ...p.setup, ...(p.setup.birds && { birds: row(p.setup.birds) }) }
+    }))
+  };
+}
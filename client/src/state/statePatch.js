@@ -0,0 +1,52 @@
+// Applies patches made by server/utils/stateDiff.js.
+//
+// The state is never mutated: every object and array on a patched path is
+// copied (once per patch), so unchanged branches keep their identity and
+// React can skip re-rendering them.
+
+function copy(value) {
+  return Array.isArray(value) ? [...value] : { ...value };
+}
+
+export function applyPatch(state, ops) {
+  if (!ops.length) return state;
+
+  const copied = new Set();
+  let root = state;
+
+  // The container at path, copied if this patch has not copied it yet
+  const writable = path => {
+    if (!copied.has(root)) {
+      root = copy(root);
+      copied.add(root);
+    }
+    let node = root;
+    for (const key of path) {
+      let child = node[key];
+      if (!copied.has(child)) {
+        child = copy(child);
+        copied.add(child);
+        node[key] = child;
+      }
+      node = child;
+    }
+    return node;
+  };
+
+  for (const { op, path, value, values, length } of ops) {
+    if (op === "set" && path.length === 0) {
+      root = value;
+      continue;
+    }
+    if (op === "set") {
+      writable(path.slice(0, -1))[path[path.length - 1]] = value;
+    } else if (op === "del") {
+      delete writable(path.slice(0, -1))[path[path.length - 1]];
+    } else if (op === "push") {
+      writable(path).push(...values);
+    } else if (op === "truncate") {
+      writable(path).length = length;
+    }
+  }
+  return root;
+}
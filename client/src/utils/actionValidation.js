@@ -109,11 +109,7 @@ export function validatePlayBird(player, state, birdId, habitat) {
   const eggCost = Math.min(columnIndex, 3);
   
   if (eggCost > 0) {
-    const totalEggs = [
-      ...(player.habitats?.forest || []),
-      ...(player.habitats?.grassland || []),
-      ...(player.habitats?.wetlands || [])
-    ].reduce((sum, b) => sum + (b.eggs || 0), 0);
+    const totalEggs = player.board?.eggs || 0;
     
     if (totalEggs < eggCost) {
       return { 
@@ -0,0 +1,118 @@
+import { useEffect, useState } from "react";
+
+// Card image paths. Cards whose artwork is shared with another card carry an
+// `image` field naming the shared file; everything else uses `{id}.jpg`.
+
+export function birdImageUrl(bird) {
+  return `/assets/birds/fronts/${bird.image || `${bird.id}.jpg`}`;
+}
+
+export function bonusImageUrl(card) {
+  return `/assets/bonus/${card.image || `${card.id}.jpg`}`;
+}
+
+// Generated by scripts/build_responsive_assets.py and scripts/build_sprite_atlas.py
+const ASSETS_PREFIX = "/assets/";
+const RESPONSIVE_PREFIX = "/assets/responsive/";
+const ATLAS_PREFIX = "/assets/atlas/";
+
+// A JSON file fetched once and shared by every component
+function jsonResource(url) {
+  const resource = {
+    value: undefined,   // undefined = not loaded yet, null = unavailable
+    promise: null,
+    load() {
+      if (!resource.promise) {
+        resource.promise = fetch(url)
+          .then(res => (res.ok ? res.json() : null))
+          .catch(() => null)
+          .then(data => (resource.value = data));
+      }
+      return resource.promise;
+    }
+  };
+  return resource;
+}
+
+function useJsonResource(resource) {
+  const [current, setCurrent] = useState(resource.value);
+
+  useEffect(() => {
+    if (current === undefined) resource.load().then(setCurrent);
+  }, [resource, current]);
+
+  return current;
+}
+
+const manifestResource = jsonResource(`${RESPONSIVE_PREFIX}manifest.json`);
+const atlasResource = jsonResource(`${ATLAS_PREFIX}atlas.json`);
+
+export function loadAssetManifest() {
+  return manifestResource.load();
+}
+
+/**
+ * The asset manifest: undefined while it loads, null if there is none
+ * (images are then served at full size).
+ */
+export function useAssetManifest() {
+  return useJsonResource(manifestResource);
+}
+
+/** The sprite atlas: undefined while it loads, null if there is none. */
+export function useSpriteAtlas() {
+  return useJsonResource(atlasResource);
+}
+
+/**
+ * srcset data for an image URL: one entry per format, best compression first,
+ * each listing every width. Returns null if the image has no variants.
+ */
+export function responsiveSources(assetManifest, url) {
+  if (!assetManifest || !url?.startsWith(ASSETS_PREFIX)) return null;
+  const entry = assetManifest.images[url.slice(ASSETS_PREFIX.length)];
+  if (!entry) return null;
+
+  const byFormat = {};
+  for (const variant of Object.values(entry.variants)) {
+    for (const [format, file] of Object.entries(variant.files)) {
+      byFormat[format] ??= new Map();
+      byFormat[format].set(variant.width, `${RESPONSIVE_PREFIX}${file.file} ${variant.width}w`);
+    }
+  }
+
+  return Object.entries(byFormat).map(([format, widths]) => ({
+    format,
+    type: assetManifest.formats[format],
+    srcSet: [...widths.values()].join(", ")
+  }));
+}
+
+/** Atlas key for an asset URL: its path under /assets without the extension. */
+export function spriteKey(url) {
+  if (!url?.startsWith(ASSETS_PREFIX)) return null;
+  return url.slice(ASSETS_PREFIX.length).replace(/\.[^./]+$/, "");
+}
+
+/**
+ * CSS for drawing a sprite `width` CSS pixels wide, or null if the atlas
+ * doesn't have it. The sheet is picked for the screen's pixel density.
+ */
+export function spriteStyle(atlas, key, width) {
+  const sprite = atlas?.sprites[key];
+  if (!sprite) return null;
+
+  const sheet = atlas.sheets[sprite.sheet];
+  const density = typeof window === "undefined" ? 1 : window.devicePixelRatio || 1;
+  const scale = atlas.scales.find(s => s >= density) ?? atlas.scales[atlas.scales.length - 1];
+  const ratio = width / sprite.width;
+
+  return {
+    width,
+    height: Math.round(sprite.height * ratio),
+    backgroundImage: `url(${ATLAS_PREFIX}${sheet.files[scale].file})`,
+    backgroundPosition: `${-sprite.x * ratio}px ${-sprite.y * ratio}px`,
+    backgroundSize: `${sheet.width * ratio}px ${sheet.height * ratio}px`,
+    backgroundRepeat: "no-repeat"
+  };
+}
@@ -4,20 +4,16 @@ Carefully analyze Wingspan PDFs to extract and map card data.
 Step 1: Extract text from Appendix to understand structure.
 """
 
-import json
 from pathlib import Path
 
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    import subprocess
-    import sys
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "PyMuPDF"])
-    import fitz
+from instrumentation import run
+from pdf_ingest import (
+    APPENDIX_PDF, BIRD_CARDS_PDF, BONUS_CARDS_PDF, close_all, open_pdf, write_pages_text
+)
 
 def analyze_appendix():
     """Extract and analyze the Appendix to understand bird data structure."""
-    pdf_path = Path("D:/wingspan-online/Wingspan Assets/WS_Appendix_r17.pdf")
+    pdf_path = APPENDIX_PDF
     
     print("="*70)
     print("ANALYZING WINGSPAN APPENDIX")
@@ -27,35 +23,26 @@ def analyze_appendix():
         print(f"ERROR: {pdf_path} not found!")
         return
     
-    doc = fitz.open(str(pdf_path))
-    print(f"\nTotal pages: {len(doc)}")
+    source = open_pdf(pdf_path)
+    print(f"\nTotal pages: {len(source)}")
     
     # Sample first few pages to understand structure
     output_file = Path("wingspan_appendix_sample.txt")
+    texts = source.texts(stop=5)  # First 5 pages
+    write_pages_text(texts, output_file)
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for page_num in range(min(5, len(doc))):  # First 5 pages
-            page = doc[page_num]
-            text = page.get_text()
-            
-            f.write(f"\n{'='*70}\n")
-            f.write(f"PAGE {page_num + 1}\n")
-            f.write(f"{'='*70}\n")
-            f.write(text)
-            
-            # Also print to console for immediate review
-            print(f"\n--- PAGE {page_num + 1} (first 800 chars) ---")
-            print(text[:800])
-            print("...\n")
-    
-    doc.close()
+    # Also print to console for immediate review
+    for page_num, text in enumerate(texts):
+        print(f"\n--- PAGE {page_num + 1} (first 800 chars) ---")
+        print(text[:800])
+        print("...\n")
     
     print(f"\nFull text saved to: {output_file}")
     print("\nPlease review the structure to understand how bird data is organized.")
 
 def analyze_bird_cards_pdf():
     """Analyze the BirdCards PDF structure."""
-    pdf_path = Path("D:/wingspan-online/Wingspan Assets/BirdCards - Update Pack Cards.pdf")
+    pdf_path = BIRD_CARDS_PDF
     
     print("\n" + "="*70)
     print("ANALYZING BIRD CARDS PDF")
@@ -65,28 +52,23 @@ def analyze_bird_cards_pdf():
         print(f"ERROR: {pdf_path} not found!")
         return
     
-    doc = fitz.open(str(pdf_path))
-    print(f"\nTotal pages: {len(doc)}")
+    source = open_pdf(pdf_path)
+    print(f"\nTotal pages: {len(source)}")
     
     # Check first page
-    page = doc[0]
-    text = page.get_text()
+    text = source.page(0).text
     
     print("\n--- PAGE 1 SAMPLE ---")
     print(text[:1000])
     
     # Count images per page
     print("\n--- IMAGE COUNT PER PAGE ---")
-    for page_num in range(min(5, len(doc))):
-        page = doc[page_num]
-        images = page.get_images(full=True)
-        print(f"Page {page_num + 1}: {len(images)} images")
-    
-    doc.close()
+    for page in source.pages(stop=5):
+        print(f"Page {page.number}: {len(page.image_xrefs)} images")
 
 def analyze_bonus_cards_pdf():
     """Analyze the Bonus Cards PDF structure."""
-    pdf_path = Path("D:/wingspan-online/Wingspan Assets/Wingspan_BonusCards - Update Pack Cards.pdf")
+    pdf_path = BONUS_CARDS_PDF
     
     print("\n" + "="*70)
     print("ANALYZING BONUS CARDS PDF")
@@ -96,25 +78,14 @@ def analyze_bonus_cards_pdf():
         print(f"ERROR: {pdf_path} not found!")
         return
     
-    doc = fitz.open(str(pdf_path))
-    print(f"\nTotal pages: {len(doc)}")
+    source = open_pdf(pdf_path)
+    print(f"\nTotal pages: {len(source)}")
     
     # Extract all text
     output_file = Path("wingspan_bonus_cards_text.txt")
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text()
-            
-            f.write(f"\n{'='*70}\n")
-            f.write(f"PAGE {page_num + 1}\n")
-            f.write(f"{'='*70}\n")
-            f.write(text)
+    write_pages_text(source.texts(), output_file)
     
     print(f"Bonus cards text saved to: {output_file}")
-    
-    doc.close()
 
 def main():
     print("WINGSPAN PDF ANALYZER")
@@ -130,6 +101,8 @@ def main():
     # Analyze Bonus Cards PDF
     analyze_bonus_cards_pdf()
     
+    close_all()
+    
     print("\n" + "="*70)
     print("ANALYSIS COMPLETE")
     print("="*70)
@@ -140,4 +113,4 @@ def main():
     print("4. Build parser based on actual structure")
 
 if __name__ == "__main__":
-    main()
+    run(main)
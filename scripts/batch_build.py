@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Batch asset build over many PDFs at once.
+
+Takes a directory or glob of card PDFs (core, expansions, update packs) and
+schedules every task for every file on one bounded process pool:
+
+    text      page text review file (PAGE N banners)
+    images    card images + _metadata.jsonl (same as extract_and_map_cards)
+    render    page renders as JPEG, split into page-range chunks
+
+Where each PDF's output goes is decided by a JSON config of rules, matched
+against the PDF filename in order (first match wins):
+
+    {
+      "output_root": "temp_extracted/batch",
+      "rules": [
+        {"match": "*BirdCards*", "name": "birds-{slug}",
+         "images": "temp_extracted/{name}",
+         "render": "client/public/assets/birds/{slug}", "prefix": "bird"},
+        {"match": "*Appendix*", "tasks": ["text"]}
+      ]
+    }
+
+A rule's name, paths and prefix may use {stem} (the PDF filename without
+.pdf), {slug} (the stem in lowercase-with-dashes) and, except in the name
+itself, {name}. The name defaults to {slug}, so one rule can match several
+PDFs (core, European, Oceania...) and give each its own folders. Any
+location a rule leaves out goes under output_root/<name>/. Two PDFs that
+would write to the same name or location are an error.
+
+Without a config, DEFAULT_RULES reproduces the locations the single-PDF
+scripts use for the core PDFs, and puts every other bird, bonus or
+appendix PDF in per-PDF folders next to them.
+
+A timing report (per task and per file) is printed and written as JSON.
+Run from the repository root, like the other data scripts.
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import glob
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from extract_and_map_cards import extract_cards
+from instrumentation import merge, run, snapshot, write_json
+from pdf_ingest import (APPENDIX_PDF, ASSETS_DIR, BIRD_CARDS_PDF, BONUS_CARDS_PDF,
+                        PdfSource, close_all, render_page_range, split_page_ranges,
+                        write_pages_text)
+
+OUTPUT_ROOT = Path("temp_extracted/batch")
+REPORT_FILE = Path("temp_extracted/batch_report.json")
+
+TASKS = ('text', 'images', 'render')
+
+DEFAULT_RULES = [
+    # The core PDFs, where the single-PDF scripts and build_data.py expect them
+    {
+        'match': BIRD_CARDS_PDF.name,
+        'name': 'birds',
+        'text': 'temp_extracted/bird_cards_text.txt',
+        'images': 'temp_extracted/birds',
+        'render': 'client/public/assets/birds/fronts',
+        'prefix': 'bird'
+    },
+    {
+        'match': BONUS_CARDS_PDF.name,
+        'name': 'bonus',
+        'text': 'temp_extracted/bonus_cards_text.txt',
+        'images': 'temp_extracted/bonus',
+        'render': 'client/public/assets/bonus',
+        'prefix': 'bonus'
+    },
+    {
+        'match': APPENDIX_PDF.name,
+        'name': 'appendix',
+        'text': 'temp_extracted/appendix_text.txt',
+        'tasks': ['text']
+    },
+    # Expansions and other packs: the same layout, one set of folders per PDF
+    {
+        'match': '*BirdCards*',
+        'name': 'birds-{slug}',
+        'text': 'temp_extracted/{name}_text.txt',
+        'images': 'temp_extracted/{name}',
+        'render': 'client/public/assets/birds/{slug}',
+        'prefix': 'bird'
+    },
+    {
+        'match': '*BonusCards*',
+        'name': 'bonus-{slug}',
+        'text': 'temp_extracted/{name}_text.txt',
+        'images': 'temp_extracted/{name}',
+        'render': 'client/public/assets/bonus/{slug}',
+        'prefix': 'bonus'
+    },
+    {
+        'match': '*Appendix*',
+        'name': 'appendix-{slug}',
+        'text': 'temp_extracted/{name}_text.txt',
+        'tasks': ['text']
+    }
+]
+
+# Text preview length printed per page by extract_cards (kept in the task log)
+PREVIEW_CHARS = 200
+
+
+def slugify(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def find_pdfs(sources):
+    """Expand directories and glob patterns into a sorted, de-duplicated PDF list."""
+    pdfs = set()
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            pdfs.update(p for p in path.rglob('*') if p.suffix.lower() == '.pdf')
+        else:
+            pdfs.update(Path(p) for p in glob.glob(source, recursive=True)
+                        if p.lower().endswith('.pdf'))
+    return sorted(pdfs)
+
+
+def load_config(path):
+    if path is None:
+        return {'output_root': str(OUTPUT_ROOT), 'rules': DEFAULT_RULES}
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    config.setdefault('output_root', str(OUTPUT_ROOT))
+    config.setdefault('rules', [])
+    return config
+
+
+def plan_pdf(pdf_path, config, tasks):
+    """
+    Resolve where one PDF's outputs go. Returns a plan dict with the PDF's
+    name, the tasks to run and a path per task.
+    """
+    rule = next((r for r in config['rules'] if fnmatch.fnmatch(pdf_path.name, r['match'])), {})
+    fields = {'stem': pdf_path.stem, 'slug': slugify(pdf_path.stem)}
+    name = rule.get('name', '{slug}').format(**fields)
+    fields['name'] = name
+    root = Path(config['output_root']) / name
+
+    def location(key, default):
+        return Path(rule[key].format(**fields)) if rule.get(key) else default
+
+    wanted = [task for task in rule.get('tasks', TASKS) if task in tasks]
+    return {
+        'name': name,
+        'pdf': str(pdf_path),
+        'tasks': wanted,
+        'text': location('text', root / 'text.txt'),
+        'images': location('images', root / 'images'),
+        'render': location('render', root / 'renders'),
+        'prefix': rule.get('prefix', '{name}').format(**fields),
+        'zoom': rule.get('zoom', config.get('zoom', 2))
+    }
+
+
+def conflicts(plans):
+    """Output names and task locations that more than one PDF would write to."""
+    owners = {}
+    for plan in plans:
+        owners.setdefault(('name', plan['name']), []).append(plan)
+        for task in plan['tasks']:
+            owners.setdefault((task, str(plan[task])), []).append(plan)
+    return [f"{what} {target} ({', '.join(Path(p['pdf']).name for p in shared)})"
+            for (what, target), shared in owners.items() if len(shared) > 1]
+
+
+def run_task(name, task, function, *args):
+    """
+    Run one task in a worker and time it. Card-by-card progress output is
+    captured instead of interleaving with other workers on the console.
+    Returns (name, task, started, seconds, result, log, spans).
+    """
+    log = io.StringIO()
+    earlier = snapshot(reset=True)
+    started = time.time()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        result = function(*args)
+        close_all()
+    seconds = time.perf_counter() - start
+    spans = snapshot(reset=True)
+    merge(earlier)
+    return name, task, started, seconds, result, log.getvalue(), spans
+
+
+def text_task(pdf_path, output_file):
+    source = PdfSource(pdf_path)
+    try:
+        texts = source.texts()
+    finally:
+        source.close()
+    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+    write_pages_text(texts, output_file)
+    return {'pages': len(texts), 'bytes': Path(output_file).stat().st_size}
+
+
+def images_task(pdf_path, output_dir):
+    cards = extract_cards(Path(pdf_path), Path(output_dir), PREVIEW_CHARS)
+    return {'cards': cards}
+
+
+def render_task(pdf_path, start, stop, output_dir, prefix, zoom):
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    rendered = render_page_range(pdf_path, start, stop, output_dir, prefix, zoom)
+    return {'pages': len(rendered), 'bytes': sum((Path(output_dir) / r[1]).stat().st_size for r in rendered)}
+
+
+def page_count(pdf_path):
+    source = PdfSource(pdf_path)
+    try:
+        return len(source)
+    finally:
+        source.close()
+
+
+def schedule(plans, workers):
+    """
+    Break every plan into (name, task, function, args) jobs. Renders are
+    split into page ranges so one large PDF can use several workers.
+    Image extraction is listed first: it is one long job per PDF and should
+    not end up waiting behind a queue of short ones.
+    """
+    jobs = []
+    for plan in plans:
+        if 'images' in plan['tasks']:
+            jobs.append((plan['name'], 'images', images_task, plan['pdf'], str(plan['images'])))
+    for plan in plans:
+        if 'render' in plan['tasks']:
+            for start, stop in split_page_ranges(page_count(plan['pdf']), workers):
+                jobs.append((plan['name'], 'render', render_task, plan['pdf'], start, stop,
+                             str(plan['render']), plan['prefix'], plan['zoom']))
+        if 'text' in plan['tasks']:
+            jobs.append((plan['name'], 'text', text_task, plan['pdf'], str(plan['text'])))
+    return jobs
+
+
+def merge_result(total, result):
+    for key, value in result.items():
+        total[key] = total.get(key, 0) + value
+
+
+def run_batch(plans, workers=1, verbose=False):
+    """Run every job on a pool of `workers` processes. Returns the timing report."""
+    jobs = schedule(plans, workers)
+    files = {plan['name']: {'pdf': plan['pdf'], 'tasks': {}, 'first_start': None, 'last_end': None}
+             for plan in plans}
+
+    def record(name, task, started, seconds, result, log, spans):
+        merge(spans)
+        entry = files[name]
+        timing = entry['tasks'].setdefault(task, {'jobs': 0, 'seconds': 0.0})
+        timing['jobs'] += 1
+        timing['seconds'] += seconds
+        merge_result(timing, result)
+        entry['first_start'] = started if entry['first_start'] is None else min(entry['first_start'], started)
+        entry['last_end'] = max(entry['last_end'] or 0, started + seconds)
+        print(f"  {name:<20} {task:<7} {seconds:7.2f}s  {result}")
+        if verbose and log:
+            print(log)
+
+    batch_start = time.perf_counter()
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_task, *job) for job in jobs]
+            for future in as_completed(futures):
+                record(*future.result())
+    else:
+        for job in jobs:
+            record(*run_task(*job))
+    wall = time.perf_counter() - batch_start
+
+    report = {'workers': workers, 'jobs': len(jobs), 'wall_seconds': round(wall, 3), 'files': {}}
+    for name, entry in files.items():
+        busy = sum(t['seconds'] for t in entry['tasks'].values())
+        span = entry['last_end'] - entry['first_start'] if entry['first_start'] is not None else 0.0
+        for timing in entry['tasks'].values():
+            timing['seconds'] = round(timing['seconds'], 3)
+        report['files'][name] = {
+            'pdf': entry['pdf'],
+            'busy_seconds': round(busy, 3),
+            'span_seconds': round(span, 3),
+            'tasks': entry['tasks']
+        }
+    return report
+
+
+def print_report(report):
+    print("\n" + "="*70)
+    print("PER-FILE TIMING")
+    print("="*70)
+    print(f"  {'file':<20} {'busy':>8} {'span':>8}  tasks")
+    for name, entry in report['files'].items():
+        tasks = ', '.join(f"{task} {t['seconds']:.2f}s" for task, t in entry['tasks'].items())
+        print(f"  {name:<20} {entry['busy_seconds']:7.2f}s {entry['span_seconds']:7.2f}s  {tasks}")
+
+    busy = sum(entry['busy_seconds'] for entry in report['files'].values())
+    print(f"\n {report['jobs']} jobs on {report['workers']} worker(s): "
+          f"{report['wall_seconds']:.2f}s wall, {busy:.2f}s of work")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract text, images and renders from many PDFs in parallel.")
+    parser.add_argument("sources", nargs='*', default=[str(ASSETS_DIR)],
+                        help="PDF files, directories or glob patterns (default: the Wingspan Assets folder)")
+    parser.add_argument("--config", type=Path, help="JSON config of output locations per PDF")
+    parser.add_argument("--tasks", default=','.join(TASKS),
+                        help=f"comma-separated tasks to run (default: {','.join(TASKS)})")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="number of worker processes (0 = one per CPU core)")
+    parser.add_argument("--report", type=Path, default=REPORT_FILE, help="where to write the JSON timing report")
+    parser.add_argument("--verbose", action="store_true", help="print each task's captured output")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    tasks = [task.strip() for task in args.tasks.split(',') if task.strip()]
+    unknown = set(tasks) - set(TASKS)
+    if unknown:
+        parser.error(f"unknown task(s): {', '.join(sorted(unknown))}")
+
+    print("="*70)
+    print("BATCH ASSET BUILD")
+    print("="*70)
+
+    config = load_config(args.config)
+    pdfs = find_pdfs(args.sources)
+    if not pdfs:
+        print(" No PDFs found")
+        return
+
+    plans = [plan_pdf(pdf, config, tasks) for pdf in pdfs]
+    shared = conflicts(plans)
+    if shared:
+        parser.error("several PDFs resolve to the same output: " + '; '.join(shared))
+
+    for plan in plans:
+        print(f"  {plan['name']:<20} {Path(plan['pdf']).name} [{', '.join(plan['tasks']) or 'nothing to do'}]")
+    print(f"\n Workers: {workers}\n")
+
+    report = run_batch(plans, workers, args.verbose)
+    print_report(report)
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    write_json(args.report, report, indent=2)
+    print(f" Report: {args.report}")
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Benchmark the data pipeline on synthetic card PDFs and CSVs.
+
+The real assets live on a private drive, so this generates stand-ins:
+
+    cards-<n>.pdf     n pages in the BirdCards layout: card text (name,
+                      scientific name, wingspan, points, power, BirdCards_
+                      footer) and one embedded card-sized JPEG per page
+    csv-<n>.csv       wingspan_game.csv with the same columns: a row for every
+                      card (a few with typos, to exercise fuzzy matching) plus
+                      CSV-only birds, CSV_EXTRA rows per card
+
+Each size (20, 200 and 2000 cards by default) runs these stages in order:
+
+    extract    extract_and_map_cards.extract_cards     PDF -> images + _metadata.jsonl
+    generate   generate_json_from_metadata             _metadata.jsonl -> data/birds.json
+    csv        update_birds_from_csv                   CSV + data/birds.json -> data/birds.json
+    render     pdf_ingest.render_page_range (serial)   PDF -> page JPEGs
+
+Every stage is timed untraced (best of --repeat runs) and then run once more
+under tracemalloc for its peak Python memory. Results are compared with the
+stored baseline; throughput more than --tolerance below it, or peak memory
+more than --tolerance above it, is a regression and the script exits with
+status 1. --save-baseline records the current results as the new baseline
+(baselines are machine-specific, so save one on the machine that runs the
+nightly rebuild).
+
+Run from the repository root, like the other data scripts.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "PyMuPDF"])
+    import fitz
+
+try:
+    from PIL import Image
+except ImportError:
+    print("Installing Pillow...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "Pillow"])
+    from PIL import Image
+
+import bird_catalogue
+from extract_and_map_cards import extract_cards
+from generate_json_from_metadata import generate_birds_json
+from instrumentation import run, snapshot, write_json
+from pdf_ingest import close_all, render_page_range
+from update_birds_from_csv import update_birds_json
+
+WORK_DIR = Path("temp_extracted/benchmark")
+BASELINE_FILE = Path(__file__).with_name("benchmark_baseline.json")
+
+RESULTS_VERSION = 1
+# Bump when the synthetic fixtures change, so cached ones are regenerated
+FIXTURE_VERSION = 1
+
+SIZES = (20, 200, 2000)
+TOLERANCE = 0.2
+
+# Card page size in points and embedded image size in pixels. The image has
+# to stay above extract_and_map_cards.MIN_CARD_IMAGE_SIZE to count as a card.
+PAGE_SIZE = (200, 280)
+IMAGE_SIZE = (300, 420)
+
+CSV_EXTRA = 0.5     # CSV-only birds per card
+TYPO_RATE = 0.05    # cards whose CSV name has a dropped letter
+
+ADJECTIVES = [
+    "American", "Black", "Blue", "Brown", "Common", "Crested", "Eastern", "Golden",
+    "Great", "Green", "Grey", "Hooded", "Horned", "Least", "Lesser", "Little",
+    "Long-billed", "Mountain", "Northern", "Painted", "Pied", "Red", "Ringed", "Rufous",
+    "Scarlet", "Short-eared", "Snowy", "Spotted", "Striped", "Tufted", "Western", "White",
+    "Yellow", "Barred", "Bridled", "Chestnut", "Dusky", "Forked", "Olive", "Sooty"
+]
+NOUNS = [
+    "Blackbird", "Bunting", "Cormorant", "Crane", "Dove", "Duck", "Eagle", "Egret",
+    "Falcon", "Finch", "Flycatcher", "Goose", "Grebe", "Gull", "Hawk", "Heron",
+    "Hummingbird", "Jay", "Kingfisher", "Kite", "Lark", "Owl", "Parrot", "Pelican",
+    "Plover", "Quail", "Sandpiper", "Sparrow", "Swallow", "Swift", "Tern", "Thrush",
+    "Vireo", "Warbler", "Woodpecker", "Wren"
+]
+POWERS = [
+    "WHEN ACTIVATED: Gain 1 [seed] from the birdfeeder, if there is one.",
+    "WHEN ACTIVATED: Lay 1 [egg] on any bird.",
+    "WHEN ACTIVATED: Draw 1 [card].",
+    "WHEN PLAYED: Draw 2 new bonus cards and keep 1.",
+    "ONCE BETWEEN TURNS: When another player plays a bird in their [wetland], tuck 1 [card] from your hand behind this bird.",
+    "WHEN ACTIVATED: Look at a [card] from the deck. If its wingspan is less than 75cm, tuck it behind this bird. If not, discard it."
+]
+CSV_COLUMNS = [
+    "Common name", "Scientific name", "Forest", "Grassland", "Wetland",
+    "Invertebrate", "Seed", "Fish", "Fruit", "Rodent", "Wild (food)", "Total food cost",
+    "Nest type", "Egg capacity", "Victory points", "Wingspan", "Power text", "PowerCategory"
+]
+NEST_TYPES = ["Bowl", "Cavity", "Ground", "Platform", "Wild"]
+POWER_CATEGORIES = {"WHEN ACTIVATED": "brown", "WHEN PLAYED": "when played", "ONCE BETWEEN TURNS": "pink"}
+
+
+# --- synthetic fixtures ---------------------------------------------------
+
+def bird_names(count, rng):
+    """count unique, plausible bird names."""
+    names = set()
+    while len(names) < count:
+        words = [rng.choice(ADJECTIVES)]
+        if rng.random() < 0.4:
+            words.append(rng.choice(ADJECTIVES))
+        words.append(rng.choice(NOUNS))
+        names.add(' '.join(dict.fromkeys(words)))
+    return sorted(names, key=lambda name: rng.random())
+
+
+def synthetic_birds(count, seed=0):
+    rng = random.Random(seed)
+    birds = []
+    for name in bird_names(count, rng):
+        birds.append({
+            'name': name,
+            'scientific': f"{rng.choice(NOUNS)}us {name.split()[-1].lower()}i",
+            'wingspan': rng.randint(20, 200),
+            'points': rng.randint(0, 9),
+            'power': rng.choice(POWERS),
+            'habitats': rng.sample(["Forest", "Grassland", "Wetland"], rng.randint(1, 3)),
+            'food': {food: rng.randint(1, 2) for food in rng.sample(CSV_COLUMNS[5:11], rng.randint(1, 3))},
+            'nest': rng.choice(NEST_TYPES),
+            'eggs': rng.randint(1, 6)
+        })
+    return birds
+
+
+def card_text(bird, number):
+    return (f"{bird['name']}\n{bird['scientific']}\n{bird['wingspan']}cm\n"
+            f"{bird['points']}\n{bird['power']}\nBirdCards_{number:03d}")
+
+
+def card_image(index):
+    """Card-sized JPEG; the noise keeps every card's bytes distinct and above the card threshold."""
+    buffer = io.BytesIO()
+    Image.effect_noise(IMAGE_SIZE, 40 + index % 20).convert('RGB').save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def write_cards_pdf(birds, path):
+    doc = fitz.open()
+    width, height = PAGE_SIZE
+    for index, bird in enumerate(birds):
+        page = doc.new_page(width=width, height=height)
+        page.insert_image(fitz.Rect(0, 0, width, height), stream=card_image(index))
+        page.insert_text((10, 20), card_text(bird, index + 1), fontsize=7)
+    doc.save(str(path), garbage=1)
+    doc.close()
+
+
+def csv_row(bird, name=None):
+    row = dict.fromkeys(CSV_COLUMNS, '')
+    row["Common name"] = name or bird['name']
+    row["Scientific name"] = bird['scientific']
+    for habitat in bird['habitats']:
+        row[habitat] = 'X'
+    for food, count in bird['food'].items():
+        row[food] = str(count)
+    row["Total food cost"] = str(sum(bird['food'].values()))
+    row["Nest type"] = bird['nest']
+    row["Egg capacity"] = str(bird['eggs'])
+    row["Victory points"] = str(bird['points'])
+    row["Wingspan"] = str(bird['wingspan'])
+    trigger, _, text = bird['power'].partition(': ')
+    row["Power text"] = text
+    row["PowerCategory"] = POWER_CATEGORIES[trigger]
+    return row
+
+
+def write_csv(birds, path, seed=0):
+    """CSV rows for every card (a few names misspelt) plus CSV-only birds, shuffled."""
+    rng = random.Random(seed + 1)
+    rows = []
+    for bird in birds:
+        name = bird['name']
+        if rng.random() < TYPO_RATE:
+            cut = rng.randrange(1, len(name) - 1)
+            name = name[:cut] + name[cut + 1:]
+        rows.append(csv_row(bird, name))
+
+    known = {bird['name'] for bird in birds}
+    extra = [bird for bird in synthetic_birds(len(birds) * 2, seed + 2) if bird['name'] not in known]
+    rows.extend(csv_row(bird) for bird in extra[:int(len(birds) * CSV_EXTRA)])
+    rng.shuffle(rows)
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def fixtures(size, fixture_dir):
+    """Return (pdf, csv) paths for a size, generating them on first use."""
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    pdf_path = fixture_dir / f"cards-{size}-v{FIXTURE_VERSION}.pdf"
+    csv_path = fixture_dir / f"csv-{size}-v{FIXTURE_VERSION}.csv"
+    if not pdf_path.exists() or not csv_path.exists():
+        print(f"  generating {size}-card fixtures...")
+        birds = synthetic_birds(size)
+        write_cards_pdf(birds, pdf_path)
+        write_csv(birds, csv_path)
+    return pdf_path.resolve(), csv_path.resolve()
+
+
+# --- stages ---------------------------------------------------------------
+
+def clear(path):
+    if Path(path).exists():
+        shutil.rmtree(path)
+
+
+def stages(pdf_path, csv_path, size):
+    """
+    (name, setup, run) per stage. setup puts the stage back in a cold state:
+    outputs removed and no PDF or CSV left open/parsed in this process.
+    """
+    def cold_extract():
+        close_all()
+        clear("temp_extracted/birds")
+
+    def cold_csv():
+        # Drop the per-process catalogue memo so the CSV is parsed every run
+        bird_catalogue._catalogues.clear()
+
+    def cold_render():
+        clear("renders")
+        Path("renders").mkdir()
+
+    return [
+        ('extract', cold_extract, lambda: extract_cards(pdf_path, Path("temp_extracted/birds"), 300)),
+        ('generate', lambda: None, lambda: generate_birds_json()),
+        ('csv', cold_csv, lambda: update_birds_json(csv_path)),
+        ('render', cold_render, lambda: render_page_range(pdf_path, 0, size, "renders", "bird")),
+    ]
+
+
+def measure(setup, function, repeat):
+    """Best-of-repeat seconds with the spans of that run, then peak memory from one traced run."""
+    best = None
+    for _ in range(repeat):
+        setup()
+        snapshot(reset=True)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            function()
+            seconds = time.perf_counter() - start
+        spans = snapshot(reset=True)
+        if best is None or seconds < best[0]:
+            best = (seconds, spans)
+
+    setup()
+    tracemalloc.start()
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        snapshot(reset=True)
+    return best[0], best[1], peak
+
+
+def benchmark_size(size, work_dir, repeat):
+    pdf_path, csv_path = fixtures(size, work_dir / "fixtures")
+    run_dir = work_dir / f"run-{size}"
+    clear(run_dir)
+    (run_dir / "data").mkdir(parents=True)
+
+    results = {}
+    cwd = Path.cwd()
+    # The stages write to paths relative to the repository root; run them
+    # inside a scratch directory instead
+    os.chdir(run_dir)
+    try:
+        for name, setup, function in stages(pdf_path, csv_path, size):
+            seconds, spans, peak = measure(setup, function, repeat)
+            results[name] = {
+                'cards': size,
+                'seconds': round(seconds, 4),
+                'cards_per_second': round(size / seconds, 2) if seconds else None,
+                'peak_bytes': peak,
+                'spans': {n: {k: round(v, 4) if isinstance(v, float) else v for k, v in t.items()}
+                          for n, t in sorted(spans.items())}
+            }
+            print(f"  {size:>5} {name:<9} {seconds:8.3f}s {results[name]['cards_per_second']:>10.1f} cards/s "
+                  f"{peak / 1e6:>8.1f} MB peak")
+    finally:
+        close_all()
+        os.chdir(cwd)
+    return results
+
+
+# --- baseline -------------------------------------------------------------
+
+def compare(results, baseline, tolerance):
+    """Return regression messages for stages slower or hungrier than the baseline."""
+    regressions = []
+    for size, stages_ in results['sizes'].items():
+        for name, current in stages_.items():
+            previous = baseline.get('sizes', {}).get(size, {}).get(name)
+            if not previous:
+                continue
+            if previous['cards_per_second'] and current['cards_per_second'] < previous['cards_per_second'] * (1 - tolerance):
+                regressions.append(f"{size} cards {name}: {current['cards_per_second']} cards/s "
+                                   f"(baseline {previous['cards_per_second']})")
+            if previous['peak_bytes'] and current['peak_bytes'] > previous['peak_bytes'] * (1 + tolerance):
+                regressions.append(f"{size} cards {name}: {current['peak_bytes'] / 1e6:.1f} MB peak "
+                                   f"(baseline {previous['peak_bytes'] / 1e6:.1f} MB)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data pipeline on synthetic PDFs and CSVs.")
+    parser.add_argument("--sizes", default=','.join(str(size) for size in SIZES),
+                        help="comma-separated card counts (default: 20,200,2000)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is kept")
+    parser.add_argument("--work-dir", type=Path, default=WORK_DIR, help="fixtures and scratch output")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="stored baseline results")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed fractional drop in throughput / rise in peak memory (default 0.2)")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    print("="*70)
+    print("DATA PIPELINE BENCHMARK")
+    print("="*70)
+
+    work_dir = args.work_dir.resolve()
+    results = {
+        'version': RESULTS_VERSION,
+        'fixture_version': FIXTURE_VERSION,
+        'machine': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'repeat': args.repeat,
+        'sizes': {}
+    }
+    for size in sizes:
+        results['sizes'][str(size)] = benchmark_size(size, work_dir, max(1, args.repeat))
+
+    write_json(work_dir / "results.json", results, indent=2)
+    print(f"\n Results: {work_dir / 'results.json'}")
+
+    if args.save_baseline:
+        write_json(args.baseline, results, indent=2)
+        print(f" Baseline saved: {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(" No baseline yet (run with --save-baseline to store one)")
+        return
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('fixture_version') != FIXTURE_VERSION:
+        print(" Baseline was recorded with different fixtures, not comparing")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n REGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print(f" No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Indexed catalogue of the birds in wingspan_game.csv.
+The CSV is parsed once into typed, compact rows, with lookup indexes by
+common name, scientific name, habitat, food type, nest type and power colour.
+"""
+
+import csv
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from instrumentation import span
+
+HABITAT_COLUMNS = {
+    'Forest': 'forest',
+    'Grassland': 'grassland',
+    'Wetland': 'wetland'
+}
+
+FOOD_COLUMNS = {
+    'Invertebrate': 'invertebrate',
+    'Seed': 'seed',
+    'Fish': 'fish',
+    'Fruit': 'fruit',
+    'Rodent': 'rodent',
+    'Wild (food)': 'wild'
+}
+
+# PowerCategory values mapped to the colour printed on the card
+POWER_COLOURS = {
+    'brown': 'brown',
+    'pink': 'pink',
+    'white': 'white',
+    'when played': 'white',
+    'teal': 'teal',
+    'yellow': 'yellow'
+}
+
+
+def normalize_name(name):
+    """Lowercase a name and replace various apostrophe characters with a standard apostrophe."""
+    name = name.strip().lower()
+    name = name.replace(chr(8217), "'")  # right single quotation mark
+    name = name.replace(chr(180), "'")   # acute accent
+    name = name.replace(chr(65533), "'") # replacement character
+    return name
+
+
+def _int_or_none(value):
+    value = (value or '').strip()
+    return int(value) if value.isdigit() else None
+
+
+@dataclass(frozen=True, slots=True)
+class CsvBird:
+    """One parsed row of wingspan_game.csv."""
+    common_name: str
+    scientific_name: str
+    habitats: tuple
+    food_cost: tuple
+    total_food_cost: int
+    nest_type: str
+    egg_capacity: int
+    points: int
+    wingspan: int
+    power_category: str
+    power_colour: str
+    power_text: str
+
+    @classmethod
+    def from_row(cls, row):
+        habitats = tuple(name for column, name in HABITAT_COLUMNS.items() if row.get(column) == 'X')
+
+        food_cost = []
+        for column, food in FOOD_COLUMNS.items():
+            count = _int_or_none(row.get(column))
+            if count:
+                food_cost.extend([food] * count)
+
+        power_category = (row.get('PowerCategory') or '').strip()
+        colour = (row.get('Color') or '').strip().lower()
+
+        return cls(
+            common_name=(row.get('Common name') or '').strip(),
+            scientific_name=(row.get('Scientific name') or '').strip(),
+            habitats=habitats,
+            food_cost=tuple(food_cost),
+            total_food_cost=_int_or_none(row.get('Total food cost')),
+            nest_type=(row.get('Nest type') or '').strip().lower(),
+            egg_capacity=_int_or_none(row.get('Egg capacity')),
+            points=_int_or_none(row.get('Victory points')),
+            wingspan=_int_or_none(row.get('Wingspan')),
+            power_category=power_category,
+            power_colour=colour or POWER_COLOURS.get(power_category.lower(), ''),
+            power_text=(row.get('Power text') or '').strip()
+        )
+
+    def as_dict(self):
+        return asdict(self)
+
+
+class BirdCatalogue:
+    """All CSV birds with prebuilt indexes for constant-time lookups."""
+
+    def __init__(self, birds, columns=()):
+        self.birds = tuple(birds)
+        self.columns = tuple(columns)
+
+        self._by_name = {}
+        self._by_scientific_name = {}
+        self._by_habitat = {}
+        self._by_food = {}
+        self._by_nest = {}
+        self._by_power_colour = {}
+        self._zero_food = []
+        self._matcher = None
+
+        for bird in self.birds:
+            # A later row with the same name replaces an earlier one, as the
+            # CSV lookup in update_birds_from_csv.py always did
+            if bird.common_name:
+                self._by_name[normalize_name(bird.common_name)] = bird
+            if bird.scientific_name:
+                self._by_scientific_name[normalize_name(bird.scientific_name)] = bird
+            for habitat in bird.habitats:
+                self._by_habitat.setdefault(habitat, []).append(bird)
+            for food in set(bird.food_cost):
+                self._by_food.setdefault(food, []).append(bird)
+            self._by_nest.setdefault(bird.nest_type, []).append(bird)
+            if bird.power_colour:
+                self._by_power_colour.setdefault(bird.power_colour, []).append(bird)
+            if bird.total_food_cost == 0:
+                self._zero_food.append(bird)
+
+    @classmethod
+    def from_csv(cls, csv_path):
+        with span('read_csv', bytes_in=Path(csv_path).stat().st_size), open(csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            birds = [CsvBird.from_row(row) for row in reader]
+            return cls(birds, reader.fieldnames or ())
+
+    def __len__(self):
+        return len(self.birds)
+
+    def __iter__(self):
+        return iter(self.birds)
+
+    def get(self, common_name):
+        """Look up a bird by common name (case and apostrophe insensitive)."""
+        return self._by_name.get(normalize_name(common_name))
+
+    def by_scientific_name(self, scientific_name):
+        return self._by_scientific_name.get(normalize_name(scientific_name))
+
+    def with_habitat(self, habitat):
+        return tuple(self._by_habitat.get(habitat, ()))
+
+    def with_food(self, food):
+        return tuple(self._by_food.get(food, ()))
+
+    def with_nest(self, nest_type):
+        return tuple(self._by_nest.get(nest_type.lower(), ()))
+
+    def with_power_colour(self, colour):
+        return tuple(self._by_power_colour.get(colour.lower(), ()))
+
+    def zero_food(self):
+        return tuple(self._zero_food)
+
+    def matcher(self):
+        """Fuzzy name matcher over this catalogue, built on first use."""
+        if self._matcher is None:
+            from name_matcher import NameMatcher
+            self._matcher = NameMatcher(self.birds)
+        return self._matcher
+
+    def match(self, name):
+        """Fuzzy lookup by common or scientific name. Returns (Match or None, ranked candidates)."""
+        return self.matcher().match(name)
+
+
+_catalogues = {}
+
+
+def load_catalogue(csv_path):
+    """Parse a CSV once per process (reloaded if the file changes on disk)."""
+    path = Path(csv_path)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    if key not in _catalogues:
+        _catalogues[key] = BirdCatalogue.from_csv(path)
+    return _catalogues[key]
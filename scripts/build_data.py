@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Incremental build driver for data/birds.json.
+
+The data refresh is modelled as stages with declared inputs and outputs:
+
+    extract    PDFs                          -> _metadata.jsonl
+    generate   _metadata.jsonl               -> birds (defaults)
+    fix        _metadata.jsonl + birds       -> birds (points, wingspan, power)
+    csv        wingspan_game.csv + birds     -> birds (habitat, food, nest, eggs)
+    zero_food  birds                         -> birds (no-food birds)
+    emit       birds (+ asset _images.json)  -> data/birds.json
+    powers     data/birds.json + parsers     -> (check only: power_grammar.py
+                                                and PowerParser.js agree)
+    compile    data/*.json                   -> data/compiled (packed card DB)
+
+File fingerprints are recorded after every run, so only stages whose inputs
+or outputs changed are re-run. Inside the bird stages each record is keyed by
+its own inputs (the bird plus its metadata item or CSV row), so only records
+whose inputs changed are recomputed, and data/birds.json is only rewritten
+when at least one record changed. A stage that fails stops the build with a
+non-zero exit status.
+
+Run from the repository root, like the other data scripts.
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from card_metadata import metadata_path, read_metadata
+from extraction_cache import file_digest
+from instrumentation import read_json, run, write_json
+
+BUILD_DIR = Path("temp_extracted/_build")
+STATE_FILE = BUILD_DIR / "state.json"
+BIRD_METADATA = metadata_path("temp_extracted/birds")
+BONUS_METADATA = metadata_path("temp_extracted/bonus")
+BIRDS_JSON = Path("data/birds.json")
+BIRD_ASSETS_DIR = Path("client/public/assets/birds/fronts")
+
+STATE_VERSION = 2
+
+
+def fingerprint(path):
+    path = Path(path)
+    return file_digest(path) if path.exists() else None
+
+
+def record_key(*parts):
+    """Fingerprint of the inputs a single record depends on."""
+    data = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def load_json(path):
+    return read_json(path)
+
+
+def dump_json(data, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_json(path, data, indent=2, ensure_ascii=False)
+
+
+def stage_output(name):
+    return BUILD_DIR / f"birds.{name}.json"
+
+
+class StageError(Exception):
+    """A stage's check failed; the build stops."""
+
+
+class Stage:
+    """A build step with declared input and output files."""
+
+    def __init__(self, name, inputs, outputs, run, optional_inputs=()):
+        self.name = name
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.run = run
+        # Fingerprinted like inputs, but the stage can run without them
+        self.optional_inputs = [Path(p) for p in optional_inputs]
+
+    def input_fingerprints(self):
+        return {str(p): fingerprint(p) for p in self.inputs + self.optional_inputs}
+
+    def output_fingerprints(self):
+        return {str(p): fingerprint(p) for p in self.outputs}
+
+    def stale_reason(self, state):
+        """Why this stage must run, or None if it is up to date."""
+        recorded = state['stages'].get(self.name)
+        if recorded is None:
+            return "never built"
+        if recorded['inputs'] != self.input_fingerprints():
+            changed = [p for p, fp in self.input_fingerprints().items() if recorded['inputs'].get(p) != fp]
+            return f"inputs changed: {', '.join(changed)}"
+        if recorded['outputs'] != self.output_fingerprints():
+            return "outputs missing or modified"
+        return None
+
+
+class Build:
+    """Shared state for one run of the driver."""
+
+    def __init__(self, force=False):
+        self.force = force
+        self.state = {'version': STATE_VERSION, 'stages': {}, 'records': {}}
+        if STATE_FILE.exists() and not force:
+            state = load_json(STATE_FILE)
+            if state.get('version') == STATE_VERSION:
+                self.state = state
+
+    def save(self):
+        dump_json(self.state, STATE_FILE)
+
+    def transform_records(self, stage_name, items):
+        """
+        Recompute only the records whose key changed since the last run.
+
+        items holds (record_id, key, compute) where compute() builds the
+        record. Records whose key matches the previous run are taken from the
+        previous stage output instead of being recomputed.
+        """
+        previous = {}
+        output_file = stage_output(stage_name)
+        if output_file.exists() and not self.force:
+            previous = {bird['id']: bird for bird in load_json(output_file)}
+        previous_keys = self.state['records'].get(stage_name, {})
+
+        records = []
+        keys = {}
+        recomputed = 0
+        for record_id, key, compute in items:
+            if previous_keys.get(record_id) == key and record_id in previous:
+                record = previous[record_id]
+            else:
+                record = compute()
+                recomputed += 1
+            keys[record['id']] = key
+            records.append(record)
+
+        self.state['records'][stage_name] = keys
+        dump_json(records, output_file)
+        print(f"  {recomputed}/{len(records)} record(s) recomputed")
+        return records
+
+
+# --- stages ---------------------------------------------------------------
+
+def run_extract(build):
+    from extract_and_map_cards import extract_bird_cards, extract_bonus_cards
+    from extraction_cache import ExtractionCache
+    from pdf_ingest import close_all
+
+    cache = ExtractionCache()
+    extract_bird_cards(cache)
+    extract_bonus_cards(cache)
+    close_all()
+    cache.save()
+
+
+def run_generate(build):
+    from generate_json_from_metadata import bird_from_metadata, unique_page_items
+
+    items = (
+        (f"bird-{bird_id}", record_key(item, bird_id),
+         lambda item=item, bird_id=bird_id: bird_from_metadata(item, bird_id))
+        for bird_id, item in enumerate(unique_page_items(read_metadata(BIRD_METADATA)), start=1)
+    )
+    build.transform_records('generate', items)
+
+
+def run_fix(build):
+    from fix_bird_data import apply_parsed_fix, card_pages
+
+    pages = card_pages(read_metadata(BIRD_METADATA))
+    birds = load_json(stage_output('generate'))
+
+    def compute(bird, item):
+        bird = copy.deepcopy(bird)
+        if item is not None:
+            apply_parsed_fix(bird, item)
+        return bird
+
+    # Birds are paired with card pages by position, as in fix_bird_data.py
+    items = []
+    for bird in birds:
+        item = next(pages, None)
+        items.append((bird['id'], record_key(bird, item), lambda bird=bird, item=item: compute(bird, item)))
+    build.transform_records('fix', items)
+
+
+def run_csv(build):
+    from name_matcher import MatchReport
+    from update_birds_from_csv import apply_csv_row, load_csv_birds
+
+    catalogue = load_csv_birds()
+    birds = load_json(stage_output('fix'))
+
+    def compute(bird, row):
+        bird = copy.deepcopy(bird)
+        if row is None:
+            print(f"  WARNING: '{bird['name']}' not found in CSV")
+        else:
+            apply_csv_row(bird, row)
+        return bird
+
+    report = MatchReport()
+    items = []
+    for bird in birds:
+        match, candidates = catalogue.match(bird['name'])
+        report.record(bird['name'], match, candidates)
+        row = match.bird if match else None
+        key = record_key(bird, row.as_dict() if row else None)
+        items.append((bird['id'], key, lambda bird=bird, row=row: compute(bird, row)))
+    build.transform_records('csv', items)
+
+    if report:
+        print(f"  {len(report.fuzzy)} fuzzy, {len(report.unmatched)} unmatched name(s), see {report.save()}")
+
+
+def run_zero_food(build):
+    from fix_zero_food_birds import ZERO_FOOD_BIRDS, fix_zero_food
+
+    birds = load_json(stage_output('csv'))
+
+    def compute(bird):
+        bird = copy.deepcopy(bird)
+        fix_zero_food(bird)
+        return bird
+
+    items = [
+        (bird['id'], record_key(bird, ZERO_FOOD_BIRDS), lambda bird=bird: compute(bird))
+        for bird in birds
+    ]
+    build.transform_records('zero_food', items)
+
+
+def run_emit(build):
+    from image_dedupe import apply_image_map, load_image_map
+
+    birds = apply_image_map(load_json(stage_output('zero_food')), load_image_map(BIRD_ASSETS_DIR))
+    current = {}
+    if BIRDS_JSON.exists():
+        current = {bird['id']: bird for bird in load_json(BIRDS_JSON)}
+
+    changed = [bird['id'] for bird in birds if current.get(bird['id']) != bird]
+    removed = [bird_id for bird_id in current if bird_id not in {b['id'] for b in birds}]
+
+    if not changed and not removed and len(current) == len(birds):
+        print(f"  {BIRDS_JSON} already up to date")
+        return
+
+    dump_json(birds, BIRDS_JSON)
+    for bird_id in changed:
+        print(f"  changed: {bird_id} ({next(b['name'] for b in birds if b['id'] == bird_id)})")
+    for bird_id in removed:
+        print(f"  removed: {bird_id}")
+    print(f"  Saved {len(changed)} changed record(s) to {BIRDS_JSON}")
+
+
+def run_powers(build):
+    from power_grammar import report_parity
+
+    if not report_parity(load_json(BIRDS_JSON)):
+        raise StageError("power_grammar.py and PowerParser.js compile powers differently")
+    print("  power_grammar.py and PowerParser.js agree")
+
+
+def run_compile(build):
+    from compile_card_db import PACK_FILE, compile_card_db
+
+    manifest = compile_card_db()
+    print(f"  Saved {manifest['bytes']} bytes to {PACK_FILE}")
+
+
+def pipeline():
+    from compile_card_db import MANIFEST_FILE, PACK_FILE, SOURCES
+    from image_dedupe import IMAGE_MAP_FILENAME
+    from power_grammar import JS_COMPILER
+    from pdf_ingest import BIRD_CARDS_PDF, BONUS_CARDS_PDF
+    from update_birds_from_csv import CSV_PATH
+
+    return [
+        Stage('extract', [BIRD_CARDS_PDF, BONUS_CARDS_PDF], [BIRD_METADATA, BONUS_METADATA], run_extract),
+        Stage('generate', [BIRD_METADATA], [stage_output('generate')], run_generate),
+        Stage('fix', [BIRD_METADATA, stage_output('generate')], [stage_output('fix')], run_fix),
+        Stage('csv', [CSV_PATH, stage_output('fix')], [stage_output('csv')], run_csv),
+        Stage('zero_food', [stage_output('csv')], [stage_output('zero_food')], run_zero_food),
+        Stage('emit', [stage_output('zero_food')], [BIRDS_JSON], run_emit,
+              optional_inputs=[BIRD_ASSETS_DIR / IMAGE_MAP_FILENAME]),
+        Stage('powers', [BIRDS_JSON, 'scripts/power_grammar.py', JS_COMPILER,
+                         'server/engine/Powers/PowerParser.js'], [], run_powers),
+        Stage('compile', list(SOURCES.values()), [PACK_FILE, MANIFEST_FILE], run_compile),
+    ]
+
+
+def run_pipeline(force=False, dry_run=False):
+    build = Build(force)
+
+    for stage in pipeline():
+        reason = "forced" if force else stage.stale_reason(build.state)
+        if reason is None:
+            print(f"[{stage.name}] up to date")
+            continue
+
+        missing = [str(p) for p in stage.inputs if fingerprint(p) is None]
+        if missing:
+            if all(p.exists() for p in stage.outputs):
+                print(f"[{stage.name}] inputs not found ({', '.join(missing)}), keeping existing outputs")
+                continue
+            print(f"[{stage.name}] ERROR: inputs not found: {', '.join(missing)}")
+            return False
+
+        print(f"[{stage.name}] {'would run' if dry_run else 'running'} ({reason})")
+        if dry_run:
+            continue
+
+        try:
+            stage.run(build)
+        except StageError as e:
+            print(f"[{stage.name}] ERROR: {e}")
+            return False
+        build.state['stages'][stage.name] = {
+            'inputs': stage.input_fingerprints(),
+            'outputs': stage.output_fingerprints()
+        }
+        build.save()
+
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally rebuild data/birds.json.")
+    parser.add_argument("--force", action="store_true", help="ignore recorded fingerprints and rebuild everything")
+    parser.add_argument("--dry-run", action="store_true", help="only report which stages are stale")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("BUILDING BIRD DATA")
+    print("="*70)
+
+    if not run_pipeline(force=args.force, dry_run=args.dry_run):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run(main)
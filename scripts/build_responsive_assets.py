@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Build responsive card images for the client.
+
+Every card image under client/public/assets is resized to a few display
+widths (thumbnail, board, zoom) and encoded as AVIF, WebP and a JPEG fallback.
+A manifest records each variant's dimensions and byte size. The client reads
+it to build <picture> srcsets, so browsers download the smallest file that
+fits the slot instead of the full-size card.
+
+Images whose source bytes are unchanged since the last run are skipped.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from instrumentation import call_in_worker, merge, run, span, write_json
+
+try:
+    from PIL import Image, features
+except ImportError:
+    print("Installing Pillow...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "Pillow"])
+    from PIL import Image, features
+
+ASSETS_DIR = Path("D:/wingspan-online/client/public/assets")
+SOURCE_DIRS = ["birds/fronts", "bonus"]
+OUTPUT_SUBDIR = "responsive"
+MANIFEST_FILENAME = "manifest.json"
+
+MANIFEST_VERSION = 1
+
+# Display slots and the pixel widths rendered for them (2x the CSS width in
+# BirdCard/CardZoom, so they stay sharp on high-density screens)
+SIZES = {
+    'thumb': 120,
+    'board': 400,
+    'zoom': 720
+}
+
+# Encoder settings per format, smallest first. Quality values were picked by
+# eye on the card art: text stays legible at the thumbnail size.
+FORMATS = {
+    'avif': {'ext': 'avif', 'mime': 'image/avif', 'save': {'quality': 50, 'speed': 6}},
+    'webp': {'ext': 'webp', 'mime': 'image/webp', 'save': {'quality': 75, 'method': 6}},
+    'jpeg': {'ext': 'jpg', 'mime': 'image/jpeg', 'save': {'quality': 80, 'optimize': True, 'progressive': True}}
+}
+
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png'}
+
+
+def available_formats():
+    """Formats this Pillow build can encode (AVIF needs libavif)."""
+    names = []
+    for name in FORMATS:
+        if name == 'avif' and not features.check('avif'):
+            print("  WARNING: Pillow has no AVIF support, skipping AVIF variants")
+            continue
+        if name == 'webp' and not features.check('webp'):
+            print("  WARNING: Pillow has no WebP support, skipping WebP variants")
+            continue
+        names.append(name)
+    return names
+
+
+def variant_widths(source_width):
+    """Target width per size, never upscaling past the source."""
+    return {size: min(width, source_width) for size, width in SIZES.items()}
+
+
+def encode(image, fmt):
+    with span(f'encode_{fmt}') as s:
+        buffer = io.BytesIO()
+        image.save(buffer, format=fmt.upper(), **FORMATS[fmt]['save'])
+        s.add(bytes_out=buffer.tell())
+    return buffer.getvalue()
+
+
+def build_variants(source_path, relative, output_dir, formats):
+    """
+    Resize and encode one source image. Returns its manifest entry.
+    Runs in worker processes, so everything it needs is passed in.
+    """
+    with span('read', bytes_in=Path(source_path).stat().st_size):
+        data = Path(source_path).read_bytes()
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert('RGB')
+        source_width, source_height = image.size
+
+        stem = Path(relative).with_suffix('')
+        entry = {
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'width': source_width,
+            'height': source_height,
+            'bytes': len(data),
+            'variants': {}
+        }
+
+        resized = {}
+        written = {}
+        for size, width in variant_widths(source_width).items():
+            height = round(source_height * width / source_width)
+            if width not in resized:
+                resized[width] = image.resize((width, height), Image.LANCZOS)
+
+            files = {}
+            for fmt in formats:
+                filename = f"{stem.as_posix()}-{width}w.{FORMATS[fmt]['ext']}"
+                # Sizes capped to the same width share their files
+                if filename not in written:
+                    output_path = Path(output_dir) / filename
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+                    encoded = encode(resized[width], fmt)
+                    with span('save', bytes_out=len(encoded)):
+                        output_path.write_bytes(encoded)
+                    written[filename] = len(encoded)
+                files[fmt] = {'file': filename, 'bytes': written[filename]}
+
+            entry['variants'][size] = {'width': width, 'height': height, 'files': files}
+
+    return relative, entry
+
+
+def source_images(assets_dir):
+    for source_dir in SOURCE_DIRS:
+        for path in sorted((assets_dir / source_dir).glob('*')):
+            if path.suffix.lower() in IMAGE_SUFFIXES:
+                yield path, path.relative_to(assets_dir).as_posix()
+
+
+def load_manifest(path):
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    return None
+
+
+def is_current(entry, source_path, output_dir, formats):
+    """True if a manifest entry was built from these exact bytes and all its files exist."""
+    if entry is None:
+        return False
+    if entry['sha256'] != hashlib.sha256(source_path.read_bytes()).hexdigest():
+        return False
+    for variant in entry['variants'].values():
+        if set(variant['files']) != set(formats):
+            return False
+        if not all((output_dir / f['file']).exists() for f in variant['files'].values()):
+            return False
+    return True
+
+
+def build_responsive_assets(assets_dir=ASSETS_DIR, workers=1, force=False):
+    """Build all variants and write the manifest. Returns the manifest."""
+    output_dir = assets_dir / OUTPUT_SUBDIR
+    manifest_file = output_dir / MANIFEST_FILENAME
+    formats = available_formats()
+
+    previous = None if force else load_manifest(manifest_file)
+    previous_images = previous['images'] if previous else {}
+    if previous and previous.get('sizes') != SIZES:
+        previous_images = {}
+
+    images = {}
+    pending = []
+    for source_path, relative in source_images(assets_dir):
+        entry = previous_images.get(relative)
+        if not force and is_current(entry, source_path, output_dir, formats):
+            images[relative] = entry
+            continue
+        # Old variants of a changed image must be re-encoded, not reused
+        if entry:
+            for variant in entry['variants'].values():
+                for f in variant['files'].values():
+                    (output_dir / f['file']).unlink(missing_ok=True)
+        pending.append((str(source_path), relative))
+
+    print(f"  {len(images)} image(s) up to date, {len(pending)} to build")
+
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(call_in_worker, build_variants, path, relative, str(output_dir), formats)
+                       for path, relative in pending]
+            results = []
+            for future in futures:
+                result, spans = future.result()
+                merge(spans)
+                results.append(result)
+    else:
+        results = [build_variants(path, relative, output_dir, formats) for path, relative in pending]
+
+    for relative, entry in results:
+        images[relative] = entry
+        smallest = entry['variants']['thumb']['files'][formats[0]]
+        print(f"  {relative}: {entry['bytes']} bytes -> {smallest['bytes']} bytes ({formats[0]} thumb)")
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'sizes': SIZES,
+        'formats': {fmt: FORMATS[fmt]['mime'] for fmt in formats},
+        'images': dict(sorted(images.items()))
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    write_json(manifest_file, manifest, indent=2)
+
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build responsive WebP/AVIF card images and an asset manifest.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of processes used to encode images (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true", help="rebuild every variant")
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count() or 1
+
+    print("="*70)
+    print("BUILDING RESPONSIVE CARD IMAGES")
+    print("="*70)
+
+    manifest = build_responsive_assets(workers=workers, force=args.force)
+
+    source_bytes = sum(entry['bytes'] for entry in manifest['images'].values())
+    first_format = next(iter(manifest['formats']), None)
+    thumb_bytes = sum(entry['variants']['thumb']['files'][first_format]['bytes']
+                      for entry in manifest['images'].values()) if first_format else 0
+
+    print(f"\n {len(manifest['images'])} images, formats: {', '.join(manifest['formats'])}")
+    print(f" Full-size sources: {source_bytes} bytes, {first_format} thumbnails: {thumb_bytes} bytes")
+    print(f" Manifest: {ASSETS_DIR / OUTPUT_SUBDIR / MANIFEST_FILENAME}")
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Pack card thumbnails and token art into a few sprite sheets.
+
+Cards are scaled to the width they are shown at on the board, tokens to a
+fixed token size. Everything is shelf-packed into sheets laid out in CSS
+pixels, and each sheet is rendered once per device scale (1x and 2x). The
+client then needs one request per sheet instead of one per card.
+
+Output (client/public/assets/atlas/):
+    sheet-<n>@<scale>x.webp   the packed images
+    atlas.json                sprite -> sheet and x/y/width/height (CSS px)
+
+Sprites are keyed by their path under client/public/assets without the
+extension, e.g. "birds/fronts/bird-1" or "food/seed".
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+from instrumentation import run, span, write_json
+
+try:
+    from PIL import Image
+except ImportError:
+    print("Installing Pillow...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "Pillow"])
+    from PIL import Image
+
+ASSETS_DIR = Path("D:/wingspan-online/client/public/assets")
+OUTPUT_SUBDIR = "atlas"
+ATLAS_FILENAME = "atlas.json"
+
+ATLAS_VERSION = 1
+
+# Sprite groups: source directory under assets and the CSS width to pack at
+CARD_WIDTH = 200    # BirdCard board width
+TOKEN_SIZE = 48     # largest FoodToken/DiceToken size
+GROUPS = {
+    'birds/fronts': CARD_WIDTH,
+    'bonus': CARD_WIDTH,
+    'food': TOKEN_SIZE,
+    'eggs': TOKEN_SIZE,
+    'dice': TOKEN_SIZE
+}
+
+# Device scales a sheet is rendered at; the largest must still fit a
+# MAX_TEXTURE_SIZE texture, so sheets are laid out in SHEET_SIZE CSS pixels.
+SCALES = (1, 2)
+MAX_TEXTURE_SIZE = 2048
+SHEET_SIZE = MAX_TEXTURE_SIZE // max(SCALES)
+
+# Gap between sprites so neighbours don't bleed in when sheets are filtered
+PADDING = 2
+
+WEBP_QUALITY = 80
+
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.webp'}
+
+
+class Sheet:
+    """One sprite sheet being filled shelf by shelf."""
+
+    def __init__(self, size):
+        self.size = size
+        self.placements = {}    # key -> (x, y, width, height)
+        self.shelf_y = 0
+        self.shelf_height = 0
+        self.cursor_x = 0
+
+    def place(self, key, width, height):
+        """Place a sprite on the current or a new shelf. Returns False if the sheet is full."""
+        if self.cursor_x + width > self.size:
+            self.shelf_y += self.shelf_height + PADDING
+            self.shelf_height = 0
+            self.cursor_x = 0
+        if self.shelf_y + height > self.size:
+            return False
+
+        self.placements[key] = (self.cursor_x, self.shelf_y, width, height)
+        self.cursor_x += width + PADDING
+        self.shelf_height = max(self.shelf_height, height)
+        return True
+
+    @property
+    def used_height(self):
+        return self.shelf_y + self.shelf_height
+
+    @property
+    def used_width(self):
+        return max((x + w for x, _, w, _ in self.placements.values()), default=0)
+
+
+def pack(sprites, sheet_size=SHEET_SIZE):
+    """
+    Shelf-pack (key, width, height) sprites, tallest first, into as few
+    sheets as needed. Returns the list of Sheets.
+    """
+    sheets = [Sheet(sheet_size)]
+    for key, width, height in sorted(sprites, key=lambda s: (-s[2], -s[1], s[0])):
+        if width > sheet_size or height > sheet_size:
+            raise ValueError(f"{key} ({width}x{height}) does not fit in a {sheet_size}px sheet")
+        if not sheets[-1].place(key, width, height):
+            sheets.append(Sheet(sheet_size))
+            sheets[-1].place(key, width, height)
+    return sheets
+
+
+def collect_sprites(assets_dir):
+    """Yield (key, path, css_width, css_height) for every image in the sprite groups."""
+    for group, target_width in GROUPS.items():
+        directory = assets_dir / group
+        if not directory.exists():
+            continue
+        for path in sorted(directory.iterdir()):
+            if path.suffix.lower() not in IMAGE_SUFFIXES:
+                continue
+            with Image.open(path) as image:
+                width, height = image.size
+            css_height = round(height * target_width / width)
+            key = path.relative_to(assets_dir).with_suffix('').as_posix()
+            yield key, path, target_width, css_height
+
+
+def render_sheet(sheet, paths, scale):
+    """Draw a sheet at a device scale. Sprites are resampled from the source images."""
+    canvas = Image.new('RGBA', (sheet.used_width * scale, sheet.used_height * scale), (0, 0, 0, 0))
+    for key, (x, y, width, height) in sheet.placements.items():
+        with Image.open(paths[key]) as image:
+            sprite = image.convert('RGBA').resize((width * scale, height * scale), Image.LANCZOS)
+        canvas.paste(sprite, (x * scale, y * scale))
+    return canvas
+
+
+def build_atlas(assets_dir=ASSETS_DIR):
+    """Pack, render and save every sheet. Returns the atlas map."""
+    output_dir = assets_dir / OUTPUT_SUBDIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sprites = list(collect_sprites(assets_dir))
+    paths = {key: path for key, path, _, _ in sprites}
+    sheets = pack([(key, width, height) for key, _, width, height in sprites])
+
+    # Remove sheets from a previous, larger build
+    for old in output_dir.glob("sheet-*.webp"):
+        old.unlink()
+
+    atlas = {'version': ATLAS_VERSION, 'scales': list(SCALES), 'sheets': [], 'sprites': {}}
+    for index, sheet in enumerate(sheets):
+        files = {}
+        for scale in SCALES:
+            filename = f"sheet-{index}@{scale}x.webp"
+            canvas = render_sheet(sheet, paths, scale)
+            with span('save') as s:
+                canvas.save(output_dir / filename, 'WEBP', quality=WEBP_QUALITY, method=6)
+                s.add(bytes_out=(output_dir / filename).stat().st_size)
+            files[str(scale)] = {'file': filename, 'bytes': (output_dir / filename).stat().st_size}
+
+        atlas['sheets'].append({'width': sheet.used_width, 'height': sheet.used_height, 'files': files})
+        for key, (x, y, width, height) in sheet.placements.items():
+            atlas['sprites'][key] = {'sheet': index, 'x': x, 'y': y, 'width': width, 'height': height}
+
+    atlas['sprites'] = dict(sorted(atlas['sprites'].items()))
+    write_json(output_dir / ATLAS_FILENAME, atlas, indent=2)
+
+    return atlas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack card thumbnails and tokens into sprite sheets.")
+    parser.add_argument("--assets-dir", type=Path, default=ASSETS_DIR, help="client/public/assets directory")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("BUILDING SPRITE ATLAS")
+    print("="*70)
+
+    atlas = build_atlas(args.assets_dir)
+
+    for index, sheet in enumerate(atlas['sheets']):
+        count = sum(1 for sprite in atlas['sprites'].values() if sprite['sheet'] == index)
+        sizes = ', '.join(f"{scale}x {info['bytes']} bytes" for scale, info in sheet['files'].items())
+        print(f"  sheet {index}: {count} sprites, {sheet['width']}x{sheet['height']}px ({sizes})")
+
+    print(f"\n Packed {len(atlas['sprites'])} sprites into {len(atlas['sheets'])} sheet(s)")
+    print(f" Atlas: {args.assets_dir / OUTPUT_SUBDIR / ATLAS_FILENAME}")
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Streaming card metadata (temp_extracted/*/_metadata.jsonl).
+
+Extraction appends one JSON record per card as it goes and finishes the file
+with an end marker. Readers are generators that hold one record at a time,
+and in follow mode they tail a file that is still being written, so the
+parsing stages can start before extraction finishes.
+"""
+
+import json
+import time
+from pathlib import Path
+
+METADATA_FILENAME = "_metadata.jsonl"
+LEGACY_METADATA_FILENAME = "_metadata.json"
+
+END_MARKER = '_end'
+
+
+def metadata_path(directory):
+    """Path of the metadata stream in an extraction output directory."""
+    return Path(directory) / METADATA_FILENAME
+
+
+class MetadataWriter:
+    """Append-only writer for a metadata stream. Use as a context manager."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8', newline='\n')
+        return self
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()  # let followers see each card as soon as it is written
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        # Only mark the stream complete if extraction did not fail part-way
+        if exc_type is None:
+            self._file.write(json.dumps({END_MARKER: True, 'count': self.count}) + '\n')
+        self._file.close()
+        self._file = None
+        return False
+
+
+def read_metadata(path, follow=False, poll_interval=0.2, timeout=None):
+    """
+    Yield card records from a metadata stream one at a time.
+
+    With follow=True the reader waits for the file to appear and for more
+    records until the writer's end marker is reached (or timeout seconds pass
+    without new data). A legacy _metadata.json array is read if no stream
+    exists next to it.
+    """
+    path = Path(path)
+    if not path.exists() and not follow:
+        legacy = path.with_name(LEGACY_METADATA_FILENAME)
+        if legacy.exists():
+            with open(legacy, 'r', encoding='utf-8') as f:
+                yield from json.load(f)
+            return
+        raise FileNotFoundError(path)
+
+    waited = 0.0
+    while not path.exists():
+        if timeout is not None and waited >= timeout:
+            raise TimeoutError(f"{path} did not appear within {timeout}s")
+        time.sleep(poll_interval)
+        waited += poll_interval
+
+    with open(path, 'r', encoding='utf-8') as f:
+        pending = ''
+        waited = 0.0
+        while True:
+            line = f.readline()
+            if not line:
+                if not follow:
+                    break
+                if timeout is not None and waited >= timeout:
+                    raise TimeoutError(f"no new records in {path} for {timeout}s")
+                time.sleep(poll_interval)
+                waited += poll_interval
+                continue
+            waited = 0.0
+
+            # A line without a newline is still being written
+            pending += line
+            if not pending.endswith('\n'):
+                continue
+            line, pending = pending.strip(), ''
+            if not line:
+                continue
+
+            record = json.loads(line)
+            if END_MARKER in record:
+                return
+            yield record
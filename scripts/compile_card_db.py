@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Compile the card JSON files into a packed, versioned card database.
+
+The pack stores each table column by column with a shared string table, is
+written without whitespace, and is described by a manifest holding its size
+and SHA-256 and the SHA-256, size and modification time of each source file
+it was built from. The server loads it once per process
+(server/engine/CardDatabase.js): it verifies the pack's SHA-256, checks the
+sources' sizes and times against the manifest, hashing only a source whose
+time differs, and falls back to the JSON sources when the pack is missing,
+corrupt or out of date.
+
+Run from the repository root, like the other data scripts.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from instrumentation import run, span
+
+PACK_FORMAT = "wingspan-card-db"
+PACK_VERSION = 1
+
+SOURCES = {
+    'birds': Path("data/birds.json"),
+    'bonusCards': Path("data/bonus_cards.json"),
+    'roundGoals': Path("data/round_goals.json")
+}
+
+OUTPUT_DIR = Path("data/compiled")
+PACK_FILE = OUTPUT_DIR / "cards.pack.json"
+MANIFEST_FILE = OUTPUT_DIR / "manifest.json"
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class StringTable:
+    """Interns strings so each distinct value is stored once."""
+
+    def __init__(self):
+        self.strings = []
+        self._index = {}
+
+    def intern(self, value):
+        if value not in self._index:
+            self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return self._index[value]
+
+
+def column_kind(values):
+    present = [v for v in values if v is not None]
+    if all(isinstance(v, str) for v in present):
+        return 'str'
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return 'int'
+    return 'json'
+
+
+def pack_table(records, strings):
+    """Pack a list of records column by column. Missing keys are stored as null."""
+    keys = []
+    for record in records:
+        for key in record:
+            if key not in keys:
+                keys.append(key)
+
+    columns = {}
+    for key in keys:
+        values = [record.get(key) for record in records]
+        kind = column_kind(values)
+        if kind == 'str':
+            values = [None if v is None else strings.intern(v) for v in values]
+        columns[key] = {'kind': kind, 'values': values}
+
+    return {'count': len(records), 'keys': keys, 'columns': columns}
+
+
+def compile_card_db():
+    """Build the pack and manifest. Returns the manifest."""
+    strings = StringTable()
+    tables = {}
+    sources = {}
+
+    for table, path in SOURCES.items():
+        raw = path.read_bytes()
+        stat = path.stat()
+        sources[path.as_posix()] = {
+            'sha256': sha256_bytes(raw),
+            'size': stat.st_size,
+            # Whole milliseconds, which JSON numbers hold exactly
+            'mtime': stat.st_mtime_ns // 1_000_000
+        }
+        tables[table] = pack_table(json.loads(raw.decode('utf-8')), strings)
+
+    pack = {
+        'format': PACK_FORMAT,
+        'version': PACK_VERSION,
+        'strings': strings.strings,
+        'tables': tables
+    }
+    data = json.dumps(pack, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    with span('save', bytes_out=len(data)):
+        PACK_FILE.write_bytes(data)
+
+    manifest = {
+        'format': PACK_FORMAT,
+        'version': PACK_VERSION,
+        'file': PACK_FILE.name,
+        'bytes': len(data),
+        'sha256': sha256_bytes(data),
+        'counts': {table: packed['count'] for table, packed in tables.items()},
+        'sources': sources
+    }
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+
+    return manifest
+
+
+def main():
+    print("="*70)
+    print("COMPILING CARD DATABASE")
+    print("="*70)
+
+    manifest = compile_card_db()
+    source_bytes = sum(path.stat().st_size for path in SOURCES.values())
+
+    for table, count in manifest['counts'].items():
+        print(f"  {table}: {count} records")
+    print(f"\n Packed {source_bytes} bytes of JSON into {manifest['bytes']} bytes")
+    print(f" Saved to: {PACK_FILE}")
+    print(f" Manifest: {MANIFEST_FILE} (sha256 {manifest['sha256'][:12]}...)")
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,16 @@
+// Compile powers with the server's parser, for the parity check in
+// power_grammar.py: reads a JSON array of powers ({type, effect}) on stdin
+// and writes the array of records PowerParser builds from their text.
+//
+//   node scripts/compile_powers.mjs < powers.json
+
+import { PowerParser } from "../server/engine/Powers/PowerParser.js";
+
+let input = "";
+process.stdin.setEncoding("utf8");
+process.stdin.on("data", chunk => (input += chunk));
+process.stdin.on("end", () => {
+  const powers = JSON.parse(input);
+  const records = powers.map(power => (power ? PowerParser.compileText(power) : null));
+  process.stdout.write(JSON.stringify(records));
+});
@@ -4,181 +4,127 @@ Extract card images AND text from Wingspan PDFs.
 Map them together to create accurate JSON data files.
 """
 
-import json
-import re
+import argparse
 from pathlib import Path
-import shutil
 
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    import subprocess
-    import sys
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "PyMuPDF"])
-    import fitz
+from card_metadata import MetadataWriter, metadata_path
+from extraction_cache import ExtractionCache, walk_pdf_cached, write_if_changed
+from instrumentation import run
+from pdf_ingest import BIRD_CARDS_PDF, BONUS_CARDS_PDF, close_all, walk_pdf
 
-def extract_bird_cards():
-    """Extract bird card images and text together."""
-    pdf_path = Path("D:/wingspan-online/Wingspan Assets/BirdCards - Update Pack Cards.pdf")
-    output_dir = Path("D:/wingspan-online/temp_extracted/birds")
+# Only save large images (>50KB = likely actual cards, not icons)
+MIN_CARD_IMAGE_SIZE = 50000
+
+def iter_pages(pdf_path, cache=None):
+    """Yield (page_number, text, images), from the extraction cache when one is given."""
+    if cache is not None:
+        yield from walk_pdf_cached(pdf_path, cache)
+        return
+    for page, images, _ in walk_pdf(pdf_path, images=True):
+        yield page.number, page.text, images
+
+def extract_cards(pdf_path, output_dir, preview_chars, cache=None):
+    """
+    Extract card images and page text together in one walk of the PDF.
+    Each card's metadata is streamed to _metadata.jsonl as soon as it is found.
+    Returns the number of cards extracted.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    print("="*70)
-    print("EXTRACTING BIRD CARDS")
-    print("="*70)
-    
-    doc = fitz.open(str(pdf_path))
-    birds = []
     card_id = 1
-    
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        
-        # Extract text from this page
-        page_text = page.get_text()
-        
-        # Extract images from this page
-        image_list = page.get_images(full=True)
-        
-        print(f"\nPage {page_num + 1}:")
-        print(f"  Text (first 300 chars): {page_text[:300].strip()}")
-        print(f"  Images found: {len(image_list)}")
-        
-        # Extract large images (actual bird cards, not icons)
-        for img_index, img in enumerate(image_list):
-            xref = img[0]
+    unchanged = 0
+    metadata_file = metadata_path(output_dir)
+    
+    with MetadataWriter(metadata_file) as metadata:
+        for page_number, page_text, images in iter_pages(pdf_path, cache):
+            print(f"\nPage {page_number}:")
+            print(f"  Text: {page_text.strip()[:preview_chars]}")
+            print(f"  Images found: {len(images)}")
             
-            try:
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
+            for image in images:
+                if image['size'] <= MIN_CARD_IMAGE_SIZE:
+                    continue
                 
-                # Only save large images (>50KB = likely actual cards)
-                if len(image_bytes) > 50000:
-                    image_filename = f"{card_id}.{image_ext}"
-                    image_path = output_dir / image_filename
-                    
-                    with open(image_path, "wb") as f:
-                        f.write(image_bytes)
-                    
-                    print(f"  Saved: {image_filename} ({len(image_bytes)} bytes)")
-                    
-                    # Store metadata
-                    birds.append({
-                        'id': card_id,
-                        'image_file': image_filename,
-                        'page': page_num + 1,
-                        'page_text': page_text.strip(),
-                        'image_size': len(image_bytes)
-                    })
-                    
-                    card_id += 1
-                    
-            except Exception as e:
-                print(f"  Error extracting image {img_index + 1}: {e}")
-    
-    doc.close()
+                image_filename = f"{card_id}.{image['ext']}"
+                image_path = output_dir / image_filename
+                
+                # Leave files from a previous run alone when their bytes match
+                if write_if_changed(image_path, image['bytes']):
+                    print(f"  Saved: {image_filename} ({image['size']} bytes)")
+                else:
+                    unchanged += 1
+                
+                # Store metadata
+                metadata.write({
+                    'id': card_id,
+                    'image_file': image_filename,
+                    'page': page_number,
+                    'page_text': page_text.strip(),
+                    'image_size': image['size']
+                })
+                
+                card_id += 1
     
-    # Save metadata
-    metadata_file = output_dir / "_metadata.json"
-    with open(metadata_file, 'w', encoding='utf-8') as f:
-        json.dump(birds, f, indent=2, ensure_ascii=False)
+    print(f"\n Metadata saved to: {metadata_file}")
+    if unchanged:
+        print(f" {unchanged} image(s) already up to date")
     
-    print(f"\n Total bird cards extracted: {len(birds)}")
-    print(f" Metadata saved to: {metadata_file}")
+    return metadata.count
+
+def extract_bird_cards(cache=None):
+    """Extract bird card images and text together."""
+    print("="*70)
+    print("EXTRACTING BIRD CARDS")
+    print("="*70)
     
-    return birds
+    count = extract_cards(BIRD_CARDS_PDF, Path("D:/wingspan-online/temp_extracted/birds"), 300, cache)
+    print(f" Total bird cards extracted: {count}")
+    return count
 
-def extract_bonus_cards():
+def extract_bonus_cards(cache=None):
     """Extract bonus card images and text together."""
-    pdf_path = Path("D:/wingspan-online/Wingspan Assets/Wingspan_BonusCards - Update Pack Cards.pdf")
-    output_dir = Path("D:/wingspan-online/temp_extracted/bonus")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
     print("\n" + "="*70)
     print("EXTRACTING BONUS CARDS")
     print("="*70)
     
-    doc = fitz.open(str(pdf_path))
-    bonus_cards = []
-    card_id = 1
-    
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        
-        # Extract text from this page
-        page_text = page.get_text()
-        
-        # Extract images from this page
-        image_list = page.get_images(full=True)
-        
-        print(f"\nPage {page_num + 1}:")
-        print(f"  Text: {page_text.strip()[:200]}")
-        print(f"  Images found: {len(image_list)}")
-        
-        # Extract large images (actual bonus cards)
-        for img_index, img in enumerate(image_list):
-            xref = img[0]
-            
-            try:
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
-                
-                # Only save large images
-                if len(image_bytes) > 50000:
-                    image_filename = f"{card_id}.{image_ext}"
-                    image_path = output_dir / image_filename
-                    
-                    with open(image_path, "wb") as f:
-                        f.write(image_bytes)
-                    
-                    print(f"  Saved: {image_filename} ({len(image_bytes)} bytes)")
-                    
-                    # Store metadata
-                    bonus_cards.append({
-                        'id': card_id,
-                        'image_file': image_filename,
-                        'page': page_num + 1,
-                        'page_text': page_text.strip(),
-                        'image_size': len(image_bytes)
-                    })
-                    
-                    card_id += 1
-                    
-            except Exception as e:
-                print(f"  Error extracting image {img_index + 1}: {e}")
-    
-    doc.close()
-    
-    # Save metadata
-    metadata_file = output_dir / "_metadata.json"
-    with open(metadata_file, 'w', encoding='utf-8') as f:
-        json.dump(bonus_cards, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n Total bonus cards extracted: {len(bonus_cards)}")
-    print(f" Metadata saved to: {metadata_file}")
-    
-    return bonus_cards
+    count = extract_cards(BONUS_CARDS_PDF, Path("D:/wingspan-online/temp_extracted/bonus"), 200, cache)
+    print(f" Total bonus cards extracted: {count}")
+    return count
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract Wingspan card images and text.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-extract every page instead of using the extraction cache")
+    parser.add_argument("--cache-max-mb", type=int, default=512,
+                        help="size cap for the extraction cache (least recently used entries are evicted)")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    cache = None if args.no_cache else ExtractionCache(max_bytes=args.cache_max_mb * 1024 * 1024)
+    
     print("WINGSPAN CARD EXTRACTOR & MAPPER")
     print("Extracting images and text together for proper mapping\n")
     
     # Extract bird cards with metadata
-    bird_cards = extract_bird_cards()
+    bird_cards = extract_bird_cards(cache)
     
     # Extract bonus cards with metadata
-    bonus_cards = extract_bonus_cards()
+    bonus_cards = extract_bonus_cards(cache)
+    close_all()
+    
+    if cache is not None:
+        cache.save()
+        print(f"\nExtraction cache: {cache.hits} hits, {cache.misses} misses")
     
     print("\n" + "="*70)
     print("EXTRACTION COMPLETE")
     print("="*70)
     print(f"\nExtracted:")
-    print(f"  {len(bird_cards)} bird cards -> temp_extracted/birds/")
-    print(f"  {len(bonus_cards)} bonus cards -> temp_extracted/bonus/")
+    print(f"  {bird_cards} bird cards -> temp_extracted/birds/")
+    print(f"  {bonus_cards} bonus cards -> temp_extracted/bonus/")
     print(f"\nMetadata files created with page text for each card")
-    print(f"\nNext: Review temp_extracted/*/_metadata.json to parse bird data")
+    print(f"\nNext: Review temp_extracted/*/_metadata.jsonl to parse bird data")
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -4,52 +4,31 @@ Extract comprehensive bird data from the Appendix PDF.
 Match with our extracted cards and update birds.json accurately.
 """
 
-import json
 import re
 from pathlib import Path
 
-try:
-    import fitz
-except ImportError:
-    import subprocess
-    import sys
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "PyMuPDF"])
-    import fitz
+from card_metadata import metadata_path, read_metadata
+from instrumentation import run
+from pdf_ingest import APPENDIX_PDF, close_all, open_pdf, write_pages_text
 
 def extract_appendix_text():
     """Extract all text from Appendix PDF."""
-    pdf_path = Path("D:/wingspan-online/Wingspan Assets/WS_Appendix_r17.pdf")
-    
     print("Extracting text from Appendix...")
-    doc = fitz.open(str(pdf_path))
-    
-    full_text = []
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text = page.get_text()
-        full_text.append(text)
-    
-    doc.close()
+    full_text = open_pdf(APPENDIX_PDF).texts()
     
     # Save for manual review
     output_file = Path("wingspan_appendix_full_text.txt")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for i, text in enumerate(full_text):
-            f.write(f"\n{'='*70}\n")
-            f.write(f"PAGE {i + 1}\n")
-            f.write(f"{'='*70}\n")
-            f.write(text)
+    write_pages_text(full_text, output_file)
     
     print(f"Saved full appendix text to: {output_file}")
     return full_text
 
 def extract_card_metadata():
-    """Get metadata from our extracted cards to match with appendix."""
-    metadata_file = Path("temp_extracted/birds/_metadata.json")
+    """Get metadata from our extracted cards to match with appendix (streamed one card at a time)."""
+    metadata_file = metadata_path("temp_extracted/birds")
     
-    if metadata_file.exists():
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    if metadata_file.exists() or metadata_file.with_suffix('.json').exists():
+        return read_metadata(metadata_file)
     return None
 
 def main():
@@ -59,6 +38,7 @@ def main():
     
     # Extract appendix text
     appendix_text = extract_appendix_text()
+    close_all()
     
     # Get our card metadata
     card_metadata = extract_card_metadata()
@@ -74,4 +54,4 @@ def main():
     print("4. Update birds.json with accurate information")
 
 if __name__ == "__main__":
-    main()
+    run(main)
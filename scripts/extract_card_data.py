@@ -8,36 +8,22 @@ import json
 import re
 from pathlib import Path
 
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    import subprocess
-    import sys
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "PyMuPDF"])
-    import fitz
+from instrumentation import run, span
+from pdf_ingest import APPENDIX_PDF, BIRD_CARDS_PDF, BONUS_CARDS_PDF, close_all, open_pdf
 
 def extract_text_from_pdf(pdf_path):
     """Extract all text from PDF pages."""
     print(f"\nExtracting text from: {pdf_path}")
-    doc = fitz.open(pdf_path)
-    
-    all_text = []
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text = page.get_text()
-        all_text.append({
-            'page': page_num + 1,
-            'text': text
-        })
-    
-    doc.close()
-    return all_text
+    return [
+        {'page': page.number, 'text': page.text}
+        for page in open_pdf(pdf_path).pages()
+    ]
 
 def extract_bird_cards_data():
     """Extract bird card data from BirdCards PDF."""
-    pdf_path = "D:/wingspan-online/Wingspan Assets/BirdCards - Update Pack Cards.pdf"
+    pdf_path = BIRD_CARDS_PDF
     
-    if not Path(pdf_path).exists():
+    if not pdf_path.exists():
         print(f"ERROR: PDF not found: {pdf_path}")
         return []
     
@@ -67,9 +53,9 @@ def extract_bird_cards_data():
 
 def extract_bonus_cards_data():
     """Extract bonus card data from BonusCards PDF."""
-    pdf_path = "D:/wingspan-online/Wingspan Assets/Wingspan_BonusCards - Update Pack Cards.pdf"
+    pdf_path = BONUS_CARDS_PDF
     
-    if not Path(pdf_path).exists():
+    if not pdf_path.exists():
         print(f"ERROR: PDF not found: {pdf_path}")
         return []
     
@@ -91,9 +77,9 @@ def extract_bonus_cards_data():
 
 def extract_appendix_data():
     """Extract comprehensive bird list from Appendix."""
-    pdf_path = "D:/wingspan-online/Wingspan Assets/WS_Appendix_r17.pdf"
+    pdf_path = APPENDIX_PDF
     
-    if not Path(pdf_path).exists():
+    if not pdf_path.exists():
         print(f"ERROR: PDF not found: {pdf_path}")
         return []
     
@@ -105,13 +91,14 @@ def extract_appendix_data():
     
     # Save to file for manual review
     output_file = "D:/wingspan-online/extracted_appendix_text.txt"
-    with open(output_file, 'w', encoding='utf-8') as f:
+    with span('save') as s, open(output_file, 'w', encoding='utf-8') as f:
         for page_data in pages_text:
             f.write(f"\n{'='*60}\n")
             f.write(f"PAGE {page_data['page']}\n")
             f.write(f"{'='*60}\n")
             f.write(page_data['text'])
             f.write('\n')
+        s.add(bytes_out=f.tell())
     
     print(f"\nAppendix text saved to: {output_file}")
     print("Review this file to understand the data structure")
@@ -132,6 +119,8 @@ def main():
     # Extract from Bonus Cards PDF
     bonus_data = extract_bonus_cards_data()
     
+    close_all()
+    
     print("\n" + "="*60)
     print("EXTRACTION COMPLETE")
     print("="*60)
@@ -139,4 +128,4 @@ def main():
     print("This will help us understand how to parse the bird data")
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -3,129 +3,79 @@
 Re-extract bird cards, but this time keep the LARGEST images (full cards).
 """
 
-import json
 from pathlib import Path
-import shutil
 
-try:
-    import fitz
-except ImportError:
-    import subprocess
-    import sys
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "PyMuPDF"])
-    import fitz
+from image_dedupe import ImageIndex
+from instrumentation import run, span
+from pdf_ingest import BIRD_CARDS_PDF, BONUS_CARDS_PDF, close_all, open_pdf
 
-def extract_full_bird_cards():
-    """Extract FULL bird card images (largest images per page)."""
-    pdf_path = Path("D:/wingspan-online/Wingspan Assets/BirdCards - Update Pack Cards.pdf")
-    output_dir = Path("D:/wingspan-online/client/public/assets/birds/fronts")
+def extract_largest_images(pdf_path, output_dir, prefix, min_size):
+    """
+    Save the largest image on each page (most likely the full card).
+    Artwork already saved for an earlier card is not written again; the card
+    is mapped to the existing file in _images.json instead.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
-    
-    print("="*70)
-    print("EXTRACTING FULL BIRD CARDS (keeping largest images)")
-    print("="*70)
-    
-    doc = fitz.open(str(pdf_path))
+    index = ImageIndex()
     card_id = 1
     
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        image_list = page.get_images(full=True)
-        
-        if not image_list:
+    for page in open_pdf(pdf_path).pages():
+        largest = page.largest_image(min_size)
+        if not largest:
             continue
         
-        # Extract ALL images from this page to find the largest
-        page_images = []
-        for img in image_list:
-            xref = img[0]
-            try:
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
-                
-                # Only consider large images (>50KB)
-                if len(image_bytes) > 50000:
-                    page_images.append({
-                        'bytes': image_bytes,
-                        'ext': image_ext,
-                        'size': len(image_bytes)
-                    })
-            except Exception as e:
-                continue
+        card_name = f"{prefix}-{card_id}"
+        filename, is_new = index.add(card_name, largest['bytes'], f"{card_name}.{largest['ext']}",
+                                     xref=largest['xref'], source=str(pdf_path))
         
-        # Keep the LARGEST image (most likely the full card)
-        if page_images:
-            largest = max(page_images, key=lambda x: x['size'])
-            
-            # Save the full card image
-            output_path = output_dir / f"bird-{card_id}.{largest['ext']}"
-            with open(output_path, 'wb') as f:
+        if is_new:
+            with span('save', bytes_out=largest['size']), open(output_dir / filename, 'wb') as f:
                 f.write(largest['bytes'])
-            
-            print(f"Page {page_num + 1}: Saved bird-{card_id}.{largest['ext']} ({largest['size']} bytes)")
-            card_id += 1
+            print(f"Page {page.number}: Saved {filename} ({largest['size']} bytes)")
+        else:
+            print(f"Page {page.number}: {card_name} duplicates {filename}, not saved again")
+        card_id += 1
+    
+    removed = index.remove_stale_duplicates(output_dir)
+    index.save_map(output_dir)
+    if index.duplicates:
+        print(f"\n {index.duplicates} duplicate image(s) mapped to existing files ({index.saved_bytes} bytes saved)")
+    if removed:
+        print(f" Removed {removed} stale duplicate file(s)")
+    
+    return card_id - 1
+
+def extract_full_bird_cards():
+    """Extract FULL bird card images (largest images per page)."""
+    print("="*70)
+    print("EXTRACTING FULL BIRD CARDS (keeping largest images)")
+    print("="*70)
     
-    doc.close()
+    # Only consider large images (>50KB)
+    total = extract_largest_images(
+        BIRD_CARDS_PDF,
+        Path("D:/wingspan-online/client/public/assets/birds/fronts"),
+        "bird",
+        50000
+    )
     
-    total = card_id - 1
     print(f"\n Extracted {total} full bird card images")
     return total
 
 def extract_full_bonus_cards():
     """Extract FULL bonus card images (largest images per page)."""
-    pdf_path = Path("D:/wingspan-online/Wingspan Assets/Wingspan_BonusCards - Update Pack Cards.pdf")
-    output_dir = Path("D:/wingspan-online/client/public/assets/bonus")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
     print("\n" + "="*70)
     print("EXTRACTING FULL BONUS CARDS (keeping largest images)")
     print("="*70)
     
-    doc = fitz.open(str(pdf_path))
-    card_id = 1
-    
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        image_list = page.get_images(full=True)
-        
-        if not image_list:
-            continue
-        
-        # Extract ALL images from this page
-        page_images = []
-        for img in image_list:
-            xref = img[0]
-            try:
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
-                
-                # Keep large images (>200KB for bonus cards)
-                if len(image_bytes) > 200000:
-                    page_images.append({
-                        'bytes': image_bytes,
-                        'ext': image_ext,
-                        'size': len(image_bytes)
-                    })
-            except Exception as e:
-                continue
-        
-        # Keep the LARGEST image
-        if page_images:
-            largest = max(page_images, key=lambda x: x['size'])
-            
-            # Save the full bonus card image
-            output_path = output_dir / f"bonus-{card_id}.{largest['ext']}"
-            with open(output_path, 'wb') as f:
-                f.write(largest['bytes'])
-            
-            print(f"Page {page_num + 1}: Saved bonus-{card_id}.{largest['ext']} ({largest['size']} bytes)")
-            card_id += 1
-    
-    doc.close()
+    # Keep large images (>200KB for bonus cards)
+    total = extract_largest_images(
+        BONUS_CARDS_PDF,
+        Path("D:/wingspan-online/client/public/assets/bonus"),
+        "bonus",
+        200000
+    )
     
-    total = card_id - 1
     print(f"\n Extracted {total} full bonus card images")
     return total
 
@@ -138,6 +88,7 @@ def main():
     
     # Extract full bonus cards
     bonus_count = extract_full_bonus_cards()
+    close_all()
     
     print("\n" + "="*70)
     print("EXTRACTION COMPLETE!")
@@ -148,4 +99,4 @@ def main():
     print(f"\n These should now show the complete card layout with all details!")
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -4,96 +4,118 @@ Extract bird cards by rendering entire PDF pages as images.
 Each page = one complete card with layout.
 """
 
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    import subprocess
-    import sys
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "PyMuPDF"])
-    import fitz
+from instrumentation import call_in_worker, merge, run, span
+from pdf_ingest import (
+    BIRD_CARDS_PDF, BONUS_CARDS_PDF, close_all, open_pdf, render_page_range,
+    split_page_ranges, walk_pdf
+)
 
-def extract_bird_cards_from_pages():
-    """Render each PDF page as a complete card image."""
-    pdf_path = Path("D:/wingspan-online/Wingspan Assets/BirdCards - Update Pack Cards.pdf")
-    output_dir = Path("D:/wingspan-online/client/public/assets/birds/fronts")
+# zoom = 2 means 2x resolution (higher quality)
+RENDER_ZOOM = 2
+
+# Ranges handed to each worker; more ranges than workers keeps the pool busy
+# when some pages are slower to render than others.
+RANGES_PER_WORKER = 4
+
+def render_pages(pdf_path, output_dir, prefix, workers=1):
+    """Render every page of a PDF as a complete card image."""
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    if workers <= 1:
+        card_id = 1
+        for page, _, pix in walk_pdf(pdf_path, render_zoom=RENDER_ZOOM):
+            # Save as JPEG
+            output_path = output_dir / f"{prefix}-{card_id}.jpg"
+            with span('save') as s:
+                pix.save(str(output_path))
+                s.add(bytes_out=output_path.stat().st_size)
+            
+            print(f"Page {page.number}: Rendered {prefix}-{card_id}.jpg ({pix.width}x{pix.height}px)")
+            
+            card_id += 1
+        
+        return card_id - 1
+    
+    # Parallel mode: each worker opens its own document handle and renders a
+    # contiguous page range. Futures are collected in submission order so the
+    # output stays in page order.
+    page_count = len(open_pdf(pdf_path))
+    ranges = split_page_ranges(page_count, workers * RANGES_PER_WORKER)
+    total = 0
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(call_in_worker, render_page_range, pdf_path, start, stop, output_dir, prefix, RENDER_ZOOM)
+            for start, stop in ranges
+        ]
+        for future in futures:
+            rendered, spans = future.result()
+            merge(spans)
+            for page_number, filename, width, height in rendered:
+                print(f"Page {page_number}: Rendered {filename} ({width}x{height}px)")
+                total += 1
+    
+    return total
+
+def extract_bird_cards_from_pages(workers=1):
+    """Render each PDF page as a complete card image."""
     print("="*70)
     print("EXTRACTING BIRD CARDS - Rendering complete pages")
     print("="*70)
     
-    doc = fitz.open(str(pdf_path))
-    card_id = 1
-    
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        
-        # Render page as image at high resolution
-        # zoom = 2 means 2x resolution (higher quality)
-        zoom = 2
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat, alpha=False)
-        
-        # Save as JPEG
-        output_path = output_dir / f"bird-{card_id}.jpg"
-        pix.save(str(output_path))
-        
-        print(f"Page {page_num + 1}: Rendered bird-{card_id}.jpg ({pix.width}x{pix.height}px)")
-        
-        card_id += 1
-    
-    doc.close()
+    total = render_pages(
+        BIRD_CARDS_PDF,
+        Path("D:/wingspan-online/client/public/assets/birds/fronts"),
+        "bird",
+        workers
+    )
     
-    total = card_id - 1
     print(f"\n Extracted {total} bird cards")
     return total
 
-def extract_bonus_cards_from_pages():
+def extract_bonus_cards_from_pages(workers=1):
     """Render each bonus card PDF page as image."""
-    pdf_path = Path("D:/wingspan-online/Wingspan Assets/Wingspan_BonusCards - Update Pack Cards.pdf")
-    output_dir = Path("D:/wingspan-online/client/public/assets/bonus")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
     print("\n" + "="*70)
     print("EXTRACTING BONUS CARDS - Rendering complete pages")
     print("="*70)
     
-    doc = fitz.open(str(pdf_path))
-    card_id = 1
+    total = render_pages(
+        BONUS_CARDS_PDF,
+        Path("D:/wingspan-online/client/public/assets/bonus"),
+        "bonus",
+        workers
+    )
     
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        
-        # Render page as image at high resolution
-        zoom = 2
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat, alpha=False)
-        
-        # Save as JPEG
-        output_path = output_dir / f"bonus-{card_id}.jpg"
-        pix.save(str(output_path))
-        
-        print(f"Page {page_num + 1}: Rendered bonus-{card_id}.jpg ({pix.width}x{pix.height}px)")
-        
-        card_id += 1
-    
-    doc.close()
-    
-    total = card_id - 1
     print(f"\n Extracted {total} bonus cards")
     return total
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Render Wingspan card PDF pages as images.")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="number of render processes (1 = serial, 0 = one per CPU core)"
+    )
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    workers = args.workers or os.cpu_count() or 1
+    
     print("WINGSPAN PAGE-TO-IMAGE EXTRACTOR")
-    print("Rendering entire PDF pages as card images\n")
+    print("Rendering entire PDF pages as card images")
+    print(f"Workers: {workers}\n")
     
     # Extract bird cards
-    bird_count = extract_bird_cards_from_pages()
+    bird_count = extract_bird_cards_from_pages(workers)
     
     # Extract bonus cards
-    bonus_count = extract_bonus_cards_from_pages()
+    bonus_count = extract_bonus_cards_from_pages(workers)
+    close_all()
     
     print("\n" + "="*70)
     print("EXTRACTION COMPLETE!")
@@ -104,4 +126,4 @@ def main():
     print(f"\n Each page rendered as a complete card with layout!")
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+On-disk cache for PDF extraction results.
+Entries are keyed by the PDF content hash, page index and image xref, so an
+unchanged PDF is never re-extracted. The cache has a size cap and evicts the
+least recently used entries when it grows past it.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from instrumentation import span
+from pdf_ingest import open_pdf
+
+DEFAULT_CACHE_DIR = Path("D:/wingspan-online/temp_extracted/_cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+INDEX_VERSION = 1
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_if_changed(path, data):
+    """Write bytes to path unless it already holds exactly those bytes. Returns True if written."""
+    path = Path(path)
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    with span('save', bytes_out=len(data)):
+        path.write_bytes(data)
+    return True
+
+
+class ExtractionCache:
+    """Content-addressed cache of page text and extracted images."""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.root / "_index.json"
+        self.hits = 0
+        self.misses = 0
+        self._digests = {}
+        self._load()
+
+    def _load(self):
+        self.index = {'version': INDEX_VERSION, 'pdfs': {}, 'entries': {}}
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                if index.get('version') == INDEX_VERSION:
+                    self.index = index
+            except (OSError, ValueError):
+                print(f"  WARNING: ignoring unreadable cache index {self.index_file}")
+
+    def save(self):
+        self.evict()
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        tmp_file.replace(self.index_file)
+
+    # --- keys -------------------------------------------------------------
+
+    def pdf_digest(self, pdf_path):
+        """Content hash of a PDF, memoised on (path, size, mtime)."""
+        stat = Path(pdf_path).stat()
+        key = (str(pdf_path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._digests:
+            self._digests[key] = file_digest(pdf_path)
+        return self._digests[key]
+
+    @staticmethod
+    def page_key(pdf_hash, page_index):
+        return f"{pdf_hash}/{page_index}"
+
+    @staticmethod
+    def image_key(pdf_hash, page_index, xref):
+        return f"{pdf_hash}/{page_index}/{xref}"
+
+    # --- lookups ----------------------------------------------------------
+
+    def page_count(self, pdf_hash):
+        return self.index['pdfs'].get(pdf_hash)
+
+    def set_page_count(self, pdf_hash, count):
+        self.index['pdfs'][pdf_hash] = count
+
+    def get_page(self, pdf_hash, page_index):
+        """Return {'text', 'xrefs'} for a cached page, or None."""
+        entry = self.index['entries'].get(self.page_key(pdf_hash, page_index))
+        if entry is None:
+            self.misses += 1
+            return None
+        entry['last_used'] = time.time()
+        self.hits += 1
+        return {'text': entry['text'], 'xrefs': entry['xrefs']}
+
+    def put_page(self, pdf_hash, page_index, text, xrefs):
+        self.index['entries'][self.page_key(pdf_hash, page_index)] = {
+            'text': text,
+            'xrefs': list(xrefs),
+            'size': len(text.encode('utf-8')),
+            'last_used': time.time()
+        }
+
+    def get_image(self, pdf_hash, page_index, xref):
+        """Return a cached image dict (xref, bytes, ext, size), or None."""
+        key = self.image_key(pdf_hash, page_index, xref)
+        entry = self.index['entries'].get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        blob = self.root / entry['file']
+        if not blob.exists():
+            del self.index['entries'][key]
+            self.misses += 1
+            return None
+        entry['last_used'] = time.time()
+        self.hits += 1
+        with span('cache_read', bytes_in=entry['size']):
+            data = blob.read_bytes()
+        return {'xref': xref, 'bytes': data, 'ext': entry['ext'], 'size': entry['size']}
+
+    def put_image(self, pdf_hash, page_index, image):
+        key = self.image_key(pdf_hash, page_index, image['xref'])
+        relative = Path(pdf_hash[:16]) / f"{page_index}-{image['xref']}.{image['ext']}"
+        blob = self.root / relative
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        blob.write_bytes(image['bytes'])
+        self.index['entries'][key] = {
+            'file': relative.as_posix(),
+            'ext': image['ext'],
+            'size': image['size'],
+            'last_used': time.time()
+        }
+
+    # --- eviction ---------------------------------------------------------
+
+    def total_bytes(self):
+        return sum(entry['size'] for entry in self.index['entries'].values())
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        entries = self.index['entries']
+        for key in sorted(entries, key=lambda k: entries[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            entry = entries.pop(key)
+            if 'file' in entry:
+                (self.root / entry['file']).unlink(missing_ok=True)
+            total -= entry['size']
+            evicted += 1
+        return evicted
+
+
+def walk_pdf_cached(pdf_path, cache):
+    """
+    Yield (page_number, text, images) for every page of a PDF, serving pages
+    from the cache where possible. The PDF is only opened if some page is
+    missing from the cache; only those pages are extracted and stored.
+    """
+    pdf_hash = cache.pdf_digest(pdf_path)
+    page_count = cache.page_count(pdf_hash)
+    source = None
+    if page_count is None:
+        source = open_pdf(pdf_path)
+        page_count = len(source)
+        cache.set_page_count(pdf_hash, page_count)
+
+    for index in range(page_count):
+        record = cache.get_page(pdf_hash, index)
+        images = None
+        if record is not None:
+            images = [cache.get_image(pdf_hash, index, xref) for xref in record['xrefs']]
+            if any(image is None for image in images):
+                images = None
+
+        if images is None:
+            source = source or open_pdf(pdf_path)
+            page = source.page(index)
+            images = [image for image in page.images() if image]
+            for image in images:
+                cache.put_image(pdf_hash, index, image)
+            record = {'text': page.text, 'xrefs': [image['xref'] for image in images]}
+            cache.put_page(pdf_hash, index, record['text'], record['xrefs'])
+
+        yield index + 1, record['text'], images
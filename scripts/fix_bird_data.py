@@ -4,10 +4,13 @@ Re-parse bird card text data correctly and update birds.json.
 Fix the points and other data that was incorrectly parsed.
 """
 
-import json
 import re
 from pathlib import Path
 
+from card_metadata import metadata_path, read_metadata
+from instrumentation import read_json, run, write_json
+from power_grammar import compile_power
+
 def parse_bird_card_correctly(text):
     """
     Parse bird card text with correct logic.
@@ -69,56 +72,67 @@ def parse_bird_card_correctly(text):
         'power': power
     }
 
+# Page 22 of the update pack does not hold a valid bird card
+INVALID_PAGES = {22}
+
+def card_pages(metadata):
+    """Yield one metadata item per bird card page, in bird order."""
+    seen_pages = set()
+    for item in metadata:
+        page = item['page']
+        
+        # Skip duplicates (same page) and invalid pages
+        if page in seen_pages or page in INVALID_PAGES:
+            continue
+        seen_pages.add(page)
+        yield item
+
+def apply_parsed_fix(bird, item):
+    """
+    Update one bird in place from its card text.
+    Returns (parsed, changes) where changes lists what differed.
+    """
+    parsed = parse_bird_card_correctly(item['page_text'])
+    
+    old_points = bird['points']
+    old_wingspan = bird['wingspan']
+    
+    bird['points'] = parsed['points']
+    bird['wingspan'] = parsed['wingspan']
+    
+    if parsed['power']:
+        bird['power'] = compile_power(parsed['power'])
+    
+    changes = []
+    if old_points != parsed['points']:
+        changes.append(f"points: {old_points} -> {parsed['points']}")
+    if old_wingspan != parsed['wingspan']:
+        changes.append(f"wingspan: {old_wingspan} -> {parsed['wingspan']}")
+    
+    return parsed, changes
+
 def fix_birds_json():
     """Update birds.json with correctly parsed data."""
     
-    # Load metadata
-    metadata_file = Path("temp_extracted/birds/_metadata.json")
-    with open(metadata_file, 'r', encoding='utf-8') as f:
-        metadata = json.load(f)
+    # Stream metadata one card at a time
+    metadata = read_metadata(metadata_path("temp_extracted/birds"))
     
     # Load current birds.json
     birds_json_file = Path("data/birds.json")
-    with open(birds_json_file, 'r', encoding='utf-8') as f:
-        birds = json.load(f)
+    birds = read_json(birds_json_file)
     
     print("="*70)
     print("FIXING BIRD DATA")
     print("="*70)
     
-    # Track unique pages (each page = one bird)
-    seen_pages = set()
     bird_index = 0
     
-    for item in metadata:
-        page = item['page']
-        
-        # Skip duplicates (same page)
-        if page in seen_pages or page == 22:  # Skip page 22 (invalid)
-            continue
-        seen_pages.add(page)
-        
-        # Parse the text correctly
-        parsed = parse_bird_card_correctly(item['page_text'])
-        
+    for item in card_pages(metadata):
         # Update the corresponding bird in birds.json
         if bird_index < len(birds):
-            old_points = birds[bird_index]['points']
-            old_wingspan = birds[bird_index]['wingspan']
-            
-            birds[bird_index]['points'] = parsed['points']
-            birds[bird_index]['wingspan'] = parsed['wingspan']
-            
-            if parsed['power']:
-                birds[bird_index]['power'] = parsed['power']
+            parsed, changes = apply_parsed_fix(birds[bird_index], item)
             
             # Show what changed
-            changes = []
-            if old_points != parsed['points']:
-                changes.append(f"points: {old_points} -> {parsed['points']}")
-            if old_wingspan != parsed['wingspan']:
-                changes.append(f"wingspan: {old_wingspan} -> {parsed['wingspan']}")
-            
             if changes:
                 print(f"{bird_index + 1}. {parsed['name']}: {', '.join(changes)}")
             else:
@@ -127,11 +141,10 @@ def fix_birds_json():
         bird_index += 1
     
     # Save updated birds.json
-    with open(birds_json_file, 'w', encoding='utf-8') as f:
-        json.dump(birds, f, indent=2, ensure_ascii=False)
+    write_json(birds_json_file, birds, indent=2, ensure_ascii=False)
     
     print(f"\n Updated {bird_index} birds in birds.json")
     print(" Saved to: data/birds.json")
 
 if __name__ == "__main__":
-    fix_birds_json()
+    run(fix_birds_json)
@@ -4,11 +4,22 @@ Parse extracted metadata and generate proper birds.json and bonus_cards.json.
 Maps images to correct data based on extracted text.
 """
 
-import json
+import argparse
 import re
 from pathlib import Path
 import shutil
 
+from card_metadata import metadata_path, read_metadata
+from image_dedupe import ImageIndex, apply_image_map, load_image_map
+from instrumentation import read_json, run, write_json
+from power_grammar import compile_power
+
+BIRD_METADATA = metadata_path("temp_extracted/birds")
+BONUS_METADATA = metadata_path("temp_extracted/bonus")
+
+BIRD_ASSETS_DIR = Path("client/public/assets/birds/fronts")
+BONUS_ASSETS_DIR = Path("client/public/assets/bonus")
+
 def parse_bird_text(text):
     """Parse bird card text to extract properties."""
     lines = text.strip().split('\n')
@@ -49,61 +60,61 @@ def parse_bird_text(text):
         'power': power
     }
 
-def generate_birds_json():
-    """Generate birds.json from extracted metadata."""
-    metadata_file = Path("temp_extracted/birds/_metadata.json")
+def unique_page_items(metadata):
+    """Keep one metadata item per page (skip duplicate images from the same page)."""
+    seen_pages = set()
+    for item in metadata:
+        page = item['page']
+        if page in seen_pages:
+            continue
+        seen_pages.add(page)
+        yield item
+
+def bird_from_metadata(item, bird_id):
+    """Build a bird record from one metadata item."""
+    parsed = parse_bird_text(item['page_text'])
+    
+    bird = {
+        'id': f"bird-{bird_id}",
+        'name': parsed['name'],
+        'habitats': ['forest'],  # Default, will need manual adjustment
+        'foodCost': ['invertebrate'],  # Default, will need manual adjustment
+        'points': parsed['points'],
+        'nestType': 'platform',  # Default
+        'eggCapacity': 4,  # Default
+        'wingspan': parsed['wingspan']
+    }
+    
+    if parsed['power']:
+        bird['power'] = compile_power(parsed['power'])
+    
+    return bird
+
+def generate_birds_json(follow=False):
+    """Generate birds.json from extracted metadata, one card at a time."""
+    metadata_file = BIRD_METADATA
     
-    if not metadata_file.exists():
+    if not follow and not metadata_file.exists() and not metadata_file.with_suffix('.json').exists():
         print(f"ERROR: {metadata_file} not found!")
         return
     
-    with open(metadata_file, 'r', encoding='utf-8') as f:
-        metadata = json.load(f)
+    metadata = read_metadata(metadata_file, follow=follow)
     
     print("="*70)
     print("GENERATING birds.json")
     print("="*70)
     
     birds = []
-    seen_pages = set()
-    bird_id = 1
     
-    for item in metadata:
-        page = item['page']
-        
-        # Skip duplicate images from same page (keep only one bird per page)
-        if page in seen_pages:
-            continue
-        seen_pages.add(page)
-        
-        # Parse bird text
-        parsed = parse_bird_text(item['page_text'])
-        
-        # Create bird object
-        bird = {
-            'id': f"bird-{bird_id}",
-            'name': parsed['name'],
-            'habitats': ['forest'],  # Default, will need manual adjustment
-            'foodCost': ['invertebrate'],  # Default, will need manual adjustment
-            'points': parsed['points'],
-            'nestType': 'platform',  # Default
-            'eggCapacity': 4,  # Default
-            'wingspan': parsed['wingspan']
-        }
-        
-        if parsed['power']:
-            bird['power'] = parsed['power']
-        
+    for bird_id, item in enumerate(unique_page_items(metadata), start=1):
+        bird = bird_from_metadata(item, bird_id)
         birds.append(bird)
         
-        print(f"{bird_id}. {parsed['name']} - {parsed['points']} points")
-        
-        bird_id += 1
+        print(f"{bird_id}. {bird['name']} - {bird['points']} points")
     
     # Save birds.json
     output_file = Path("data/birds.json")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(birds, f, indent=2, ensure_ascii=False)
+    write_json(output_file, birds, indent=2, ensure_ascii=False)
     
     print(f"\n Generated {len(birds)} birds")
     print(f" Saved to: {output_file}")
@@ -125,16 +136,15 @@ def parse_bonus_text(text):
         'description': description
     }
 
-def generate_bonus_cards_json():
-    """Generate bonus_cards.json from extracted metadata."""
-    metadata_file = Path("temp_extracted/bonus/_metadata.json")
+def generate_bonus_cards_json(follow=False):
+    """Generate bonus_cards.json from extracted metadata, one card at a time."""
+    metadata_file = BONUS_METADATA
     
-    if not metadata_file.exists():
+    if not follow and not metadata_file.exists() and not metadata_file.with_suffix('.json').exists():
         print(f"\nERROR: {metadata_file} not found!")
         return
     
-    with open(metadata_file, 'r', encoding='utf-8') as f:
-        metadata = json.load(f)
+    metadata = read_metadata(metadata_file, follow=follow)
     
     print("\n" + "="*70)
     print("GENERATING bonus_cards.json")
@@ -176,87 +186,102 @@ def generate_bonus_cards_json():
     
     # Save bonus_cards.json
     output_file = Path("data/bonus_cards.json")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(bonus_cards, f, indent=2, ensure_ascii=False)
+    write_json(output_file, bonus_cards, indent=2, ensure_ascii=False)
     
     print(f"\n Generated {len(bonus_cards)} bonus cards")
     print(f" Saved to: {output_file}")
     
     return bonus_cards
 
+def copy_unique_images(items, src_dir, dest_dir, prefix):
+    """
+    Copy one image per card to the assets folder. Images that duplicate an
+    earlier card's artwork are not copied; the card is mapped to that file
+    in _images.json instead.
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    index = ImageIndex()
+    
+    for card_id, item in enumerate(items, start=1):
+        src_file = src_dir / item['image_file']
+        if not src_file.exists():
+            continue
+        
+        card_name = f"{prefix}-{card_id}"
+        ext = Path(item['image_file']).suffix
+        filename, is_new = index.add(card_name, src_file.read_bytes(), f"{card_name}{ext}")
+        
+        if is_new:
+            shutil.copy2(src_file, dest_dir / filename)
+            print(f" Copied: {item['image_file']} -> {filename}")
+        else:
+            print(f" Skipped: {item['image_file']} ({card_name} duplicates {filename})")
+    
+    index.remove_stale_duplicates(dest_dir)
+    index.save_map(dest_dir)
+    if index.duplicates:
+        print(f" {index.duplicates} duplicate image(s) not copied ({index.saved_bytes} bytes saved)")
+    return index.cards
+
 def copy_images_to_assets():
     """Copy the extracted images to the proper assets folder."""
     print("\n" + "="*70)
     print("COPYING IMAGES TO ASSETS FOLDER")
     print("="*70)
     
-    # Copy bird images
-    birds_src = Path("temp_extracted/birds")
-    birds_dest = Path("client/public/assets/birds/fronts")
-    birds_dest.mkdir(parents=True, exist_ok=True)
-    
-    # Copy only the images we're using (skip duplicates from same page)
-    with open("temp_extracted/birds/_metadata.json", 'r', encoding='utf-8') as f:
-        bird_metadata = json.load(f)
+    # Copy bird images (one per page)
+    copy_unique_images(
+        unique_page_items(read_metadata(BIRD_METADATA)),
+        Path("temp_extracted/birds"),
+        BIRD_ASSETS_DIR,
+        "bird"
+    )
     
+    # Copy bonus card images (one large image per page)
     seen_pages = set()
-    bird_id = 1
-    for item in bird_metadata:
-        page = item['page']
-        if page in seen_pages:
+    bonus_items = []
+    for item in read_metadata(BONUS_METADATA):
+        if item['page'] in seen_pages or item['image_size'] < 300000:
             continue
-        seen_pages.add(page)
-        
-        src_file = birds_src / item['image_file']
-        ext = Path(item['image_file']).suffix
-        dest_file = birds_dest / f"bird-{bird_id}{ext}"
-        
-        if src_file.exists():
-            shutil.copy2(src_file, dest_file)
-            print(f" Copied: {item['image_file']} -> bird-{bird_id}{ext}")
-        
-        bird_id += 1
-    
-    # Copy bonus card images
-    bonus_src = Path("temp_extracted/bonus")
-    bonus_dest = Path("client/public/assets/bonus")
-    bonus_dest.mkdir(parents=True, exist_ok=True)
-    
-    with open("temp_extracted/bonus/_metadata.json", 'r', encoding='utf-8') as f:
-        bonus_metadata = json.load(f)
+        seen_pages.add(item['page'])
+        bonus_items.append(item)
     
-    seen_pages = set()
-    bonus_id = 1
-    for item in bonus_metadata:
-        page = item['page']
-        image_size = item['image_size']
-        
-        if page in seen_pages or image_size < 300000:
+    copy_unique_images(bonus_items, Path("temp_extracted/bonus"), BONUS_ASSETS_DIR, "bonus")
+
+def link_shared_images():
+    """Add an "image" field to cards that share another card's image file."""
+    for data_file, assets_dir in ((Path("data/birds.json"), BIRD_ASSETS_DIR),
+                                  (Path("data/bonus_cards.json"), BONUS_ASSETS_DIR)):
+        image_map = load_image_map(assets_dir)
+        if not data_file.exists() or not image_map:
             continue
-        seen_pages.add(page)
         
-        src_file = bonus_src / item['image_file']
-        ext = Path(item['image_file']).suffix
-        dest_file = bonus_dest / f"bonus-{bonus_id}{ext}"
-        
-        if src_file.exists():
-            shutil.copy2(src_file, dest_file)
-            print(f" Copied: {item['image_file']} -> bonus-{bonus_id}{ext}")
+        cards = read_json(data_file)
+        apply_image_map(cards, image_map)
+        write_json(data_file, cards, indent=2, ensure_ascii=False)
         
-        bonus_id += 1
+        shared = sum(1 for card in cards if 'image' in card)
+        if shared:
+            print(f" {data_file}: {shared} card(s) use a shared image")
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate birds.json and bonus_cards.json from extracted metadata.")
+    parser.add_argument("--follow", action="store_true",
+                        help="start while extraction is still running and wait for each card as it is written")
+    args = parser.parse_args()
+    
     print("WINGSPAN JSON GENERATOR")
     print("Generating birds.json and bonus_cards.json from metadata\n")
     
     # Generate birds.json
-    birds = generate_birds_json()
+    birds = generate_birds_json(args.follow)
     
     # Generate bonus_cards.json
-    bonus_cards = generate_bonus_cards_json()
+    bonus_cards = generate_bonus_cards_json(args.follow)
     
     # Copy images to assets folder
     copy_images_to_assets()
+    link_shared_images()
     
     print("\n" + "="*70)
     print("GENERATION COMPLETE!")
@@ -270,4 +295,4 @@ def main():
     print(f" These would need manual adjustment or image recognition to be accurate.")
 
 if __name__ == "__main__":
-    main()
+    run(main)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Deduplicate card images before they are written to client/public/assets.
+
+Every image is fingerprinted three ways, cheapest first:
+  - its xref, for the same image object embedded on several pages of a PDF
+  - the SHA-256 of its bytes, for identical files
+  - a 256-bit difference hash (dHash) of its pixels, confirmed against a
+    small thumbnail, for the same artwork re-encoded in another update pack
+
+Each unique image is stored once. A card whose image duplicates an earlier one
+is mapped to that file in _images.json, and the build copies the mapping into
+the card's "image" field so the client loads the shared file.
+"""
+
+import hashlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    print("Installing PyMuPDF...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "PyMuPDF"])
+    import fitz
+
+IMAGE_MAP_FILENAME = "_images.json"
+
+# dHash grid size (HASH_SIZE * HASH_SIZE bits)
+HASH_SIZE = 16
+
+# Cards share their frame and layout, so distinct cards can have close hashes.
+# A hash within PHASH_MAX_DISTANCE only makes a candidate; it is confirmed by
+# comparing grayscale thumbnails pixel by pixel. On the current card art,
+# re-encoded copies differ by at most ~0.5 grey levels and distinct cards by
+# at least ~1.4.
+PHASH_MAX_DISTANCE = 24
+THUMBNAIL_SIZE = 32
+MAX_MEAN_DIFFERENCE = 0.9
+
+
+def image_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _grayscale(data):
+    pix = fitz.Pixmap(data)
+    if pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+    if pix.n != 1:
+        pix = fitz.Pixmap(fitz.csGRAY, pix)
+    return pix
+
+
+def perceptual_hash(data, size=HASH_SIZE):
+    """dHash of size*size bits: compare neighbouring pixels of a grayscale thumbnail."""
+    small = fitz.Pixmap(_grayscale(data), size + 1, size, None)
+    samples = small.samples
+
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = samples[row * (size + 1) + col]
+            right = samples[row * (size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def thumbnail(data, size=THUMBNAIL_SIZE):
+    """Grayscale size x size pixels, for confirming a perceptual-hash match."""
+    return fitz.Pixmap(_grayscale(data), size, size, None).samples
+
+
+def mean_difference(a, b):
+    return sum(abs(x - y) for x, y in zip(a, b)) / len(a)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+class ImageIndex:
+    """Maps card ids to the single stored copy of their image."""
+
+    def __init__(self, max_distance=PHASH_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.cards = {}          # card id -> stored filename
+        self._by_xref = {}       # (source, xref) -> filename
+        self._by_digest = {}     # sha256 -> filename
+        self._hashes = []        # (dhash, thumbnail, filename)
+        self.duplicates = 0
+        self.saved_bytes = 0
+
+    def _match(self, data, xref, source):
+        """Return (stored filename or None, digest, (dhash, thumbnail)) for an image."""
+        if xref is not None and (source, xref) in self._by_xref:
+            return self._by_xref[(source, xref)], None, None
+
+        digest = image_digest(data)
+        if digest in self._by_digest:
+            return self._by_digest[digest], digest, None
+
+        phash = perceptual_hash(data)
+        thumb = None
+        for other, other_thumb, filename in self._hashes:
+            if hamming(phash, other) > self.max_distance:
+                continue
+            thumb = thumb or thumbnail(data)
+            if mean_difference(thumb, other_thumb) <= MAX_MEAN_DIFFERENCE:
+                return filename, digest, None
+        return None, digest, (phash, thumb or thumbnail(data))
+
+    def add(self, card_id, data, filename, xref=None, source=None):
+        """
+        Register a card's image. Returns (stored filename, is_new); when
+        is_new is True the caller should write data to filename.
+        """
+        existing, digest, fingerprint = self._match(data, xref, source)
+        if existing:
+            self.cards[card_id] = existing
+            self.duplicates += 1
+            self.saved_bytes += len(data)
+            if xref is not None:
+                self._by_xref[(source, xref)] = existing
+            return existing, False
+
+        self.cards[card_id] = filename
+        self._by_digest[digest] = filename
+        self._hashes.append((*fingerprint, filename))
+        if xref is not None:
+            self._by_xref[(source, xref)] = filename
+        return filename, True
+
+    def remove_stale_duplicates(self, output_dir):
+        """Delete files a previous run wrote for cards that now share another card's image."""
+        stored = set(self.cards.values())
+        removed = 0
+        for card_id, filename in self.cards.items():
+            for stale in Path(output_dir).glob(f"{card_id}.*"):
+                if stale.name not in stored:
+                    stale.unlink()
+                    removed += 1
+        return removed
+
+    def save_map(self, output_dir):
+        path = Path(output_dir) / IMAGE_MAP_FILENAME
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.cards, f, indent=2)
+        return path
+
+
+def load_image_map(directory):
+    path = Path(directory) / IMAGE_MAP_FILENAME
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def apply_image_map(records, image_map):
+    """
+    Point cards at their shared image. Only cards whose image lives in another
+    card's file get an "image" field; the rest keep the default {id}.jpg.
+    """
+    for record in records:
+        filename = image_map.get(record['id'])
+        if filename and Path(filename).stem != record['id']:
+            record['image'] = filename
+        else:
+            record.pop('image', None)
+    return records
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Shared timing and profiling for the asset scripts.
+
+Code wraps its expensive steps in named spans:
+
+    with span('get_pixmap') as s:
+        pix = page.get_pixmap(...)
+        s.add(bytes_out=len(pix.samples))
+
+Each span name accumulates a call count, total and longest duration, and
+bytes read/written. Spans may nest, so a span's seconds include any spans
+inside it. Recording is always on (it is a perf_counter call per step); a
+report is only produced when asked for.
+
+Every script's entry point runs through run(main), which understands three
+extra command-line options (they are removed before the script parses its
+own arguments):
+
+    --profile-report PATH   write a JSON report of spans (and profiles) to PATH
+    --cprofile              run under cProfile; the report lists the top functions
+                            and the raw stats are saved next to it as .prof
+    --tracemalloc           trace Python allocations and report peak memory
+
+Any of them also prints a span summary when the script finishes.
+"""
+
+import argparse
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPORT_VERSION = 1
+
+# Functions listed in the report from cProfile and tracemalloc
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 15
+
+_spans = {}
+
+
+class Span:
+    """Timer for one step. Adds itself to the span totals when it exits."""
+
+    __slots__ = ('name', 'bytes_in', 'bytes_out', '_start')
+
+    def __init__(self, name, bytes_in=0, bytes_out=0):
+        self.name = name
+        self.bytes_in = bytes_in
+        self.bytes_out = bytes_out
+
+    def add(self, bytes_in=0, bytes_out=0):
+        """Count bytes that are only known once the step has run."""
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self._start, self.bytes_in, self.bytes_out)
+        return False
+
+
+def span(name, bytes_in=0, bytes_out=0):
+    return Span(name, bytes_in, bytes_out)
+
+
+def record(name, seconds, bytes_in=0, bytes_out=0, count=1, max_seconds=None):
+    totals = _spans.get(name)
+    if totals is None:
+        totals = _spans[name] = {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'bytes_in': 0, 'bytes_out': 0}
+    totals['count'] += count
+    totals['seconds'] += seconds
+    totals['max_seconds'] = max(totals['max_seconds'], seconds if max_seconds is None else max_seconds)
+    totals['bytes_in'] += bytes_in
+    totals['bytes_out'] += bytes_out
+
+
+def snapshot(reset=False):
+    """Copy of the span totals (for shipping back from worker processes)."""
+    copy = {name: dict(totals) for name, totals in _spans.items()}
+    if reset:
+        _spans.clear()
+    return copy
+
+
+def merge(spans):
+    """Add span totals from a snapshot taken in another process."""
+    for name, totals in spans.items():
+        record(name, totals['seconds'], totals['bytes_in'], totals['bytes_out'],
+               totals['count'], totals['max_seconds'])
+
+
+def call_in_worker(function, *args):
+    """
+    Run function in a pool worker and return (result, span totals) so the
+    parent can merge() the worker's spans into its own report. Spans
+    recorded before the call are kept, so it is also safe to call in-process.
+    """
+    earlier = snapshot(reset=True)
+    result = function(*args)
+    spans = snapshot(reset=True)
+    merge(earlier)
+    return result, spans
+
+
+def write_json(path, data, **dump_options):
+    """json.dump to a file as a 'json_dump' span, counting the bytes written."""
+    with span('json_dump') as s:
+        text = json.dumps(data, **dump_options)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        s.add(bytes_out=len(text.encode('utf-8')))
+
+
+def read_json(path):
+    """json.load from a file as a 'json_load' span, counting the bytes read."""
+    with span('json_load') as s:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        s.add(bytes_in=len(text.encode('utf-8')))
+        return json.loads(text)
+
+
+def span_table(spans):
+    lines = [f"  {'span':<18} {'count':>7} {'seconds':>9} {'max':>8} {'MB in':>9} {'MB out':>9}"]
+    for name, t in sorted(spans.items(), key=lambda item: -item[1]['seconds']):
+        lines.append(f"  {name:<18} {t['count']:>7} {t['seconds']:>9.3f} {t['max_seconds']:>8.3f} "
+                     f"{t['bytes_in'] / 1e6:>9.2f} {t['bytes_out'] / 1e6:>9.2f}")
+    return '\n'.join(lines)
+
+
+def profile_summary(profiler, limit=TOP_FUNCTIONS):
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f"{Path(filename).name}:{line}({function})",
+            'calls': calls,
+            'own_seconds': round(own, 4),
+            'cumulative_seconds': round(cumulative, 4)
+        })
+    rows.sort(key=lambda row: -row['cumulative_seconds'])
+    return rows[:limit]
+
+
+def memory_summary(limit=TOP_ALLOCATIONS):
+    current, peak = tracemalloc.get_traced_memory()
+    top = tracemalloc.take_snapshot().statistics('lineno')[:limit]
+    return {
+        'current_bytes': current,
+        'peak_bytes': peak,
+        'top': [{'where': str(stat.traceback[0]), 'bytes': stat.size, 'blocks': stat.count} for stat in top]
+    }
+
+
+def parse_options(argv):
+    """Split the instrumentation options off argv. Returns (options, remaining argv)."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile-report", type=Path)
+    parser.add_argument("--cprofile", action="store_true")
+    parser.add_argument("--tracemalloc", action="store_true")
+    return parser.parse_known_args(argv)
+
+
+def run(main, name=None):
+    """Run a script's main() with the instrumentation options applied."""
+    options, remaining = parse_options(sys.argv[1:])
+    sys.argv[1:] = remaining
+    name = name or Path(sys.argv[0]).stem
+    enabled = options.profile_report or options.cprofile or options.tracemalloc
+
+    if options.tracemalloc:
+        tracemalloc.start()
+    profiler = cProfile.Profile() if options.cprofile else None
+
+    started = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    try:
+        if profiler:
+            return profiler.runcall(main)
+        return main()
+    finally:
+        wall = time.perf_counter() - start
+        if enabled:
+            report = {
+                'version': REPORT_VERSION,
+                'script': name,
+                'argv': remaining,
+                'started': started.isoformat(timespec='seconds'),
+                'wall_seconds': round(wall, 4),
+                'spans': {n: {k: round(v, 4) if isinstance(v, float) else v for k, v in t.items()}
+                          for n, t in sorted(_spans.items())}
+            }
+            if profiler:
+                report['cprofile'] = profile_summary(profiler)
+            if options.tracemalloc:
+                report['memory'] = memory_summary()
+                tracemalloc.stop()
+
+            print("\n" + "="*70)
+            print(f"TIMING: {name} ({wall:.2f}s wall)")
+            print("="*70)
+            print(span_table(_spans))
+            if options.tracemalloc:
+                print(f"\n Peak traced memory: {report['memory']['peak_bytes'] / 1e6:.1f} MB")
+
+            if options.profile_report:
+                options.profile_report.parent.mkdir(parents=True, exist_ok=True)
+                with open(options.profile_report, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2)
+                print(f" Report: {options.profile_report}")
+                if profiler:
+                    profiler.dump_stats(str(options.profile_report.with_suffix('.prof')))
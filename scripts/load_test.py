@@ -0,0 +1,640 @@
+#!/usr/bin/env python3
+"""
+Socket.IO load test: many concurrent lobbies playing full games.
+
+Starts the server locally (node server/index.js on --port) or targets a
+running one (--url), then opens --lobbies lobbies of --players simulated
+players each. Every player is its own Socket.IO session and plays through
+the real event protocol in server/socket.js:
+
+    createLobby / joinLobby -> lobbyUpdate
+    startGame               -> gameStarted
+    confirmSetup            -> state broadcast (own setup confirmed)
+    gainFood / layEggs / drawCards / playBird
+                            -> actionSuccess or actionError
+    discardCards            -> actionSuccess (between rounds, over 5 cards)
+    selectBonusCard         -> actionSuccess (after a bonus card power)
+
+Game state arrives as stateSnapshot or statePatch messages; players apply
+patches, acknowledge every version with stateAck and ask for
+requestSnapshot when a patch's base version is missing, like the client.
+
+Players act on their own turn from the latest state: a legal bird
+play when they can afford one, otherwise food, eggs or cards, with an
+optional random think time. Lobby starts are spread over --ramp seconds.
+
+Reported per event: request count, errors and timeouts, and latency
+percentiles from emit to reply. State fan-out is measured per broadcast
+version: from the emit that caused it to its arrival at each player in the
+game (delivery) and at the last one (fan-out), plus the message sizes of
+patches and snapshots.
+The report is printed and written as JSON.
+
+Run from the repository root, like the other scripts.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+try:
+    import socketio
+except ImportError:
+    print("Installing python-socketio...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "python-socketio[asyncio_client]"])
+    import socketio
+
+try:
+    import aiohttp
+except ImportError:
+    print("Installing aiohttp...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "aiohttp"])
+    import aiohttp
+
+from instrumentation import run, write_json
+
+SERVER_COMMAND = ["node", "server/index.js"]
+REPORT_FILE = Path("temp_extracted/load_report.json")
+SERVER_LOG = Path("temp_extracted/load_server.log")
+
+REPORT_VERSION = 1
+
+PORT = 3100
+SERVER_START_TIMEOUT = 20
+REQUEST_TIMEOUT = 10
+GAME_TIMEOUT = 600
+
+PERCENTILES = (50, 90, 99)
+
+# Player habitats and the names playBird expects for them
+ROWS = {'forest': 'forest', 'grassland': 'grassland', 'wetland': 'wetlands', 'wetlands': 'wetlands'}
+DEFAULT_EGG_CAPACITY = 6
+HAND_LIMIT = 5
+
+
+# --- statistics -----------------------------------------------------------
+
+class Stats:
+    """Latencies per event, error counts and state broadcast timings."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.timeouts = {}
+        self.messages = {}
+        self.delivery = []
+        self.fanout = []
+        self.payload_bytes = {'statePatch': [], 'stateSnapshot': []}
+        self.snapshot_requests = 0
+        self.games_started = 0
+        self.games_finished = 0
+        self.games_failed = 0
+
+    def latency(self, event, seconds):
+        self.latencies.setdefault(event, []).append(seconds)
+
+    def error(self, event, kind='errors'):
+        counts = getattr(self, kind)
+        counts[event] = counts.get(event, 0) + 1
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    rank = max(1, -(-p * len(values) // 100))
+    return values[int(rank) - 1]
+
+
+def distribution(values, scale=1000.0, digits=2):
+    """count, mean, percentiles and max of values, scaled (seconds to ms by default)."""
+    values = sorted(values)
+    if not values:
+        return {'count': 0}
+    summary = {'count': len(values), 'mean': round(sum(values) / len(values) * scale, digits)}
+    for p in PERCENTILES:
+        summary[f"p{p}"] = round(percentile(values, p) * scale, digits)
+    summary['max'] = round(values[-1] * scale, digits)
+    return summary
+
+
+# --- simulated players ----------------------------------------------------
+
+class Table:
+    """Shared bookkeeping for the players of one game."""
+
+    def __init__(self, size, stats):
+        self.size = size
+        self.stats = stats
+        self.game_id = None
+        self.lobby_id = None
+        # state version -> [emit time, players that received it]
+        self.broadcasts = {}
+
+    def expect_broadcast(self, version):
+        self.broadcasts[version] = [time.perf_counter(), 0]
+
+    def received(self, version, event, message):
+        broadcast = self.broadcasts.get(version)
+        if broadcast is None:
+            return
+        now = time.perf_counter()
+        self.stats.delivery.append(now - broadcast[0])
+        broadcast[1] += 1
+        if broadcast[1] == 1:
+            self.stats.payload_bytes[event].append(len(json.dumps(message, separators=(',', ':'))))
+        if broadcast[1] == self.size:
+            self.stats.fanout.append(now - broadcast[0])
+            del self.broadcasts[version]
+
+
+class SimulatedPlayer:
+    """One Socket.IO session playing one seat."""
+
+    def __init__(self, name, table, stats, rng, think, timeout):
+        self.name = name
+        self.table = table
+        self.stats = stats
+        self.rng = rng
+        self.think = think
+        self.timeout = timeout
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.state = None
+        self.version = 0
+        self.versions = {}
+        self.changed = asyncio.Event()
+        self.started = asyncio.Event()
+        self.started_at = None
+        self.waiting = []
+        self.cards = {}
+
+        for event in ('lobbyUpdate', 'gameStarted', 'stateSnapshot', 'statePatch', 'actionSuccess',
+                      'actionError', 'powerActivated', 'cardTable'):
+            self.sio.on(event, self.handler(event))
+
+    @property
+    def sid(self):
+        return self.sio.get_sid()
+
+    def handler(self, event):
+        async def receive(data=None):
+            reply = event
+            if reply in ('stateSnapshot', 'statePatch'):
+                self.table.received(data['version'], reply, data)
+                state = await self.receive_state(reply, data)
+                if state is None:
+                    return
+                self.state = state
+                self.changed.set()
+                # Waiters see the resulting state, whichever message carried it
+                reply, data = 'state', state
+            elif reply == 'gameStarted' and not self.started.is_set():
+                self.started_at = time.perf_counter()
+                self.table.game_id = data['gameId']
+                self.state = await self.receive_state(reply, data)
+                self.started.set()
+            elif reply == 'powerActivated' and data.get('requiresBonusCardSelection') \
+                    and data.get('playerId') == self.sid:
+                asyncio.ensure_future(self.select_bonus_card(data['bonusCards']))
+
+            for waiter in list(self.waiting):
+                replies, accept, future = waiter
+                if reply in replies and not future.done() and accept(reply, data):
+                    future.set_result((reply, data))
+                    self.waiting.remove(waiter)
+        return receive
+
+    async def request(self, event, payload, replies, accept=lambda event, data: True, broadcast=False):
+        """Emit event and wait for the first reply event that accept()s. Returns (reply, data) or None."""
+        future = asyncio.get_running_loop().create_future()
+        waiter = (replies, accept, future)
+        self.waiting.append(waiter)
+        if broadcast:
+            self.table.expect_broadcast(self.version + 1)
+        start = time.perf_counter()
+        await self.sio.emit(event, payload)
+        try:
+            reply, data = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            if waiter in self.waiting:
+                self.waiting.remove(waiter)
+            self.stats.error(event, 'timeouts')
+            return None
+        self.stats.latency(event, time.perf_counter() - start)
+        if reply == 'actionError':
+            self.stats.error(event)
+            self.stats.error(f"{event}: {data.get('error')}", 'messages')
+        return reply, data
+
+    async def receive_state(self, event, message):
+        """Apply a snapshot or patch and acknowledge it. Returns the new state, or None."""
+        if event == 'statePatch':
+            if message['version'] <= self.version:
+                return None
+            base = self.versions.get(message['baseVersion'])
+            if base is None:
+                self.stats.snapshot_requests += 1
+                await self.sio.emit('requestSnapshot', {'gameId': message['gameId']})
+                return None
+            state = apply_patch(base, message['ops'])
+            self.versions = {v: s for v, s in self.versions.items() if v >= message['baseVersion']}
+        else:
+            state = message['state']
+            self.versions = {}
+        self.version = message['version']
+        self.versions[self.version] = state
+        await self.sio.emit('stateAck', {'gameId': message['gameId'], 'version': self.version})
+        return state
+
+    async def connect(self, url):
+        start = time.perf_counter()
+        await self.sio.connect(url, transports=['websocket'])
+        self.stats.latency('connect', time.perf_counter() - start)
+        # Bird definitions; cards in game states carry only their id and own state
+        reply = await self.request('requestCardTable', {}, ('cardTable',))
+        if reply:
+            self.cards = {bird['id']: bird for bird in reply[1]['birds']}
+
+    async def disconnect(self):
+        if self.sio.connected:
+            await self.sio.disconnect()
+
+    def card(self, card):
+        """A card from a game state with its definition from the card table filled in."""
+        return {**self.cards.get(card['id'], {}), **card}
+
+    def me(self):
+        """This session's player, with its private part ('you': hand, setup cards) merged in
+        and its cards filled in from the card table."""
+        player = next((p for p in self.state['players'] if p['id'] == self.sid), None)
+        own = dict(self.state.get('you') or {})
+        if player is None or own.pop('playerId', None) != player['id']:
+            return player
+        setup = {**player['setup'], **own.get('setup', {})}
+        return {
+            **player, **own,
+            'hand': [self.card(c) for c in own.get('hand', [])],
+            'habitats': {h: [self.card(c) for c in row] for h, row in player['habitats'].items()},
+            'setup': {**setup, 'birds': [self.card(c) for c in setup.get('birds') or []]},
+        }
+
+    async def confirm_setup(self):
+        me = self.me()
+        birds = sorted(me['setup']['birds'], key=lambda bird: len(bird.get('foodCost') or []))
+        kept = [bird['id'] for bird in birds[:2]]
+        bonus = (me['setup'].get('bonusCards') or [{}])[0].get('id')
+        await self.request('confirmSetup', {'gameId': self.table.game_id, 'keptBirdIds': kept, 'bonusCardId': bonus},
+                           ('state',), lambda event, state: self.confirmed(state))
+
+    def confirmed(self, state):
+        me = next((p for p in state['players'] if p['id'] == self.sid), None)
+        return bool(me and me['setup'].get('confirmed'))
+
+    async def select_bonus_card(self, cards):
+        card = cards[0]
+        await self.request('selectBonusCard', {'gameId': self.table.game_id,
+                                               'selectedCardId': card.get('instanceId') or card['id']},
+                           ('actionSuccess', 'actionError'))
+
+    async def play(self):
+        """Act on every state change until the game ends."""
+        await self.confirm_setup()
+        discarded_round = None
+        while True:
+            await self.changed.wait()
+            self.changed.clear()
+            state = self.state
+            phase = state['phase']
+            if phase == 'END':
+                return
+            me = self.me()
+            if me is None:
+                return
+
+            if phase == 'DISCARD' and len(me['hand']) > HAND_LIMIT and discarded_round != state['round']['round']:
+                discarded_round = state['round']['round']
+                cards = [card['id'] for card in me['hand']]
+                await self.request('discardCards', {'gameId': self.table.game_id,
+                                                    'cardIds': cards[:len(cards) - HAND_LIMIT]},
+                                   ('actionSuccess', 'actionError'), broadcast=True)
+            elif phase == 'PLAY' and state['turn']['activePlayerId'] == self.sid and me['actionCubes'] > 0:
+                await self.take_turn(state, me)
+
+    async def take_turn(self, state, me):
+        if self.think:
+            await asyncio.sleep(self.rng.uniform(0, self.think))
+        for event, payload in self.choose_actions(state, me):
+            reply = await self.request(event, payload, ('actionSuccess', 'actionError'), broadcast=True)
+            if reply is None or reply[0] == 'actionSuccess':
+                return
+
+    def choose_actions(self, state, me):
+        """Legal-looking actions, preferred first; later ones are fallbacks after an actionError."""
+        game_id = self.table.game_id
+        actions = []
+        play = self.playable_bird(me)
+        if play and self.rng.random() < 0.7:
+            bird, habitat, wild = play
+            actions.append(('playBird', {'gameId': game_id, 'birdId': bird['id'], 'habitat': habitat,
+                                         'wildFoodChoices': wild}))
+
+        others = []
+        strength = len(me['habitats']['forest']) + 1
+        dice = state.get('diceTray') or []
+        if strength <= len(dice):
+            others.append(('gainFood', {'gameId': game_id, 'habitat': 'forest', 'foodTypes': dice[:strength]}))
+        # LayEggs looks birds up by card id, so only the first copy of a card can take eggs
+        first = {}
+        for row in me['habitats'].values():
+            for bird in row:
+                first.setdefault(bird['id'], bird)
+        nests = [bird_id for bird_id, bird in first.items()
+                 if (bird.get('eggs') or 0) < (bird.get('eggCapacity') or DEFAULT_EGG_CAPACITY)]
+        if nests:
+            strength = len(me['habitats']['grassland']) + 1
+            others.append(('layEggs', {'gameId': game_id, 'habitat': 'grassland',
+                                       'birdIds': [nests[i % len(nests)] for i in range(strength)]}))
+        others.append(('drawCards', {'gameId': game_id, 'habitat': 'wetlands',
+                                     'count': len(me['habitats']['wetlands']) + 1, 'fromTray': []}))
+        self.rng.shuffle(others)
+        return actions + others
+
+    def playable_bird(self, me):
+        """(bird, habitat, wild food choices) for a bird in hand the player can pay for, or None."""
+        eggs = sum(bird.get('eggs') or 0 for row in me['habitats'].values() for bird in row)
+        for bird in self.rng.sample(me['hand'], len(me['hand'])):
+            wild = pay_for(me['food'], bird.get('foodCost') or [])
+            if wild is None:
+                continue
+            for habitat in bird.get('habitats') or []:
+                row = ROWS.get(habitat)
+                if row and min(len(me['habitats'][row]), 3) <= eggs:
+                    return bird, habitat, wild
+        return None
+
+
+def apply_patch(state, ops):
+    """
+    Apply a statePatch (server/utils/stateDiff.js) without changing state:
+    containers on patched paths are copied once, the rest is shared.
+    """
+    copied = set()
+    root = state
+
+    def writable(path):
+        nonlocal root
+        if id(root) not in copied:
+            root = copy_container(root)
+            copied.add(id(root))
+        node = root
+        for key in path:
+            child = node[key]
+            if id(child) not in copied:
+                child = copy_container(child)
+                copied.add(id(child))
+                node[key] = child
+            node = child
+        return node
+
+    for op in ops:
+        path = op['path']
+        if op['op'] == 'set' and not path:
+            root = op['value']
+        elif op['op'] == 'set':
+            writable(path[:-1])[path[-1]] = op['value']
+        elif op['op'] == 'del':
+            del writable(path[:-1])[path[-1]]
+        elif op['op'] == 'push':
+            writable(path).extend(op['values'])
+        elif op['op'] == 'truncate':
+            del writable(path)[op['length']:]
+    return root
+
+
+def copy_container(value):
+    return list(value) if isinstance(value, list) else dict(value)
+
+
+def pay_for(food, cost):
+    """Wild food choices that pay cost from food, or None if it cannot be paid (mirrors canPlayBird)."""
+    left = dict(food)
+    wild = 0
+    for entry in cost:
+        if isinstance(entry, list):
+            option = next((f for f in entry if left.get(f, 0) > 0), None)
+            if option is None:
+                return None
+            left[option] -= 1
+        elif entry == 'wild':
+            wild += 1
+        else:
+            if left.get(entry, 0) <= 0:
+                return None
+            left[entry] -= 1
+    choices = []
+    for _ in range(wild):
+        option = max(left, key=left.get, default=None)
+        if option is None or left[option] <= 0:
+            return None
+        left[option] -= 1
+        choices.append(option)
+    return choices
+
+
+# --- lobbies --------------------------------------------------------------
+
+async def play_game(number, url, size, stats, args, delay):
+    await asyncio.sleep(delay)
+    rng = random.Random(args.seed * 1_000_003 + number)
+    table = Table(size, stats)
+    players = [SimulatedPlayer(f"load-{number}-{seat}", table, stats, random.Random(rng.random()),
+                               args.think, args.timeout) for seat in range(size)]
+    try:
+        await asyncio.gather(*(player.connect(url) for player in players))
+
+        host = players[0]
+        reply = await host.request('createLobby', {'playerName': host.name}, ('lobbyUpdate',))
+        if reply is None:
+            raise RuntimeError("createLobby timed out")
+        table.lobby_id = reply[1]['id']
+        for player in players[1:]:
+            joined = await player.request('joinLobby', {'lobbyId': table.lobby_id, 'playerName': player.name},
+                                          ('lobbyUpdate',),
+                                          lambda event, lobby, name=player.name:
+                                          any(p['name'] == name for p in lobby['players']))
+            if joined is None:
+                raise RuntimeError("joinLobby timed out")
+
+        start = time.perf_counter()
+        await host.sio.emit('startGame', {'lobbyId': table.lobby_id})
+        await asyncio.wait_for(asyncio.gather(*(player.started.wait() for player in players)), args.timeout)
+        stats.latency('startGame', host.started_at - start)
+        stats.latency('startGame (fan-out)', max(player.started_at for player in players) - start)
+        stats.games_started += 1
+
+        await asyncio.wait_for(asyncio.gather(*(player.play() for player in players)), args.game_timeout)
+        stats.games_finished += 1
+    except (asyncio.TimeoutError, RuntimeError, socketio.exceptions.ConnectionError) as e:
+        stats.games_failed += 1
+        print(f"  game {number}: {type(e).__name__} {e}")
+    finally:
+        await asyncio.gather(*(player.disconnect() for player in players), return_exceptions=True)
+
+
+async def run_load(url, args, stats):
+    rng = random.Random(args.seed)
+    sizes = [rng.choice(args.player_counts) for _ in range(args.lobbies)]
+    ramp = args.ramp / args.lobbies if args.lobbies else 0
+    start = time.perf_counter()
+    await asyncio.gather(*(play_game(number, url, size, stats, args, number * ramp)
+                           for number, size in enumerate(sizes)))
+    return sizes, time.perf_counter() - start
+
+
+# --- local server ---------------------------------------------------------
+
+async def wait_for_server(url, process, timeout):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"server exited with status {process.returncode}")
+            try:
+                async with session.get(f"{url}/health") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server did not answer {url}/health within {timeout}s")
+
+
+def start_server(command, port, log_path):
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    log = open(log_path, 'w', encoding='utf-8')
+    env = dict(os.environ, PORT=str(port))
+    return subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, env=env), log
+
+
+def build_report(stats, sizes, wall, args, url):
+    sessions = sum(sizes)
+    requests = sum(len(values) for event, values in stats.latencies.items() if event != 'connect')
+    return {
+        'version': REPORT_VERSION,
+        'url': url,
+        'lobbies': args.lobbies,
+        'sessions': sessions,
+        'players': args.player_counts,
+        'think_seconds': args.think,
+        'ramp_seconds': args.ramp,
+        'wall_seconds': round(wall, 3),
+        'games': {'started': stats.games_started, 'finished': stats.games_finished,
+                  'failed': stats.games_failed},
+        'requests_per_second': round(requests / wall, 1) if wall else None,
+        'events': {event: dict(distribution(values), errors=stats.errors.get(event, 0),
+                               timeouts=stats.timeouts.get(event, 0))
+                   for event, values in sorted(stats.latencies.items())},
+        'error_messages': dict(sorted(stats.messages.items(), key=lambda item: -item[1])),
+        'state_updates': {
+            'delivery_ms': distribution(stats.delivery),
+            'fanout_ms': distribution(stats.fanout),
+            'patch_bytes': distribution(stats.payload_bytes['statePatch'], scale=1, digits=0),
+            'snapshot_bytes': distribution(stats.payload_bytes['stateSnapshot'], scale=1, digits=0),
+            'snapshot_requests': stats.snapshot_requests
+        }
+    }
+
+
+def print_report(report):
+    print("\n" + "="*70)
+    print("LOAD TEST REPORT")
+    print("="*70)
+    games = report['games']
+    print(f"  {report['lobbies']} lobbies, {report['sessions']} sessions: {games['finished']} games finished, "
+          f"{games['failed']} failed in {report['wall_seconds']:.1f}s ({report['requests_per_second']} requests/s)")
+    print(f"\n  {'event (ms)':<24} {'count':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'errors':>7}")
+    for event, d in report['events'].items():
+        if d['count']:
+            print(f"  {event:<24} {d['count']:>7} {d['p50']:>8.1f} {d['p90']:>8.1f} {d['p99']:>8.1f} "
+                  f"{d['max']:>8.1f} {d['errors'] + d['timeouts']:>7}")
+    for name, key in (('state delivery', 'delivery_ms'), ('state fan-out', 'fanout_ms')):
+        d = report['state_updates'][key]
+        if d['count']:
+            print(f"  {name:<24} {d['count']:>7} {d['p50']:>8.1f} {d['p90']:>8.1f} {d['p99']:>8.1f} {d['max']:>8.1f}")
+    print()
+    for name, key in (('statePatch', 'patch_bytes'), ('stateSnapshot', 'snapshot_bytes')):
+        d = report['state_updates'][key]
+        if d['count']:
+            print(f"  {name} size: {d['p50']:.0f} bytes median, {d['max']:.0f} max ({d['count']} broadcasts)")
+    if report['state_updates']['snapshot_requests']:
+        print(f"  snapshots requested after a missing base: {report['state_updates']['snapshot_requests']}")
+
+
+def parse_player_counts(text):
+    if '-' in text:
+        low, high = (int(n) for n in text.split('-', 1))
+        return list(range(low, high + 1))
+    return [int(n) for n in text.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many concurrent games against the Socket.IO server.")
+    parser.add_argument("--lobbies", type=int, default=50, help="concurrent lobbies (default 50)")
+    parser.add_argument("--players", default="2-5", help="players per lobby, as a range or list (default 2-5)")
+    parser.add_argument("--url", help="server to test (default: start one locally on --port)")
+    parser.add_argument("--port", type=int, default=PORT, help=f"port for the local server (default {PORT})")
+    parser.add_argument("--server-log", type=Path, default=SERVER_LOG, help="where the local server's output goes")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which lobbies start (default 5)")
+    parser.add_argument("--think", type=float, default=0.0, help="max random seconds a player waits before acting")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="seconds to wait for a reply")
+    parser.add_argument("--game-timeout", type=float, default=GAME_TIMEOUT, help="seconds a whole game may take")
+    parser.add_argument("--seed", type=int, default=0, help="seed for lobby sizes and player choices")
+    parser.add_argument("--report", type=Path, default=REPORT_FILE, help="where to write the JSON report")
+    args = parser.parse_args()
+    args.player_counts = parse_player_counts(args.players)
+    if not args.player_counts or min(args.player_counts) < 1 or max(args.player_counts) > 5:
+        parser.error("players per lobby must be between 1 and 5")
+
+    print("="*70)
+    print("SOCKET.IO LOAD TEST")
+    print("="*70)
+
+    process = log = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        process, log = start_server(SERVER_COMMAND, args.port, args.server_log)
+        print(f"  Started {' '.join(SERVER_COMMAND)} on port {args.port} (log: {args.server_log})")
+
+    async def load():
+        await wait_for_server(url, process, SERVER_START_TIMEOUT)
+        print(f"  {args.lobbies} lobbies of {args.players} players against {url}\n")
+        return await run_load(url, args, stats)
+
+    stats = Stats()
+    try:
+        sizes, wall = asyncio.run(load())
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+            log.close()
+
+    report = build_report(stats, sizes, wall, args, url)
+    print_report(report)
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    write_json(args.report, report, indent=2)
+    print(f"\n Report: {args.report}")
+    if stats.games_failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Fuzzy bird-name matching against the CSV catalogue.
+
+Common and scientific names are indexed once as character trigrams in an
+inverted index. A query only scores the names that share at least one
+trigram with it, so lookups stay well under a millisecond. Scores are the
+Dice coefficient of the trigram sets (1.0 for an exact match after
+normalisation).
+"""
+
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+
+NGRAM_SIZE = 3
+
+# Matches at or above this score are applied automatically
+ACCEPT_SCORE = 0.8
+
+# A match is also rejected if the runner-up is this close, since it is ambiguous
+MIN_MARGIN = 0.1
+
+REPORT_FILE = Path("temp_extracted/name_match_report.json")
+
+
+def match_key(name):
+    """Normalise a name for matching: no accents, punctuation or case."""
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+    name = name.lower()
+    for ch in ("'", '`', chr(8217), chr(180), chr(65533)):  # apostrophe variants
+        name = name.replace(ch, '')
+    name = re.sub(r'[^a-z0-9]+', ' ', name)
+    return name.strip()
+
+
+def ngrams(key, n=NGRAM_SIZE):
+    padded = f"  {key} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+@dataclass(frozen=True, slots=True)
+class Match:
+    """A ranked candidate for a query name."""
+    bird: object
+    score: float
+    field: str  # 'common' or 'scientific'
+
+    @property
+    def name(self):
+        return self.bird.common_name
+
+
+class NameMatcher:
+    """Trigram index over the common and scientific names of CSV birds."""
+
+    def __init__(self, birds):
+        self._entries = []   # (bird, field, key, gram count)
+        self._exact = {}
+        self._postings = {}
+
+        for bird in birds:
+            for field, name in (('common', bird.common_name), ('scientific', bird.scientific_name)):
+                key = match_key(name or '')
+                if not key:
+                    continue
+                self._exact.setdefault(key, (bird, field))
+                grams = ngrams(key)
+                entry_id = len(self._entries)
+                self._entries.append((bird, field, key, len(grams)))
+                for gram in grams:
+                    self._postings.setdefault(gram, []).append(entry_id)
+
+    def candidates(self, name, limit=5):
+        """Return up to limit Matches, best first, one per bird."""
+        key = match_key(name)
+        if not key:
+            return []
+
+        exact = self._exact.get(key)
+        grams = ngrams(key)
+        shared = {}
+        for gram in grams:
+            for entry_id in self._postings.get(gram, ()):
+                shared[entry_id] = shared.get(entry_id, 0) + 1
+
+        best = {}
+        if exact:
+            best[id(exact[0])] = Match(exact[0], 1.0, exact[1])
+        for entry_id, count in shared.items():
+            bird, field, _, size = self._entries[entry_id]
+            score = 2 * count / (len(grams) + size)
+            current = best.get(id(bird))
+            if current is None or score > current.score:
+                best[id(bird)] = Match(bird, round(score, 4), field)
+
+        return sorted(best.values(), key=lambda m: (-m.score, m.name))[:limit]
+
+    def match(self, name):
+        """
+        Return (match, candidates). match is the top candidate when it is
+        confident and unambiguous, otherwise None.
+        """
+        candidates = self.candidates(name)
+        if not candidates:
+            return None, candidates
+        top = candidates[0]
+        if top.score == 1.0:
+            return top, candidates
+        runner_up = candidates[1].score if len(candidates) > 1 else 0.0
+        if top.score >= ACCEPT_SCORE and top.score - runner_up >= MIN_MARGIN:
+            return top, candidates
+        return None, candidates
+
+
+class MatchReport:
+    """Collects fuzzy and rejected matches for manual review."""
+
+    def __init__(self):
+        self.fuzzy = []
+        self.unmatched = []
+
+    def record(self, name, match, candidates):
+        summary = [
+            {'name': c.name, 'scientificName': c.bird.scientific_name, 'score': c.score, 'field': c.field}
+            for c in candidates
+        ]
+        if match is None:
+            self.unmatched.append({'name': name, 'candidates': summary})
+        elif match.score < 1.0:
+            self.fuzzy.append({'name': name, 'matched': match.name, 'score': match.score, 'candidates': summary})
+
+    def __bool__(self):
+        return bool(self.fuzzy or self.unmatched)
+
+    def save(self, path=REPORT_FILE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'fuzzy': self.fuzzy, 'unmatched': self.unmatched}, f, indent=2, ensure_ascii=False)
+        return path
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Shared PDF ingestion for the Wingspan asset scripts.
+Each PDF is opened once per process and every page is walked a single time;
+text, image xrefs, extracted images and renders all come from that walk.
+"""
+
+from pathlib import Path
+
+from instrumentation import span
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    import subprocess
+    import sys
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "PyMuPDF"])
+    import fitz
+
+ASSETS_DIR = Path("D:/wingspan-online/Wingspan Assets")
+BIRD_CARDS_PDF = ASSETS_DIR / "BirdCards - Update Pack Cards.pdf"
+BONUS_CARDS_PDF = ASSETS_DIR / "Wingspan_BonusCards - Update Pack Cards.pdf"
+APPENDIX_PDF = ASSETS_DIR / "WS_Appendix_r17.pdf"
+
+_open_sources = {}
+
+
+class PdfPage:
+    """One page of a PdfSource. Text, xrefs and images are read at most once."""
+
+    def __init__(self, source, index):
+        self.source = source
+        self.index = index
+        self.number = index + 1
+        self._page = None
+        self._text = None
+        self._xrefs = None
+
+    @property
+    def page(self):
+        if self._page is None:
+            self._page = self.source.doc[self.index]
+        return self._page
+
+    @property
+    def text(self):
+        if self._text is None:
+            with span('get_text') as s:
+                self._text = self.page.get_text()
+                s.add(bytes_out=len(self._text))
+        return self._text
+
+    @property
+    def image_xrefs(self):
+        if self._xrefs is None:
+            self._xrefs = [img[0] for img in self.page.get_images(full=True)]
+        return self._xrefs
+
+    def images(self, min_size=0):
+        """Return extracted images on this page as dicts with xref, bytes, ext and size."""
+        images = []
+        for xref in self.image_xrefs:
+            image = self.source.extract_image(xref)
+            if image and image['size'] > min_size:
+                images.append(image)
+        return images
+
+    def largest_image(self, min_size=0):
+        images = self.images(min_size)
+        return max(images, key=lambda x: x['size']) if images else None
+
+    def render(self, zoom=2):
+        """Render the page as a pixmap. Renders are not cached (they are large)."""
+        mat = fitz.Matrix(zoom, zoom)
+        with span('get_pixmap') as s:
+            pix = self.page.get_pixmap(matrix=mat, alpha=False)
+            s.add(bytes_out=len(pix.samples))
+        return pix
+
+
+class PdfSource:
+    """A PDF opened once, with its pages walked lazily and cached."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with span('open', bytes_in=self.path.stat().st_size):
+            self.doc = fitz.open(str(self.path))
+        self._pages = {}
+        self._images = {}
+
+    def __len__(self):
+        return len(self.doc)
+
+    def page(self, index):
+        if index not in self._pages:
+            self._pages[index] = PdfPage(self, index)
+        return self._pages[index]
+
+    def pages(self, start=0, stop=None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        for index in range(start, stop):
+            yield self.page(index)
+
+    def texts(self, start=0, stop=None):
+        return [page.text for page in self.pages(start, stop)]
+
+    def extract_image(self, xref):
+        """Extract an image by xref. Shared xrefs across pages are only decoded once."""
+        if xref not in self._images:
+            try:
+                with span('extract_image') as s:
+                    base_image = self.doc.extract_image(xref)
+                    s.add(bytes_out=len(base_image["image"]))
+                self._images[xref] = {
+                    'xref': xref,
+                    'bytes': base_image["image"],
+                    'ext': base_image["ext"],
+                    'size': len(base_image["image"])
+                }
+            except Exception as e:
+                print(f"  Error extracting image xref {xref}: {e}")
+                self._images[xref] = None
+        return self._images[xref]
+
+    def close(self):
+        self.doc.close()
+        self._pages.clear()
+        self._images.clear()
+
+
+def open_pdf(pdf_path):
+    """Return the shared PdfSource for a path, opening it on first use."""
+    key = str(Path(pdf_path).resolve())
+    if key not in _open_sources:
+        _open_sources[key] = PdfSource(pdf_path)
+    return _open_sources[key]
+
+
+def close_all():
+    for source in _open_sources.values():
+        source.close()
+    _open_sources.clear()
+
+
+def walk_pdf(pdf_path, images=False, min_image_size=0, render_zoom=None):
+    """
+    Walk every page once and yield (page, images, pixmap) tuples.
+    images is a list of extracted images (empty unless requested) and
+    pixmap is a render at render_zoom (None unless requested).
+    """
+    source = open_pdf(pdf_path)
+    for page in source.pages():
+        page_images = page.images(min_image_size) if images else []
+        pixmap = page.render(render_zoom) if render_zoom else None
+        yield page, page_images, pixmap
+
+
+def write_pages_text(texts, output_file, separator_width=70):
+    """Write page texts to a review file with the usual PAGE N banners."""
+    with span('save') as s, open(output_file, 'w', encoding='utf-8') as f:
+        for i, text in enumerate(texts):
+            f.write(f"\n{'='*separator_width}\n")
+            f.write(f"PAGE {i + 1}\n")
+            f.write(f"{'='*separator_width}\n")
+            f.write(text)
+        s.add(bytes_out=f.tell())
+
+
+def split_page_ranges(page_count, chunks):
+    """Split [0, page_count) into at most `chunks` contiguous (start, stop) ranges."""
+    chunks = max(1, min(chunks, page_count))
+    size, extra = divmod(page_count, chunks)
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        stop = start + size + (1 if i < extra else 0)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def render_page_range(pdf_path, start, stop, output_dir, prefix, zoom=2, first_id=1):
+    """
+    Render pages [start, stop) to JPEG files named {prefix}-{id}.jpg.
+    Opens a private document handle so it is safe to run in a worker process.
+    Returns (page_number, filename, width, height) tuples in page order.
+    """
+    source = PdfSource(pdf_path)
+    results = []
+    try:
+        for page in source.pages(start, stop):
+            pix = page.render(zoom)
+            filename = f"{prefix}-{first_id + page.index}.jpg"
+            output_path = Path(output_dir) / filename
+            with span('save') as s:
+                pix.save(str(output_path))
+                s.add(bytes_out=output_path.stat().st_size)
+            results.append((page.number, filename, pix.width, pix.height))
+    finally:
+        source.close()
+    return results
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Compile bird power text into structured effect records.
+
+The server used to re-parse each power's free-form effect string every time
+the power ran or was registered. The data scripts now parse it once and
+store the result on the card as power.parsed:
+
+    {
+      "version": 1,
+      "trigger": "WHEN_ACTIVATED",          # the power's type
+      "effectType": "CONDITIONAL_TUCK",     # what PowerParser.parse returned
+      "params": {"maxWingspan": 75, "drawCount": 1},
+      "events": [],                         # between-turn listeners, see below
+      "whenPlayed": {...}                   # WHEN_PLAYED powers only
+    }
+
+events lists the game events a "when another player ..." power listens to,
+each with the details its handler needs, e.g.
+{"event": "PLAYER_PLAYS_BIRD", "habitat": "wetlands", "reward": "tuck"}.
+
+The rules mirror server/engine/Powers/PowerParser.js, which still compiles
+the same record from the text for cards that have no (or an older) parsed
+record. Change both together and bump GRAMMAR_VERSION. check_parity() runs
+both over every power (the JS side through scripts/compile_powers.mjs) and
+lists the powers they disagree on; the build_data.py pipeline fails on any.
+
+Run directly to (re)compile the powers in data/birds.json in place, or with
+--check to only compare the two parsers on them.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from instrumentation import read_json, run, write_json
+
+GRAMMAR_VERSION = 1
+
+BIRDS_JSON = Path("data/birds.json")
+JS_COMPILER = Path("scripts/compile_powers.mjs")
+
+NEST_TYPES = ['ground', 'bowl', 'cavity', 'platform']
+
+# Habitat icons in power text and the habitat names the event handlers use
+HABITAT_ICONS = {
+    '[forest]': 'forest',
+    '[grassland]': 'grasslands',
+    '[wetland]': 'wetlands'
+}
+
+FOOD_TYPES = ['invertebrate', 'seed', 'fish', 'fruit', 'rodent']
+
+
+def extract_nest_type(text):
+    return next((nest for nest in NEST_TYPES if f"[{nest}]" in text), None)
+
+
+def extract_habitat(text):
+    return next((habitat for icon, habitat in HABITAT_ICONS.items() if icon in text), None)
+
+
+def extract_food_type(text):
+    """First food named in the text; anything else (dice, birdfeeder) is wild."""
+    for food in FOOD_TYPES:
+        if food in text:
+            return food
+    return 'wild'
+
+
+def parse_between_turn(text, effect):
+    if '"gain food"' in text and 'rodent' in text:
+        return 'WHEN_OTHER_GAINS_FOOD', {'foodType': 'rodent', 'cache': True}
+    if '"lay eggs"' in text:
+        return 'WHEN_OTHER_LAYS_EGGS', {'nestType': extract_nest_type(text) or 'any', 'eggCount': 1}
+    if 'plays a' in text and 'bird' in text:
+        return 'WHEN_OTHER_PLAYS_BIRD', {'habitat': extract_habitat(text) or 'any', 'foodType': extract_food_type(text)}
+    if 'predator succeeds' in text:
+        return 'WHEN_OTHER_PREDATOR_SUCCEEDS', {'gainFromFeeder': True}
+    return 'BETWEEN_TURNS', {'text': effect}
+
+
+def parse_basic_action(text):
+    numbers = re.findall(r'\d+', text)
+    count = int(numbers[0]) if numbers else 1
+
+    if 'draw' in text and 'card' in text:
+        return 'DRAW_CARD', {'count': count}
+    if 'lay' in text and 'egg' in text:
+        return 'LAY_EGG', {'count': count}
+    if 'gain' in text and ('food' in text or 'die' in text):
+        return 'GAIN_FOOD', {'foodType': extract_food_type(text), 'count': count}
+    if 'cache' in text and 'food' in text:
+        return 'CACHE_FOOD', {'foodType': extract_food_type(text), 'count': count}
+    return 'UNKNOWN', {'text': text}
+
+
+def parse_effect(effect):
+    """(effectType, params) for an effect string, as PowerParser.parse decides them."""
+    text = effect.lower()
+
+    if 'when another player' in text:
+        return parse_between_turn(text, effect)
+    if 'all players draw' in text and 'card' in text:
+        return 'ALL_PLAYERS_DRAW', {'count': 1}
+    if 'draw' in text and 'bonus card' in text:
+        return 'DRAW_BONUS_CARDS', {'draw': 2, 'keep': 1}
+    if 'look at' in text and 'card' in text and 'tuck' in text:
+        wingspan = re.search(r'<(\d+)cm', text)
+        return 'CONDITIONAL_TUCK', {'maxWingspan': int(wingspan.group(1)) if wingspan else 75, 'drawCount': 1}
+    if 'tuck' in text and 'card' in text and 'hand' in text:
+        if 'lay' in text and 'egg' in text:
+            return 'TUCK_AND_LAY_EGG', {'eggs': 1}
+        return 'TUCK_CARD', {'count': 1}
+    if 'gain' in text or 'draw' in text or 'lay' in text:
+        return parse_basic_action(text)
+    return 'CUSTOM', {'text': effect}
+
+
+def between_turn_events(text):
+    """The events a "when another player ..." power listens to (one power may listen to several)."""
+    if 'when another player' not in text:
+        return []
+
+    events = []
+    if '"gain food"' in text:
+        events.append({
+            'event': 'PLAYER_GAINS_FOOD',
+            'foodType': 'rodent' if 'rodent' in text else None,
+            'cache': 'cache' in text
+        })
+    if '"lay eggs"' in text:
+        events.append({'event': 'PLAYER_LAYS_EGGS', 'nestType': extract_nest_type(text)})
+    if 'plays a' in text and 'bird' in text:
+        reward = None
+        if 'gain' in text and 'invertebrate' in text:
+            reward = 'invertebrate'
+        elif 'gain' in text and 'fish' in text:
+            reward = 'fish'
+        elif 'tuck' in text:
+            reward = 'tuck'
+        events.append({'event': 'PLAYER_PLAYS_BIRD', 'habitat': extract_habitat(text), 'reward': reward})
+    if 'predator succeeds' in text:
+        events.append({'event': 'PREDATOR_SUCCEEDS'})
+    return events
+
+
+def when_played_action(text):
+    """What a WHEN_PLAYED power does, in the order WhenPlayed checks for it."""
+    if 'draw' in text and 'card' in text:
+        return {'action': 'DRAW_CARD'}
+    if 'gain' in text and 'food' in text:
+        return {'action': 'GAIN_FOOD', 'foodType': extract_food_type(text)}
+    if 'lay' in text and 'egg' in text:
+        return {'action': 'LAY_EGG'}
+    if 'tuck' in text and 'card' in text:
+        return {'action': 'TUCK_CARD'}
+    return {'action': 'NONE'}
+
+
+def parse_power(power):
+    """Structured record for a power dict ({type, effect}), or None for no power."""
+    if not power:
+        return None
+
+    effect = power.get('effect')
+    record = {'version': GRAMMAR_VERSION, 'trigger': power.get('type')}
+    if not effect or not isinstance(effect, str):
+        record.update(effectType='NONE', params={}, events=[])
+        return record
+
+    text = effect.lower()
+    effect_type, params = parse_effect(effect)
+    record.update(effectType=effect_type, params=params, events=between_turn_events(text))
+    if power.get('type') == 'WHEN_PLAYED':
+        record['whenPlayed'] = when_played_action(text)
+    return record
+
+
+def compile_power(power):
+    """A copy of a power dict with its parsed record attached."""
+    if not power:
+        return power
+    power = {key: value for key, value in power.items() if key != 'parsed'}
+    power['parsed'] = parse_power(power)
+    return power
+
+
+def compile_bird_powers(birds):
+    """Attach parsed records to every bird's power in place. Returns how many changed."""
+    changed = 0
+    for bird in birds:
+        if not bird.get('power'):
+            continue
+        compiled = compile_power(bird['power'])
+        if compiled != bird['power']:
+            bird['power'] = compiled
+            changed += 1
+    return changed
+
+
+def js_records(powers):
+    """The records server/engine/Powers/PowerParser.js compiles for powers."""
+    result = subprocess.run(
+        ['node', str(JS_COMPILER)],
+        input=json.dumps(powers, ensure_ascii=False),
+        capture_output=True, text=True, encoding='utf-8', check=True
+    )
+    return json.loads(result.stdout)
+
+
+def check_parity(birds):
+    """(bird name, Python record, JS record) for every power the two parsers compile differently."""
+    with_power = [bird for bird in birds if bird.get('power')]
+    powers = [{key: value for key, value in bird['power'].items() if key != 'parsed'} for bird in with_power]
+    mismatches = []
+    for bird, power, theirs in zip(with_power, powers, js_records(powers)):
+        ours = parse_power(power)
+        if ours != theirs:
+            mismatches.append((bird['name'], ours, theirs))
+    return mismatches
+
+
+def report_parity(birds):
+    """Print the powers the parsers disagree on. Returns True when they agree on all."""
+    mismatches = check_parity(birds)
+    for name, ours, theirs in mismatches:
+        print(f"  MISMATCH {name}")
+        print(f"    power_grammar.py: {json.dumps(ours, sort_keys=True)}")
+        print(f"    PowerParser.js:   {json.dumps(theirs, sort_keys=True)}")
+    if mismatches:
+        print(f"\n {len(mismatches)} power(s) compile differently; change both parsers together")
+    return not mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the bird powers in data/birds.json.")
+    parser.add_argument("--check", action="store_true",
+                        help="only check that power_grammar.py and PowerParser.js agree")
+    args = parser.parse_args()
+
+    birds = read_json(BIRDS_JSON)
+    if args.check:
+        if not report_parity(birds):
+            sys.exit(1)
+        print(f" Both parsers agree on all {sum(1 for bird in birds if bird.get('power'))} power(s)")
+        return
+
+    print("="*70)
+    print("COMPILING BIRD POWERS")
+    print("="*70)
+
+    changed = compile_bird_powers(birds)
+    if changed:
+        write_json(BIRDS_JSON, birds, indent=2, ensure_ascii=False)
+
+    counts = {}
+    for bird in birds:
+        if bird.get('power'):
+            effect_type = bird['power']['parsed']['effectType']
+            counts[effect_type] = counts.get(effect_type, 0) + 1
+    for effect_type, count in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f"  {effect_type:<30} {count}")
+
+    print(f"\n Updated {changed} power(s) in {BIRDS_JSON}")
+
+
+if __name__ == "__main__":
+    run(main)
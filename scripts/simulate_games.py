@@ -0,0 +1,1001 @@
+#!/usr/bin/env python3
+"""
+Headless Wingspan game simulator for throughput and rule-regression runs.
+
+Plays complete games with no server, sockets or UI, from the same data the
+engine loads:
+
+    data/birds.json            cards (foodCost, habitats, points, eggCapacity,
+                               nestType, wingspan, compiled power records)
+    data/bonus_cards.json      bonus deck
+    data/round_goals.json      4 goals drawn per game
+    data/habitat_columns.json  egg costs and column benefits (--rules board)
+
+The rules follow server/engine: 8/7/6/5 action cubes per round, a 5-die
+tray where a taken die is rerolled, 3 face-up birds, a hand limit of 8 and
+a discard down to 5 between rounds, round goals scored with RoundGoalEngine's
+table plus Game.endRound's 4/3/2/1, and ScoringEngine's final scoring. Bird
+powers run from their compiled records (power.parsed): WHEN_ACTIVATED
+effects right to left along the activated row, WHEN_PLAYED effects, and the
+between-turn events of GameEvents. Powers the engine does not implement are
+not simulated either.
+
+Two rule sets are available:
+
+    board    egg costs and benefits per column from habitat_columns.json,
+             including the egg/food/card exchanges on the 3rd and 5th column
+    engine   what the socket handlers enforce today: strength is birds in
+             the row + 1 and a bird costs min(column, 3) eggs
+
+Each seat is driven by a policy (--policies cycles over the seats, and the
+seating rotates every game):
+
+    random   uniform over the legal actions and choices
+    greedy   plays the most valuable affordable bird, otherwise gathers what
+             its hand needs; lays eggs late in the game
+
+Games are split into batches over a process pool and only totals come back.
+The summary (throughput, actions, powers, scores per policy) is printed and
+written as JSON. With --baseline, mean scores and action shares are compared
+with a stored run of the same configuration; a shift of more than --sigma
+standard errors is reported as a regression and the script exits with
+status 1. Games are seeded from --seed, so the same arguments replay the
+same games.
+
+Run from the repository root, like the other data scripts.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from instrumentation import call_in_worker, merge, read_json, run, span, write_json
+
+DATA_DIR = Path("data")
+SUMMARY_FILE = Path("temp_extracted/simulation.json")
+
+SUMMARY_VERSION = 1
+
+FOOD_TYPES = ['invertebrate', 'seed', 'fish', 'fruit', 'rodent']
+FOOD_INDEX = {food: i for i, food in enumerate(FOOD_TYPES)}
+WILD = -1
+
+# Player rows, in the order the engine pays egg costs from
+ROWS = ('forest', 'grassland', 'wetlands')
+ROW_INDEX = {'forest': 0, 'grassland': 1, 'grasslands': 1, 'wetland': 2, 'wetlands': 2}
+MAX_COLUMNS = 5
+
+ROUND_CUBES = (8, 7, 6, 5)
+HAND_LIMIT = 8
+ROUND_HAND_LIMIT = 5
+TRAY_SIZE = 3
+DICE = 5
+DEFAULT_EGG_CAPACITY = 6
+BONUS_COPIES = 5
+
+# RoundGoalEngine.score points by round and (tied) rank; Game.endRound then
+# adds ENDROUND_POINTS by finishing order on top
+ROUND_GOAL_POINTS = {1: (5, 2, 1, 0), 2: (6, 3, 2, 0), 3: (7, 4, 2, 0), 4: (8, 5, 3, 0)}
+ENDROUND_POINTS = (4, 3, 2, 1)
+
+ACTIONS = ('play', 'food', 'eggs', 'cards')
+GAMES_PER_BATCH = 500
+SIGMA = 4.0
+
+
+# --- cards ----------------------------------------------------------------
+
+class Card:
+    """A bird definition, with cost and power reduced to what the rules need."""
+
+    __slots__ = ('id', 'name', 'rows', 'cost', 'fixed', 'either', 'wild', 'points', 'capacity',
+                 'nest', 'wingspan', 'activated', 'params', 'when_played', 'events')
+
+    def __init__(self, bird):
+        self.id = bird['id']
+        self.name = bird.get('name', bird['id'])
+        self.rows = tuple(sorted({ROW_INDEX[h] for h in bird.get('habitats', []) if h in ROW_INDEX}))
+        self.cost = encode_cost(bird.get('foodCost') or [])
+        # The cost split the way pay_plan pays it
+        self.fixed = tuple(entry for entry in self.cost if isinstance(entry, int) and entry != WILD)
+        self.either = tuple(entry for entry in self.cost if isinstance(entry, tuple))
+        self.wild = self.cost.count(WILD)
+        self.points = bird.get('points') or 0
+        # Same fallback as the engine (bird.eggCapacity || 6)
+        self.capacity = bird.get('eggCapacity') or DEFAULT_EGG_CAPACITY
+        self.nest = bird.get('nestType')
+        self.wingspan = bird.get('wingspan') or 0
+
+        parsed = (bird.get('power') or {}).get('parsed') or {}
+        trigger = parsed.get('trigger')
+        self.activated = parsed.get('effectType') if trigger == 'WHEN_ACTIVATED' else None
+        self.params = parsed.get('params') or {}
+        self.when_played = (parsed.get('whenPlayed') or {}).get('action') if trigger == 'WHEN_PLAYED' else None
+        self.events = tuple(parsed.get('events') or ()) if trigger == 'WHEN_ACTIVATED' else ()
+
+
+def encode_cost(cost):
+    """foodCost as food indexes: an int, a tuple for "one of", or WILD."""
+    encoded = []
+    for entry in cost:
+        if isinstance(entry, list):
+            encoded.append(tuple(FOOD_INDEX[food] for food in entry if food in FOOD_INDEX))
+        elif entry == 'wild':
+            encoded.append(WILD)
+        elif entry in FOOD_INDEX:
+            encoded.append(FOOD_INDEX[entry])
+    return tuple(encoded)
+
+
+def load_rules(columns, name):
+    """Per row: (egg cost, benefit amount, exchange) for 0..MAX_COLUMNS birds already in it."""
+    if name == 'engine':
+        egg_costs = [min(column, 3) for column in range(MAX_COLUMNS + 1)]
+        return {row: [(egg_costs[n], n + 1, None) for n in range(MAX_COLUMNS + 1)] for row in range(3)}
+
+    egg_costs = columns['eggCosts']
+    amounts = {'forest': 'food', 'grassland': 'eggs', 'wetlands': 'cards'}
+    rules = {}
+    for row, habitat in enumerate(ROWS):
+        benefits = columns[habitat]['benefits']
+        rules[row] = [(egg_costs[n], benefits[n][amounts[habitat]], benefits[n].get('exchange'))
+                      for n in range(MAX_COLUMNS + 1)]
+    return rules
+
+
+_tables = {}
+
+
+def tables(data_dir, rules_name):
+    """Card, bonus and goal data plus rules, loaded once per process."""
+    key = (str(data_dir), rules_name)
+    if key not in _tables:
+        data_dir = Path(data_dir)
+        _tables[key] = {
+            'cards': [Card(bird) for bird in read_json(data_dir / "birds.json")],
+            'bonus': [card['id'] for card in read_json(data_dir / "bonus_cards.json")],
+            'goals': [goal['id'] for goal in read_json(data_dir / "round_goals.json")],
+            'rules': load_rules(read_json(data_dir / "habitat_columns.json"), rules_name)
+        }
+    return _tables[key]
+
+
+# --- game state -----------------------------------------------------------
+
+class Bird:
+    """A bird on a player's board."""
+
+    __slots__ = ('card', 'eggs', 'tucked', 'cached')
+
+    def __init__(self, card):
+        self.card = card
+        self.eggs = 0
+        self.tucked = 0
+        self.cached = 0
+
+
+class Player:
+    __slots__ = ('seat', 'policy', 'food', 'hand', 'rows', 'bonus', 'goal_points', 'cubes')
+
+    def __init__(self, seat, policy):
+        self.seat = seat
+        self.policy = policy
+        self.food = [1] * len(FOOD_TYPES)
+        self.hand = []
+        self.rows = ([], [], [])
+        self.bonus = None
+        self.goal_points = 0
+        self.cubes = 0
+
+    def birds(self):
+        return self.rows[0] + self.rows[1] + self.rows[2]
+
+    def eggs(self):
+        return sum(bird.eggs for row in self.rows for bird in row)
+
+    def bird_count(self):
+        return len(self.rows[0]) + len(self.rows[1]) + len(self.rows[2])
+
+
+class Game:
+    def __init__(self, data, policies, rng):
+        self.rng = rng
+        self.cards = data['cards']
+        self.rules = data['rules']
+        self.deck = self.shuffled(self.cards)
+        self.bonus_deck = self.shuffled(data['bonus'] * BONUS_COPIES)
+        self.goals = self.shuffled(data['goals'])[:len(ROUND_CUBES)]
+        self.dice = [rng.randrange(len(FOOD_TYPES)) for _ in range(DICE)]
+        self.players = [Player(seat, policy) for seat, policy in enumerate(policies)]
+        self.tray = []
+        self.round = 1
+        self.listeners = []
+        self.counts = {'turns': 0, 'actions': dict.fromkeys(ACTIONS, 0), 'exchanges': 0,
+                       'powers': {}, 'events': {}, 'birds_played': 0, 'eggs_laid': 0,
+                       'food_gained': 0, 'cards_drawn': 0, 'discarded': 0, 'violations': {}}
+
+    def shuffled(self, items):
+        items = list(items)
+        self.rng.shuffle(items)
+        return items
+
+    # Deck.draw refills from the full card list when it runs dry
+    def draw(self):
+        if not self.deck:
+            self.deck = self.shuffled(self.cards)
+        return self.deck.pop()
+
+    def draw_into(self, player, count):
+        for _ in range(count):
+            player.hand.append(self.draw())
+        self.counts['cards_drawn'] += count
+        if len(player.hand) > HAND_LIMIT:
+            del player.hand[HAND_LIMIT:]
+
+    def refill_tray(self):
+        while len(self.tray) < TRAY_SIZE:
+            self.tray.append(self.draw())
+
+    def take_die(self, index):
+        food = self.dice[index]
+        self.dice[index] = self.rng.randrange(len(FOOD_TYPES))
+        return food
+
+    def count(self, group, key):
+        counts = self.counts[group]
+        counts[key] = counts.get(key, 0) + 1
+
+    # --- setup and rounds ---
+
+    def setup(self):
+        for player in self.players:
+            birds = [self.draw() for _ in range(5)]
+            bonus = [self.bonus_deck.pop(), self.bonus_deck.pop()]
+            kept, player.bonus = player.policy.setup(self, player, birds, bonus)
+            # One food per kept bird
+            for food in player.policy.setup_discards(self, player, kept, len(kept)):
+                player.food[food] -= 1
+            player.hand = kept
+        self.refill_tray()
+
+    def play(self):
+        self.setup()
+        for cubes in ROUND_CUBES:
+            self.register_listeners()
+            for player in self.players:
+                player.cubes = cubes
+            for _ in range(cubes):
+                for player in self.players:
+                    self.turn(player)
+            self.end_round()
+            self.round += 1
+        return self.final_scores()
+
+    def turn(self, player):
+        player.cubes -= 1
+        self.counts['turns'] += 1
+        action, choice = player.policy.action(self, player, self.playable(player))
+        self.counts['actions'][action] += 1
+        if action == 'play':
+            self.play_bird(player, *choice)
+        elif action == 'food':
+            self.gain_food(player)
+        elif action == 'eggs':
+            self.lay_eggs(player)
+        else:
+            self.draw_cards(player)
+        self.check(player)
+
+    def end_round(self):
+        goal = self.goals[self.round - 1]
+        values = sorted(((goal_value(goal, p), p) for p in self.players), key=lambda item: -item[0])
+        table = ROUND_GOAL_POINTS.get(self.round, ROUND_GOAL_POINTS[1])
+        rank, previous = 0, None
+        for index, (value, player) in enumerate(values):
+            if value != previous:
+                rank = index
+            previous = value
+            player.goal_points += table[rank] if rank < len(table) else 0
+            player.goal_points += ENDROUND_POINTS[index] if index < len(ENDROUND_POINTS) else 0
+
+        if self.round < len(ROUND_CUBES):
+            for player in self.players:
+                excess = len(player.hand) - ROUND_HAND_LIMIT
+                if excess > 0:
+                    for card in player.policy.discard(self, player, excess):
+                        player.hand.remove(card)
+                    self.counts['discarded'] += excess
+
+    def final_scores(self):
+        scores = []
+        for player in self.players:
+            birds = player.birds()
+            score = {
+                'birdPoints': sum(bird.card.points for bird in birds),
+                'eggPoints': sum(bird.eggs for bird in birds),
+                'tuckedCardPoints': sum(bird.tucked for bird in birds),
+                'cachedFoodPoints': sum(bird.cached for bird in birds),
+                'bonusPoints': bonus_points(player),
+                'roundGoalPoints': player.goal_points
+            }
+            score['total'] = sum(score.values())
+            scores.append(score)
+        return scores
+
+    # --- actions ---
+
+    def playable(self, player):
+        """(card, row, food to pay) for every bird in hand the player can play now."""
+        eggs = player.eggs()
+        options = []
+        for card in player.hand:
+            payment = None
+            for row in card.rows:
+                birds = len(player.rows[row])
+                if birds >= MAX_COLUMNS or self.rules[row][birds][0] > eggs:
+                    continue
+                if payment is None:
+                    payment = pay_plan(player.food, card)
+                    if payment is False:
+                        break
+                options.append((card, row, payment))
+        return options
+
+    def play_bird(self, player, card, row, payment):
+        for food in payment:
+            player.food[food] -= 1
+        egg_cost = self.rules[row][len(player.rows[row])][0]
+        for bird in player.birds():
+            if not egg_cost:
+                break
+            removed = min(bird.eggs, egg_cost)
+            bird.eggs -= removed
+            egg_cost -= removed
+
+        bird = Bird(card)
+        player.rows[row].append(bird)
+        player.hand.remove(card)
+        self.counts['birds_played'] += 1
+
+        if card.when_played:
+            self.when_played(player, bird)
+        self.emit('PLAYER_PLAYS_BIRD', player, row)
+        self.register_listeners()
+
+    def gain_food(self, player):
+        _, amount, exchange = self.rules[0][len(player.rows[0])]
+        if exchange and player.policy.exchange(self, player, exchange) and self.spend_egg(player):
+            amount += 1
+            self.counts['exchanges'] += 1
+        gained = []
+        for _ in range(amount):
+            food = self.take_die(player.policy.pick_die(self, player))
+            player.food[food] += 1
+            gained.append(food)
+        self.counts['food_gained'] += amount
+        self.activate(player, 0)
+        self.emit('PLAYER_GAINS_FOOD', player, gained)
+
+    def lay_eggs(self, player):
+        _, amount, exchange = self.rules[1][len(player.rows[1])]
+        if exchange and any(player.food) and player.policy.exchange(self, player, exchange):
+            player.food[max(range(len(FOOD_TYPES)), key=player.food.__getitem__)] -= 1
+            amount += 1
+            self.counts['exchanges'] += 1
+        laid = 0
+        for _ in range(amount):
+            bird = player.policy.pick_nest(self, player)
+            if bird is None:
+                break
+            bird.eggs += 1
+            laid += 1
+        self.counts['eggs_laid'] += laid
+        self.activate(player, 1)
+        self.emit('PLAYER_LAYS_EGGS', player, laid)
+
+    def draw_cards(self, player):
+        _, amount, exchange = self.rules[2][len(player.rows[2])]
+        if exchange and player.policy.exchange(self, player, exchange) and self.spend_egg(player):
+            amount += 1
+            self.counts['exchanges'] += 1
+        for card in player.policy.pick_tray(self, player, amount):
+            self.tray.remove(card)
+            player.hand.append(card)
+            amount -= 1
+            self.counts['cards_drawn'] += 1
+        self.draw_into(player, amount)
+        self.refill_tray()
+        self.activate(player, 2)
+
+    def spend_egg(self, player):
+        for bird in player.birds():
+            if bird.eggs:
+                bird.eggs -= 1
+                return True
+        return False
+
+    # --- powers ---
+
+    def activate(self, player, row):
+        """WHEN_ACTIVATED powers along the row, right to left."""
+        for bird in reversed(player.rows[row]):
+            effect = bird.card.activated
+            if effect and effect in ACTIVATED_EFFECTS:
+                if ACTIVATED_EFFECTS[effect](self, player, bird, bird.card.params) is not False:
+                    self.count('powers', effect)
+
+    def when_played(self, player, bird):
+        action = bird.card.when_played
+        count = bird.card.params.get('count') or 1
+        if action == 'DRAW_CARD':
+            self.draw_into(player, count)
+        elif action == 'GAIN_FOOD':
+            player.food[self.take_die(0)] += 1
+        elif action == 'LAY_EGG':
+            bird.eggs = min(bird.card.capacity, bird.eggs + count)
+        elif action == 'TUCK_CARD' and player.hand:
+            tucked = min(count, len(player.hand))
+            del player.hand[-tucked:]
+            bird.tucked += tucked
+        else:
+            return
+        self.count('powers', f"WHEN_PLAYED:{action}")
+
+    def register_listeners(self):
+        self.listeners = [(event['event'], owner, bird, event)
+                          for owner in self.players
+                          for bird in owner.birds()
+                          for event in bird.card.events]
+
+    def emit(self, name, player, data):
+        for event, owner, bird, trigger in self.listeners:
+            if event != name or owner is player:
+                continue
+            if BETWEEN_TURN[event](self, owner, bird, trigger, data) is not False:
+                self.count('events', event)
+
+    # --- checks ---
+
+    def check(self, player):
+        """Count anything the rules should make impossible."""
+        if min(player.food) < 0:
+            self.count('violations', 'negative_food')
+        if len(player.hand) > HAND_LIMIT:
+            self.count('violations', 'hand_limit')
+        for row in player.rows:
+            if len(row) > MAX_COLUMNS:
+                self.count('violations', 'row_full')
+            for bird in row:
+                if bird.eggs < 0 or bird.eggs > bird.card.capacity:
+                    self.count('violations', 'egg_capacity')
+
+
+def pay_plan(food, card):
+    """Food indexes paying card's cost from food, or False. Fixed foods first, then "one of", then wild."""
+    left = list(food)
+    paid = []
+    for entry in card.fixed:
+        if not left[entry]:
+            return False
+        left[entry] -= 1
+        paid.append(entry)
+    for entry in card.either:
+        # PlayBird pays the first option the player has
+        option = next((food for food in entry if left[food]), None)
+        if option is None:
+            return False
+        left[option] -= 1
+        paid.append(option)
+    for _ in range(card.wild):
+        option = max(range(len(left)), key=left.__getitem__)
+        if not left[option]:
+            return False
+        left[option] -= 1
+        paid.append(option)
+    return paid
+
+
+def goal_value(goal, player):
+    if goal == 'goal-1':
+        return len(player.rows[0])
+    if goal == 'goal-2':
+        return player.eggs()
+    if goal == 'goal-3':
+        return player.bird_count()
+    if goal == 'goal-4':
+        return len(player.rows[1])
+    if goal == 'goal-5':
+        return len(player.rows[2])
+    if goal == 'goal-6':
+        return len(player.hand)
+    return 0
+
+
+def bonus_points(player):
+    """The bonus cards ScoringEngine scores: bonus-1 per forest bird, bonus-2 per two eggs."""
+    if player.bonus == 'bonus-1':
+        return len(player.rows[0])
+    if player.bonus == 'bonus-2':
+        return player.eggs() // 2
+    return 0
+
+
+def room(bird):
+    return bird.eggs < bird.card.capacity
+
+
+# WHEN_ACTIVATED effects (WhenActivated.execute). Return False when nothing happened.
+
+def lay_egg(game, player, bird, params):
+    if not room(bird):
+        return False
+    bird.eggs = min(bird.card.capacity, bird.eggs + (params.get('count') or 1))
+
+
+def gain_food(game, player, bird, params):
+    # The engine reads power.food, which cards do not set, so this is always wild
+    player.food[game.take_die(0)] += 1
+
+
+def draw_card(game, player, bird, params):
+    game.draw_into(player, params.get('count') or 1)
+
+
+def cache_food(game, player, bird, params):
+    game.take_die(0)
+    bird.cached += 1
+
+
+def tuck_card(game, player, bird, params):
+    if not player.hand:
+        return False
+    player.hand.pop()
+    bird.tucked += 1
+
+
+def conditional_tuck(game, player, bird, params):
+    if game.draw().wingspan < (params.get('maxWingspan') or 75):
+        bird.tucked += 1
+
+
+def tuck_and_lay_egg(game, player, bird, params):
+    if not player.hand:
+        return False
+    player.hand.pop()
+    bird.tucked += 1
+    if room(bird):
+        bird.eggs += 1
+
+
+def all_players_draw(game, player, bird, params):
+    for other in game.players:
+        game.draw_into(other, params.get('count') or 1)
+
+
+def draw_bonus_cards(game, player, bird, params):
+    drawn = [game.bonus_deck.pop() for _ in range(params.get('draw') or 2) if game.bonus_deck]
+    player.bonus = player.policy.pick_bonus(game, player, [player.bonus] + drawn)
+
+
+ACTIVATED_EFFECTS = {
+    'LAY_EGG': lay_egg,
+    'GAIN_FOOD': gain_food,
+    'DRAW_CARD': draw_card,
+    'CACHE_FOOD': cache_food,
+    'TUCK_CARD': tuck_card,
+    'CONDITIONAL_TUCK': conditional_tuck,
+    'TUCK_AND_LAY_EGG': tuck_and_lay_egg,
+    'ALL_PLAYERS_DRAW': all_players_draw,
+    'DRAW_BONUS_CARDS': draw_bonus_cards
+}
+
+
+# Between-turn handlers (GameEvents), called for other players' actions
+
+def when_other_gains_food(game, owner, bird, trigger, gained):
+    if trigger.get('foodType') != 'rodent' or FOOD_INDEX['rodent'] not in gained:
+        return False
+    if trigger.get('cache'):
+        bird.cached += 1
+    else:
+        owner.food[FOOD_INDEX['rodent']] += 1
+
+
+def when_other_lays_eggs(game, owner, bird, trigger, laid):
+    nest = trigger.get('nestType')
+    if not nest:
+        return False
+    target = next((b for b in owner.birds() if b.card.nest == nest and room(b)), None)
+    if target is None:
+        return False
+    target.eggs += 1
+
+
+def when_other_plays_bird(game, owner, bird, trigger, row):
+    if ROW_INDEX.get(trigger.get('habitat')) != row:
+        return False
+    reward = trigger.get('reward')
+    if reward in FOOD_INDEX:
+        owner.food[FOOD_INDEX[reward]] += 1
+    elif reward == 'tuck' and owner.hand:
+        owner.hand.pop()
+        bird.tucked += 1
+    else:
+        return False
+
+
+BETWEEN_TURN = {
+    'PLAYER_GAINS_FOOD': when_other_gains_food,
+    'PLAYER_LAYS_EGGS': when_other_lays_eggs,
+    'PLAYER_PLAYS_BIRD': when_other_plays_bird,
+    # Nothing in the engine emits predator events yet
+    'PREDATOR_SUCCEEDS': lambda game, owner, bird, trigger, data: False
+}
+
+
+# --- policies -------------------------------------------------------------
+
+class RandomPolicy:
+    """Uniformly random legal actions and choices."""
+
+    name = 'random'
+
+    def setup(self, game, player, birds, bonus):
+        kept = [card for card in birds if game.rng.random() < 0.5]
+        return kept, game.rng.choice(bonus)
+
+    def setup_discards(self, game, player, kept, count):
+        food = [i for i, n in enumerate(player.food) for _ in range(n)]
+        return game.rng.sample(food, count)
+
+    def action(self, game, player, playable):
+        actions = ['food', 'cards']
+        if any(room(bird) for bird in player.birds()):
+            actions.append('eggs')
+        if playable:
+            actions.append('play')
+        action = game.rng.choice(actions)
+        if action == 'play':
+            card, row, payment = game.rng.choice(playable)
+            return action, (card, row, payment)
+        return action, None
+
+    def exchange(self, game, player, kind):
+        return game.rng.random() < 0.5
+
+    def pick_die(self, game, player):
+        return game.rng.randrange(DICE)
+
+    def pick_nest(self, game, player):
+        open_birds = [bird for bird in player.birds() if room(bird)]
+        return game.rng.choice(open_birds) if open_birds else None
+
+    def pick_tray(self, game, player, count):
+        return game.rng.sample(game.tray, game.rng.randint(0, min(count, len(game.tray))))
+
+    def pick_bonus(self, game, player, cards):
+        return game.rng.choice(cards)
+
+    def discard(self, game, player, count):
+        return game.rng.sample(player.hand, count)
+
+
+class GreedyPolicy(RandomPolicy):
+    """
+    Scripted play: the most valuable affordable bird first, otherwise the
+    action that gets the hand closer to playable, and eggs in the last rounds.
+    """
+
+    name = 'greedy'
+
+    def setup(self, game, player, birds, bonus):
+        kept = sorted(birds, key=lambda card: card.points - len(card.cost), reverse=True)[:3]
+        return kept, 'bonus-1' if 'bonus-1' in bonus else bonus[0]
+
+    def setup_discards(self, game, player, kept, count):
+        needed = self.needed_food(kept)
+        order = sorted(range(len(FOOD_TYPES)), key=lambda food: needed[food])
+        discards = []
+        for food in order:
+            while len(discards) < count and player.food[food] - discards.count(food) > 0:
+                discards.append(food)
+        return discards
+
+    def needed_food(self, cards):
+        needed = [0] * len(FOOD_TYPES)
+        for card in cards:
+            for entry in card.cost:
+                if isinstance(entry, tuple):
+                    for food in entry:
+                        needed[food] += 1
+                elif entry != WILD:
+                    needed[entry] += 1
+        return needed
+
+    def action(self, game, player, playable):
+        if playable:
+            best = max(playable, key=lambda option: (option[0].points, -len(player.rows[option[1]])))
+            return 'play', best
+        late = game.round >= len(ROUND_CUBES) - 1
+        if late and any(room(bird) for bird in player.birds()):
+            return 'eggs', None
+        if len(player.hand) < 2:
+            return 'cards', None
+        return 'food', None
+
+    def exchange(self, game, player, kind):
+        # Eggs are worth a point each; only trade them early
+        return kind == 'food→egg' or game.round <= 2
+
+    def pick_die(self, game, player):
+        needed = self.needed_food(player.hand)
+        return max(range(DICE), key=lambda i: (needed[game.dice[i]] - player.food[game.dice[i]], -i))
+
+    def pick_nest(self, game, player):
+        open_birds = [bird for bird in player.birds() if room(bird)]
+        return max(open_birds, key=lambda bird: bird.card.capacity - bird.eggs) if open_birds else None
+
+    def pick_tray(self, game, player, count):
+        return sorted(game.tray, key=lambda card: card.points, reverse=True)[:count]
+
+    def pick_bonus(self, game, player, cards):
+        return 'bonus-1' if 'bonus-1' in cards else player.bonus
+
+    def discard(self, game, player, count):
+        return sorted(player.hand, key=lambda card: card.points)[:count]
+
+
+POLICIES = {policy.name: policy for policy in (RandomPolicy, GreedyPolicy)}
+
+
+# --- batches --------------------------------------------------------------
+
+def new_totals():
+    return {'games': 0, 'turns': 0, 'actions': dict.fromkeys(ACTIONS, 0), 'exchanges': 0,
+            'birds_played': 0, 'eggs_laid': 0, 'food_gained': 0, 'cards_drawn': 0, 'discarded': 0,
+            'powers': {}, 'events': {}, 'violations': {}, 'players': {}, 'policies': {}}
+
+
+def add_counts(total, counts):
+    """Add counters (numbers and nested dicts of numbers) from counts into total."""
+    for key, value in counts.items():
+        if isinstance(value, dict):
+            add_counts(total.setdefault(key, {}), value)
+        else:
+            total[key] = total.get(key, 0) + value
+
+
+def play_batch(data_dir, rules_name, seed, first, count, player_counts, policy_names):
+    """Play games first .. first+count-1 and return their totals."""
+    data = tables(data_dir, rules_name)
+    policies = {name: POLICIES[name]() for name in set(policy_names)}
+    totals = new_totals()
+
+    with span('simulate'):
+        for number in range(first, first + count):
+            rng = random.Random(seed * 1_000_003 + number)
+            players = rng.choice(player_counts)
+            # Rotate the seating so no policy always goes first
+            seats = [policy_names[(number + seat) % len(policy_names)] for seat in range(players)]
+            game = Game(data, [policies[name] for name in seats], rng)
+            scores = game.play()
+
+            totals['games'] += 1
+            add_counts(totals, game.counts)
+            by_players = totals['players'].setdefault(str(players), {'games': 0, 'winning_score': 0})
+            by_players['games'] += 1
+            best = max(score['total'] for score in scores)
+            by_players['winning_score'] += best
+            winners = sum(1 for score in scores if score['total'] == best)
+
+            for name, score in zip(seats, scores):
+                stats = totals['policies'].setdefault(name, {'seats': 0, 'wins': 0.0, 'score': 0,
+                                                             'score_squares': 0, 'components': {}})
+                stats['seats'] += 1
+                stats['score'] += score['total']
+                stats['score_squares'] += score['total'] ** 2
+                if score['total'] == best:
+                    stats['wins'] += 1 / winners
+                add_counts(stats['components'], {key: value for key, value in score.items() if key != 'total'})
+    return totals
+
+
+def split_batches(games, batch_size):
+    return [(first, min(batch_size, games - first)) for first in range(0, games, batch_size)]
+
+
+def simulate(data_dir, rules_name, games, seed, player_counts, policy_names, workers=1,
+             batch_size=GAMES_PER_BATCH):
+    """Play games on a pool of `workers` processes. Returns (totals, wall seconds)."""
+    batches = split_batches(games, batch_size)
+    totals = new_totals()
+
+    start = time.perf_counter()
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(call_in_worker, play_batch, str(data_dir), rules_name, seed,
+                                   first, count, player_counts, policy_names)
+                       for first, count in batches]
+            for future in as_completed(futures):
+                result, spans = future.result()
+                merge(spans)
+                add_counts(totals, result)
+    else:
+        for first, count in batches:
+            add_counts(totals, play_batch(str(data_dir), rules_name, seed, first, count,
+                                          player_counts, policy_names))
+    return totals, time.perf_counter() - start
+
+
+def summarize(totals, wall, config):
+    games = totals['games']
+    turns = totals['turns']
+    summary = {
+        'version': SUMMARY_VERSION,
+        'config': config,
+        'games': games,
+        'wall_seconds': round(wall, 3),
+        'games_per_second': round(games / wall, 1) if wall else None,
+        'turns_per_second': round(turns / wall, 1) if wall else None,
+        'action_share': {action: round(n / turns, 4) if turns else 0.0
+                         for action, n in totals['actions'].items()},
+        'per_game': {key: round(totals[key] / games, 3) if games else 0.0
+                     for key in ('birds_played', 'eggs_laid', 'food_gained', 'cards_drawn',
+                                 'discarded', 'exchanges')},
+        'powers': dict(sorted(totals['powers'].items())),
+        'events': dict(sorted(totals['events'].items())),
+        'violations': totals['violations'],
+        'players': {n: {'games': entry['games'],
+                        'mean_winning_score': round(entry['winning_score'] / entry['games'], 2)}
+                    for n, entry in sorted(totals['players'].items())},
+        'policies': {}
+    }
+    for name, stats in sorted(totals['policies'].items()):
+        seats = stats['seats']
+        mean = stats['score'] / seats
+        variance = max(stats['score_squares'] / seats - mean ** 2, 0.0)
+        summary['policies'][name] = {
+            'seats': seats,
+            'win_rate': round(stats['wins'] / seats, 4),
+            'mean_score': round(mean, 3),
+            'score_stdev': round(math.sqrt(variance), 3),
+            'components': {key: round(value / seats, 3) for key, value in sorted(stats['components'].items())}
+        }
+    return summary
+
+
+def print_summary(summary):
+    print("\n" + "="*70)
+    print("SIMULATION SUMMARY")
+    print("="*70)
+    print(f"  {summary['games']} games in {summary['wall_seconds']:.2f}s: "
+          f"{summary['games_per_second']} games/s, {summary['turns_per_second']} turns/s")
+    print("  actions: " + ', '.join(f"{a} {share:.1%}" for a, share in summary['action_share'].items()))
+    print("  per game: " + ', '.join(f"{key} {value}" for key, value in summary['per_game'].items()))
+    for n, entry in summary['players'].items():
+        print(f"  {n} players: {entry['games']} games, mean winning score {entry['mean_winning_score']}")
+    print(f"\n  {'policy':<10} {'seats':>7} {'win rate':>9} {'score':>8} {'stdev':>7}")
+    for name, stats in summary['policies'].items():
+        print(f"  {name:<10} {stats['seats']:>7} {stats['win_rate']:>9.1%} "
+              f"{stats['mean_score']:>8.2f} {stats['score_stdev']:>7.2f}")
+    if summary['powers']:
+        print("\n  powers: " + ', '.join(f"{k} {v}" for k, v in summary['powers'].items()))
+    if summary['events']:
+        print("  between-turn: " + ', '.join(f"{k} {v}" for k, v in summary['events'].items()))
+    if summary['violations']:
+        print("\n  RULE VIOLATIONS: " + ', '.join(f"{k} {v}" for k, v in summary['violations'].items()))
+
+
+# --- baseline -------------------------------------------------------------
+
+def compare(summary, baseline, sigma):
+    """Return messages for statistics that moved more than sigma standard errors from the baseline."""
+    drifts = []
+    for name, current in summary['policies'].items():
+        previous = baseline['policies'].get(name)
+        if not previous:
+            continue
+        error = math.sqrt(current['score_stdev'] ** 2 / current['seats'] +
+                          previous['score_stdev'] ** 2 / previous['seats'])
+        if error and abs(current['mean_score'] - previous['mean_score']) > sigma * error:
+            drifts.append(f"{name} mean score {current['mean_score']} (baseline {previous['mean_score']})")
+
+    turns = summary['turns_per_second'] * summary['wall_seconds']
+    for action, share in summary['action_share'].items():
+        previous = baseline['action_share'].get(action, 0.0)
+        error = math.sqrt(max(previous * (1 - previous), 1e-9) / max(turns, 1))
+        if abs(share - previous) > sigma * error:
+            drifts.append(f"{action} share {share:.2%} (baseline {previous:.2%})")
+
+    if summary['violations'] and not baseline['violations']:
+        drifts.append(f"rule violations {summary['violations']} (baseline none)")
+    return drifts
+
+
+def parse_player_counts(text):
+    if '-' in text:
+        low, high = (int(n) for n in text.split('-', 1))
+        return list(range(low, high + 1))
+    return [int(n) for n in text.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless Wingspan games and report throughput and statistics.")
+    parser.add_argument("--games", type=int, default=10000, help="games to play (default 10000)")
+    parser.add_argument("--players", default="2-5", help="player counts, as a range or list (default 2-5)")
+    parser.add_argument("--policies", default="greedy,random",
+                        help=f"comma-separated seat policies, cycled over the seats ({', '.join(POLICIES)})")
+    parser.add_argument("--rules", choices=('board', 'engine'), default='board',
+                        help="column rules: habitat_columns.json (board) or the socket handlers (engine)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; the same seed replays the same games")
+    parser.add_argument("--workers", type=int, default=0, help="number of worker processes (0 = one per CPU core)")
+    parser.add_argument("--batch", type=int, default=GAMES_PER_BATCH, help="games per worker task")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="directory with the game data JSON")
+    parser.add_argument("--output", type=Path, default=SUMMARY_FILE, help="where to write the JSON summary")
+    parser.add_argument("--baseline", type=Path, help="summary of an earlier run to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="also write this summary to --baseline")
+    parser.add_argument("--sigma", type=float, default=SIGMA,
+                        help="standard errors a statistic may move before it counts as a regression (default 4)")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    player_counts = parse_player_counts(args.players)
+    policy_names = [name.strip() for name in args.policies.split(',') if name.strip()]
+    unknown = set(policy_names) - set(POLICIES)
+    if unknown:
+        parser.error(f"unknown policy(s): {', '.join(sorted(unknown))}")
+    if not player_counts or min(player_counts) < 1 or max(player_counts) > 5:
+        parser.error("player counts must be between 1 and 5")
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline needs --baseline PATH")
+
+    print("="*70)
+    print("HEADLESS GAME SIMULATION")
+    print("="*70)
+    print(f"  {args.games} games, {args.players} players, policies {', '.join(policy_names)}, "
+          f"{args.rules} rules, seed {args.seed}, {workers} worker(s)")
+
+    config = {'players': player_counts, 'policies': policy_names, 'rules': args.rules,
+              'seed': args.seed, 'data_dir': str(args.data_dir)}
+    totals, wall = simulate(args.data_dir, args.rules, args.games, args.seed, player_counts,
+                            policy_names, workers, max(1, args.batch))
+    summary = summarize(totals, wall, config)
+    summary['config']['workers'] = workers
+    print_summary(summary)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    write_json(args.output, summary, indent=2)
+    print(f"\n Summary: {args.output}")
+
+    if not args.baseline:
+        return
+    if args.save_baseline:
+        write_json(args.baseline, summary, indent=2)
+        print(f" Baseline saved: {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f" No baseline at {args.baseline} (run with --save-baseline to store one)")
+        return
+
+    baseline = read_json(args.baseline)
+    same = {key: value for key, value in baseline['config'].items() if key != 'workers'}
+    if same != {key: value for key, value in config.items() if key != 'workers'}:
+        print(" Baseline was recorded with a different configuration, not comparing")
+        return
+
+    drifts = compare(summary, baseline, args.sigma)
+    if drifts:
+        print(f"\n REGRESSIONS ({args.sigma:g} sigma):")
+        for message in drifts:
+            print(f"  {message}")
+        sys.exit(1)
+    print(f" No regressions against {args.baseline} ({args.sigma:g} sigma)")
+
+
+if __name__ == "__main__":
+    run(main)
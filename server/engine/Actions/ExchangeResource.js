@@ -5,7 +5,7 @@ export function ExchangeResource(game, player, exchangeType, params = {}) {
   switch (exchangeType) {
     case "egg_for_food": {
       // Forest columns 3 & 5: Exchange 1 egg for 2 food from supply
-      if (player.eggs < 1) {
+      if (player.board.eggs < 1) {
         throw new Error("Not enough eggs for exchange");
       }
 
@@ -21,7 +21,7 @@ export function ExchangeResource(game, player, exchangeType, params = {}) {
         throw new Error("No bird has eggs to exchange");
       }
 
-      birdWithEgg.eggs -= 1;
+      player.removeEggs(birdWithEgg, 1);
 
       // Give 2 food of any type from supply
       const foodType1 = params.foodType1 || "seed";
@@ -59,7 +59,7 @@ export function ExchangeResource(game, player, exchangeType, params = {}) {
         throw new Error(`${bird.name} is at egg capacity`);
       }
 
-      bird.eggs += 1;
+      player.addEggs(bird, 1);
       game.logs.push(`${player.name} laid 1 bonus egg on ${bird.name}`);
       break;
     }
@@ -122,8 +122,7 @@ export function ExchangeResource(game, player, exchangeType, params = {}) {
       player.food[foodType] -= 1;
 
       const cardToTuck = player.hand.pop();
-      bird.tuckedCards = bird.tuckedCards || [];
-      bird.tuckedCards.push(cardToTuck);
+      player.tuck(bird, cardToTuck);
 
       game.logs.push(
         `${player.name} tucked ${cardToTuck.name} under ${bird.name} (paid 1 ${foodType})`
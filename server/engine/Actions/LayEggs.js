@@ -11,7 +11,7 @@ export function LayEggs(game, player, habitat, birdIds) {
       player.habitats.wetlands.find(b => b.id === id);
 
     if (!bird) throw new Error("Invalid bird");
-    bird.eggs++;
+    player.addEggs(bird, 1);
   });
 
   game.logs.push(`${player.name} laid ${birdIds.length} eggs`);
@@ -1,5 +1,6 @@
 import { canPlayBird } from "../validators/canPlayBird.js";
 import { PowerEngine } from "../Powers/PowerEngine.js";
+import { CardDatabase } from "../CardDatabase.js";
 
 export function PlayBird(game, player, birdId, habitat, wildFoodChoices = []) {
   const bird = player.hand.find(b => b.id === birdId);
@@ -50,13 +51,14 @@ export function PlayBird(game, player, birdId, habitat, wildFoodChoices = []) {
     for (const b of allBirds) {
       if (eggsToRemove === 0) break;
       const canRemove = Math.min(b.eggs || 0, eggsToRemove);
-      b.eggs -= canRemove;
+      player.removeEggs(b, canRemove);
       eggsToRemove -= canRemove;
     }
   }
 
-  const placedBird = { ...bird, eggs: 0 };
-  player.habitats[normalizedHabitat].push(placedBird);
+  // A fresh instance of the card: own state copied, definition shared
+  const placedBird = CardDatabase.instance(CardDatabase.getBird(bird.id), { ...bird, eggs: 0 });
+  player.placeBird(normalizedHabitat, placedBird);
   player.hand = player.hand.filter(b => b.id !== birdId);
 
   game.logs.push(`${player.name} played ${bird.name} in ${habitat}${eggCost > 0 ? ` (paid ${eggCost} eggs)` : ""}`);
@@ -1,15 +1,11 @@
-import fs from "fs";
-import path from "path";
-import { fileURLToPath } from "url";
 import { shuffle } from "../utils/shuffle.js";
-
-const __filename = fileURLToPath(import.meta.url);
-const __dirname = path.dirname(__filename);
+import { CardDatabase } from "./CardDatabase.js";
+import { Rng } from "../utils/rng.js";
 
 export class BonusDeck {
-  constructor() {
-    const file = path.join(__dirname, "../../data/bonus_cards.json");
-    const data = JSON.parse(fs.readFileSync(file, "utf-8"));
+  constructor(rng = new Rng()) {
+    this.rng = rng;
+    const data = CardDatabase.bonusCards();
     
     // Create multiple copies of each bonus card to allow duplicates between players
     // In a 5-player game, each player gets 2 bonus cards, so we need at least 10 cards
@@ -21,7 +17,7 @@ export class BonusDeck {
       });
     }
     
-    this.cards = shuffle(expandedDeck);
+    this.cards = shuffle(expandedDeck, () => this.rng.next());
   }
 
   draw() {
@@ -32,7 +28,7 @@ export class BonusDeck {
   returnCard(card) {
     if (card) {
       this.cards.push(card);
-      this.cards = shuffle(this.cards);
+      this.cards = shuffle(this.cards, () => this.rng.next());
     }
   }
 }
@@ -0,0 +1,224 @@
+import fs from "fs";
+import path from "path";
+import crypto from "crypto";
+import { fileURLToPath } from "url";
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+const DATA_DIR = path.join(__dirname, "../../data");
+const COMPILED_DIR = path.join(DATA_DIR, "compiled");
+
+const PACK_FORMAT = "wingspan-card-db";
+const PACK_VERSION = 1;
+
+// Tables in the pack and the JSON files they are compiled from
+const SOURCES = {
+  birds: "data/birds.json",
+  bonusCards: "data/bonus_cards.json",
+  roundGoals: "data/round_goals.json"
+};
+
+let loaded = null;
+
+function sha256(buffer) {
+  return crypto.createHash("sha256").update(buffer).digest("hex");
+}
+
+function deepFreeze(value) {
+  if (value && typeof value === "object" && !Object.isFrozen(value)) {
+    Object.values(value).forEach(deepFreeze);
+    Object.freeze(value);
+  }
+  return value;
+}
+
+function unpackTable(table, strings) {
+  const records = [];
+  for (let i = 0; i < table.count; i++) {
+    const record = {};
+    for (const key of table.keys) {
+      const column = table.columns[key];
+      const value = column.values[i];
+      if (value === null || value === undefined) continue;
+      record[key] = column.kind === "str" ? strings[value] : value;
+    }
+    records.push(record);
+  }
+  return records;
+}
+
+function sourceFile(relativePath) {
+  return path.join(DATA_DIR, "..", relativePath);
+}
+
+// A source's size and modification time (whole ms), as the manifest records them
+function sourceStat(relativePath) {
+  const stat = fs.statSync(sourceFile(relativePath), { bigint: true });
+  return { size: Number(stat.size), mtime: Number(stat.mtimeNs / 1000000n) };
+}
+
+// Identifies the card data clients cache (see cardTable()), from the sources' hashes
+function versionOf(hashes) {
+  return sha256(hashes.join("\n")).slice(0, 16);
+}
+
+/**
+ * Reads the compiled pack if it exists, matches its checksum and was built
+ * from the current JSON sources. A source with the size and modification
+ * time in the manifest is not read at all; one with another time (a fresh
+ * checkout) is hashed and compared. Returns the tables and the sources'
+ * hashes, or null.
+ */
+function readPack() {
+  const manifestFile = path.join(COMPILED_DIR, "manifest.json");
+  if (!fs.existsSync(manifestFile)) return null;
+
+  const manifest = JSON.parse(fs.readFileSync(manifestFile, "utf-8"));
+  if (manifest.format !== PACK_FORMAT || manifest.version !== PACK_VERSION) {
+    console.warn(`[CardDatabase] Unsupported pack ${manifest.format} v${manifest.version}, using JSON sources`);
+    return null;
+  }
+
+  const hashes = [];
+  for (const relativePath of Object.values(SOURCES)) {
+    const recorded = manifest.sources?.[relativePath];
+    const stat = sourceStat(relativePath);
+    const unchanged = recorded?.size === stat.size &&
+      (recorded.mtime === stat.mtime || recorded.sha256 === sha256(fs.readFileSync(sourceFile(relativePath))));
+    if (!unchanged) {
+      console.warn(`[CardDatabase] ${relativePath} changed since the pack was compiled, using JSON sources`);
+      return null;
+    }
+    hashes.push(recorded.sha256);
+  }
+
+  const packBuffer = fs.readFileSync(path.join(COMPILED_DIR, manifest.file));
+  if (sha256(packBuffer) !== manifest.sha256) {
+    console.warn("[CardDatabase] Pack checksum mismatch, using JSON sources");
+    return null;
+  }
+
+  try {
+    const pack = JSON.parse(packBuffer.toString("utf-8"));
+    const tables = {};
+    for (const table of Object.keys(SOURCES)) {
+      tables[table] = unpackTable(pack.tables[table], pack.strings);
+    }
+    return { tables, hashes };
+  } catch (e) {
+    console.warn(`[CardDatabase] Unreadable pack (${e.message}), using JSON sources`);
+    return null;
+  }
+}
+
+function load() {
+  let { tables, hashes } = readPack() ?? {};
+  if (!tables) {
+    tables = {};
+    hashes = [];
+    for (const [table, relativePath] of Object.entries(SOURCES)) {
+      const buffer = fs.readFileSync(sourceFile(relativePath));
+      hashes.push(sha256(buffer));
+      tables[table] = JSON.parse(buffer.toString("utf-8"));
+    }
+  }
+
+  return {
+    version: versionOf(hashes),
+    birds: deepFreeze(tables.birds),
+    bonusCards: deepFreeze(tables.bonusCards),
+    roundGoals: deepFreeze(tables.roundGoals),
+    birdsById: new Map(tables.birds.map(b => [b.id, b])),
+    bonusCardsById: new Map(tables.bonusCards.map(b => [b.id, b])),
+    roundGoalsById: new Map(tables.roundGoals.map(g => [g.id, g]))
+  };
+}
+
+/**
+ * Static card data, loaded once per process and shared by every game.
+ * Records are frozen. Birds in a game are flyweights over them (see
+ * instance()); other cards are copied when a game needs per-game state.
+ */
+export class CardDatabase {
+  static load() {
+    if (!loaded) loaded = load();
+    return loaded;
+  }
+
+  static birds() {
+    return CardDatabase.load().birds;
+  }
+
+  static bonusCards() {
+    return CardDatabase.load().bonusCards;
+  }
+
+  static roundGoals() {
+    return CardDatabase.load().roundGoals;
+  }
+
+  static getBird(id) {
+    return CardDatabase.load().birdsById.get(id);
+  }
+
+  static version() {
+    return CardDatabase.load().version;
+  }
+
+  /** The bird definitions clients resolve card instances against */
+  static cardTable() {
+    const { version, birds } = CardDatabase.load();
+    return { version, birds };
+  }
+
+  /**
+   * A bird card in a game: an object whose prototype is the shared record,
+   * with only its own state as own properties (id, and instanceId, eggs,
+   * tuckedCards, cachedFood as the game adds them). Reads fall through to
+   * the record; JSON (state updates, snapshots) carries the own state only,
+   * and clients fill in the rest from cardTable().
+   */
+  static instance(record, state = {}) {
+    return Object.create(record, Object.getOwnPropertyDescriptors({ id: record.id, ...state }));
+  }
+
+  /**
+   * Compact form of a card from `table` ("birds", "bonusCards" or
+   * "roundGoals") for snapshots: its id plus only the fields a game added
+   * or changed (eggs, cached food, instance ids). Copies share nested
+   * values with the frozen record, so unchanged fields compare identical.
+   * Cards tucked under a bird are packed as birds too.
+   */
+  static pack(card, table) {
+    if (!card) return card;
+    const record = CardDatabase.load()[`${table}ById`].get(card.id);
+    if (!record) return { ...card };
+    if (card === record) return card.id;
+    const packed = { id: card.id };
+    for (const [key, value] of Object.entries(card)) {
+      if (record[key] !== value) packed[key] = value;
+    }
+    if (table === "birds" && packed.tuckedCards) {
+      packed.tuckedCards = packed.tuckedCards.map(c => CardDatabase.pack(c, "birds"));
+    }
+    return packed;
+  }
+
+  /**
+   * A card from pack(): the shared record itself, a bird instance, or a
+   * copy with the game's fields
+   */
+  static unpack(packed, table) {
+    if (!packed) return packed;
+    const records = CardDatabase.load()[`${table}ById`];
+    if (typeof packed === "string") return records.get(packed);
+    const record = records.get(packed.id);
+    if (!record) return { ...packed };
+    if (table !== "birds") return { ...record, ...packed };
+    const state = packed.tuckedCards
+      ? { ...packed, tuckedCards: packed.tuckedCards.map(c => CardDatabase.unpack(c, "birds")) }
+      : packed;
+    return CardDatabase.instance(record, state);
+  }
+}
@@ -1,28 +1,27 @@
-import fs from "fs";
-import path from "path";
-import { fileURLToPath } from "url";
 import { shuffle } from "../utils/shuffle.js";
-
-const __filename = fileURLToPath(import.meta.url);
-const __dirname = path.dirname(__filename);
+import { CardDatabase } from "./CardDatabase.js";
+import { Rng } from "../utils/rng.js";
 
 export class Deck {
-  constructor() {
-    const file = path.join(__dirname, "../../data/birds.json");
-    this.original = JSON.parse(fs.readFileSync(file, "utf-8"));
-    this.cards = shuffle([...this.original]);
+  constructor(rng = new Rng()) {
+    this.rng = rng;
+    // Shared, frozen card definitions; draw() hands out instances of them
+    this.original = CardDatabase.birds();
+    this.cards = shuffle([...this.original], () => this.rng.next());
+    // Numbers instance ids of duplicate draws (deterministic, unlike a clock)
+    this.serial = 0;
   }
 
   replenish() {
     // Refill from original to avoid undefined draws when deck runs dry
-    this.cards = shuffle([...this.original]);
+    this.cards = shuffle([...this.original], () => this.rng.next());
   }
 
   draw(count = 1) {
     if (count === 1) {
       if (!this.cards.length) this.replenish();
       const card = this.cards.pop();
-      return card ? { ...card } : null;
+      return card ? CardDatabase.instance(card) : null;
     }
     const drawn = [];
     const seenIds = new Set();
@@ -30,14 +29,11 @@ export class Deck {
       if (!this.cards.length) this.replenish();
       const card = this.cards.pop();
       if (card) {
-        // Create a unique instance to avoid React key conflicts
-        const cardCopy = { ...card };
-        // Add instance ID if we've seen this bird ID before in this draw
-        if (seenIds.has(card.id)) {
-          cardCopy.instanceId = `${card.id}-${Date.now()}-${i}`;
-        }
+        // Add instance ID if we've seen this bird ID before in this draw,
+        // to avoid React key conflicts
+        const state = seenIds.has(card.id) ? { instanceId: `${card.id}-${++this.serial}` } : {};
         seenIds.add(card.id);
-        drawn.push(cardCopy);
+        drawn.push(CardDatabase.instance(card, state));
       }
     }
     return drawn;
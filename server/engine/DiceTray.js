@@ -1,7 +1,10 @@
+import { Rng } from "../utils/rng.js";
+
 const FOOD_FACES = ["seed", "invertebrate", "fish", "fruit", "rodent"];
 
 export class DiceTray {
-  constructor() {
+  constructor(rng = new Rng()) {
+    this.rng = rng;
     this.refill();
   }
 
@@ -13,7 +16,7 @@ export class DiceTray {
   }
 
   roll() {
-    return FOOD_FACES[Math.floor(Math.random() * FOOD_FACES.length)];
+    return FOOD_FACES[this.rng.int(FOOD_FACES.length)];
   }
 
   take(food) {
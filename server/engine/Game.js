@@ -7,34 +7,36 @@ import { RoundGoalEngine } from "./RoundGoalEngine.js";
 import { GameEvents } from "./Powers/GameEvents.js";
 import { EndOfRound } from "./Powers/EndOfRound.js";
 import { EndOfGame } from "./Powers/EndOfGame.js";
+import { GameLog } from "./GameLog.js";
 import { uid } from "../utils/uid.js";
 import { shuffle } from "../utils/shuffle.js";
-import fs from "fs";
-import path from "path";
-import { fileURLToPath } from "url";
+import { Rng } from "../utils/rng.js";
+import { CardDatabase } from "./CardDatabase.js";
 
-const __filename = fileURLToPath(import.meta.url);
-const __dirname = path.dirname(__filename);
+// Bump when the snapshot layout changes
+const SNAPSHOT_VERSION = 1;
 
 export class Game {
-  constructor() {
-    this.id = uid();
+  constructor({ seed, id = uid() } = {}) {
+    this.id = id;
+    this.lobbyId = null;
     this.players = [];
     this.phase = "SETUP"; // SETUP | PLAY | END
 
     this.round = { round: 1, maxRounds: 4 };
     this.roundConfig = [8, 7, 6, 5];
 
-    this.deck = new Deck();
-    this.bonusDeck = new BonusDeck();
-    this.diceTray = new DiceTray();
+    // All of the game's randomness comes from this generator, so replaying
+    // the same actions from a snapshot reproduces the same game
+    this.rng = new Rng(seed);
+    this.deck = new Deck(this.rng);
+    this.bonusDeck = new BonusDeck(this.rng);
+    this.diceTray = new DiceTray(this.rng);
     this.turnManager = new TurnManager();
     this.events = new GameEvents();
 
     // Select 4 random round goals for the game
-    const goalsFile = path.join(__dirname, "../../data/round_goals.json");
-    const allGoals = JSON.parse(fs.readFileSync(goalsFile, "utf-8"));
-    this.roundGoals = shuffle(allGoals).slice(0, 4);
+    this.roundGoals = shuffle(CardDatabase.roundGoals(), () => this.rng.next()).slice(0, 4);
 
     // Face-up bird tray (3 visible cards)
     this.birdTray = [
@@ -43,7 +45,7 @@ export class Game {
       this.deck.draw()
     ].filter(b => b);
 
-    this.logs = [];
+    this.logs = new GameLog();
   }
 
   addPlayer(name, socketId) {
@@ -90,9 +92,6 @@ export class Game {
     this.players.forEach(p => (p.actionCubes = cubes));
     this.turnManager.reset(this.players);
     this.logs.push(`Round ${this.round.round} started`);
-    
-    // Register all between-turn powers at the start of each round
-    this.events.registerBetweenTurnPowers(this);
   }
 
   endRound() {
@@ -135,7 +134,107 @@ export class Game {
       faceUpBirds: this.birdTray, // Alias for compatibility
       roundGoals: this.roundGoals,
       currentRoundGoal: this.roundGoals[this.round.round - 1],
-      logs: this.logs
+      logs: this.logs.serialize()
     };
   }
+
+  /**
+   * Complete game state as plain JSON, for persistence. Cards are stored
+   * in CardDatabase.pack() form; the between-turn power index is not
+   * stored, it is rebuilt from the boards on restore.
+   */
+  toSnapshot() {
+    const birds = cards => cards.map(c => CardDatabase.pack(c, "birds"));
+    const bonusCards = cards => cards.map(c => CardDatabase.pack(c, "bonusCards"));
+
+    return {
+      version: SNAPSHOT_VERSION,
+      id: this.id,
+      lobbyId: this.lobbyId,
+      phase: this.phase,
+      round: { ...this.round },
+      roundConfig: [...this.roundConfig],
+      rng: this.rng.state,
+      deck: { cards: birds(this.deck.cards), serial: this.deck.serial },
+      bonusDeck: bonusCards(this.bonusDeck.cards),
+      diceTray: [...this.diceTray.dice],
+      activeIndex: this.turnManager.activeIndex,
+      roundGoals: this.roundGoals.map(g => CardDatabase.pack(g, "roundGoals")),
+      birdTray: birds(this.birdTray),
+      logs: this.logs.toSnapshot(),
+      pendingBonusCardSelection: this.pendingBonusCardSelection && {
+        ...this.pendingBonusCardSelection,
+        cards: bonusCards(this.pendingBonusCardSelection.cards)
+      },
+      finalScores: this.finalScores,
+      players: this.players.map(p => ({
+        ...p,
+        hand: birds(p.hand),
+        bonusCard: CardDatabase.pack(p.bonusCard, "bonusCards"),
+        bonusCards: p.bonusCards && bonusCards(p.bonusCards),
+        setup: {
+          ...p.setup,
+          birds: birds(p.setup.birds),
+          bonusCards: bonusCards(p.setup.bonusCards)
+        },
+        habitats: Object.fromEntries(
+          Object.entries(p.habitats).map(([habitat, row]) => [habitat, birds(row)])
+        )
+      }))
+    };
+  }
+
+  static fromSnapshot(snapshot) {
+    if (snapshot.version !== SNAPSHOT_VERSION) {
+      throw new Error(`Unsupported game snapshot version ${snapshot.version}`);
+    }
+    const birds = cards => cards.map(c => CardDatabase.unpack(c, "birds"));
+    const bonusCards = cards => cards.map(c => CardDatabase.unpack(c, "bonusCards"));
+
+    const game = new Game({ seed: snapshot.rng });
+    game.rng.state = snapshot.rng;
+    game.id = snapshot.id;
+    game.lobbyId = snapshot.lobbyId;
+    game.phase = snapshot.phase;
+    game.round = { ...snapshot.round };
+    game.roundConfig = [...snapshot.roundConfig];
+    game.deck.cards = birds(snapshot.deck.cards);
+    game.deck.serial = snapshot.deck.serial;
+    game.bonusDeck.cards = bonusCards(snapshot.bonusDeck);
+    game.diceTray.dice = [...snapshot.diceTray];
+    game.roundGoals = snapshot.roundGoals.map(g => CardDatabase.unpack(g, "roundGoals"));
+    game.birdTray = birds(snapshot.birdTray);
+    game.logs = GameLog.fromSnapshot(snapshot.logs);
+    if (snapshot.pendingBonusCardSelection) {
+      game.pendingBonusCardSelection = {
+        ...snapshot.pendingBonusCardSelection,
+        cards: bonusCards(snapshot.pendingBonusCardSelection.cards)
+      };
+    }
+    if (snapshot.finalScores !== undefined) game.finalScores = snapshot.finalScores;
+
+    game.players = snapshot.players.map(data => {
+      const player = Object.assign(new Player(data.name, data.id), data);
+      player.hand = birds(data.hand);
+      player.bonusCard = CardDatabase.unpack(data.bonusCard, "bonusCards");
+      if (data.bonusCards) player.bonusCards = bonusCards(data.bonusCards);
+      player.setup = {
+        ...data.setup,
+        birds: birds(data.setup.birds),
+        bonusCards: bonusCards(data.setup.bonusCards)
+      };
+      player.habitats = Object.fromEntries(
+        Object.entries(data.habitats).map(([habitat, row]) => [habitat, birds(row)])
+      );
+      player.recount();
+      return player;
+    });
+
+    if (game.phase !== "SETUP") {
+      game.turnManager.reset(game.players);
+      game.turnManager.activeIndex = snapshot.activeIndex;
+      game.events.registerBetweenTurnPowers(game);
+    }
+    return game;
+  }
 }
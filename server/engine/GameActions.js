@@ -0,0 +1,339 @@
+import { GainFood } from "./Actions/GainFood.js";
+import { LayEggs } from "./Actions/LayEggs.js";
+import { DrawCards } from "./Actions/DrawCards.js";
+import { PlayBird } from "./Actions/PlayBird.js";
+import { ExchangeResource } from "./Actions/ExchangeResource.js";
+import { ConvertFood } from "./Actions/ConvertFood.js";
+import { ScoringEngine } from "./ScoringEngine.js";
+import { WhenPlayed } from "./Powers/WhenPlayed.js";
+import { EndOfGame } from "./Powers/EndOfGame.js";
+
+/**
+ * Every change a player makes to a game goes through applyAction, both
+ * live (server/socket.js) and when a persisted game is rebuilt by
+ * replaying its action log (server/persistence/GameStore.js). Given the
+ * same game state and action it makes the same changes, since the game's
+ * randomness comes from its seeded rng.
+ *
+ * An action is plain JSON: { type, seat, ...params }, where seat is the
+ * player's index in game.players (socket ids change on reconnect).
+ *
+ * Returns { activations, message, ... } for the caller to send out, or
+ * null if the action was ignored. Throws an Error with a message for the
+ * player if the action is invalid.
+ */
+export function applyAction(game, action) {
+  const handler = ACTIONS[action.type];
+  if (!handler) throw new Error(`Unknown action ${action.type}`);
+  return handler(game, action);
+}
+
+const isPlayable = game => {
+  if (!game) return false;
+  // Allow actions during PLAY phase
+  if (game.phase === "PLAY" && game.turnManager.activePlayer) return true;
+  return false;
+};
+
+function playerAt(game, seat) {
+  const player = game.players[seat];
+  if (!player) throw new Error("Player not found");
+  return player;
+}
+
+/**
+ * Checks shared by the four main actions; takes the action cube, runs
+ * perform() and gives the cube back if it throws.
+ */
+function takeTurn(game, seat, perform) {
+  if (!isPlayable(game)) throw new Error("Game is not in playable state");
+  const player = playerAt(game, seat);
+
+  if (player.actionCubes <= 0) throw new Error("No action cubes remaining");
+  player.actionCubes -= 1;
+
+  try {
+    return perform(player);
+  } catch (e) {
+    player.actionCubes += 1;
+    throw e;
+  }
+}
+
+function postActionAdvance(game) {
+  const activations = [];
+
+  // If everyone is out of cubes, advance round or end game
+  const allOut = game.players.every(p => p.actionCubes === 0);
+  if (allOut) {
+    // Score the round goal and execute END_OF_ROUND powers
+    activations.push(...(game.endRound() || []));
+
+    if (game.round.round >= game.round.maxRounds) {
+      // Execute END_OF_GAME powers before final scoring
+      const endOfGameActivations = EndOfGame.executeAll(game);
+
+      game.phase = "END";
+      game.finalScores = ScoringEngine.scoreGame(game.players);
+      game.logs.push("Game Over! Final scores calculated.");
+
+      activations.push(...endOfGameActivations);
+      return activations;
+    }
+
+    // Check if any player needs to discard cards (more than 5 in hand)
+    const needsDiscard = game.players.some(p => p.hand && p.hand.length > 5);
+    if (needsDiscard) {
+      game.phase = "DISCARD";
+      game.players.forEach(p => {
+        p.discardConfirmed = false;
+      });
+      game.logs.push("End of round: Players must discard down to 5 cards");
+      return activations;
+    }
+
+    game.round.round += 1;
+    game.startRound();
+    return activations;
+  }
+
+  game.turnManager.advance();
+  return activations;
+}
+
+// Power activations from the action itself, then from other players'
+// between-turn powers, then from the end of the round or game
+function finishTurn(game, activations, message) {
+  const endActivations = postActionAdvance(game);
+  return { activations: [...activations.filter(Boolean), ...endActivations], message };
+}
+
+const ACTIONS = {
+  confirmSetup(game, { seat, keptBirdIds, bonusCardId }) {
+    if (!game) return null;
+    const player = game.players[seat];
+    if (!player) return null;
+
+    if (game.phase !== "SETUP") return null;
+
+    const availableBirds =
+      (player.setup?.birds || []).filter(b => b && b.id) || [];
+    const kept = availableBirds.filter(b =>
+      (keptBirdIds || []).includes(b.id)
+    );
+
+    // Validate selection and food cost
+    const foodCount = Object.values(player.food || {}).reduce(
+      (a, b) => a + b,
+      0
+    );
+    if (kept.length > foodCount) return null;
+
+    // Discard food: 1 food per bird kept
+    let toDiscard = kept.length;
+    for (const k of Object.keys(player.food)) {
+      while (player.food[k] > 0 && toDiscard > 0) {
+        player.food[k]--;
+        toDiscard--;
+      }
+    }
+
+    player.hand = kept;
+
+    // Handle bonus card selection
+    if (bonusCardId && player.setup.bonusCards) {
+      const selectedBonus = player.setup.bonusCards.find(b => b.id === bonusCardId);
+      if (selectedBonus) {
+        player.bonusCard = selectedBonus;
+      }
+    }
+
+    player.setup.confirmed = true;
+    game.logs.push(`${player.name} confirmed setup (kept ${kept.length} birds)`);
+
+    const allConfirmed = game.players.every(p => p.setup.confirmed);
+
+    if (allConfirmed) {
+      game.phase = "PLAY";
+      game.startRound();
+      game.logs.push("All players confirmed setup. Game starting!");
+    } else {
+      const remaining = game.players.filter(p => !p.setup.confirmed).length;
+      game.logs.push(`Waiting for ${remaining} more player(s) to confirm setup`);
+    }
+
+    return { activations: [], started: allConfirmed };
+  },
+
+  gainFood(game, { seat, habitat, foodTypes }) {
+    return takeTurn(game, seat, player => {
+      const powerActivations = GainFood(game, player, habitat, foodTypes) || [];
+
+      // Emit event for between-turn powers
+      const betweenTurnActivations = game.events.emit("PLAYER_GAINS_FOOD", {
+        playerId: player.id,
+        playerName: player.name,
+        habitat: habitat,
+        foodTypes: foodTypes
+      });
+
+      return finishTurn(game, [...powerActivations, ...betweenTurnActivations], "Gained food successfully!");
+    });
+  },
+
+  layEggs(game, { seat, habitat, birdIds }) {
+    return takeTurn(game, seat, player => {
+      const powerActivations = LayEggs(game, player, habitat, birdIds) || [];
+
+      // Emit event for between-turn powers
+      const betweenTurnActivations = game.events.emit("PLAYER_LAYS_EGGS", {
+        playerId: player.id,
+        playerName: player.name,
+        habitat: habitat,
+        eggCount: birdIds.length
+      });
+
+      return finishTurn(game, [...powerActivations, ...betweenTurnActivations], `Laid ${birdIds.length} eggs successfully!`);
+    });
+  },
+
+  drawCards(game, { seat, habitat, count, fromTray }) {
+    return takeTurn(game, seat, player => {
+      const powerActivations = DrawCards(game, player, habitat, count, fromTray || []) || [];
+      return finishTurn(game, powerActivations, `Drew ${count} cards successfully!`);
+    });
+  },
+
+  playBird(game, { seat, birdId, habitat, wildFoodChoices = [] }) {
+    const player = takeTurn(game, seat, player => {
+      PlayBird(game, player, birdId, habitat, wildFoodChoices);
+      return player;
+    });
+    return playedBird(game, player, habitat);
+  },
+
+  exchangeResource(game, { seat, exchangeType, params }) {
+    if (!isPlayable(game)) throw new Error("Game is not in playable state");
+    ExchangeResource(game, playerAt(game, seat), exchangeType, params);
+    return { activations: [], message: "Exchange completed successfully!" };
+  },
+
+  convertFood(game, { seat, giveFoods, getFood }) {
+    if (!isPlayable(game)) throw new Error("Game is not in playable state");
+    ConvertFood(game, playerAt(game, seat), giveFoods, getFood);
+    return { activations: [], message: "Food conversion successful!" };
+  },
+
+  // End-of-round discard
+  discardCards(game, { seat, cardIds }) {
+    if (!game) throw new Error("Game not found");
+    if (game.phase !== "DISCARD") throw new Error("Not in discard phase");
+    const player = playerAt(game, seat);
+
+    // Validate discard
+    if (!Array.isArray(cardIds)) throw new Error("Invalid card selection");
+
+    const cardsToDiscard = cardIds.length;
+    const finalHandSize = player.hand.length - cardsToDiscard;
+
+    if (finalHandSize > 5) {
+      throw new Error(`Must discard to 5 cards. Currently would have ${finalHandSize} cards.`);
+    }
+
+    if (finalHandSize < 5 && player.hand.length > 5) {
+      throw new Error("Cannot discard more than necessary");
+    }
+
+    // Perform discard
+    player.hand = player.hand.filter(card => !cardIds.includes(card.id));
+    player.discardConfirmed = true;
+    game.logs.push(`${player.name} discarded ${cardsToDiscard} card(s)`);
+
+    // Check if all players have confirmed discard
+    const allConfirmed = game.players.every(p =>
+      p.hand.length <= 5 || p.discardConfirmed
+    );
+
+    if (allConfirmed) {
+      // All players have discarded, start next round
+      game.phase = "PLAY";
+      game.round.round += 1;
+      game.startRound();
+      game.logs.push(`Round ${game.round.round} started`);
+    }
+
+    return { activations: [], message: "Discarded cards successfully!" };
+  },
+
+  // Bonus card chosen after a DRAW_BONUS_CARDS power
+  selectBonusCard(game, { seat, selectedCardId }) {
+    if (!game) throw new Error("Game not found");
+    const player = playerAt(game, seat);
+
+    // Check if there's a pending bonus card selection
+    if (!game.pendingBonusCardSelection || game.pendingBonusCardSelection.playerId !== player.id) {
+      throw new Error("No pending bonus card selection");
+    }
+
+    const { cards, birdName } = game.pendingBonusCardSelection;
+    const selectedCard = cards.find(c => (c.instanceId || c.id) === selectedCardId);
+
+    if (!selectedCard) throw new Error("Invalid card selection");
+
+    // Add selected card to player's bonus cards
+    if (!player.bonusCards) {
+      player.bonusCards = [];
+    }
+    player.bonusCards.push(selectedCard);
+
+    // Return non-selected cards to bonus deck
+    cards.forEach(card => {
+      if ((card.instanceId || card.id) !== selectedCardId) {
+        game.bonusDeck.returnCard(card);
+      }
+    });
+
+    game.logs.push(`${player.name} selected a bonus card from ${birdName}'s power`);
+
+    // Clear pending selection
+    delete game.pendingBonusCardSelection;
+
+    return { activations: [], message: "Bonus card selected successfully!", card: selectedCard };
+  }
+};
+
+// The rest of playBird once the bird is on the board: its WHEN_PLAYED
+// power, other players' between-turn powers, and the end of the turn
+function playedBird(game, player, habitat) {
+  // Normalize habitat name (wetland -> wetlands for consistency)
+  const normalizedHabitat = habitat === "wetland" ? "wetlands" : habitat;
+  const habitatBirds = player.habitats[normalizedHabitat];
+
+  if (!habitatBirds || habitatBirds.length === 0) {
+    throw new Error("Bird was not placed correctly");
+  }
+
+  const bird = habitatBirds[habitatBirds.length - 1];
+  const powerActivations = [];
+
+  // Its between-turn power (if any) can fire from the next action on
+  game.events.addBird(bird, player, game);
+
+  // Execute WHEN_PLAYED power
+  if (bird && bird.power && bird.power.type === "WHEN_PLAYED") {
+    const activation = WhenPlayed.execute({ bird, player, game });
+    if (activation) {
+      powerActivations.push(activation);
+    }
+  }
+
+  // Emit event for between-turn powers
+  const betweenTurnActivations = game.events.emit("PLAYER_PLAYS_BIRD", {
+    playerId: player.id,
+    playerName: player.name,
+    habitat: habitat,
+    birdName: bird?.name
+  });
+
+  return finishTurn(game, [...powerActivations, ...betweenTurnActivations], `Played ${bird?.name || "bird"} successfully!`);
+}
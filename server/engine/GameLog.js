@@ -0,0 +1,109 @@
+// Entries kept in the live game state (what every broadcast carries)
+export const LIVE_LOG_SIZE = 30;
+// Older entries kept for history requests; beyond this the oldest are dropped
+export const LOG_HISTORY_SIZE = 2000;
+// Default and maximum page size for history requests
+const PAGE_SIZE = 50;
+
+/**
+ * Game log as a fixed-size ring buffer.
+ *
+ * Only the last LIVE_LOG_SIZE entries are part of the game state. They are
+ * serialized in slot order, so each new entry changes a single slot and a
+ * state patch carries just that entry instead of shifting the whole window.
+ * Entries pushed out of the ring move to a bounded history that clients
+ * page through on demand (see page()).
+ *
+ * Entry number n (0-based, counted from the start of the game) lives in
+ * slot n % capacity while it is live.
+ */
+export class GameLog {
+  constructor(capacity = LIVE_LOG_SIZE, historySize = LOG_HISTORY_SIZE) {
+    this.capacity = capacity;
+    this.historySize = historySize;
+    this.slots = [];
+    this.history = [];   // entries older than the ring, oldest first
+    this.total = 0;      // entries ever pushed
+  }
+
+  push(...entries) {
+    for (const entry of entries) {
+      const slot = this.total % this.capacity;
+      if (this.slots.length < this.capacity) {
+        this.slots.push(entry);
+      } else {
+        this.history.push(this.slots[slot]);
+        this.slots[slot] = entry;
+      }
+      this.total += 1;
+    }
+    if (this.history.length > this.historySize) {
+      this.history.splice(0, this.history.length - this.historySize);
+    }
+    return this.total;
+  }
+
+  /** Number of the oldest entry still kept (live or history) */
+  get first() {
+    return this.total - this.slots.length - this.history.length;
+  }
+
+  /** Live entries, oldest first */
+  recent() {
+    if (this.total <= this.capacity) return [...this.slots];
+    const head = this.total % this.capacity;
+    return [...this.slots.slice(head), ...this.slots.slice(0, head)];
+  }
+
+  /** All kept entries, oldest first */
+  entries() {
+    return [...this.history, ...this.recent()];
+  }
+
+  some(predicate) {
+    return this.history.some(predicate) || this.slots.some(predicate);
+  }
+
+  includes(entry) {
+    return this.history.includes(entry) || this.slots.includes(entry);
+  }
+
+  get length() {
+    return this.total;
+  }
+
+  /**
+   * A page of entries numbered before `before` (default: everything),
+   * newest page first. Returns { entries, start, total, hasMore } where
+   * entries are oldest first and start is the number of entries[0].
+   */
+  page({ before = this.total, limit = PAGE_SIZE } = {}) {
+    limit = Math.max(1, Math.min(Number(limit) || PAGE_SIZE, PAGE_SIZE));
+    const end = Math.max(this.first, Math.min(Number(before) || 0, this.total));
+    const start = Math.max(this.first, end - limit);
+    const kept = this.entries();
+    return {
+      entries: kept.slice(start - this.first, end - this.first),
+      start,
+      total: this.total,
+      hasMore: start > this.first
+    };
+  }
+
+  serialize() {
+    return { total: this.total, capacity: this.capacity, entries: [...this.slots] };
+  }
+
+  /** Everything kept, for persistence (see Game.toSnapshot) */
+  toSnapshot() {
+    return { ...this.serialize(), historySize: this.historySize, history: [...this.history] };
+  }
+
+  static fromSnapshot({ total, capacity, entries, historySize, history }) {
+    const log = new GameLog(capacity, historySize);
+    log.slots = [...entries];
+    log.history = [...history];
+    log.total = total;
+    return log;
+  }
+}
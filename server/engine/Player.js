@@ -23,16 +23,57 @@ export class Player {
       wetlands: []
     };
 
+    // Running totals over the birds in habitats, kept up to date by the
+    // methods below; change eggs, tucked cards and cached food through them
+    this.board = { birds: 0, points: 0, eggs: 0, tuckedCards: 0, cachedFood: 0 };
+
     // Assign player color for action cubes
     this.color = this.generateColor();
   }
 
   totalEggs() {
-    return (
-      this.habitats.forest.reduce((sum, b) => sum + (b.eggs || 0), 0) +
-      this.habitats.grassland.reduce((sum, b) => sum + (b.eggs || 0), 0) +
-      this.habitats.wetlands.reduce((sum, b) => sum + (b.eggs || 0), 0)
-    );
+    return this.board.eggs;
+  }
+
+  placeBird(habitat, bird) {
+    this.habitats[habitat].push(bird);
+    this.countBird(bird);
+  }
+
+  addEggs(bird, count = 1) {
+    bird.eggs = (bird.eggs || 0) + count;
+    this.board.eggs += count;
+  }
+
+  removeEggs(bird, count = 1) {
+    bird.eggs -= count;
+    this.board.eggs -= count;
+  }
+
+  tuck(bird, ...cards) {
+    bird.tuckedCards = bird.tuckedCards || [];
+    bird.tuckedCards.push(...cards);
+    this.board.tuckedCards += cards.length;
+  }
+
+  cache(bird, ...foods) {
+    bird.cachedFood = bird.cachedFood || [];
+    bird.cachedFood.push(...foods);
+    this.board.cachedFood += foods.length;
+  }
+
+  // Recompute the totals from the birds (a player restored from a snapshot)
+  recount() {
+    this.board = { birds: 0, points: 0, eggs: 0, tuckedCards: 0, cachedFood: 0 };
+    Object.values(this.habitats).forEach(birds => birds.forEach(bird => this.countBird(bird)));
+  }
+
+  countBird(bird) {
+    this.board.birds += 1;
+    this.board.points += bird.points || 0;
+    this.board.eggs += bird.eggs || 0;
+    this.board.tuckedCards += bird.tuckedCards?.length || 0;
+    this.board.cachedFood += bird.cachedFood?.length || 0;
   }
 
   generateColor() {
@@ -63,11 +63,8 @@ export class EndOfRound {
         const match = text.match(/(\d+)/);
         const count = match ? parseInt(match[0]) : 1;
         const tuckedCount = Math.min(count, player.hand.length);
-        bird.tuckedCards = bird.tuckedCards || [];
-        
         for (let i = 0; i < tuckedCount; i++) {
-          const card = player.hand.pop();
-          bird.tuckedCards.push(card);
+          player.tuck(bird, player.hand.pop());
         }
         
         message = `⚡ ${bird.name} tucked ${tuckedCount} card(s) at end of round!`;
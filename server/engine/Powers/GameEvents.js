@@ -1,5 +1,42 @@
+import { PowerParser } from "./PowerParser.js";
+
+// Bucket for triggers that do not depend on the event's details
+const ANY = "*";
+
+/**
+ * Where each between-turn trigger is filed in the dispatch index, and which
+ * buckets an emitted event looks in. `trigger` returns the bucket for a
+ * trigger, or null when its handler could never fire (nothing is indexed);
+ * `data` returns the buckets an event reaches.
+ */
+const FILTERS = {
+  PLAYER_GAINS_FOOD: {
+    // Only rodent powers are implemented
+    trigger: t => (t.foodType === "rodent" ? t.foodType : null),
+    data: d => d.foodTypes || []
+  },
+  PLAYER_LAYS_EGGS: {
+    trigger: t => (t.nestType ? ANY : null),
+    data: () => [ANY]
+  },
+  PLAYER_PLAYS_BIRD: {
+    trigger: t => (t.habitat && ["invertebrate", "fish", "tuck"].includes(t.reward) ? t.habitat : null),
+    data: d => [d.habitat]
+  },
+  PREDATOR_SUCCEEDS: {
+    trigger: () => ANY,
+    data: () => [ANY]
+  }
+};
+
 /**
- * Game Event System for tracking player actions and triggering between-turn powers
+ * Game Event System for tracking player actions and triggering between-turn powers.
+ *
+ * Birds' between-turn powers live in a dispatch index: event -> bucket
+ * (food, habitat, ...; see FILTERS) -> powers, kept in seat, habitat and
+ * column order so they fire in the same order however the index was built.
+ * A bird is added when it is played (addBird), so emit() only calls the
+ * powers that can fire on the event.
  */
 export class GameEvents {
   constructor() {
@@ -13,6 +50,17 @@ export class GameEvents {
       ROUND_ENDS: [],
       GAME_ENDS: []
     };
+
+    // Handler for each event a between-turn power can listen to
+    this.handlers = {
+      PLAYER_GAINS_FOOD: this.handleWhenOtherGainsFood,
+      PLAYER_LAYS_EGGS: this.handleWhenOtherLaysEggs,
+      PLAYER_PLAYS_BIRD: this.handleWhenOtherPlaysBird,
+      PREDATOR_SUCCEEDS: this.handleWhenOtherPredatorSucceeds
+    };
+
+    // event -> Map(bucket -> [{ bird, owner, game, trigger, rank }])
+    this.index = {};
   }
 
   /**
@@ -34,144 +82,125 @@ export class GameEvents {
   }
 
   /**
-   * Emit an event and execute all registered listeners
+   * Emit an event: run the indexed between-turn powers it can trigger, then
+   * any registered listeners. Returns their results.
    */
   emit(eventType, data) {
-    if (this.listeners[eventType]) {
-      const results = [];
-      for (const callback of this.listeners[eventType]) {
-        try {
-          const result = callback(data);
-          if (result) {
-            results.push(result);
-          }
-        } catch (error) {
-          console.error(`Error in event listener for ${eventType}:`, error);
+    const results = [];
+    const call = (run) => {
+      try {
+        const result = run();
+        if (result) {
+          results.push(result);
+        }
+      } catch (error) {
+        console.error(`Error in event listener for ${eventType}:`, error);
+      }
+    };
+
+    const buckets = this.index[eventType];
+    if (buckets) {
+      const handler = this.handlers[eventType];
+      for (const key of new Set(FILTERS[eventType].data(data))) {
+        for (const { bird, owner, game, trigger } of buckets.get(key) || []) {
+          // Don't trigger on own action
+          if (owner.id === data.playerId) continue;
+          call(() => handler.call(this, bird, owner, data, game, trigger));
         }
       }
-      return results;
     }
-    return [];
+    for (const callback of this.listeners[eventType] || []) {
+      call(() => callback(data));
+    }
+    return results;
   }
 
   /**
-   * Clear all listeners
+   * Clear all listeners and indexed powers
    */
   clear() {
     Object.keys(this.listeners).forEach(key => {
       this.listeners[key] = [];
     });
+    this.index = {};
   }
 
   /**
-   * Register all between-turn powers for all players
+   * Rebuild the index from every player's board (a game restored from a
+   * snapshot). During play, addBird() keeps it up to date.
    */
   registerBetweenTurnPowers(game) {
-    // Clear existing listeners
-    this.clear();
-
-    // Register powers for each player
+    this.index = {};
     game.players.forEach(player => {
-      // Check all habitats for birds with between-turn powers
-      ['forest', 'grasslands', 'wetlands'].forEach(habitat => {
-        const birds = player.habitats[habitat] || [];
-        birds.forEach(bird => {
-          if (bird && bird.power && bird.power.type === 'WHEN_ACTIVATED') {
-            this.registerBirdPower(bird, player, game);
-          }
-        });
+      Object.values(player.habitats).forEach(birds => {
+        birds.forEach(bird => this.addBird(bird, player, game));
       });
     });
   }
 
   /**
-   * Register a single bird's between-turn power
+   * Index a bird's between-turn power, if it has one; call when the bird is
+   * placed on its owner's board
    */
-  registerBirdPower(bird, ownerPlayer, game) {
-    const powerText = bird.power.effect;
-    if (!powerText || typeof powerText !== 'string') return;
-
-    const text = powerText.toLowerCase();
-
-    // Check if this is a between-turn power
-    if (!text.includes('when another player')) return;
-
-    // WHEN OTHER PLAYER GAINS FOOD
-    if (text.includes('"gain food"')) {
-      this.on('PLAYER_GAINS_FOOD', (data) => {
-        // Don't trigger on own action
-        if (data.playerId === ownerPlayer.id) return null;
-
-        const result = this.handleWhenOtherGainsFood(bird, ownerPlayer, data, game);
-        return result;
-      });
-    }
-
-    // WHEN OTHER PLAYER LAYS EGGS
-    if (text.includes('"lay eggs"')) {
-      this.on('PLAYER_LAYS_EGGS', (data) => {
-        // Don't trigger on own action
-        if (data.playerId === ownerPlayer.id) return null;
-
-        const result = this.handleWhenOtherLaysEggs(bird, ownerPlayer, data, game);
-        return result;
-      });
-    }
-
-    // WHEN OTHER PLAYER PLAYS BIRD
-    if (text.includes('plays a') && text.includes('bird')) {
-      this.on('PLAYER_PLAYS_BIRD', (data) => {
-        // Don't trigger on own action
-        if (data.playerId === ownerPlayer.id) return null;
-
-        const result = this.handleWhenOtherPlaysBird(bird, ownerPlayer, data, game);
-        return result;
-      });
-    }
-
-    // WHEN OTHER PLAYER'S PREDATOR SUCCEEDS
-    if (text.includes('predator succeeds')) {
-      this.on('PREDATOR_SUCCEEDS', (data) => {
-        // Don't trigger on own action
-        if (data.playerId === ownerPlayer.id) return null;
+  addBird(bird, ownerPlayer, game) {
+    if (!bird || !bird.power || bird.power.type !== 'WHEN_ACTIVATED') return;
+
+    // Events come precompiled with the card (power.parsed), no text matching here
+    const { events } = PowerParser.compile(bird.power);
+    const rank = this.rank(bird, ownerPlayer, game);
+
+    events.forEach(trigger => {
+      const filter = FILTERS[trigger.event];
+      const key = filter && filter.trigger(trigger);
+      if (key == null) return;
+
+      if (!this.index[trigger.event]) this.index[trigger.event] = new Map();
+      const buckets = this.index[trigger.event];
+      if (!buckets.has(key)) buckets.set(key, []);
+      const bucket = buckets.get(key);
+
+      // Keep board order; a bird's own triggers stay in the order it lists them
+      let at = bucket.length;
+      while (at > 0 && compareRanks(bucket[at - 1].rank, rank) > 0) at--;
+      bucket.splice(at, 0, { bird, owner: ownerPlayer, game, trigger, rank });
+    });
+  }
 
-        const result = this.handleWhenOtherPredatorSucceeds(bird, ownerPlayer, data, game);
-        return result;
-      });
-    }
+  // Seat, habitat and column of a bird on the board
+  rank(bird, ownerPlayer, game) {
+    const habitats = Object.values(ownerPlayer.habitats);
+    const row = habitats.findIndex(birds => birds.includes(bird));
+    return [game.players.indexOf(ownerPlayer), row, habitats[row]?.indexOf(bird) ?? -1];
   }
 
   /**
    * Handle "When another player gains food" powers
    */
-  handleWhenOtherGainsFood(bird, ownerPlayer, data, game) {
-    const text = bird.power.effect.toLowerCase();
-
-    // Check if specific food type is mentioned
-    if (text.includes('rodent') || text.includes('[rodent]')) {
-      // Check if the other player gained rodent
-      if (data.foodTypes && data.foodTypes.includes('rodent')) {
-        // This player gains 1 rodent and caches it
-        if (text.includes('cache')) {
-          bird.cachedFood = bird.cachedFood || [];
-          bird.cachedFood.push('rodent');
-          game.logs.push(`${ownerPlayer.name}'s ${bird.name} cached 1 rodent (between-turn power)`);
-          return {
-            playerId: ownerPlayer.id,
-            playerName: ownerPlayer.name,
-            birdName: bird.name,
-            message: `⚡ ${ownerPlayer.name}'s ${bird.name} cached 1 rodent!`
-          };
-        } else {
-          ownerPlayer.food.rodent = (ownerPlayer.food.rodent || 0) + 1;
-          game.logs.push(`${ownerPlayer.name}'s ${bird.name} gained 1 rodent (between-turn power)`);
-          return {
-            playerId: ownerPlayer.id,
-            playerName: ownerPlayer.name,
-            birdName: bird.name,
-            message: `⚡ ${ownerPlayer.name}'s ${bird.name} gained 1 rodent!`
-          };
-        }
+  handleWhenOtherGainsFood(bird, ownerPlayer, data, game, trigger) {
+    // Only rodent powers are implemented
+    if (trigger.foodType !== 'rodent') return null;
+
+    // Check if the other player gained rodent
+    if (data.foodTypes && data.foodTypes.includes('rodent')) {
+      // This player gains 1 rodent and caches it
+      if (trigger.cache) {
+        ownerPlayer.cache(bird, 'rodent');
+        game.logs.push(`${ownerPlayer.name}'s ${bird.name} cached 1 rodent (between-turn power)`);
+        return {
+          playerId: ownerPlayer.id,
+          playerName: ownerPlayer.name,
+          birdName: bird.name,
+          message: `⚡ ${ownerPlayer.name}'s ${bird.name} cached 1 rodent!`
+        };
+      } else {
+        ownerPlayer.food.rodent = (ownerPlayer.food.rodent || 0) + 1;
+        game.logs.push(`${ownerPlayer.name}'s ${bird.name} gained 1 rodent (between-turn power)`);
+        return {
+          playerId: ownerPlayer.id,
+          playerName: ownerPlayer.name,
+          birdName: bird.name,
+          message: `⚡ ${ownerPlayer.name}'s ${bird.name} gained 1 rodent!`
+        };
       }
     }
 
@@ -181,16 +210,8 @@ export class GameEvents {
   /**
    * Handle "When another player lays eggs" powers
    */
-  handleWhenOtherLaysEggs(bird, ownerPlayer, data, game) {
-    const text = bird.power.effect.toLowerCase();
-
-    // Extract nest type from power text
-    let targetNestType = null;
-    if (text.includes('[ground]')) targetNestType = 'ground';
-    else if (text.includes('[bowl]')) targetNestType = 'bowl';
-    else if (text.includes('[cavity]')) targetNestType = 'cavity';
-    else if (text.includes('[platform]')) targetNestType = 'platform';
-
+  handleWhenOtherLaysEggs(bird, ownerPlayer, data, game, trigger) {
+    const targetNestType = trigger.nestType;
     if (!targetNestType) return null;
 
     // Find a bird with the target nest type in owner's habitats
@@ -210,7 +231,7 @@ export class GameEvents {
     }
 
     if (targetBird) {
-      targetBird.eggs = (targetBird.eggs || 0) + 1;
+      ownerPlayer.addEggs(targetBird, 1);
       game.logs.push(`${ownerPlayer.name}'s ${bird.name} laid 1 egg on ${targetBird.name} (between-turn power)`);
       return {
         playerId: ownerPlayer.id,
@@ -226,40 +247,22 @@ export class GameEvents {
   /**
    * Handle "When another player plays bird" powers
    */
-  handleWhenOtherPlaysBird(bird, ownerPlayer, data, game) {
-    const text = bird.power.effect.toLowerCase();
-
-    // Extract habitat from power text
-    let targetHabitat = null;
-    if (text.includes('[forest]')) targetHabitat = 'forest';
-    else if (text.includes('[grassland]')) targetHabitat = 'grasslands';
-    else if (text.includes('[wetland]')) targetHabitat = 'wetlands';
-
+  handleWhenOtherPlaysBird(bird, ownerPlayer, data, game, trigger) {
     // Check if the played bird matches the habitat
-    if (targetHabitat && data.habitat === targetHabitat) {
+    if (trigger.habitat && data.habitat === trigger.habitat) {
       // Gain food or tuck card based on power text
-      if (text.includes('gain') && text.includes('invertebrate')) {
-        ownerPlayer.food.invertebrate = (ownerPlayer.food.invertebrate || 0) + 1;
-        game.logs.push(`${ownerPlayer.name}'s ${bird.name} gained 1 invertebrate (between-turn power)`);
+      if (trigger.reward === 'invertebrate' || trigger.reward === 'fish') {
+        const food = trigger.reward;
+        ownerPlayer.food[food] = (ownerPlayer.food[food] || 0) + 1;
+        game.logs.push(`${ownerPlayer.name}'s ${bird.name} gained 1 ${food} (between-turn power)`);
         return {
           playerId: ownerPlayer.id,
           playerName: ownerPlayer.name,
           birdName: bird.name,
-          message: `⚡ ${ownerPlayer.name}'s ${bird.name} gained 1 invertebrate!`
+          message: `⚡ ${ownerPlayer.name}'s ${bird.name} gained 1 ${food}!`
         };
-      } else if (text.includes('gain') && text.includes('fish')) {
-        ownerPlayer.food.fish = (ownerPlayer.food.fish || 0) + 1;
-        game.logs.push(`${ownerPlayer.name}'s ${bird.name} gained 1 fish (between-turn power)`);
-        return {
-          playerId: ownerPlayer.id,
-          playerName: ownerPlayer.name,
-          birdName: bird.name,
-          message: `⚡ ${ownerPlayer.name}'s ${bird.name} gained 1 fish!`
-        };
-      } else if (text.includes('tuck') && ownerPlayer.hand.length > 0) {
-        const tuckedCard = ownerPlayer.hand.pop();
-        bird.tuckedCards = bird.tuckedCards || [];
-        bird.tuckedCards.push(tuckedCard);
+      } else if (trigger.reward === 'tuck' && ownerPlayer.hand.length > 0) {
+        ownerPlayer.tuck(bird, ownerPlayer.hand.pop());
         game.logs.push(`${ownerPlayer.name}'s ${bird.name} tucked a card (between-turn power)`);
         return {
           playerId: ownerPlayer.id,
@@ -293,3 +296,10 @@ export class GameEvents {
     return null;
   }
 }
+
+function compareRanks(a, b) {
+  for (let i = 0; i < a.length; i++) {
+    if (a[i] !== b[i]) return a[i] - b[i];
+  }
+  return 0;
+}
@@ -1,6 +1,17 @@
 /**
- * Parses bird power text descriptions into structured effect types
+ * Parses bird power text descriptions into structured effect types.
+ *
+ * The data pipeline (scripts/power_grammar.py) runs the same rules once and
+ * stores the result on each card as power.parsed, so normally nothing is
+ * parsed at runtime. Cards without a current parsed record are compiled from
+ * their text here, once per power object. Keep both in step and bump
+ * GRAMMAR_VERSION together.
  */
+export const GRAMMAR_VERSION = 1;
+
+// Compiled records for powers that arrived without one (power object -> record)
+const compiledPowers = new WeakMap();
+
 export class PowerParser {
   /**
    * Parse a power text description and return structured effect data
@@ -8,11 +19,45 @@ export class PowerParser {
    * @returns {Object} - Structured power data with effectType and parameters
    */
   static parse(power) {
-    if (!power || !power.effect) {
+    if (!power) {
       return { effectType: "NONE", params: {} };
     }
+    return this.compile(power);
+  }
+
+  /**
+   * The full compiled record for a power: trigger, effectType, params, the
+   * between-turn events it listens to and (WHEN_PLAYED) what it does.
+   * Precomputed records from the data files are used as they are.
+   */
+  static compile(power) {
+    if (power.parsed && power.parsed.version === GRAMMAR_VERSION) {
+      return power.parsed;
+    }
+    let record = compiledPowers.get(power);
+    if (!record) {
+      record = this.compileText(power);
+      compiledPowers.set(power, record);
+    }
+    return record;
+  }
+
+  static compileText(power) {
+    const record = { version: GRAMMAR_VERSION, trigger: power.type };
+    if (!power.effect || typeof power.effect !== "string") {
+      return { ...record, effectType: "NONE", params: {}, events: [] };
+    }
 
     const text = power.effect.toLowerCase();
+    const { effectType, params } = this.parseEffect(text, power);
+    Object.assign(record, { effectType, params, events: this.parseEvents(text) });
+    if (power.type === "WHEN_PLAYED") {
+      record.whenPlayed = this.parseWhenPlayed(text);
+    }
+    return record;
+  }
+
+  static parseEffect(text, power) {
 
     // Check for "When another player" - these are between-turn powers
     if (text.includes("when another player")) {
@@ -117,6 +162,52 @@ export class PowerParser {
     return { effectType: "UNKNOWN", params: { text } };
   }
 
+  /**
+   * Events a "when another player ..." power listens to, with what each
+   * handler needs. One power can listen to several events.
+   */
+  static parseEvents(text) {
+    if (!text.includes("when another player")) return [];
+
+    const events = [];
+    if (text.includes('"gain food"')) {
+      events.push({
+        event: "PLAYER_GAINS_FOOD",
+        foodType: text.includes("rodent") ? "rodent" : null,
+        cache: text.includes("cache")
+      });
+    }
+    if (text.includes('"lay eggs"')) {
+      const nestType = this.extractNestType(text);
+      events.push({ event: "PLAYER_LAYS_EGGS", nestType: nestType === "any" ? null : nestType });
+    }
+    if (text.includes("plays a") && text.includes("bird")) {
+      const habitat = this.extractHabitat(text);
+      let reward = null;
+      if (text.includes("gain") && text.includes("invertebrate")) reward = "invertebrate";
+      else if (text.includes("gain") && text.includes("fish")) reward = "fish";
+      else if (text.includes("tuck")) reward = "tuck";
+      events.push({ event: "PLAYER_PLAYS_BIRD", habitat: habitat === "any" ? null : habitat, reward });
+    }
+    if (text.includes("predator succeeds")) {
+      events.push({ event: "PREDATOR_SUCCEEDS" });
+    }
+    return events;
+  }
+
+  /**
+   * What a WHEN_PLAYED power does, checked in the order WhenPlayed applies them
+   */
+  static parseWhenPlayed(text) {
+    if (text.includes("draw") && text.includes("card")) return { action: "DRAW_CARD" };
+    if (text.includes("gain") && text.includes("food")) {
+      return { action: "GAIN_FOOD", foodType: this.extractFoodType(text) };
+    }
+    if (text.includes("lay") && text.includes("egg")) return { action: "LAY_EGG" };
+    if (text.includes("tuck") && text.includes("card")) return { action: "TUCK_CARD" };
+    return { action: "NONE" };
+  }
+
   static extractNestType(text) {
     if (text.includes("[ground]")) return "ground";
     if (text.includes("[bowl]")) return "bowl";
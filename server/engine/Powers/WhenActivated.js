@@ -27,7 +27,7 @@ export class WhenActivated {
       case "LAY_EGG":
         const capacity = bird.eggCapacity || 6;
         if (bird.eggs < capacity) {
-          bird.eggs += value;
+          player.addEggs(bird, value);
           message = `⚡ ${bird.name} laid ${value} egg(s)!`;
           game.logs.push(
             `${player.name} lays ${value} egg(s) on ${bird.name} (power activated)`
@@ -78,8 +78,7 @@ export class WhenActivated {
           // For now, cache from dice tray
           if (game.diceTray && game.diceTray.dice && game.diceTray.dice.length > 0) {
             const food = game.diceTray.take(game.diceTray.dice[0]);
-            bird.cachedFood = bird.cachedFood || [];
-            bird.cachedFood.push(food);
+            player.cache(bird, food);
             message = `⚡ ${bird.name} cached 1 ${food}!`;
             game.logs.push(`${player.name} caches 1 ${food} on ${bird.name} (power activated)`);
           }
@@ -90,9 +89,7 @@ export class WhenActivated {
       case "TUCK_CARD": {
         // Tuck a card from hand under this bird
         if (player.hand.length > 0) {
-          const tuckedCard = player.hand.pop();
-          bird.tuckedCards = bird.tuckedCards || [];
-          bird.tuckedCards.push(tuckedCard);
+          player.tuck(bird, player.hand.pop());
           message = `⚡ ${bird.name} tucked a card!`;
           game.logs.push(`${player.name} tucks a card under ${bird.name} (power activated)`);
         }
@@ -106,8 +103,7 @@ export class WhenActivated {
         if (drawnCard) {
           const wingspan = drawnCard.wingspan || 0;
           if (wingspan < maxWingspan) {
-            bird.tuckedCards = bird.tuckedCards || [];
-            bird.tuckedCards.push(drawnCard);
+            player.tuck(bird, drawnCard);
             message = `⚡ ${bird.name} tucked ${drawnCard.name} (${wingspan}cm)!`;
             game.logs.push(`${player.name} tucked ${drawnCard.name} under ${bird.name} (power activated)`);
           } else {
@@ -121,13 +117,11 @@ export class WhenActivated {
       case "TUCK_AND_LAY_EGG": {
         // Tuck a card from hand and lay an egg
         if (player.hand.length > 0) {
-          const tuckedCard = player.hand.pop();
-          bird.tuckedCards = bird.tuckedCards || [];
-          bird.tuckedCards.push(tuckedCard);
-          
+          player.tuck(bird, player.hand.pop());
+
           const capacity = bird.eggCapacity || 6;
           if (bird.eggs < capacity) {
-            bird.eggs += 1;
+            player.addEggs(bird, 1);
             message = `⚡ ${bird.name} tucked a card and laid 1 egg!`;
             game.logs.push(`${player.name} tucks a card under ${bird.name} and lays 1 egg (power activated)`);
           } else {
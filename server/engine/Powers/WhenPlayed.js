@@ -7,15 +7,14 @@ export class WhenPlayed {
   static execute({ bird, player, game }) {
     if (!bird.power || bird.power.type !== "WHEN_PLAYED") return null;
 
-    const parsed = PowerParser.parse(bird.power);
-    const effectType = parsed.effectType;
+    const parsed = PowerParser.compile(bird.power);
     const params = parsed.params;
-    const text = bird.power.effect.toLowerCase();
+    const { action, foodType } = parsed.whenPlayed || { action: "NONE" };
 
     let message = null;
 
     // Common WHEN_PLAYED effects
-    if (text.includes('draw') && text.includes('card')) {
+    if (action === "DRAW_CARD") {
       const count = params.count || 1;
       const drawn = game.deck.draw(count);
       if (Array.isArray(drawn)) {
@@ -30,9 +29,8 @@ export class WhenPlayed {
         player.hand = player.hand.slice(0, 8);
       }
       game.logs.push(`${player.name} draws ${count} card(s) from ${bird.name} (when played)`);
-    } else if (text.includes('gain') && text.includes('food')) {
+    } else if (action === "GAIN_FOOD") {
       // Gain food when played
-      const foodType = this.extractFoodType(text);
       const count = params.count || 1;
       
       if (foodType === 'wild' && game.diceTray && game.diceTray.dice && game.diceTray.dice.length > 0) {
@@ -45,27 +43,24 @@ export class WhenPlayed {
         message = `⚡ ${bird.name} gained ${count} ${foodType} when played!`;
         game.logs.push(`${player.name} gains ${count} ${foodType} from ${bird.name} (when played)`);
       }
-    } else if (text.includes('lay') && text.includes('egg')) {
+    } else if (action === "LAY_EGG") {
       // Lay eggs when played
       const count = params.count || 1;
       const capacity = bird.eggCapacity || 6;
       const eggsToLay = Math.min(count, capacity - (bird.eggs || 0));
       
       if (eggsToLay > 0) {
-        bird.eggs = (bird.eggs || 0) + eggsToLay;
+        player.addEggs(bird, eggsToLay);
         message = `⚡ ${bird.name} laid ${eggsToLay} egg(s) when played!`;
         game.logs.push(`${player.name} lays ${eggsToLay} egg(s) on ${bird.name} (when played)`);
       }
-    } else if (text.includes('tuck') && text.includes('card')) {
+    } else if (action === "TUCK_CARD") {
       // Tuck cards when played
       if (player.hand.length > 0) {
         const count = params.count || 1;
         const tuckedCount = Math.min(count, player.hand.length);
-        bird.tuckedCards = bird.tuckedCards || [];
-        
         for (let i = 0; i < tuckedCount; i++) {
-          const card = player.hand.pop();
-          bird.tuckedCards.push(card);
+          player.tuck(bird, player.hand.pop());
         }
         
         message = `⚡ ${bird.name} tucked ${tuckedCount} card(s) when played!`;
@@ -83,13 +78,4 @@ export class WhenPlayed {
       message: message
     } : null;
   }
-
-  static extractFoodType(text) {
-    if (text.includes('[invertebrate]') || text.includes('invertebrate')) return 'invertebrate';
-    if (text.includes('[seed]') || text.includes('seed')) return 'seed';
-    if (text.includes('[fish]') || text.includes('fish')) return 'fish';
-    if (text.includes('[fruit]') || text.includes('fruit')) return 'fruit';
-    if (text.includes('[rodent]') || text.includes('rodent')) return 'rodent';
-    return 'wild';
-  }
 }
@@ -11,10 +11,7 @@ export class RoundGoalEngine {
           value = RoundGoalEngine.countEggs(p);
           break;
         case "goal-3":
-          value =
-            p.habitats.forest.length +
-            p.habitats.grassland.length +
-            p.habitats.wetlands.length;
+          value = p.board.birds;
           break;
         case "goal-4":
           value = p.habitats.grassland.length;
@@ -78,10 +75,6 @@ export class RoundGoalEngine {
   }
 
   static countEggs(player) {
-    return [
-      ...player.habitats.forest,
-      ...player.habitats.grassland,
-      ...player.habitats.wetlands
-    ].reduce((sum, b) => sum + (b.eggs || 0), 0);
+    return player.totalEggs();
   }
 }
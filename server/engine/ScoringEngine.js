@@ -1,28 +1,12 @@
 export class ScoringEngine {
   static scorePlayer(player) {
-    let birdPoints = 0;
-    let eggPoints = 0;
-    let tuckedCardPoints = 0;
-    let cachedFoodPoints = 0;
-
-    const birds = [
-      ...player.habitats.forest,
-      ...player.habitats.grassland,
-      ...player.habitats.wetlands
-    ];
-
-    birds.forEach(b => {
-      birdPoints += b.points || 0;
-      eggPoints += b.eggs || 0;
-      // Tucked cards: 1 point each
-      if (b.tuckedCards && b.tuckedCards.length > 0) {
-        tuckedCardPoints += b.tuckedCards.length;
-      }
-      // Cached food: 1 point each
-      if (b.cachedFood && b.cachedFood.length > 0) {
-        cachedFoodPoints += b.cachedFood.length;
-      }
-    });
+    // Tucked cards and cached food are 1 point each
+    const {
+      points: birdPoints,
+      eggs: eggPoints,
+      tuckedCards: tuckedCardPoints,
+      cachedFood: cachedFoodPoints
+    } = player.board;
 
     let bonusPoints = 0;
     if (player.bonusCard?.id === "bonus-1") {
@@ -73,11 +73,7 @@ export function canPlayBird(game, player, bird, habitat, wildFoodChoices = []) {
   
   if (eggCost > 0) {
     // Count total eggs available
-    const totalEggs = [
-      ...player.habitats.forest,
-      ...player.habitats.grassland,
-      ...player.habitats.wetlands
-    ].reduce((sum, b) => sum + (b.eggs || 0), 0);
+    const totalEggs = player.totalEggs();
     
     if (totalEggs < eggCost) {
       throw new Error(`Not enough eggs: need ${eggCost}, have ${totalEggs}`);
@@ -0,0 +1,14 @@
+// A game shard in its own process, forked by GameRouter.workers() when
+// GAME_WORKERS is set. It owns the games shardFor() assigns to GAME_SHARD
+// and talks to the socket gateway over IPC.
+import { ProcessBackplane } from "./network/Backplane.js";
+import { startShard } from "./network/GameRouter.js";
+import { createGameStore } from "./persistence/GameStore.js";
+
+const shard = Number(process.env.GAME_SHARD);
+const shards = Number(process.env.GAME_SHARDS);
+
+// The gateway went away: nothing left to serve
+process.on("disconnect", () => process.exit(0));
+
+startShard(ProcessBackplane.worker(), shard, shards, await createGameStore());
@@ -0,0 +1,96 @@
+import { EventEmitter } from "events";
+
+/**
+ * Pub/sub between the socket gateway and game shards. Messages are plain
+ * JSON published on named channels:
+ *
+ *   shard:<n>   client events for the games shard n owns (see GameRouter)
+ *   gateway     what the shards send back: emits to sockets, games restored
+ *               and finished
+ *
+ * A backplane has publish(channel, message) and subscribe(channel, handler).
+ * Delivery is asynchronous and messages are copied, as they would be
+ * across processes or machines. A networked pub/sub (Redis and the like)
+ * would slot in behind the same two methods.
+ */
+
+/** Everything in one process: the stand-in for testing sharding on one machine */
+export class LocalBackplane {
+  constructor() {
+    this.emitter = new EventEmitter();
+    this.emitter.setMaxListeners(0);
+  }
+
+  publish(channel, message) {
+    const copy = structuredClone(message);
+    setImmediate(() => this.emitter.emit(channel, copy));
+  }
+
+  subscribe(channel, handler) {
+    this.emitter.on(channel, handler);
+  }
+}
+
+/**
+ * Across the primary process and the worker processes it forked, over
+ * their IPC channels. The primary is the hub: a worker's subscriptions
+ * are registered with it, and it relays each message to whichever side
+ * subscribed to the channel.
+ */
+export class ProcessBackplane {
+  /** The primary's end; add each forked worker with attach() */
+  static hub() {
+    return new ProcessBackplane(null);
+  }
+
+  /** A worker's end, talking to the primary through process.send */
+  static worker() {
+    const backplane = new ProcessBackplane(process);
+    process.on("message", ({ channel, message }) => backplane.deliver(channel, message));
+    return backplane;
+  }
+
+  constructor(parent) {
+    this.parent = parent;
+    this.local = new EventEmitter();
+    this.local.setMaxListeners(0);
+    this.remote = new Map(); // channel -> Set(child process), hub only
+  }
+
+  attach(child) {
+    child.on("message", ({ subscribe, channel, message }) => {
+      if (subscribe) {
+        if (!this.remote.has(subscribe)) this.remote.set(subscribe, new Set());
+        this.remote.get(subscribe).add(child);
+      } else {
+        this.publish(channel, message);
+      }
+    });
+    child.on("exit", () => {
+      for (const children of this.remote.values()) children.delete(child);
+    });
+  }
+
+  deliver(channel, message) {
+    this.local.emit(channel, message);
+  }
+
+  publish(channel, message) {
+    if (this.parent) {
+      this.parent.send({ channel, message });
+      return;
+    }
+    if (this.local.listenerCount(channel)) {
+      const copy = structuredClone(message);
+      setImmediate(() => this.deliver(channel, copy));
+    }
+    for (const child of this.remote.get(channel) || []) {
+      if (child.connected) child.send({ channel, message });
+    }
+  }
+
+  subscribe(channel, handler) {
+    this.local.on(channel, handler);
+    if (this.parent) this.parent.send({ subscribe: channel });
+  }
+}
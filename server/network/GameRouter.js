@@ -0,0 +1,173 @@
+import { fork } from "child_process";
+import path from "path";
+import { fileURLToPath } from "url";
+import { GameService } from "./GameService.js";
+import { RemoteIo } from "./RemoteIo.js";
+import { LocalBackplane, ProcessBackplane } from "./Backplane.js";
+import { uid } from "../utils/uid.js";
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+// Pause before replacing a dead worker, so a crash on startup cannot spin
+const RESPAWN_DELAY_MS = 1000;
+
+/** Shard (0..shards-1) that owns a game, from its id (FNV-1a) */
+export function shardFor(gameId, shards) {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < gameId.length; i++) {
+    hash ^= gameId.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return (hash >>> 0) % shards;
+}
+
+/**
+ * Run one game shard on a backplane: a GameService for the games
+ * shardFor() assigns to `shard`, talking to clients through a RemoteIo.
+ * Used by each worker process (server/gameWorker.js) and by the
+ * in-process shards of GameRouter.localShards().
+ */
+export function startShard(backplane, shard, shards, store) {
+  const io = new RemoteIo(backplane);
+  const service = new GameService(io, store, {
+    ended: game => backplane.publish("gateway", { op: "ended", gameId: game.id, lobbyId: game.lobbyId })
+  });
+  const restored = service.restore(gameId => shardFor(gameId, shards) === shard);
+
+  backplane.subscribe(`shard:${shard}`, ({ socketId, event, payload }) => {
+    try {
+      service.handle(socketId, event, payload);
+    } catch (e) {
+      // A malformed event must not take down every game on the shard
+      console.error(`[shard ${shard}] ${event} from ${socketId} failed:`, e);
+    }
+    if (event === "disconnect") io.forget(socketId);
+  });
+  backplane.publish("gateway", {
+    op: "ready",
+    shard,
+    games: restored.map(game => ({ id: game.id, lobbyId: game.lobbyId }))
+  });
+  return service;
+}
+
+/**
+ * The socket gateway's way to the games. Client events for a game go to
+ * the GameService that owns it:
+ *
+ *   GameRouter.inProcess()    one GameService on the Socket.IO server (default)
+ *   GameRouter.localShards()  n shards in this process over a LocalBackplane,
+ *                             to exercise the sharded path on one machine
+ *   GameRouter.workers()      n forked worker processes over IPC
+ *
+ * Sharded, a game lives on shardFor(gameId); events without a game id
+ * (disconnect, leaveGame) go to every shard, and reconnectToGame finds
+ * the game from its lobby id. Shards answer on the gateway channel and
+ * the router emits to the sockets.
+ */
+export class GameRouter {
+  static async inProcess(io, store) {
+    const router = new GameRouter(io, null, 1);
+    router.service = new GameService(io, store);
+    router.service.restore();
+    return router;
+  }
+
+  static async localShards(io, shards, createStore) {
+    const backplane = new LocalBackplane();
+    const router = new GameRouter(io, backplane, shards);
+    for (let shard = 0; shard < shards; shard++) {
+      router.shardServices.push(startShard(backplane, shard, shards, await createStore()));
+    }
+    await router.ready;
+    return router;
+  }
+
+  static async workers(io, shards) {
+    const backplane = ProcessBackplane.hub();
+    const router = new GameRouter(io, backplane, shards);
+    for (let shard = 0; shard < shards; shard++) {
+      router.spawn(shard);
+    }
+    await router.ready;
+    return router;
+  }
+
+  constructor(io, backplane, shards) {
+    this.io = io;
+    this.backplane = backplane;
+    this.shards = shards;
+    this.service = null;
+    this.shardServices = []; // localShards only
+    // lobbyId -> gameId of the running games, for routing reconnectToGame
+    this.lobbies = new Map();
+    this.workerProcesses = [];
+    this.closing = false;
+    this.waiting = new Set(Array.from({ length: backplane ? shards : 0 }, (_, shard) => shard));
+
+    let ready;
+    this.ready = new Promise(resolve => (ready = resolve));
+    if (!this.waiting.size) ready();
+
+    backplane?.subscribe("gateway", message => {
+      if (message.op === "emit") {
+        this.io.to(message.to).emit(message.event, message.data);
+      } else if (message.op === "ready") {
+        message.games.forEach(game => this.lobbies.set(game.lobbyId, game.id));
+        this.waiting.delete(message.shard);
+        if (!this.waiting.size) ready();
+      } else if (message.op === "ended") {
+        if (this.lobbies.get(message.lobbyId) === message.gameId) this.lobbies.delete(message.lobbyId);
+      }
+    });
+  }
+
+  // Fork a worker process for a shard; a worker that dies is replaced,
+  // and the new one restores the shard's games from the game store
+  spawn(shard) {
+    const worker = fork(path.join(__dirname, "../gameWorker.js"), [], {
+      env: { ...process.env, GAME_SHARD: String(shard), GAME_SHARDS: String(this.shards) }
+    });
+    this.backplane.attach(worker);
+    worker.on("exit", (code, signal) => {
+      if (this.closing) return;
+      console.error(`Game worker ${shard} exited (${signal || code}), restarting`);
+      setTimeout(() => this.spawn(shard), RESPAWN_DELAY_MS);
+    });
+    this.workerProcesses[shard] = worker;
+  }
+
+  /** Start a game for a lobby on its shard. Returns the game id. */
+  createGame(lobby) {
+    const gameId = uid();
+    // One GameService finds games by lobby id itself
+    if (this.backplane) this.lobbies.set(lobby.id, gameId);
+    this.route(lobby.players[0].id, "createGame", { gameId, lobbyId: lobby.id, players: lobby.players });
+    return gameId;
+  }
+
+  route(socketId, event, payload = {}) {
+    if (this.service) {
+      this.service.handle(socketId, event, payload);
+      return;
+    }
+
+    if (event === "disconnect" || event === "leaveGame") {
+      for (let shard = 0; shard < this.shards; shard++) {
+        this.backplane.publish(`shard:${shard}`, { socketId, event, payload });
+      }
+      return;
+    }
+
+    const gameId = event === "reconnectToGame"
+      ? this.lobbies.get(String(payload.lobbyId).toLowerCase()) ?? String(payload.lobbyId).toLowerCase()
+      : String(payload.gameId);
+    this.backplane.publish(`shard:${shardFor(gameId, this.shards)}`, { socketId, event, payload });
+  }
+
+  close() {
+    this.closing = true;
+    this.workerProcesses.forEach(worker => worker.kill());
+  }
+}
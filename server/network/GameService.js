@@ -0,0 +1,227 @@
+import { Game } from "../engine/Game.js";
+import { applyAction } from "../engine/GameActions.js";
+import { StateSync } from "./StateSync.js";
+
+// Client events that act on a game, with the applyAction parameters each carries
+const ACTION_EVENTS = {
+  confirmSetup: ["keptBirdIds", "bonusCardId"],
+  gainFood: ["habitat", "foodTypes"],
+  layEggs: ["habitat", "birdIds"],
+  drawCards: ["habitat", "count", "fromTray"],
+  playBird: ["birdId", "habitat", "wildFoodChoices"],
+  exchangeResource: ["exchangeType", "params"],
+  convertFood: ["giveFoods", "getFood"],
+  discardCards: ["cardIds"],
+  selectBonusCard: ["selectedCardId"]
+};
+
+/**
+ * Client events handled by GameService; the rest (lobbies) stay with the
+ * socket gateway in server/socket.js.
+ */
+export const CLIENT_EVENTS = [
+  "reconnectToGame",
+  ...Object.keys(ACTION_EVENTS),
+  "leaveGame",
+  "stateAck",
+  "requestSnapshot",
+  "requestLogHistory"
+];
+
+// Plus the gateway's own: createGame when a lobby starts, disconnect when a socket goes away
+const EVENTS = new Set([...CLIENT_EVENTS, "createGame", "disconnect"]);
+
+/**
+ * Runs a set of games: applies players' actions, persists them and sends
+ * out state. It talks to clients only through `io`, which is either the
+ * Socket.IO server itself or, when games are sharded across processes, a
+ * RemoteIo that forwards to the gateway (see GameRouter).
+ */
+export class GameService {
+  /** `ended(game)` is called when an action finishes a game */
+  constructor(io, store, { ended = () => {} } = {}) {
+    this.io = io;
+    this.store = store;
+    this.ended = ended;
+    this.games = new Map();
+    // Versioned state: patches since each socket's acknowledged version
+    this.sync = new StateSync(io);
+  }
+
+  /** Load persisted games (those `owns` accepts). Returns the restored games. */
+  restore(owns = () => true) {
+    const games = this.store.restore(owns);
+    for (const game of games) {
+      this.games.set(game.id, game);
+      // Players still connected (a restarted worker) keep getting updates;
+      // the others rejoin with reconnectToGame
+      game.players.forEach(p => this.io.in(p.id).socketsJoin(game.id));
+    }
+    return games;
+  }
+
+  handle(socketId, event, payload = {}) {
+    if (event in ACTION_EVENTS) {
+      const params = Object.fromEntries(ACTION_EVENTS[event].map(key => [key, payload[key]]));
+      return this.perform(socketId, payload.gameId, { type: event, ...params });
+    }
+    if (EVENTS.has(event)) return this[event](socketId, payload);
+    return undefined;
+  }
+
+  // Games are created from lobbies; clients reconnect with the lobby id
+  findGame(id) {
+    return this.games.get(id) ?? [...this.games.values()].find(game => game.lobbyId === id);
+  }
+
+  reply(socketId, event, data) {
+    this.io.to(socketId).emit(event, data);
+  }
+
+  // Bonus cards offered by a power are seen only by the player choosing
+  emitPowerActivation(game, activation) {
+    if (!activation.bonusCards) {
+      this.io.to(game.id).emit("powerActivated", activation);
+      return;
+    }
+    const { bonusCards, ...visible } = activation;
+    this.io.to(game.id).except(activation.playerId).emit("powerActivated", visible);
+    this.io.to(activation.playerId).emit("powerActivated", activation);
+  }
+
+  createGame(socketId, { gameId, lobbyId, players }) {
+    const game = new Game({ id: gameId });
+    game.lobbyId = lobbyId;
+    players.forEach(p => game.addPlayer(p.name, p.id));
+
+    game.dealSetup();
+    this.games.set(game.id, game);
+    this.store.create(game);
+
+    // Move all lobby players into the game room BEFORE emitting
+    players.forEach(p => this.io.in(p.id).socketsJoin(game.id));
+
+    // Each player gets the snapshot of their own view of the game
+    players.forEach(p => {
+      this.reply(p.id, "gameStarted", this.sync.snapshotFor(p.id, game));
+    });
+    return game;
+  }
+
+  reconnectToGame(socketId, { lobbyId, playerName }) {
+    // Case-insensitive lobby lookup
+    const game = this.findGame(lobbyId.toLowerCase());
+
+    if (!game) {
+      this.reply(socketId, "reconnectError", { error: "Game not found" });
+      return;
+    }
+
+    // Find the player by name
+    const player = game.players.find(p => p.name === playerName);
+    if (!player) {
+      this.reply(socketId, "reconnectError", { error: "Player not found in game" });
+      return;
+    }
+
+    // Update the player's socket ID
+    const oldSocketId = player.id;
+    player.id = socketId;
+    if (game.pendingBonusCardSelection?.playerId === oldSocketId) {
+      game.pendingBonusCardSelection.playerId = socketId;
+    }
+
+    // Join the game room
+    this.io.in(socketId).socketsJoin(game.id);
+
+    // Notify the player they've reconnected, with a full snapshot
+    this.reply(socketId, "reconnectSuccess", {
+      message: `Reconnected as ${playerName}`,
+      ...this.sync.snapshotFor(socketId, game)
+    });
+
+    // Notify other players
+    game.logs.push(`${playerName} reconnected`);
+    this.sync.broadcast(game);
+  }
+
+  // Log a player's action, apply it to the game and send out the result.
+  // Returns the applyAction result, or null if nothing happened.
+  perform(socketId, gameId, action) {
+    const game = this.games.get(gameId);
+    const seat = game ? game.players.findIndex(p => p.id === socketId) : -1;
+    const over = game?.phase === "END";
+    action = { ...action, seat };
+
+    // Only a player's actions can change a game
+    if (seat !== -1) this.store.record(game, action);
+
+    let result;
+    try {
+      result = applyAction(game, action);
+    } catch (e) {
+      this.reply(socketId, "actionError", { error: e.message });
+      return null;
+    } finally {
+      if (seat !== -1) this.store.checkpoint(game);
+    }
+    if (!result) return null;
+
+    if (result.started) {
+      // Ensure all players are in the game room for updates
+      game.players.forEach(p => this.io.in(p.id).socketsJoin(game.id));
+    }
+
+    this.sync.broadcast(game);
+    result.activations.forEach(activation => this.emitPowerActivation(game, activation));
+    if (result.message) this.reply(socketId, "actionSuccess", { message: result.message });
+    if (result.card) this.reply(socketId, "bonusCardSelected", { card: result.card });
+    if (!over && game.phase === "END") this.ended(game);
+    return result;
+  }
+
+  // Handle player disconnect
+  disconnect(socketId) {
+    // Find any active games this player is in
+    this.sync.drop(socketId);
+    for (const game of this.games.values()) {
+      const player = game.players.find(p => p.id === socketId);
+      if (player) {
+        game.logs.push(`${player.name} disconnected`);
+        this.sync.broadcast(game);
+      }
+    }
+  }
+
+  // Handle manual leave
+  leaveGame(socketId) {
+    // Remove session data (client will do this too)
+    // Just notify the game if player is in one
+    for (const game of this.games.values()) {
+      const player = game.players.find(p => p.id === socketId);
+      if (player) {
+        game.logs.push(`${player.name} left the game`);
+        this.sync.broadcast(game);
+      }
+    }
+  }
+
+  // Client applied a state version (stateSnapshot or statePatch)
+  stateAck(socketId, { gameId, version }) {
+    this.sync.ack(socketId, gameId, version);
+  }
+
+  // Client could not apply a patch and needs the whole state
+  requestSnapshot(socketId, { gameId }) {
+    const game = this.games.get(gameId);
+    if (!game || !game.players.some(p => p.id === socketId)) return;
+    this.reply(socketId, "stateSnapshot", this.sync.snapshotFor(socketId, game));
+  }
+
+  // Older log entries than the live window in the game state, one page at a time
+  requestLogHistory(socketId, { gameId, before, limit }) {
+    const game = this.games.get(gameId);
+    if (!game || !game.players.some(p => p.id === socketId)) return;
+    this.reply(socketId, "logHistory", { gameId, ...game.logs.page({ before, limit }) });
+  }
+}
@@ -0,0 +1,82 @@
+/**
+ * The part of the Socket.IO server API GameService and StateSync use
+ * (to/in/except, emit, socketsJoin, sockets.adapter.rooms), for a game
+ * shard that has no sockets of its own. Rooms are tracked here, so every
+ * emit is resolved to socket ids locally and published to the gateway as
+ *
+ *   { op: "emit", to: [socketId, ...], event, data }
+ *
+ * which sends it with one io.to(ids).emit() (see GameRouter).
+ */
+export class RemoteIo {
+  constructor(backplane, channel = "gateway") {
+    this.backplane = backplane;
+    this.channel = channel;
+    this.rooms = new Map(); // room -> Set(socketId)
+    this.sockets = { adapter: { rooms: this.rooms } };
+  }
+
+  to(target) {
+    return new RemoteTarget(this, [].concat(target), []);
+  }
+
+  in(target) {
+    return this.to(target);
+  }
+
+  /** Socket ids in the targets (rooms or socket ids), minus the excluded ones */
+  resolve(targets, except) {
+    const excluded = new Set();
+    for (const target of except) {
+      for (const socketId of this.rooms.get(target) || [target]) excluded.add(socketId);
+    }
+    const ids = new Set();
+    for (const target of targets) {
+      for (const socketId of this.rooms.get(target) || [target]) {
+        if (!excluded.has(socketId)) ids.add(socketId);
+      }
+    }
+    return [...ids];
+  }
+
+  join(socketId, room) {
+    if (!this.rooms.has(room)) this.rooms.set(room, new Set());
+    this.rooms.get(room).add(socketId);
+  }
+
+  /** A socket disconnected: it leaves every room, as it would in Socket.IO */
+  forget(socketId) {
+    for (const [room, members] of this.rooms) {
+      members.delete(socketId);
+      if (!members.size) this.rooms.delete(room);
+    }
+  }
+}
+
+class RemoteTarget {
+  constructor(io, targets, except) {
+    this.io = io;
+    this.targets = targets;
+    this.excluded = except;
+  }
+
+  to(target) {
+    return new RemoteTarget(this.io, [...this.targets, ...[].concat(target)], this.excluded);
+  }
+
+  except(target) {
+    return new RemoteTarget(this.io, this.targets, [...this.excluded, ...[].concat(target)]);
+  }
+
+  emit(event, data) {
+    const to = this.io.resolve(this.targets, this.excluded);
+    if (to.length) this.io.backplane.publish(this.io.channel, { op: "emit", to, event, data });
+    return true;
+  }
+
+  socketsJoin(room) {
+    for (const socketId of this.io.resolve(this.targets, this.excluded)) {
+      this.io.join(socketId, room);
+    }
+  }
+}
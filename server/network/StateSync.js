@@ -0,0 +1,169 @@
+import { diff } from "../utils/stateDiff.js";
+import { publicState, privateStates, viewFor } from "./projection.js";
+
+// Versions kept per game for clients that have not acknowledged yet. A
+// client further behind than this gets a full snapshot instead of a patch.
+export const MAX_HISTORY = 32;
+
+/**
+ * Versioned game state delivery.
+ *
+ * Every broadcast numbers the game's serialized state. A socket receives
+ * either a full snapshot or a patch from the last version it acknowledged:
+ *
+ *   stateSnapshot  { gameId, version, state }
+ *   statePatch     { gameId, version, baseVersion, ops }
+ *
+ * and answers with stateAck { gameId, version }. A client that cannot apply
+ * a patch (it no longer has baseVersion) asks for requestSnapshot. New
+ * sockets, including reconnecting players, always start from a snapshot.
+ *
+ * Each socket sees its own projection of the state (see projection.js).
+ * The public part is diffed once per base version and shared; only the
+ * recipient's private part is diffed per socket.
+ */
+export class StateSync {
+  constructor(io) {
+    this.io = io;
+    // gameId -> {
+    //   version,
+    //   states: Map(version -> { public, private: Map(playerId -> private part) }),
+    //   clients: Map(socketId -> acked version)
+    // }
+    this.games = new Map();
+    this.socketGames = new Map();  // socketId -> gameId
+  }
+
+  entry(gameId) {
+    let entry = this.games.get(gameId);
+    if (!entry) {
+      entry = { version: 0, states: new Map(), clients: new Map() };
+      this.games.set(gameId, entry);
+    }
+    return entry;
+  }
+
+  track(socketId, gameId, version) {
+    const previous = this.socketGames.get(socketId);
+    if (previous && previous !== gameId) this.games.get(previous)?.clients.delete(socketId);
+    this.socketGames.set(socketId, gameId);
+    this.entry(gameId).clients.set(socketId, version);
+  }
+
+  /**
+   * Number the game's current state as a new version. The stored copies
+   * are plain JSON, so later changes to the game cannot leak into them.
+   */
+  publish(game) {
+    const entry = this.entry(game.id);
+    entry.version += 1;
+    const state = JSON.parse(JSON.stringify({
+      public: publicState(game),
+      private: [...privateStates(game)]
+    }));
+    state.private = new Map(state.private);
+    entry.states.set(entry.version, state);
+    this.prune(entry);
+    return { version: entry.version, state };
+  }
+
+  /**
+   * Publish the game's state and send every socket in its room a patch
+   * from the version it acknowledged (or a snapshot). Sockets on the same
+   * base version whose private part did not change share one message.
+   */
+  broadcast(game) {
+    const { version, state } = this.publish(game);
+    const entry = this.games.get(game.id);
+    const room = this.io.sockets.adapter.rooms.get(game.id) || new Set();
+
+    const byBase = new Map();
+    const fresh = [];
+    for (const socketId of room) {
+      const acked = entry.clients.get(socketId);
+      if (acked !== undefined && entry.states.has(acked)) {
+        if (!byBase.has(acked)) byBase.set(acked, []);
+        byBase.get(acked).push(socketId);
+      } else {
+        fresh.push(socketId);
+      }
+    }
+
+    for (const [baseVersion, socketIds] of byBase) {
+      const base = entry.states.get(baseVersion);
+      const ops = diff(base.public, state.public);
+      const shared = [];
+      for (const socketId of socketIds) {
+        const own = diff(base.private.get(socketId) ?? null, state.private.get(socketId) ?? null, ["you"]);
+        if (own.length) {
+          this.io.to(socketId).emit("statePatch", { gameId: game.id, version, baseVersion, ops: [...ops, ...own] });
+        } else {
+          shared.push(socketId);
+        }
+      }
+      if (shared.length) {
+        this.io.to(shared).emit("statePatch", { gameId: game.id, version, baseVersion, ops });
+      }
+    }
+    for (const socketId of fresh) {
+      this.track(socketId, game.id, version);
+      this.io.to(socketId).emit("stateSnapshot", {
+        gameId: game.id, version, state: viewFor(state.public, state.private.get(socketId))
+      });
+    }
+  }
+
+  /**
+   * The latest version of the game's state, as the socket's player sees
+   * it, for a socket that is about to receive it whole (game start,
+   * reconnect, requestSnapshot). Patches to the socket are based on this
+   * version from now on.
+   */
+  snapshotFor(socketId, game) {
+    const entry = this.games.get(game.id);
+    const latest = entry?.states.get(entry.version);
+    // A reconnected player has a new socket id the latest version predates
+    const current = latest && (latest.private.has(socketId) || !game.getPlayer(socketId));
+    const { version, state } = current
+      ? { version: entry.version, state: latest }
+      : this.publish(game);
+    this.track(socketId, game.id, version);
+    return { gameId: game.id, version, state: viewFor(state.public, state.private.get(socketId)) };
+  }
+
+  ack(socketId, gameId, version) {
+    const entry = this.games.get(gameId);
+    const acked = entry?.clients.get(socketId);
+    if (acked === undefined) return;
+    if (version > acked && entry.states.has(version)) {
+      entry.clients.set(socketId, version);
+      this.prune(entry);
+    }
+  }
+
+  /**
+   * Forget versions no client of the game can still be patched from,
+   * keeping at most MAX_HISTORY.
+   */
+  prune(entry) {
+    let oldest = entry.version;
+    for (const version of entry.clients.values()) {
+      oldest = Math.min(oldest, version);
+    }
+    oldest = Math.max(oldest, entry.version - MAX_HISTORY + 1);
+    for (const version of entry.states.keys()) {
+      if (version < oldest) entry.states.delete(version);
+    }
+  }
+
+  drop(socketId) {
+    const gameId = this.socketGames.get(socketId);
+    if (gameId === undefined) return;
+    this.socketGames.delete(socketId);
+    const entry = this.games.get(gameId);
+    if (entry) {
+      entry.clients.delete(socketId);
+      this.prune(entry);
+    }
+  }
+}
@@ -0,0 +1,63 @@
+// What each recipient of a game state may see.
+//
+// The state a socket receives is the game's public state plus, under
+// `you`, the private part of that socket's own player:
+//
+//   { ...publicState, you: { playerId, hand, bonusCard, bonusCards, setup: { birds, bonusCards } } }
+//
+// The public state has every player's hidden fields replaced by counts, so
+// it is the same for every recipient and is serialized once per update.
+// Keeping the private part under its own key means patches to the public
+// state never touch it, and the per-recipient work is limited to `you`.
+
+// Player fields only their owner sees; counts are published instead
+const HIDDEN = ["hand", "bonusCard", "bonusCards"];
+const HIDDEN_SETUP = ["birds", "bonusCards"];
+
+function count(value) {
+  if (Array.isArray(value)) return value.length;
+  return value ? 1 : 0;
+}
+
+export function publicPlayer(player) {
+  const visible = {};
+  for (const [key, value] of Object.entries(player)) {
+    if (!HIDDEN.includes(key) && key !== "setup") visible[key] = value;
+  }
+  visible.handCount = count(player.hand);
+  visible.bonusCardCount = count(player.bonusCard) + count(player.bonusCards);
+  visible.setup = {
+    confirmed: Boolean(player.setup?.confirmed),
+    birdCount: count(player.setup?.birds),
+    bonusCardCount: count(player.setup?.bonusCards)
+  };
+  return visible;
+}
+
+export function privatePlayer(player) {
+  const own = { playerId: player.id };
+  for (const key of HIDDEN) {
+    if (player[key] !== undefined) own[key] = player[key];
+  }
+  own.setup = {};
+  for (const key of HIDDEN_SETUP) {
+    if (player.setup?.[key] !== undefined) own.setup[key] = player.setup[key];
+  }
+  return own;
+}
+
+/** The game's serialized state with hidden player fields removed */
+export function publicState(game) {
+  const state = game.serialize();
+  return { ...state, players: game.players.map(publicPlayer) };
+}
+
+/** Private parts of every player, by player id */
+export function privateStates(game) {
+  return new Map(game.players.map(player => [player.id, privatePlayer(player)]));
+}
+
+/** The state as one recipient sees it (`you` is null for non-players) */
+export function viewFor(publicPart, privatePart) {
+  return { ...publicPart, you: privatePart ?? null };
+}
@@ -0,0 +1,69 @@
+import fs from "fs";
+import path from "path";
+
+/**
+ * Game storage on local disk. Per game:
+ *
+ *   <id>.snapshot.json   { seq, snapshot }, replaced atomically (write + rename)
+ *   <id>.wal             one JSON line { seq, action } per action since the snapshot
+ *
+ * Appends are synchronous, so an action is on disk before its result is
+ * broadcast. A torn last line (crash mid-append) is ignored on read.
+ */
+export class FileBackend {
+  constructor(dir) {
+    this.dir = dir;
+    fs.mkdirSync(dir, { recursive: true });
+  }
+
+  file(gameId, ext) {
+    return path.join(this.dir, `${gameId}.${ext}`);
+  }
+
+  gameIds() {
+    return fs.readdirSync(this.dir)
+      .filter(name => name.endsWith(".snapshot.json"))
+      .map(name => name.slice(0, -".snapshot.json".length));
+  }
+
+  readSnapshot(gameId) {
+    const file = this.file(gameId, "snapshot.json");
+    if (!fs.existsSync(file)) return null;
+    return JSON.parse(fs.readFileSync(file, "utf-8"));
+  }
+
+  writeSnapshot(gameId, seq, snapshot) {
+    const file = this.file(gameId, "snapshot.json");
+    fs.writeFileSync(`${file}.tmp`, JSON.stringify({ seq, snapshot }));
+    fs.renameSync(`${file}.tmp`, file);
+    // Everything in the log is now covered by the snapshot
+    fs.writeFileSync(this.file(gameId, "wal"), "");
+  }
+
+  readLog(gameId) {
+    const file = this.file(gameId, "wal");
+    if (!fs.existsSync(file)) return [];
+    const entries = [];
+    for (const line of fs.readFileSync(file, "utf-8").split("\n")) {
+      if (!line) continue;
+      try {
+        entries.push(JSON.parse(line));
+      } catch {
+        break;
+      }
+    }
+    return entries;
+  }
+
+  append(gameId, seq, action) {
+    fs.appendFileSync(this.file(gameId, "wal"), JSON.stringify({ seq, action }) + "\n");
+  }
+
+  remove(gameId) {
+    for (const ext of ["snapshot.json", "snapshot.json.tmp", "wal"]) {
+      fs.rmSync(this.file(gameId, ext), { force: true });
+    }
+  }
+
+  close() {}
+}
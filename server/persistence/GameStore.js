@@ -0,0 +1,147 @@
+import path from "path";
+import { fileURLToPath } from "url";
+import { Game } from "../engine/Game.js";
+import { applyAction } from "../engine/GameActions.js";
+import { FileBackend } from "./FileBackend.js";
+import { SqliteBackend } from "./SqliteBackend.js";
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+// Actions between snapshots; a restart replays at most this many per game
+const SNAPSHOT_EVERY = 50;
+
+/**
+ * Keeps running games across server restarts.
+ *
+ * Every action a player sends to a game is appended to the game's
+ * write-ahead log (numbered by seq) before it is applied. Rejected actions
+ * are logged too: some change the game before failing validation (a die
+ * taken and rerolled), and replay must fail them the same way. Every
+ * SNAPSHOT_EVERY actions (and when the game is created) the whole game is
+ * written as a compact snapshot, which also empties the log. On startup
+ * each game is rebuilt from its latest snapshot plus the logged actions
+ * after it. Finished games are deleted.
+ *
+ * Storage errors are logged, never thrown into a game: losing
+ * persistence must not stop a game in progress.
+ */
+export class GameStore {
+  constructor(backend, { snapshotEvery = SNAPSHOT_EVERY } = {}) {
+    this.backend = backend;
+    this.snapshotEvery = snapshotEvery;
+    this.seqs = new Map(); // gameId -> { seq, snapshotSeq }
+  }
+
+  guard(what, gameId, work) {
+    if (!this.backend) return undefined;
+    try {
+      return work();
+    } catch (e) {
+      console.error(`[GameStore] ${what} failed for game ${gameId}:`, e);
+      return undefined;
+    }
+  }
+
+  create(game) {
+    this.snapshot(game, 0);
+  }
+
+  /** Log an action before applying it to the game */
+  record(game, action) {
+    this.guard("record", game.id, () => {
+      const seqs = this.seqs.get(game.id);
+      // Not persisted yet (a failed create): checkpoint() snapshots it instead
+      if (!seqs) return;
+      seqs.seq += 1;
+      this.backend.append(game.id, seqs.seq, action);
+    });
+  }
+
+  /** After an action: snapshot when due, or delete the game once it is over */
+  checkpoint(game) {
+    const seqs = this.seqs.get(game.id);
+    if (game.phase === "END") {
+      this.remove(game.id);
+    } else if (!seqs || seqs.seq - seqs.snapshotSeq >= this.snapshotEvery) {
+      this.snapshot(game, seqs?.seq ?? 0);
+    }
+  }
+
+  snapshot(game, seq = this.seqs.get(game.id)?.seq ?? 0) {
+    this.guard("snapshot", game.id, () => {
+      this.backend.writeSnapshot(game.id, seq, game.toSnapshot());
+      this.seqs.set(game.id, { seq, snapshotSeq: seq });
+    });
+  }
+
+  remove(gameId) {
+    this.seqs.delete(gameId);
+    this.guard("remove", gameId, () => this.backend.remove(gameId));
+  }
+
+  /** Rebuild the stored games `owns` accepts (all by default). Returns the games. */
+  restore(owns = () => true) {
+    if (!this.backend) return [];
+    const games = [];
+    for (const gameId of this.backend.gameIds().filter(owns)) {
+      const game = this.guard("restore", gameId, () => this.restoreGame(gameId));
+      if (game) games.push(game);
+    }
+    return games;
+  }
+
+  restoreGame(gameId) {
+    const stored = this.backend.readSnapshot(gameId);
+    if (!stored) return null;
+
+    const game = Game.fromSnapshot(stored.snapshot);
+    let seq = stored.seq;
+    for (const entry of this.backend.readLog(gameId)) {
+      // Entries up to the snapshot survive a crash between snapshot and trim
+      if (entry.seq <= seq) continue;
+      if (entry.seq !== seq + 1) {
+        console.warn(`[GameStore] Game ${gameId}: log skips from ${seq} to ${entry.seq}, stopping replay`);
+        break;
+      }
+      try {
+        applyAction(game, entry.action);
+      } catch {
+        // Rejected live as well; any changes it made before failing are replayed
+      }
+      seq = entry.seq;
+    }
+
+    this.seqs.set(gameId, { seq, snapshotSeq: stored.seq });
+    if (seq > stored.seq) this.snapshot(game, seq);
+    return game;
+  }
+
+  close() {
+    this.guard("close", "-", () => this.backend.close());
+  }
+}
+
+/**
+ * The store configured by the environment:
+ *
+ *   GAME_STORE           file (default), sqlite, or off
+ *   GAME_STORE_PATH      directory (file) or database file (sqlite);
+ *                        defaults to .game-store[.sqlite] in the repo root
+ *   GAME_SNAPSHOT_EVERY  actions between snapshots (default 50)
+ */
+export async function createGameStore(env = process.env) {
+  const kind = (env.GAME_STORE || "file").toLowerCase();
+  const options = { snapshotEvery: Number(env.GAME_SNAPSHOT_EVERY) || SNAPSHOT_EVERY };
+  const root = path.join(__dirname, "../..");
+
+  if (kind === "off") return new GameStore(null, options);
+  if (kind === "sqlite") {
+    const file = env.GAME_STORE_PATH || path.join(root, ".game-store.sqlite");
+    return new GameStore(await SqliteBackend.open(file), options);
+  }
+  if (kind === "file") {
+    return new GameStore(new FileBackend(env.GAME_STORE_PATH || path.join(root, ".game-store")), options);
+  }
+  throw new Error(`Unknown GAME_STORE "${kind}" (expected file, sqlite or off)`);
+}
@@ -0,0 +1,105 @@
+/**
+ * Game storage in one SQLite file: a snapshots table with the latest
+ * snapshot per game and a wal table with the actions since it. Writing a
+ * snapshot and trimming the log happen in one transaction.
+ *
+ * Uses the built-in node:sqlite (Node 22.5+) when available, otherwise
+ * the better-sqlite3 package, which is not a dependency by default.
+ */
+async function openDatabase(file) {
+  try {
+    const { DatabaseSync } = await import("node:sqlite");
+    return new DatabaseSync(file);
+  } catch {
+    try {
+      const { default: Database } = await import("better-sqlite3");
+      return new Database(file);
+    } catch {
+      throw new Error("SQLite game store needs Node 22.5+ (node:sqlite) or `npm install better-sqlite3`");
+    }
+  }
+}
+
+export class SqliteBackend {
+  static async open(file) {
+    return new SqliteBackend(await openDatabase(file));
+  }
+
+  constructor(db) {
+    this.db = db;
+    db.exec(`
+      PRAGMA journal_mode = WAL;
+      PRAGMA synchronous = NORMAL;
+      CREATE TABLE IF NOT EXISTS snapshots (
+        game_id TEXT PRIMARY KEY,
+        seq INTEGER NOT NULL,
+        data TEXT NOT NULL
+      );
+      CREATE TABLE IF NOT EXISTS wal (
+        game_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        action TEXT NOT NULL,
+        PRIMARY KEY (game_id, seq)
+      );
+    `);
+    this.statements = {
+      gameIds: db.prepare("SELECT game_id FROM snapshots"),
+      readSnapshot: db.prepare("SELECT seq, data FROM snapshots WHERE game_id = ?"),
+      writeSnapshot: db.prepare(
+        "INSERT INTO snapshots (game_id, seq, data) VALUES (?, ?, ?) " +
+        "ON CONFLICT (game_id) DO UPDATE SET seq = excluded.seq, data = excluded.data"
+      ),
+      trimLog: db.prepare("DELETE FROM wal WHERE game_id = ? AND seq <= ?"),
+      readLog: db.prepare("SELECT seq, action FROM wal WHERE game_id = ? ORDER BY seq"),
+      append: db.prepare("INSERT INTO wal (game_id, seq, action) VALUES (?, ?, ?)"),
+      removeSnapshot: db.prepare("DELETE FROM snapshots WHERE game_id = ?"),
+      removeLog: db.prepare("DELETE FROM wal WHERE game_id = ?")
+    };
+  }
+
+  transaction(work) {
+    this.db.exec("BEGIN");
+    try {
+      work();
+      this.db.exec("COMMIT");
+    } catch (e) {
+      this.db.exec("ROLLBACK");
+      throw e;
+    }
+  }
+
+  gameIds() {
+    return this.statements.gameIds.all().map(row => row.game_id);
+  }
+
+  readSnapshot(gameId) {
+    const row = this.statements.readSnapshot.get(gameId);
+    return row ? { seq: row.seq, snapshot: JSON.parse(row.data) } : null;
+  }
+
+  writeSnapshot(gameId, seq, snapshot) {
+    this.transaction(() => {
+      this.statements.writeSnapshot.run(gameId, seq, JSON.stringify(snapshot));
+      this.statements.trimLog.run(gameId, seq);
+    });
+  }
+
+  readLog(gameId) {
+    return this.statements.readLog.all(gameId).map(row => ({ seq: row.seq, action: JSON.parse(row.action) }));
+  }
+
+  append(gameId, seq, action) {
+    this.statements.append.run(gameId, seq, JSON.stringify(action));
+  }
+
+  remove(gameId) {
+    this.transaction(() => {
+      this.statements.removeSnapshot.run(gameId);
+      this.statements.removeLog.run(gameId);
+    });
+  }
+
+  close() {
+    this.db.close();
+  }
+}
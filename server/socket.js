@@ -2,17 +2,12 @@ import express from "express";
 import { createServer } from "http";
 import { Server } from "socket.io";
 import path from "path";
+import os from "os";
 import { fileURLToPath } from "url";
-import { Game } from "./engine/Game.js";
-import { GainFood } from "./engine/Actions/GainFood.js";
-import { LayEggs } from "./engine/Actions/LayEggs.js";
-import { DrawCards } from "./engine/Actions/DrawCards.js";
-import { PlayBird } from "./engine/Actions/PlayBird.js";
-import { ExchangeResource } from "./engine/Actions/ExchangeResource.js";
-import { ConvertFood } from "./engine/Actions/ConvertFood.js";
-import { ScoringEngine } from "./engine/ScoringEngine.js";
-import { WhenPlayed } from "./engine/Powers/WhenPlayed.js";
-import { EndOfGame } from "./engine/Powers/EndOfGame.js";
+import { GameRouter } from "./network/GameRouter.js";
+import { CLIENT_EVENTS } from "./network/GameService.js";
+import { createGameStore } from "./persistence/GameStore.js";
+import { CardDatabase } from "./engine/CardDatabase.js";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -39,7 +34,24 @@ const io = new Server(httpServer, {
 });
 
 const lobbies = new Map();
-const games = new Map();
+
+// Games run in this process by default. GAME_WORKERS=n (or "auto", one per
+// core) shards them across n worker processes by game id; with
+// GAME_BACKPLANE=local the n shards run in this process instead, over the
+// in-process backplane, to test sharding without extra processes.
+const workers = process.env.GAME_WORKERS === "auto"
+  ? os.availableParallelism()
+  : Number(process.env.GAME_WORKERS) || 0;
+let router;
+if (workers <= 0) {
+  router = await GameRouter.inProcess(io, await createGameStore());
+} else if (process.env.GAME_BACKPLANE === "local") {
+  router = await GameRouter.localShards(io, workers, createGameStore);
+  console.log(`Games sharded across ${workers} in-process shards`);
+} else {
+  router = await GameRouter.workers(io, workers);
+  console.log(`Games sharded across ${workers} worker processes`);
+}
 
 io.on("connection", socket => {
   socket.on("createLobby", ({ playerName }) => {
@@ -63,591 +75,28 @@ io.on("connection", socket => {
     io.to(normalizedLobbyId).emit("lobbyUpdate", lobby);
   });
 
-  socket.on("reconnectToGame", ({ lobbyId, playerName }) => {
-    // Case-insensitive lobby lookup
-    const normalizedLobbyId = lobbyId.toLowerCase();
-    const game = games.get(normalizedLobbyId);
-    
-    if (!game) {
-      socket.emit("reconnectError", { error: "Game not found" });
-      return;
-    }
-
-    // Find the player by name
-    const player = game.players.find(p => p.name === playerName);
-    if (!player) {
-      socket.emit("reconnectError", { error: "Player not found in game" });
-      return;
-    }
-
-    // Update the player's socket ID
-    const oldSocketId = player.id;
-    player.id = socket.id;
-
-    // Join the game room
-    socket.join(normalizedLobbyId);
-
-    // Notify the player they've reconnected
-    socket.emit("reconnectSuccess", { 
-      message: `Reconnected as ${playerName}`,
-      state: game.serialize()
-    });
-
-    // Notify other players
-    game.logs.push(`${playerName} reconnected`);
-    io.to(normalizedLobbyId).emit("stateUpdate", game.serialize());
-  });
-
   socket.on("startGame", ({ lobbyId }) => {
     // Case-insensitive lobby lookup
     const normalizedLobbyId = lobbyId.toLowerCase();
     const lobby = lobbies.get(normalizedLobbyId);
     if (!lobby) return;
 
-    const game = new Game();
-    lobby.players.forEach(p => game.addPlayer(p.name, p.id));
-
-    game.dealSetup();
-    games.set(game.id, game);
-
-    // Move all lobby players into the game room BEFORE emitting
-    lobby.players.forEach(p => {
-      const s = io.sockets.sockets.get(p.id);
-      if (s) s.join(game.id);
-    });
-
-    // Emit to both lobbyId (for players still listening) and game.id (for safety)
-    const gameState = game.serialize();
-    io.to(normalizedLobbyId).emit("gameStarted", { state: gameState });
-    io.to(game.id).emit("gameStarted", { state: gameState });
-    
+    router.createGame(lobby);
     lobbies.delete(normalizedLobbyId);
   });
 
-  socket.on("confirmSetup", ({ gameId, keptBirdIds, bonusCardId }) => {
-    const game = games.get(gameId);
-    if (!game) return;
-    
-    const player = game.getPlayer(socket.id);
-    if (!player) return;
-
-    if (game.phase !== "SETUP") return;
-
-    const availableBirds =
-      (player.setup?.birds || []).filter(b => b && b.id) || [];
-    const kept = availableBirds.filter(b =>
-      (keptBirdIds || []).includes(b.id)
-    );
-
-    // Validate selection and food cost
-    const foodCount = Object.values(player.food || {}).reduce(
-      (a, b) => a + b,
-      0
-    );
-    if (kept.length > foodCount) return;
-
-    // Discard food: 1 food per bird kept
-    let toDiscard = kept.length;
-    for (const k of Object.keys(player.food)) {
-      while (player.food[k] > 0 && toDiscard > 0) {
-        player.food[k]--;
-        toDiscard--;
-      }
-    }
-
-    player.hand = kept;
-    
-    // Handle bonus card selection
-    if (bonusCardId && player.setup.bonusCards) {
-      const selectedBonus = player.setup.bonusCards.find(b => b.id === bonusCardId);
-      if (selectedBonus) {
-        player.bonusCard = selectedBonus;
-      }
-    }
-    
-    player.setup.confirmed = true;
-    game.logs.push(`${player.name} confirmed setup (kept ${kept.length} birds)`);
-
-    const allConfirmed = game.players.every(p => p.setup.confirmed);
-    
-    if (allConfirmed) {
-      game.phase = "PLAY";
-      game.startRound();
-      game.logs.push("All players confirmed setup. Game starting!");
-
-      // Ensure all players are in the game room for updates
-      game.players.forEach(p => {
-        const s = io.sockets.sockets.get(p.id);
-        if (s) s.join(game.id);
-      });
-    } else {
-      const remaining = game.players.filter(p => !p.setup.confirmed).length;
-      game.logs.push(`Waiting for ${remaining} more player(s) to confirm setup`);
-    }
-
-    // Always emit state update so all players see the progress
-    io.to(game.id).emit("stateUpdate", game.serialize());
-  });
-
-  const ensurePlayable = game => {
-    if (!game) return false;
-    // Allow actions during PLAY phase
-    if (game.phase === "PLAY" && game.turnManager.activePlayer) return true;
-    return false;
-  };
-
-  function postActionAdvance(game) {
-    // If everyone is out of cubes, advance round or end game
-    const allOut = game.players.every(p => p.actionCubes === 0);
-    if (allOut) {
-      // Score the round goal and execute END_OF_ROUND powers
-      const endOfRoundActivations = game.endRound() || [];
-      
-      // Emit END_OF_ROUND power activations
-      if (endOfRoundActivations.length > 0) {
-        endOfRoundActivations.forEach(activation => {
-          io.to(game.id).emit("powerActivated", activation);
-        });
-      }
-      
-      if (game.round.round >= game.round.maxRounds) {
-        // Execute END_OF_GAME powers before final scoring
-        const endOfGameActivations = EndOfGame.executeAll(game);
-        
-        game.phase = "END";
-        game.finalScores = ScoringEngine.scoreGame(game.players);
-        game.logs.push("Game Over! Final scores calculated.");
-        
-        // Emit END_OF_GAME power activations
-        if (endOfGameActivations.length > 0) {
-          endOfGameActivations.forEach(activation => {
-            io.to(game.id).emit("powerActivated", activation);
-          });
-        }
-        return;
-      }
-      
-      // Check if any player needs to discard cards (more than 5 in hand)
-      const needsDiscard = game.players.some(p => p.hand && p.hand.length > 5);
-      if (needsDiscard) {
-        game.phase = "DISCARD";
-        game.players.forEach(p => {
-          p.discardConfirmed = false;
-        });
-        game.logs.push("End of round: Players must discard down to 5 cards");
-        return;
-      }
-      
-      game.round.round += 1;
-      game.startRound();
-      return;
-    }
-
-    game.turnManager.advance();
-  }
-
-  socket.on("gainFood", ({ gameId, habitat, foodTypes }) => {
-    const game = games.get(gameId);
-    if (!ensurePlayable(game)) {
-      socket.emit("actionError", { error: "Game is not in playable state" });
-      return;
-    }
-    const player = game.getPlayer(socket.id);
-    if (!player) {
-      socket.emit("actionError", { error: "Player not found" });
-      return;
-    }
-
-    if (player.actionCubes <= 0) {
-      socket.emit("actionError", { error: "No action cubes remaining" });
-      return;
-    }
-    player.actionCubes -= 1;
-
-    let powerActivations = [];
-    try {
-      powerActivations = GainFood(game, player, habitat, foodTypes) || [];
-    } catch (e) {
-      player.actionCubes += 1;
-      socket.emit("actionError", { error: e.message });
-      return;
-    }
-
-    // Emit event for between-turn powers
-    const betweenTurnActivations = game.events.emit('PLAYER_GAINS_FOOD', {
-      playerId: player.id,
-      playerName: player.name,
-      habitat: habitat,
-      foodTypes: foodTypes
-    });
-    
-    // Combine all power activations
-    const allActivations = [...powerActivations, ...betweenTurnActivations].filter(Boolean);
-
-    postActionAdvance(game);
-    io.to(game.id).emit("stateUpdate", game.serialize());
-    
-    // Emit power activations to all players in the game
-    if (allActivations.length > 0) {
-      console.log(`[socket.js] Emitting ${allActivations.length} power activations`);
-      allActivations.forEach(activation => {
-        console.log(`[socket.js] Emitting powerActivated:`, JSON.stringify(activation, null, 2));
-        io.to(game.id).emit("powerActivated", activation);
-      });
-    } else {
-      console.log(`[socket.js] No power activations to emit`);
-    }
-    
-    socket.emit("actionSuccess", { message: "Gained food successfully!" });
-  });
-
-  socket.on("layEggs", ({ gameId, habitat, birdIds }) => {
-    const game = games.get(gameId);
-    if (!ensurePlayable(game)) {
-      socket.emit("actionError", { error: "Game is not in playable state" });
-      return;
-    }
-    const player = game.getPlayer(socket.id);
-    if (!player) {
-      socket.emit("actionError", { error: "Player not found" });
-      return;
-    }
-
-    if (player.actionCubes <= 0) {
-      socket.emit("actionError", { error: "No action cubes remaining" });
-      return;
-    }
-    player.actionCubes -= 1;
-
-    let powerActivations = [];
-    try {
-      powerActivations = LayEggs(game, player, habitat, birdIds) || [];
-    } catch (e) {
-      player.actionCubes += 1;
-      socket.emit("actionError", { error: e.message });
-      return;
-    }
-
-    // Emit event for between-turn powers
-    const betweenTurnActivations = game.events.emit('PLAYER_LAYS_EGGS', {
-      playerId: player.id,
-      playerName: player.name,
-      habitat: habitat,
-      eggCount: birdIds.length
-    });
-    
-    // Combine all power activations
-    const allActivations = [...powerActivations, ...betweenTurnActivations].filter(Boolean);
-
-    postActionAdvance(game);
-    io.to(game.id).emit("stateUpdate", game.serialize());
-    
-    // Emit power activations to all players in the game
-    if (allActivations.length > 0) {
-      allActivations.forEach(activation => {
-        io.to(game.id).emit("powerActivated", activation);
-      });
-    }
-    
-    socket.emit("actionSuccess", { message: `Laid ${birdIds.length} eggs successfully!` });
-  });
-
-  socket.on("drawCards", ({ gameId, habitat, count, fromTray }) => {
-    const game = games.get(gameId);
-    if (!ensurePlayable(game)) {
-      socket.emit("actionError", { error: "Game is not in playable state" });
-      return;
-    }
-    const player = game.getPlayer(socket.id);
-    if (!player) {
-      socket.emit("actionError", { error: "Player not found" });
-      return;
-    }
-
-    if (player.actionCubes <= 0) {
-      socket.emit("actionError", { error: "No action cubes remaining" });
-      return;
-    }
-    player.actionCubes -= 1;
-
-    let powerActivations = [];
-    try {
-      powerActivations = DrawCards(game, player, habitat, count, fromTray || []) || [];
-    } catch (e) {
-      player.actionCubes += 1;
-      socket.emit("actionError", { error: e.message });
-      return;
-    }
-
-    postActionAdvance(game);
-    io.to(game.id).emit("stateUpdate", game.serialize());
-    
-    // Emit power activations to all players in the game
-    if (powerActivations.length > 0) {
-      powerActivations.forEach(activation => {
-        io.to(game.id).emit("powerActivated", activation);
-      });
-    }
-    
-    socket.emit("actionSuccess", { message: `Drew ${count} cards successfully!` });
-  });
-
-  socket.on("playBird", ({ gameId, birdId, habitat, wildFoodChoices = [] }) => {
-    const game = games.get(gameId);
-    if (!ensurePlayable(game)) {
-      socket.emit("actionError", { error: "Game is not in playable state" });
-      return;
-    }
-    const player = game.getPlayer(socket.id);
-    if (!player) {
-      socket.emit("actionError", { error: "Player not found" });
-      return;
-    }
-
-    if (player.actionCubes <= 0) {
-      socket.emit("actionError", { error: "No action cubes remaining" });
-      return;
-    }
-    player.actionCubes -= 1;
-
-    try {
-      PlayBird(game, player, birdId, habitat, wildFoodChoices);
-    } catch (e) {
-      player.actionCubes += 1;
-      socket.emit("actionError", { error: e.message });
-      return;
-    }
-
-    // Normalize habitat name (wetland -> wetlands for consistency)
-    const normalizedHabitat = habitat === 'wetland' ? 'wetlands' : habitat;
-    const habitatBirds = player.habitats[normalizedHabitat];
-    
-    if (!habitatBirds || habitatBirds.length === 0) {
-      socket.emit("actionError", { error: "Bird was not placed correctly" });
-      return;
-    }
-    
-    const bird = habitatBirds[habitatBirds.length - 1];
-    const powerActivations = [];
-
-    // Execute WHEN_PLAYED power
-    if (bird && bird.power && bird.power.type === 'WHEN_PLAYED') {
-      const activation = WhenPlayed.execute({ bird, player, game });
-      if (activation) {
-        powerActivations.push(activation);
-      }
-    }
-
-    // Emit event for between-turn powers
-    const betweenTurnActivations = game.events.emit('PLAYER_PLAYS_BIRD', {
-      playerId: player.id,
-      playerName: player.name,
-      habitat: habitat,
-      birdName: bird?.name
-    });
-    
-    // Combine all power activations
-    const allActivations = [...powerActivations, ...betweenTurnActivations].filter(Boolean);
-    
-    // Re-register between-turn powers (new bird may have them)
-    game.events.registerBetweenTurnPowers(game);
-
-    postActionAdvance(game);
-    io.to(game.id).emit("stateUpdate", game.serialize());
-    
-    // Emit power activations to all players in the game
-    if (allActivations.length > 0) {
-      allActivations.forEach(activation => {
-        io.to(game.id).emit("powerActivated", activation);
-      });
-    }
-    
-    socket.emit("actionSuccess", { message: `Played ${bird?.name || "bird"} successfully!` });
-  });
-
-  // Resource exchange handler
-  socket.on("exchangeResource", ({ gameId, exchangeType, params }) => {
-    const game = games.get(gameId);
-    if (!ensurePlayable(game)) {
-      socket.emit("actionError", { error: "Game is not in playable state" });
-      return;
-    }
-    const player = game.getPlayer(socket.id);
-    if (!player) {
-      socket.emit("actionError", { error: "Player not found" });
-      return;
-    }
-
-    try {
-      ExchangeResource(game, player, exchangeType, params);
-    } catch (e) {
-      socket.emit("actionError", { error: e.message });
-      return;
-    }
-
-    io.to(game.id).emit("stateUpdate", game.serialize());
-    socket.emit("actionSuccess", { message: "Exchange completed successfully!" });
-  });
-
-  // Food conversion (2:1 ratio)
-  socket.on("convertFood", ({ gameId, giveFoods, getFood }) => {
-    const game = games.get(gameId);
-    if (!ensurePlayable(game)) {
-      socket.emit("actionError", { error: "Game is not in playable state" });
-      return;
-    }
-    const player = game.getPlayer(socket.id);
-    if (!player) {
-      socket.emit("actionError", { error: "Player not found" });
-      return;
-    }
-
-    try {
-      ConvertFood(game, player, giveFoods, getFood);
-    } catch (e) {
-      socket.emit("actionError", { error: e.message });
-      return;
-    }
-
-    io.to(game.id).emit("stateUpdate", game.serialize());
-    socket.emit("actionSuccess", { message: "Food conversion successful!" });
-  });
-
-  // End-of-round discard handler
-  socket.on("discardCards", ({ gameId, cardIds }) => {
-    const game = games.get(gameId);
-    if (!game) {
-      socket.emit("actionError", { error: "Game not found" });
-      return;
-    }
-
-    if (game.phase !== "DISCARD") {
-      socket.emit("actionError", { error: "Not in discard phase" });
-      return;
-    }
-
-    const player = game.getPlayer(socket.id);
-    if (!player) {
-      socket.emit("actionError", { error: "Player not found" });
-      return;
-    }
-
-    // Validate discard
-    if (!Array.isArray(cardIds)) {
-      socket.emit("actionError", { error: "Invalid card selection" });
-      return;
-    }
-
-    const cardsToDiscard = cardIds.length;
-    const finalHandSize = player.hand.length - cardsToDiscard;
-
-    if (finalHandSize > 5) {
-      socket.emit("actionError", { error: `Must discard to 5 cards. Currently would have ${finalHandSize} cards.` });
-      return;
-    }
-
-    if (finalHandSize < 5 && player.hand.length > 5) {
-      socket.emit("actionError", { error: "Cannot discard more than necessary" });
-      return;
-    }
-
-    // Perform discard
-    player.hand = player.hand.filter(card => !cardIds.includes(card.id));
-    player.discardConfirmed = true;
-    game.logs.push(`${player.name} discarded ${cardsToDiscard} card(s)`);
-
-    // Check if all players have confirmed discard
-    const allConfirmed = game.players.every(p => 
-      p.hand.length <= 5 || p.discardConfirmed
-    );
-
-    if (allConfirmed) {
-      // All players have discarded, start next round
-      game.phase = "PLAY";
-      game.round.round += 1;
-      game.startRound();
-      game.logs.push(`Round ${game.round.round} started`);
-    }
-
-    io.to(game.id).emit("stateUpdate", game.serialize());
-    socket.emit("actionSuccess", { message: "Discarded cards successfully!" });
-  });
-
-  // Handle bonus card selection (from bird power)
-  socket.on("selectBonusCard", ({ gameId, selectedCardId }) => {
-    const game = games.get(gameId);
-    if (!game) {
-      socket.emit("actionError", { error: "Game not found" });
-      return;
-    }
-
-    const player = game.getPlayer(socket.id);
-    if (!player) {
-      socket.emit("actionError", { error: "Player not found" });
-      return;
-    }
-
-    // Check if there's a pending bonus card selection
-    if (!game.pendingBonusCardSelection || game.pendingBonusCardSelection.playerId !== player.id) {
-      socket.emit("actionError", { error: "No pending bonus card selection" });
-      return;
-    }
-
-    const { cards, birdName } = game.pendingBonusCardSelection;
-    const selectedCard = cards.find(c => (c.instanceId || c.id) === selectedCardId);
-
-    if (!selectedCard) {
-      socket.emit("actionError", { error: "Invalid card selection" });
-      return;
-    }
-
-    // Add selected card to player's bonus cards
-    if (!player.bonusCards) {
-      player.bonusCards = [];
-    }
-    player.bonusCards.push(selectedCard);
-
-    // Return non-selected cards to bonus deck
-    cards.forEach(card => {
-      if ((card.instanceId || card.id) !== selectedCardId) {
-        game.bonusDeck.returnCard(card);
-      }
-    });
-
-    game.logs.push(`${player.name} selected a bonus card from ${birdName}'s power`);
-
-    // Clear pending selection
-    delete game.pendingBonusCardSelection;
-
-    io.to(game.id).emit("stateUpdate", game.serialize());
-    socket.emit("actionSuccess", { message: "Bonus card selected successfully!" });
-    socket.emit("bonusCardSelected", { card: selectedCard });
-  });
-
-  // Handle player disconnect
-  socket.on("disconnect", () => {
-    // Find any active games this player is in
-    for (const [gameId, game] of games.entries()) {
-      const player = game.players.find(p => p.id === socket.id);
-      if (player) {
-        game.logs.push(`${player.name} disconnected`);
-        io.to(gameId).emit("stateUpdate", game.serialize());
-      }
-    }
+  // Bird definitions: cards in game states carry only their id and own
+  // state. A client that already has this version cached gets no table.
+  socket.on("requestCardTable", ({ version } = {}) => {
+    const table = CardDatabase.cardTable();
+    socket.emit("cardTable", version === table.version ? { version } : table);
   });
 
-  // Handle manual leave
-  socket.on("leaveGame", () => {
-    // Remove session data (client will do this too)
-    // Just notify the game if player is in one
-    for (const [gameId, game] of games.entries()) {
-      const player = game.players.find(p => p.id === socket.id);
-      if (player) {
-        game.logs.push(`${player.name} left the game`);
-        io.to(gameId).emit("stateUpdate", game.serialize());
-      }
-    }
+  // Everything about a running game goes to the service that owns it
+  CLIENT_EVENTS.forEach(event => {
+    socket.on(event, payload => router.route(socket.id, event, payload));
   });
+  socket.on("disconnect", () => router.route(socket.id, "disconnect"));
 });
 
 httpServer.listen(PORT, () => {
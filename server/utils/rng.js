@@ -0,0 +1,32 @@
+import crypto from "crypto";
+
+/**
+ * Small seedable random number generator (mulberry32).
+ *
+ * Its whole state is one 32-bit integer, so a game can store it in a
+ * snapshot and replay logged actions with exactly the same shuffles and
+ * dice rolls.
+ */
+export class Rng {
+  constructor(seed = Rng.seed()) {
+    this.state = seed >>> 0;
+  }
+
+  static seed() {
+    return crypto.randomInt(2 ** 32);
+  }
+
+  /** Float in [0, 1), like Math.random() */
+  next() {
+    this.state = (this.state + 0x6d2b79f5) >>> 0;
+    let t = this.state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  }
+
+  /** Integer in [0, n) */
+  int(n) {
+    return Math.floor(this.next() * n);
+  }
+}
@@ -0,0 +1,49 @@
+// Structural diff between two plain JSON values (no functions, no undefined).
+//
+// A patch is a list of operations, applied in order:
+//   { op: "set", path, value }         replace (or add) the value at path
+//   { op: "del", path }                delete an object key
+//   { op: "push", path, values }       append values to the array at path
+//   { op: "truncate", path, length }   shorten the array at path
+//
+// path is a list of object keys and array indexes; [] is the whole value.
+// Arrays are compared index by index, so appends (logs) cost only the new
+// entries. The client applies patches with client/src/state/statePatch.js.
+
+function isContainer(value) {
+  return value !== null && typeof value === "object";
+}
+
+export function diff(prev, next, path = [], ops = []) {
+  if (prev === next) return ops;
+
+  if (!isContainer(prev) || !isContainer(next) || Array.isArray(prev) !== Array.isArray(next)) {
+    ops.push({ op: "set", path, value: next });
+    return ops;
+  }
+
+  if (Array.isArray(next)) {
+    const common = Math.min(prev.length, next.length);
+    for (let i = 0; i < common; i++) {
+      diff(prev[i], next[i], [...path, i], ops);
+    }
+    if (next.length < prev.length) {
+      ops.push({ op: "truncate", path, length: next.length });
+    } else if (next.length > prev.length) {
+      ops.push({ op: "push", path, values: next.slice(common) });
+    }
+    return ops;
+  }
+
+  for (const key of Object.keys(prev)) {
+    if (!(key in next)) ops.push({ op: "del", path: [...path, key] });
+  }
+  for (const key of Object.keys(next)) {
+    if (key in prev) {
+      diff(prev[key], next[key], [...path, key], ops);
+    } else {
+      ops.push({ op: "set", path: [...path, key], value: next[key] });
+    }
+  }
+  return ops;
+}
@@ -0,0 +1,44 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { applyAction } from "../../server/engine/GameActions.js";
+import { newGame, playGame, tryAction, plain } from "../helpers/bot.js";
+
+test("the same game and actions always give the same state", () => {
+  const actions = [];
+  const game = playGame(newGame({ seed: 11 }), { seed: 4, each: action => actions.push(action) });
+  assert.equal(game.phase, "END");
+
+  // Replaying the actions, rejected ones included, on a game with the same seed
+  const replayed = newGame({ seed: 11 });
+  actions.forEach(action => tryAction(replayed, action));
+  assert.deepEqual(plain(replayed.serialize()), plain(game.serialize()));
+  assert.deepEqual(replayed.toSnapshot(), game.toSnapshot());
+});
+
+test("actions run in lockstep on two games with the same seed", () => {
+  const a = newGame({ seed: 12, players: 4 });
+  const b = newGame({ seed: 12, players: 4 });
+  playGame(a, {
+    seed: 6,
+    each: action => {
+      tryAction(b, action);
+      assert.deepEqual(plain(b.serialize()), plain(a.serialize()));
+    }
+  });
+});
+
+test("a rejected turn action throws and gives the action cube back", () => {
+  const game = newGame({ seed: 2, players: 2 });
+  game.players.forEach((player, seat) => {
+    applyAction(game, { type: "confirmSetup", seat, keptBirdIds: [], bonusCardId: player.setup.bonusCards[0].id });
+  });
+  const seat = game.players.indexOf(game.turnManager.activePlayer);
+  const cubes = game.players[seat].actionCubes;
+
+  assert.throws(
+    () => applyAction(game, { type: "playBird", seat, birdId: "no-such-bird", habitat: "forest" }),
+    /Bird not in hand/
+  );
+  assert.equal(game.players[seat].actionCubes, cubes);
+  assert.throws(() => applyAction(game, { type: "fly", seat }), /Unknown action fly/);
+});
@@ -0,0 +1,94 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { Game } from "../../server/engine/Game.js";
+import { GameEvents } from "../../server/engine/Powers/GameEvents.js";
+import { CardDatabase } from "../../server/engine/CardDatabase.js";
+import { applyAction } from "../../server/engine/GameActions.js";
+import { newGame, playGame, plain } from "../helpers/bot.js";
+
+// What the index holds, in a form two indexes can be compared by
+function indexed(events) {
+  const out = {};
+  for (const [event, buckets] of Object.entries(events.index)) {
+    for (const [key, bucket] of buckets) {
+      out[`${event}/${key}`] = bucket.map(({ bird, owner, trigger, rank }) => ({ bird: bird.id, owner: owner.id, trigger, rank }));
+    }
+  }
+  return out;
+}
+
+function rebuilt(game) {
+  const events = new GameEvents();
+  events.registerBetweenTurnPowers(game);
+  return events;
+}
+
+test("the index kept up during play matches a full rebuild", () => {
+  for (const seed of [1, 2, 3, 4]) {
+    const game = newGame({ seed, players: 4 });
+    playGame(game, {
+      seed,
+      each: () => assert.deepEqual(indexed(game.events), indexed(rebuilt(game)))
+    });
+    assert.equal(game.phase, "END");
+  }
+});
+
+test("emit fires powers in seat, habitat and column order however the birds were played", () => {
+  const game = newGame({ seed: 7, players: 3 });
+  game.players.forEach((player, seat) => {
+    applyAction(game, { type: "confirmSetup", seat, keptBirdIds: [], bonusCardId: player.setup.bonusCards[0].id });
+  });
+
+  // Birds in the order they were played, which is not board order
+  const played = [
+    [2, "grassland", "bird-19"], // predator succeeds
+    [0, "wetlands", "bird-17"], // another player plays in wetlands
+    [1, "forest", "bird-20"], // predator succeeds
+    [0, "grassland", "bird-12"], // another player lays eggs: bowl
+    [2, "forest", "bird-16"], // another player plays in forest; a bowl nest
+    [0, "forest", "bird-18"], // predator succeeds
+    [1, "grassland", "bird-14"], // another player lays eggs: bowl
+    [1, "forest", "bird-10"], // another player gains a rodent; a bowl nest
+    [2, "forest", "bird-13"], // another player lays eggs: bowl
+    [0, "forest", "bird-10"]
+  ];
+  for (const [seat, habitat, id] of played) {
+    const player = game.players[seat];
+    const bird = CardDatabase.instance(CardDatabase.getBird(id), { eggs: 0 });
+    player.placeBird(habitat, bird);
+    game.events.addBird(bird, player, game);
+  }
+
+  // A restored game rebuilds its index from the boards
+  const restored = Game.fromSnapshot(game.toSnapshot());
+  assert.deepEqual(indexed(game.events), indexed(restored.events));
+
+  const [first, second] = game.players.map(p => p.id);
+  const emits = [
+    ["PREDATOR_SUCCEEDS", { playerId: "someone" }],
+    ["PLAYER_GAINS_FOOD", { playerId: second, foodTypes: ["rodent", "seed"] }],
+    ["PLAYER_LAYS_EGGS", { playerId: "someone" }],
+    ["PLAYER_PLAYS_BIRD", { playerId: first, habitat: "forest" }],
+    ["PLAYER_PLAYS_BIRD", { playerId: "someone", habitat: "wetlands" }],
+    ["PREDATOR_SUCCEEDS", { playerId: first }]
+  ];
+  const fired = [];
+  for (const [event, data] of emits) {
+    const live = game.events.emit(event, data);
+    assert.deepEqual(plain(live), plain(restored.events.emit(event, data)), event);
+    fired.push(live.map(a => `${a.playerName}: ${a.birdName}`));
+  }
+  assert.deepEqual(plain(restored.serialize()), plain(game.serialize()));
+
+  const [p1, p2, p3] = game.players.map(p => p.name);
+  const bird = id => CardDatabase.getBird(id).name;
+  assert.deepEqual(fired, [
+    [`${p1}: ${bird("bird-18")}`, `${p2}: ${bird("bird-20")}`, `${p3}: ${bird("bird-19")}`],
+    [`${p1}: ${bird("bird-10")}`],
+    [`${p1}: ${bird("bird-12")}`, `${p2}: ${bird("bird-14")}`, `${p3}: ${bird("bird-13")}`],
+    [`${p3}: ${bird("bird-16")}`],
+    [`${p1}: ${bird("bird-17")}`],
+    [`${p2}: ${bird("bird-20")}`, `${p3}: ${bird("bird-19")}`]
+  ]);
+});
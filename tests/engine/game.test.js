@@ -0,0 +1,124 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import fs from "fs";
+import os from "os";
+import path from "path";
+import { createGameStore } from "../../server/persistence/GameStore.js";
+import { CardDatabase } from "../../server/engine/CardDatabase.js";
+import { Rng } from "../../server/utils/rng.js";
+import { newGame, nextAction, tryAction, plain } from "../helpers/bot.js";
+
+const sqliteAvailable = await import("node:sqlite").then(
+  () => true,
+  () => import("better-sqlite3").then(() => true, () => false)
+);
+
+function tempPath(name) {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), "wingspan-store-"));
+  return path.join(dir, name);
+}
+
+// Log, apply and checkpoint an action, as GameService.perform does
+function act(store, game, action) {
+  store.record(game, action);
+  const result = tryAction(game, action);
+  store.checkpoint(game);
+  return result;
+}
+
+function playStored(store, game, rng, actions) {
+  for (let i = 0; i < actions; i++) {
+    const action = nextAction(game, rng);
+    if (!action) break;
+    act(store, game, action);
+  }
+}
+
+function restoreOne(store, gameId) {
+  const restored = store.restore().find(game => game.id === gameId);
+  assert.ok(restored, `game ${gameId} was restored`);
+  return restored;
+}
+
+for (const kind of ["file", "sqlite"]) {
+  test(`a game restored from the ${kind} store matches the live game`, { skip: kind === "sqlite" && !sqliteAvailable && "needs node:sqlite or better-sqlite3" }, async () => {
+    const env = { GAME_STORE: kind, GAME_STORE_PATH: tempPath(kind === "file" ? "games" : "games.sqlite"), GAME_SNAPSHOT_EVERY: "4" };
+    const store = await createGameStore(env);
+    const game = newGame({ seed: 21 });
+    store.create(game);
+    const rng = new Rng(7);
+
+    for (let round = 0; round < 6; round++) {
+      playStored(store, game, rng, 13);
+      const restored = restoreOne(await createGameStore(env), game.id);
+      assert.deepEqual(plain(restored.serialize()), plain(game.serialize()));
+      assert.deepEqual(restored.toSnapshot(), game.toSnapshot());
+    }
+
+    // Both continue the same way: the rng state came back too
+    const restored = restoreOne(await createGameStore(env), game.id);
+    const live = new Rng(99), replayed = new Rng(99);
+    for (let i = 0; i < 20; i++) {
+      const action = nextAction(game, live);
+      if (!action) break;
+      tryAction(game, action);
+      tryAction(restored, nextAction(restored, replayed));
+    }
+    assert.deepEqual(plain(restored.serialize()), plain(game.serialize()));
+  });
+}
+
+test("a torn last line in the action log is ignored", async () => {
+  const env = { GAME_STORE: "file", GAME_STORE_PATH: tempPath("games"), GAME_SNAPSHOT_EVERY: "50" };
+  const store = await createGameStore(env);
+  const game = newGame({ seed: 5 });
+  store.create(game);
+  playStored(store, game, new Rng(5), 30);
+  assert.ok(store.backend.readLog(game.id).length > 0);
+
+  // A crash in the middle of appending the next action
+  fs.appendFileSync(path.join(env.GAME_STORE_PATH, `${game.id}.wal`), '{"seq":31,"action":{"type":"gai');
+
+  const restored = restoreOne(await createGameStore(env), game.id);
+  assert.deepEqual(plain(restored.serialize()), plain(game.serialize()));
+});
+
+test("a rejected action is logged and replayed with the changes it made", async () => {
+  const env = { GAME_STORE: "file", GAME_STORE_PATH: tempPath("games"), GAME_SNAPSHOT_EVERY: "50" };
+  const store = await createGameStore(env);
+  const game = newGame({ seed: 3, players: 2 });
+  store.create(game);
+  const rng = new Rng(3);
+  while (game.phase === "SETUP") act(store, game, nextAction(game, rng));
+
+  // Forest strength 2, so gainFood takes two dice: the first is taken
+  // (and rerolled) before the second turns out not to exist
+  const seat = game.players.indexOf(game.turnManager.activePlayer);
+  const player = game.players[seat];
+  player.placeBird("forest", CardDatabase.instance(CardDatabase.birds()[0]));
+  game.diceTray.dice = ["seed", "seed", "seed", "seed", "seed"];
+  store.snapshot(game);
+
+  const seeds = player.food.seed || 0;
+  const action = { type: "gainFood", seat, habitat: "forest", foodTypes: ["seed", "nectar"] };
+  assert.equal(act(store, game, action), null);
+  assert.equal(player.food.seed, seeds + 1);
+  assert.deepEqual(store.backend.readLog(game.id).map(entry => entry.action), [action]);
+
+  const restored = restoreOne(await createGameStore(env), game.id);
+  assert.deepEqual(plain(restored.serialize()), plain(game.serialize()));
+  assert.deepEqual(restored.toSnapshot(), game.toSnapshot());
+});
+
+test("a finished game is removed from the store", async () => {
+  const env = { GAME_STORE: "file", GAME_STORE_PATH: tempPath("games"), GAME_SNAPSHOT_EVERY: "4" };
+  const store = await createGameStore(env);
+  const game = newGame({ seed: 8 });
+  store.create(game);
+  playStored(store, game, new Rng(8), 5000);
+
+  assert.equal(game.phase, "END");
+  assert.deepEqual(store.backend.gameIds(), []);
+  assert.deepEqual(fs.readdirSync(env.GAME_STORE_PATH), []);
+  assert.deepEqual((await createGameStore(env)).restore(), []);
+});
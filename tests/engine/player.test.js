@@ -0,0 +1,53 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { applyAction } from "../../server/engine/GameActions.js";
+import { CardDatabase } from "../../server/engine/CardDatabase.js";
+import { newGame, playGame } from "../helpers/bot.js";
+
+function assertBoardsCounted(game, action) {
+  for (const player of game.players) {
+    const kept = { ...player.board };
+    player.recount();
+    assert.deepEqual(kept, player.board, `${player.name}'s totals after ${action?.type}`);
+  }
+}
+
+test("board totals match a recount after every action", () => {
+  for (const seed of [1, 2, 3]) {
+    const game = newGame({ seed, players: 2 + seed });
+    let changed = 0;
+    playGame(game, {
+      seed,
+      each: (action, result) => {
+        if (result) changed++;
+        assertBoardsCounted(game, action);
+      }
+    });
+    assert.equal(game.phase, "END");
+    assert.ok(changed > 0);
+    assert.ok(game.players.some(p => p.board.eggs > 0 && p.board.birds > 0));
+  }
+});
+
+test("egg_for_food spends an egg from the board total", () => {
+  const game = newGame({ seed: 5, players: 2 });
+  game.players.forEach((player, seat) => {
+    applyAction(game, { type: "confirmSetup", seat, keptBirdIds: [], bonusCardId: player.setup.bonusCards[0].id });
+  });
+  const seat = game.players.indexOf(game.turnManager.activePlayer);
+  const player = game.players[seat];
+  const exchange = { type: "exchangeResource", seat, exchangeType: "egg_for_food", params: { foodType1: "fish", foodType2: "fruit" } };
+
+  assert.throws(() => applyAction(game, exchange), /Not enough eggs/);
+
+  const bird = CardDatabase.instance(CardDatabase.birds()[0], { eggs: 0 });
+  player.placeBird("grassland", bird);
+  player.addEggs(bird, 2);
+  const food = { ...player.food };
+
+  applyAction(game, exchange);
+  assert.equal(bird.eggs, 1);
+  assert.equal(player.board.eggs, 1);
+  assert.equal(player.food.fish, (food.fish || 0) + 1);
+  assert.equal(player.food.fruit, (food.fruit || 0) + 1);
+});
@@ -0,0 +1,13 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { spawnSync } from "child_process";
+import path from "path";
+import { fileURLToPath } from "url";
+
+const root = path.join(path.dirname(fileURLToPath(import.meta.url)), "../..");
+const pythonAvailable = !spawnSync("python3", ["--version"]).error;
+
+test("PowerParser.js compiles every bird power as power_grammar.py does", { skip: !pythonAvailable && "needs python3" }, () => {
+  const check = spawnSync("python3", ["scripts/power_grammar.py", "--check"], { cwd: root, encoding: "utf8" });
+  assert.equal(check.status, 0, check.stdout + check.stderr);
+});
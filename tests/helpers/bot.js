@@ -0,0 +1,132 @@
+import { Game } from "../../server/engine/Game.js";
+import { applyAction } from "../../server/engine/GameActions.js";
+import { Rng } from "../../server/utils/rng.js";
+
+// The engine logs every power activation; keep test output readable
+console.log = () => {};
+
+const HABITATS = ["forest", "grassland", "wetlands"];
+
+/** A seeded game with `players` players, setup dealt */
+export function newGame({ seed = 1, players = 3, id = `game-${seed}` } = {}) {
+  const game = new Game({ seed, id });
+  for (let i = 0; i < players; i++) game.addPlayer(`Player ${i + 1}`, `socket-${i}`);
+  game.dealSetup();
+  return game;
+}
+
+/**
+ * The next action a simple random player would send, as passed to
+ * applyAction, or null once the game is over. Actions are often invalid
+ * (not enough food, a full bird); the engine rejects those, as it would a
+ * client's.
+ */
+export function nextAction(game, rng) {
+  const pick = list => list[rng.int(list.length)];
+
+  if (game.phase === "END") return null;
+
+  if (game.phase === "SETUP") {
+    const seat = game.players.findIndex(p => !p.setup.confirmed);
+    const player = game.players[seat];
+    return {
+      type: "confirmSetup",
+      seat,
+      keptBirdIds: player.setup.birds.slice(0, 2).map(b => b.id),
+      bonusCardId: player.setup.bonusCards[0]?.id
+    };
+  }
+
+  if (game.phase === "DISCARD") {
+    const seat = game.players.findIndex(p => p.hand.length > 5 && !p.discardConfirmed);
+    return { type: "discardCards", seat, cardIds: game.players[seat].hand.slice(5).map(c => c.id) };
+  }
+
+  if (game.pendingBonusCardSelection) {
+    const { playerId, cards } = game.pendingBonusCardSelection;
+    const card = cards[0];
+    return {
+      type: "selectBonusCard",
+      seat: game.players.findIndex(p => p.id === playerId),
+      selectedCardId: card.instanceId || card.id
+    };
+  }
+
+  const seat = game.players.indexOf(game.turnManager.activePlayer);
+  const player = game.players[seat];
+  const board = Object.values(player.habitats).flat();
+  switch (rng.int(6)) {
+    case 0:
+    case 1: {
+      if (!player.hand.length) break;
+      const bird = pick(player.hand);
+      const wild = Object.keys(player.food).filter(food => player.food[food] > 0);
+      return {
+        type: "playBird",
+        seat,
+        birdId: bird.id,
+        habitat: pick(HABITATS),
+        wildFoodChoices: [wild[0], wild[1] ?? wild[0]]
+      };
+    }
+    case 2:
+      return {
+        type: "gainFood",
+        seat,
+        habitat: "forest",
+        foodTypes: Array.from({ length: player.habitats.forest.length + 1 }, () => pick(game.diceTray.dice))
+      };
+    case 3:
+      return {
+        type: "layEggs",
+        seat,
+        habitat: "grassland",
+        birdIds: board.filter(b => b.eggs < (b.eggCapacity || 6))
+          .slice(0, player.habitats.grassland.length + 1)
+          .map(b => b.id)
+      };
+    case 4:
+      if (!board.length) break;
+      return {
+        type: "exchangeResource",
+        seat,
+        exchangeType: pick(["egg_for_food", "extra_egg", "food_for_tuck"]),
+        params: { birdId: pick(board).id, foodType: pick(Object.keys(player.food)) }
+      };
+  }
+  return {
+    type: "drawCards",
+    seat,
+    habitat: "wetlands",
+    count: Math.ceil((player.habitats.wetlands.length + 1) / 2),
+    fromTray: []
+  };
+}
+
+/** applyAction, with a rejected action reported as null instead of thrown */
+export function tryAction(game, action) {
+  try {
+    return applyAction(game, action) ?? null;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Play `game` to the end with a random player seeded by `seed`, calling
+ * each(action, result) after every action. Returns the game.
+ */
+export function playGame(game, { seed = 1, maxActions = 5000, each = () => {} } = {}) {
+  const rng = new Rng(seed);
+  for (let i = 0; i < maxActions; i++) {
+    const action = nextAction(game, rng);
+    if (!action) break;
+    each(action, tryAction(game, action));
+  }
+  return game;
+}
+
+/** A value as JSON would carry it: own enumerable data only */
+export function plain(value) {
+  return JSON.parse(JSON.stringify(value));
+}
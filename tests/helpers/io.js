@@ -0,0 +1,71 @@
+/**
+ * Stand-in for the Socket.IO server, with the part of its API the game
+ * code uses: to/in/except, emit, socketsJoin and sockets.adapter.rooms.
+ * Each socket's received messages are kept in order in `inbox`.
+ */
+export class FakeIo {
+  constructor() {
+    this.rooms = new Map(); // room -> Set(socketId); every socket is in its own room
+    this.sockets = { adapter: { rooms: this.rooms } };
+    this.inbox = new Map(); // socketId -> [{ event, data }]
+  }
+
+  connect(socketId) {
+    this.join(socketId, socketId);
+    this.inbox.set(socketId, []);
+  }
+
+  join(socketId, room) {
+    if (!this.rooms.has(room)) this.rooms.set(room, new Set());
+    this.rooms.get(room).add(socketId);
+  }
+
+  to(target) {
+    return new FakeTarget(this, [].concat(target), []);
+  }
+
+  in(target) {
+    return this.to(target);
+  }
+
+  /** Messages sent to a socket since the last call, optionally only `event` */
+  take(socketId, event) {
+    const inbox = this.inbox.get(socketId) || [];
+    const taken = inbox.filter(message => !event || message.event === event);
+    this.inbox.set(socketId, inbox.filter(message => !taken.includes(message)));
+    return taken;
+  }
+}
+
+class FakeTarget {
+  constructor(io, targets, except) {
+    this.io = io;
+    this.targets = targets;
+    this.excluded = except;
+  }
+
+  to(target) {
+    return new FakeTarget(this.io, [...this.targets, ...[].concat(target)], this.excluded);
+  }
+
+  except(target) {
+    return new FakeTarget(this.io, this.targets, [...this.excluded, ...[].concat(target)]);
+  }
+
+  socketIds() {
+    const members = room => [...(this.io.rooms.get(room) || [])];
+    const excluded = new Set(this.excluded.flatMap(members));
+    return [...new Set(this.targets.flatMap(members))].filter(id => !excluded.has(id));
+  }
+
+  emit(event, data) {
+    // Sent over the wire as JSON
+    const message = { event, data: JSON.parse(JSON.stringify(data)) };
+    this.socketIds().forEach(id => this.io.inbox.get(id)?.push(message));
+    return true;
+  }
+
+  socketsJoin(room) {
+    this.socketIds().forEach(id => this.io.join(id, room));
+  }
+}
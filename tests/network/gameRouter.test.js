@@ -0,0 +1,110 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { GameRouter, shardFor } from "../../server/network/GameRouter.js";
+import { createGameStore } from "../../server/persistence/GameStore.js";
+import { Rng } from "../../server/utils/rng.js";
+import { FakeIo } from "../helpers/io.js";
+import { nextAction } from "../helpers/bot.js";
+
+const SHARDS = 2;
+
+// Let the backplane deliver: gateway -> shard -> gateway
+async function settle() {
+  for (let i = 0; i < 4; i++) await new Promise(resolve => setImmediate(resolve));
+}
+
+async function shardedRouter() {
+  const io = new FakeIo();
+  const router = await GameRouter.localShards(io, SHARDS, () => createGameStore({ GAME_STORE: "off" }));
+
+  // What each shard is sent
+  const received = Array.from({ length: SHARDS }, () => []);
+  received.forEach((messages, shard) => router.backplane.subscribe(`shard:${shard}`, m => messages.push(m)));
+  return { io, router, received };
+}
+
+async function startGames(io, router, count) {
+  const games = [];
+  for (let i = 0; i < count; i++) {
+    const players = [0, 1].map(seat => ({ id: `socket-${i}-${seat}`, name: `Player ${seat + 1}` }));
+    players.forEach(p => io.connect(p.id));
+    const lobby = { id: `lobby${i}`, players };
+    games.push({ lobby, gameId: router.createGame(lobby) });
+  }
+  await settle();
+  return games;
+}
+
+test("games run on their shard and reconnect through their lobby", async () => {
+  const { io, router, received } = await shardedRouter();
+  const games = await startGames(io, router, 8);
+
+  for (const { lobby, gameId } of games) {
+    const shard = shardFor(gameId, SHARDS);
+    assert.ok(router.shardServices[shard].games.has(gameId), `${gameId} is on shard ${shard}`);
+    assert.ok(!router.shardServices[1 - shard].games.has(gameId));
+    assert.equal(router.lobbies.get(lobby.id), gameId);
+    for (const player of lobby.players) {
+      const [started] = io.take(player.id, "gameStarted");
+      assert.equal(started.data.state.id, gameId);
+      assert.equal(started.data.state.you.playerId, player.id);
+    }
+  }
+  assert.equal(new Set(games.map(g => shardFor(g.gameId, SHARDS))).size, SHARDS, "both shards have games");
+
+  // Actions go to the game's shard only
+  const { gameId, lobby } = games[0];
+  received.forEach(messages => messages.splice(0));
+  router.route(lobby.players[0].id, "requestSnapshot", { gameId });
+  await settle();
+  assert.deepEqual(received.map(m => m.length), [0, 1].map(s => (s === shardFor(gameId, SHARDS) ? 1 : 0)));
+  assert.equal(io.take(lobby.players[0].id, "stateSnapshot").length, 1);
+
+  // Reconnecting names the lobby, which may hash to the other shard
+  const moved = games.find(g => shardFor(g.lobby.id, SHARDS) !== shardFor(g.gameId, SHARDS));
+  assert.ok(moved, "a lobby id that hashes to another shard than its game");
+  io.connect("rejoined");
+  router.route("rejoined", "reconnectToGame", { lobbyId: moved.lobby.id.toUpperCase(), playerName: "Player 2" });
+  await settle();
+  const [rejoined] = io.take("rejoined", "reconnectSuccess");
+  assert.equal(rejoined.data.state.id, moved.gameId);
+  assert.equal(rejoined.data.state.you.playerId, "rejoined");
+
+  // A disconnect reaches every shard; the player's game tells the others
+  received.forEach(messages => messages.splice(0));
+  io.take(moved.lobby.players[0].id);
+  router.route("rejoined", "disconnect");
+  await settle();
+  assert.deepEqual(received.map(m => m.map(({ event }) => event)), [["disconnect"], ["disconnect"]]);
+  const updates = io.take(moved.lobby.players[0].id).map(m => JSON.stringify(m.data));
+  assert.ok(updates.some(text => text.includes("Player 2 disconnected")));
+});
+
+test("a finished game's lobby is forgotten", async () => {
+  const { io, router } = await shardedRouter();
+  const games = await startGames(io, router, 3);
+  const { lobby, gameId } = games[1];
+  const game = router.shardServices[shardFor(gameId, SHARDS)].games.get(gameId);
+
+  const rng = new Rng(9);
+  for (let i = 0; i < 5000 && game.phase !== "END"; i++) {
+    const { type, seat, ...params } = nextAction(game, rng);
+    router.route(game.players[seat].id, type, { gameId, ...params });
+    await settle();
+  }
+  assert.equal(game.phase, "END");
+
+  assert.ok(!router.lobbies.has(lobby.id));
+  assert.deepEqual([...router.lobbies.keys()].sort(), [games[0].lobby.id, games[2].lobby.id]);
+});
+
+test("one service finds games by lobby itself, so none are indexed", async () => {
+  const io = new FakeIo();
+  const router = await GameRouter.inProcess(io, await createGameStore({ GAME_STORE: "off" }));
+  const [{ lobby, gameId }] = await startGames(io, router, 1);
+  assert.equal(router.lobbies.size, 0);
+
+  io.connect("rejoined");
+  router.route("rejoined", "reconnectToGame", { lobbyId: lobby.id, playerName: "Player 1" });
+  assert.equal(io.take("rejoined", "reconnectSuccess")[0].data.state.id, gameId);
+});
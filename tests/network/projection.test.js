@@ -0,0 +1,63 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { publicState, privateStates, viewFor } from "../../server/network/projection.js";
+import { Rng } from "../../server/utils/rng.js";
+import { newGame, nextAction, tryAction, plain } from "../helpers/bot.js";
+
+const HIDDEN = ["hand", "bonusCard", "bonusCards"];
+
+function assertViews(game) {
+  const shared = publicState(game);
+  const privates = privateStates(game);
+
+  for (const owner of game.players) {
+    const view = plain(viewFor(shared, privates.get(owner.id)));
+    const live = plain(owner);
+
+    // The owner's hidden fields, and only theirs, are under `you`
+    assert.equal(view.you.playerId, owner.id);
+    for (const key of HIDDEN) assert.deepEqual(view.you[key], live[key], `you.${key}`);
+    assert.deepEqual(view.you.setup.birds, live.setup?.birds);
+    assert.deepEqual(view.you.setup.bonusCards, live.setup?.bonusCards);
+
+    // Every player, the recipient included, is published with counts only
+    for (const [i, player] of game.players.entries()) {
+      const seen = view.players[i];
+      for (const key of HIDDEN) assert.ok(!(key in seen), `${key} of ${player.name} is hidden`);
+      assert.ok(!("birds" in seen.setup) && !("bonusCards" in seen.setup), "setup cards are hidden");
+      assert.equal(seen.handCount, player.hand.length);
+      assert.equal(seen.bonusCardCount, (player.bonusCard ? 1 : 0) + (player.bonusCards?.length ?? 0));
+      assert.equal(seen.setup.birdCount, player.setup?.birds?.length ?? 0);
+      assert.equal(seen.setup.bonusCardCount, player.setup?.bonusCards?.length ?? 0);
+      assert.equal(seen.setup.confirmed, Boolean(player.setup?.confirmed));
+    }
+  }
+
+  // Spectators get the public part and no `you`
+  assert.equal(viewFor(shared, undefined).you, null);
+
+  // The public part is one object shared by every recipient
+  const views = game.players.map(player => viewFor(shared, privates.get(player.id)));
+  for (const view of views) {
+    assert.equal(view.players, shared.players);
+    for (const key of Object.keys(shared)) assert.equal(view[key], shared[key], key);
+  }
+}
+
+test("opponents see counts only and owners see their cards under you", () => {
+  const game = newGame({ seed: 3 });
+  const rng = new Rng(3);
+  assert.ok(game.players.every(p => p.setup.birds.length && p.setup.bonusCards.length));
+  assertViews(game);
+
+  let inGame = 0;
+  for (let i = 0; i < 200; i++) {
+    const action = nextAction(game, rng);
+    if (!action) break;
+    tryAction(game, action);
+    assertViews(game);
+    if (game.phase !== "SETUP") inGame++;
+  }
+  assert.ok(inGame > 0, "the game left setup");
+  assert.ok(game.players.some(p => p.hand.length && p.bonusCards?.length));
+});
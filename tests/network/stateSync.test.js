@@ -0,0 +1,124 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { StateSync, MAX_HISTORY } from "../../server/network/StateSync.js";
+import { publicState, privateStates, viewFor } from "../../server/network/projection.js";
+import { applyPatch } from "../../client/src/state/statePatch.js";
+import { Rng } from "../../server/utils/rng.js";
+import { FakeIo } from "../helpers/io.js";
+import { newGame, nextAction, tryAction, plain } from "../helpers/bot.js";
+
+// A client keeping received versions, as client/src/network/stateSync.js does
+class Client {
+  constructor(io, socketId) {
+    this.io = io;
+    this.socketId = socketId;
+    this.versions = new Map();
+    this.latest = 0;
+    this.kinds = [];
+  }
+
+  load({ version, state }) {
+    this.versions = new Map([[version, state]]);
+    this.latest = version;
+  }
+
+  receive() {
+    for (const { event, data } of this.io.take(this.socketId)) {
+      this.kinds.push(event);
+      if (event === "stateSnapshot") {
+        this.load(data);
+      } else if (event === "statePatch") {
+        const base = this.versions.get(data.baseVersion);
+        assert.ok(base, `${this.socketId} has base version ${data.baseVersion}`);
+        this.versions.set(data.version, applyPatch(base, data.ops));
+        this.latest = data.version;
+      }
+    }
+  }
+
+  get state() {
+    return this.versions.get(this.latest);
+  }
+}
+
+function setup({ players = 2 } = {}) {
+  const io = new FakeIo();
+  const game = newGame({ seed: 41, players });
+  const sync = new StateSync(io);
+  const clients = game.players.map(player => {
+    io.connect(player.id);
+    io.join(player.id, game.id);
+    return new Client(io, player.id);
+  });
+  return { io, game, sync, clients, rng: new Rng(41) };
+}
+
+const viewOf = (game, socketId) => plain(viewFor(publicState(game), privateStates(game).get(socketId)));
+
+function step(game, rng) {
+  tryAction(game, nextAction(game, rng));
+}
+
+test("clients patched from their acked versions see their own view", () => {
+  const { game, sync, clients, rng } = setup({ players: 3 });
+  clients.forEach(client => {
+    client.load(plain(sync.snapshotFor(client.socketId, game)));
+    sync.ack(client.socketId, game.id, client.latest);
+  });
+
+  for (let i = 0; i < 120 && game.phase !== "END"; i++) {
+    step(game, rng);
+    sync.broadcast(game);
+    for (const client of clients) {
+      client.receive();
+      sync.ack(client.socketId, game.id, client.latest);
+      assert.deepEqual(client.state, viewOf(game, client.socketId));
+    }
+  }
+  clients.forEach(client => assert.ok(client.kinds.every(kind => kind === "statePatch")));
+});
+
+test("a socket with no known version gets a full snapshot", () => {
+  const { io, game, sync, clients } = setup();
+  const [first, second] = clients;
+  first.load(plain(sync.snapshotFor(first.socketId, game)));
+  sync.ack(first.socketId, game.id, first.latest);
+
+  // An ack for a version that was never sent changes nothing
+  sync.ack(first.socketId, game.id, 999);
+  // Acks from a socket the game never sent a state to are ignored
+  sync.ack(second.socketId, game.id, 1);
+
+  sync.broadcast(game);
+  const [patch] = io.take(first.socketId, "statePatch");
+  assert.equal(patch.data.baseVersion, first.latest);
+
+  second.receive();
+  assert.deepEqual(second.kinds, ["stateSnapshot"]);
+  assert.deepEqual(second.state, viewOf(game, second.socketId));
+});
+
+test("history stays within MAX_HISTORY and a client left behind gets a snapshot", () => {
+  const { game, sync, clients, rng } = setup();
+  const [acking, lagging] = clients;
+  clients.forEach(client => {
+    client.load(plain(sync.snapshotFor(client.socketId, game)));
+    sync.ack(client.socketId, game.id, client.latest);
+  });
+
+  for (let i = 0; i < MAX_HISTORY * 2; i++) {
+    step(game, rng);
+    sync.broadcast(game);
+    acking.receive();
+    sync.ack(acking.socketId, game.id, acking.latest);
+    // The lagging client receives but never acknowledges
+    lagging.receive();
+    assert.ok(sync.games.get(game.id).states.size <= MAX_HISTORY);
+  }
+
+  assert.ok(acking.kinds.every(kind => kind === "statePatch"));
+  assert.ok(lagging.kinds.includes("stateSnapshot"));
+  // Patches while its base was kept, then snapshots once it was pruned
+  assert.equal(lagging.kinds.indexOf("stateSnapshot"), MAX_HISTORY - 1);
+  assert.deepEqual(lagging.state, viewOf(game, lagging.socketId));
+});
@@ -0,0 +1,65 @@
+import { test } from "node:test";
+import assert from "node:assert/strict";
+import { diff } from "../../server/utils/stateDiff.js";
+import { applyPatch } from "../../client/src/state/statePatch.js";
+import { publicState } from "../../server/network/projection.js";
+import { newGame, playGame, plain } from "../helpers/bot.js";
+
+// Patch prev into next as the client would, checking prev is left alone
+function roundTrip(prev, next) {
+  const before = structuredClone(prev);
+  const patched = applyPatch(prev, diff(prev, next));
+  assert.deepEqual(patched, next);
+  assert.deepEqual(prev, before);
+  return patched;
+}
+
+test("patches between successive game states rebuild the next state", () => {
+  const states = [];
+  const game = newGame({ seed: 31, players: 4 });
+  states.push(plain(game.serialize()));
+  playGame(game, { seed: 31, each: () => states.push(plain(game.serialize())) });
+  assert.equal(game.phase, "END");
+
+  for (let i = 1; i < states.length; i++) roundTrip(states[i - 1], states[i]);
+  // Further apart too, as for a client a few versions behind
+  for (let i = 7; i < states.length; i += 7) roundTrip(states[i - 7], states[i]);
+  // And backwards, where hands, trays and the log ring shrink or lose keys
+  for (let i = 1; i < states.length; i += 3) roundTrip(states[i], states[i - 1]);
+});
+
+test("patches of public states carry the counts that replace hidden fields", () => {
+  const game = newGame({ seed: 32 });
+  let prev = plain(publicState(game));
+  playGame(game, {
+    seed: 32,
+    each: () => {
+      const next = plain(publicState(game));
+      roundTrip(prev, next);
+      prev = next;
+    }
+  });
+});
+
+test("arrays that shrink and keys that are deleted", () => {
+  roundTrip({ a: [1, 2, 3, 4], b: { c: 1, d: 2 } }, { a: [1, 5], b: { d: 2 } });
+  roundTrip({ a: [1, 2] }, { a: [] });
+  roundTrip({ a: [{ x: 1 }, { x: 2 }] }, { a: [{ x: 1, y: 2 }] });
+  roundTrip({ a: [1], gone: { deep: [1] } }, { a: [1, 2, 3] });
+  roundTrip({ a: { b: 1 } }, { a: [1] });
+  roundTrip({ a: null }, { a: { b: [] } });
+  roundTrip([1, 2, 3], { not: "an array" });
+  roundTrip({ same: [1, { two: 2 }] }, { same: [1, { two: 2 }] });
+});
+
+test("the patch format is the one statePatch.js applies", () => {
+  assert.deepEqual(diff({ a: [1, 2, 3], b: 1, c: 1 }, { a: [1], b: 2 }), [
+    { op: "del", path: ["c"] },
+    { op: "truncate", path: ["a"], length: 1 },
+    { op: "set", path: ["b"], value: 2 }
+  ]);
+  assert.deepEqual(diff({ log: ["x"] }, { log: ["x", "y", "z"] }), [
+    { op: "push", path: ["log"], values: ["y", "z"] }
+  ]);
+  assert.deepEqual(diff(1, 2), [{ op: "set", path: [], value: 2 }]);
+});